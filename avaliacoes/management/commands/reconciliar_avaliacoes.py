@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from avaliacoes.models import Avaliacao
+from avaliacoes.notas import reconciliar_notas
+from usuarios.models import Usuario
+
+
+class Command(BaseCommand):
+    help = "Recalcula soma_notas/total_avaliacoes/nota_media de todos os usuários e corrige divergências."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lote", type=int, default=500,
+            help="Quantidade de usuários por UPDATE em lote (padrão: 500).",
+        )
+        parser.add_argument(
+            "--apenas-verificar", action="store_true",
+            help="Só relata as divergências, sem gravar.",
+        )
+
+    def handle(self, *args, **options):
+        corrigir = not options["apenas_verificar"]
+        inicio = time.perf_counter()
+        with transaction.atomic():
+            divergentes = reconciliar_notas(
+                Usuario, Avaliacao, corrigir=corrigir, tamanho_lote=options["lote"]
+            )
+        duracao = time.perf_counter() - inicio
+
+        if not divergentes:
+            self.stdout.write(self.style.SUCCESS(f"Nenhuma divergência ({duracao:.2f}s)."))
+            return
+
+        amostra = ", ".join(str(i) for i in divergentes[:20])
+        acao = "corrigidos" if corrigir else "divergentes"
+        self.stdout.write(self.style.WARNING(
+            f"{len(divergentes)} usuários {acao} em {duracao:.2f}s (IDs: {amostra}{'...' if len(divergentes) > 20 else ''})."
+        ))
@@ -0,0 +1,78 @@
+"""
+Agregados de notas por usuário avaliado.
+
+Usuario guarda soma_notas e total_avaliacoes, ajustados com incrementos F()
+pelos sinais de Avaliacao (avaliacoes/signals.py): cada escrita de avaliação
+custa dois UPDATEs de uma linha, independente de quantas avaliações o usuário
+já tem. nota_media é derivada desses contadores no próprio banco.
+
+O comando reconciliar_avaliacoes recalcula tudo em lote para detectar e
+corrigir divergências (ex.: alterações feitas com QuerySet.update()).
+"""
+from django.db.models import Case, Count, F, FloatField, Sum, When
+from django.db.models.functions import Cast, Round
+
+# nota_media = soma / total com duas casas (None sem avaliações)
+NOTA_MEDIA = Case(
+    When(total_avaliacoes=0, then=None),
+    default=Round(Cast("soma_notas", FloatField()) / F("total_avaliacoes"), 2),
+    output_field=FloatField(),
+)
+
+
+def media(soma, total):
+    return round(soma / total, 2) if total else None
+
+
+def ajustar_notas(usuario_id, delta_soma, delta_total=0):
+    """Aplica a variação aos contadores e recalcula nota_media (UPDATEs atômicos)."""
+    from usuarios.models import Usuario
+
+    if not (delta_soma or delta_total):
+        return
+    usuario = Usuario.objects.filter(pk=usuario_id)
+    usuario.update(
+        soma_notas=F("soma_notas") + delta_soma,
+        total_avaliacoes=F("total_avaliacoes") + delta_total,
+    )
+    # Em UPDATE separado: no MySQL um SET enxerga os valores já alterados no mesmo UPDATE
+    usuario.update(nota_media=NOTA_MEDIA)
+
+
+def reconciliar_notas(Usuario, Avaliacao, corrigir=True, tamanho_lote=500):
+    """
+    Recalcula os agregados de todos os usuários com uma consulta agrupada e
+    compara com os contadores gravados. Retorna a lista de IDs divergentes
+    (corrigidos se corrigir=True).
+    """
+    reais = {
+        avaliado_id: (soma, total)
+        for avaliado_id, soma, total in (
+            Avaliacao.objects.order_by()
+            .values_list("avaliado")
+            .annotate(Sum("nota"), Count("id"))
+            .iterator(chunk_size=tamanho_lote)
+        )
+    }
+
+    divergentes = []
+    usuarios = (
+        Usuario.objects.order_by("id")
+        .values_list("id", "soma_notas", "total_avaliacoes", "nota_media")
+        .iterator(chunk_size=tamanho_lote)
+    )
+    for usuario_id, soma, total, nota_media in usuarios:
+        soma_real, total_real = reais.get(usuario_id, (0, 0))
+        if (soma, total, nota_media) != (soma_real, total_real, media(soma_real, total_real)):
+            divergentes.append(Usuario(
+                id=usuario_id,
+                soma_notas=soma_real,
+                total_avaliacoes=total_real,
+                nota_media=media(soma_real, total_real),
+            ))
+
+    if corrigir and divergentes:
+        Usuario.objects.bulk_update(
+            divergentes, ["soma_notas", "total_avaliacoes", "nota_media"], batch_size=tamanho_lote
+        )
+    return [usuario.id for usuario in divergentes]
@@ -15,12 +15,12 @@ class PermissaoAvaliacao(BasePermission):
         if request.method in SAFE_METHODS:
             # O avaliador ou o avaliado podem visualizar
             return (
-                request.user == obj.avaliador or
-                request.user == obj.avaliado
+                request.user.id == obj.avaliador_id or
+                request.user.id == obj.avaliado_id
             )
 
         if request.method == "DELETE":
             return False
 
         # Só avaliador pode criar/editar
-        return request.user == obj.avaliador
+        return request.user.id == obj.avaliador_id
@@ -1,11 +1,8 @@
 from rest_framework import serializers
-from django.db import models
+from django.db import transaction
 from .models import Avaliacao
 from usuarios.models import Usuario
-import re
-
-# Palavras proibidas
-PALAVRAS_PROIBIDAS = ['ofensa', 'palavrão', 'xingar', 'idiota', 'burro']
+from moderacao.filtro import validar_texto
 
 
 class UsuarioBasicoSerializer(serializers.ModelSerializer):
@@ -48,11 +45,7 @@ class AvaliacaoSerializer(serializers.ModelSerializer):
     def validate_comentario(self, value):
         if value and len(value) > 500:
             raise serializers.ValidationError("O comentário deve ter no máximo 500 caracteres.")
-        if value:
-            for palavra in PALAVRAS_PROIBIDAS:
-                if re.search(rf"\b{palavra}\b", value, re.IGNORECASE):
-                    raise serializers.ValidationError("Comentário contém palavras ofensivas ou inapropriadas.")
-        return value
+        return validar_texto(value, "Comentário contém palavras ofensivas ou inapropriadas.")
 
     def validate(self, data):
         """
@@ -93,26 +86,12 @@ class AvaliacaoSerializer(serializers.ModelSerializer):
         return data
 
     # CREATE / UPDATE
+    # Os contadores de nota do avaliado são ajustados pelos sinais
+    # (avaliacoes/signals.py) na mesma transação da escrita.
     def create(self, validated_data):
-        avaliacao = super().create(validated_data)
-        self.atualizar_nota_media(avaliacao.avaliado)
-        return avaliacao
+        with transaction.atomic():
+            return super().create(validated_data)
 
     def update(self, instance, validated_data):
-        avaliacao = super().update(instance, validated_data)
-        self.atualizar_nota_media(avaliacao.avaliado)
-        return avaliacao
-
-    # MÉTODO AUXILIAR
-    def atualizar_nota_media(self, usuario):
-        """
-        Atualiza a nota média do usuário avaliado
-        com base em todas as avaliações recebidas.
-        """
-        avaliacoes = Avaliacao.objects.filter(avaliado=usuario)
-        if avaliacoes.exists():
-            media = avaliacoes.aggregate(models.Avg('nota'))['nota__avg']
-            usuario.nota_media = round(media, 2)
-        else:
-            usuario.nota_media = None
-        usuario.save(update_fields=['nota_media'])
+        with transaction.atomic():
+            return super().update(instance, validated_data)
@@ -0,0 +1,49 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from usuarios.busca_freelancers import indexar_freelancer
+
+from .models import Avaliacao
+from .notas import ajustar_notas
+
+
+# Agregados de notas do avaliado (avaliacoes/notas.py)
+@receiver(pre_save, sender=Avaliacao)
+def guardar_nota_anterior(sender, instance, raw=False, **kwargs):
+    instance._nota_anterior = None
+    if raw or instance.pk is None:
+        return
+    instance._nota_anterior = (
+        Avaliacao.objects.filter(pk=instance.pk).values_list("avaliado_id", "nota").first()
+    )
+
+
+@receiver(post_save, sender=Avaliacao)
+def ajustar_notas_ao_salvar(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    anterior = getattr(instance, "_nota_anterior", None)
+    if created or anterior is None:
+        ajustar_notas(instance.avaliado_id, instance.nota, 1)
+    else:
+        avaliado_anterior, nota_anterior = anterior
+        if avaliado_anterior == instance.avaliado_id:
+            if instance.nota == nota_anterior:
+                return
+            ajustar_notas(instance.avaliado_id, instance.nota - nota_anterior)
+        else:
+            ajustar_notas(avaliado_anterior, -nota_anterior, -1)
+            ajustar_notas(instance.avaliado_id, instance.nota, 1)
+            indexar_freelancer(avaliado_anterior)
+
+    # Nota e pontuação do perfil de busca (no-op para contratantes)
+    indexar_freelancer(instance.avaliado_id)
+
+
+@receiver(post_delete, sender=Avaliacao)
+def ajustar_notas_ao_excluir(sender, instance, **kwargs):
+    ajustar_notas(instance.avaliado_id, -instance.nota, -1)
+    # Após o commit: na exclusão em cascata do próprio avaliado, ele já não existe
+    avaliado_id = instance.avaliado_id
+    transaction.on_commit(lambda: indexar_freelancer(avaliado_id))
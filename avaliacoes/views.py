@@ -17,7 +17,7 @@ class AvaliacaoViewSet(viewsets.ModelViewSet):
     - Criação com notificação automática
     """
     queryset = Avaliacao.objects.all().select_related(
-        "avaliador", "avaliado", "contrato"
+        "avaliador", "avaliado", "contrato__trabalho"
     ).order_by("-data_avaliacao", "-id")
     
     serializer_class = AvaliacaoSerializer
@@ -37,7 +37,7 @@ class AvaliacaoViewSet(viewsets.ModelViewSet):
         return (
             Avaliacao.objects
             .filter(models.Q(avaliador=user) | models.Q(avaliado=user))
-            .select_related("avaliador", "avaliado", "contrato")
+            .select_related("avaliador", "avaliado", "contrato__trabalho")
             .distinct()
             .order_by("-data_avaliacao", "-id")
         )
@@ -64,7 +64,7 @@ class AvaliacaoViewSet(viewsets.ModelViewSet):
         avaliacoes = (
             Avaliacao.objects
             .filter(avaliador=request.user)
-            .select_related("avaliador", "avaliado", "contrato")
+            .select_related("avaliador", "avaliado", "contrato__trabalho")
             .order_by("-data_avaliacao", "-id")
         )
         serializer = self.get_serializer(avaliacoes, many=True)
@@ -76,7 +76,7 @@ class AvaliacaoViewSet(viewsets.ModelViewSet):
         avaliacoes = (
             Avaliacao.objects
             .filter(avaliado=request.user)
-            .select_related("avaliador", "avaliado", "contrato")
+            .select_related("avaliador", "avaliado", "contrato__trabalho")
             .order_by("-data_avaliacao", "-id")
         )
         serializer = self.get_serializer(avaliacoes, many=True)
@@ -0,0 +1,124 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from contratos.models import Contrato
+from contratos.serializers import ContratoSerializer
+from contratos.views import ContratoViewSet
+from habilidades.models import Habilidade, Ramo
+from pagamentos.models import Pagamento
+from propostas.models import Proposta
+from trabalhos.models import Trabalho
+from usuarios.models import Usuario
+
+
+class Command(BaseCommand):
+    help = (
+        "Conta as consultas de GET /contratos/ para 1 e N contratos na página: "
+        "serializer completo sem select_related (antigo) contra a listagem "
+        "resumida. Falha se as consultas da listagem crescerem com N. "
+        "Tudo roda dentro de uma transação desfeita ao final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--contratos", type=int, default=6,
+            help="Contratos na página (padrão: 6, o PAGE_SIZE).",
+        )
+        parser.add_argument(
+            "--habilidades", type=int, default=3,
+            help="Habilidades por trabalho (padrão: 3).",
+        )
+
+    def handle(self, *args, **options):
+        n = options["contratos"]
+        fabrica = APIRequestFactory()
+        resultados = {}
+
+        with transaction.atomic():
+            sufixo = time.time_ns()
+            contratante = Usuario.objects.create(
+                email=f"benchmark-c-{sufixo}@exemplo.com", nome="Contratante",
+                tipo="contratante", telefone="0", password="!",
+            )
+            freelancer = Usuario.objects.create(
+                email=f"benchmark-f-{sufixo}@exemplo.com", nome="Freelancer",
+                tipo="freelancer", telefone="0", password="!",
+            )
+            ramo = Ramo.objects.create(nome=f"Benchmark {sufixo}")
+            habilidades = Habilidade.objects.bulk_create(
+                [Habilidade(nome=f"Benchmark {sufixo} {i}") for i in range(options["habilidades"])]
+            )
+
+            self.stdout.write(f"{'contratos':>9} | {'modo':<7} | {'consultas':>9} | {'ms':>8}")
+            self.stdout.write("-" * 44)
+
+            criados = 0
+            for quantidade in (1, n):
+                while criados < quantidade:
+                    self._criar_contrato(contratante, freelancer, ramo, habilidades)
+                    criados += 1
+
+                for modo in ("antigo", "lista"):
+                    requisicao = fabrica.get("/contratos/")
+                    force_authenticate(requisicao, user=contratante)
+                    view = self._view(modo)
+
+                    with CaptureQueriesContext(connection) as consultas:
+                        inicio = time.perf_counter()
+                        resposta = view(requisicao)
+                        resposta.render()
+                        duracao = (time.perf_counter() - inicio) * 1000
+
+                    assert resposta.status_code == 200, resposta.data
+                    assert len(resposta.data["results"]) == quantidade
+                    resultados[modo, quantidade] = len(consultas)
+                    self.stdout.write(
+                        f"{quantidade:>9} | {modo:<7} | {len(consultas):>9} | {duracao:>8.1f}"
+                    )
+
+            transaction.set_rollback(True)
+
+        if resultados["lista", n] != resultados["lista", 1]:
+            raise CommandError(
+                f"A listagem fez {resultados['lista', 1]} consultas com 1 contrato "
+                f"e {resultados['lista', n]} com {n}: há N+1 na serialização."
+            )
+        self.stdout.write(self.style.SUCCESS("Consultas da listagem constantes."))
+
+    # Helpers
+    def _view(self, modo):
+        if modo == "lista":
+            return ContratoViewSet.as_view({"get": "list"})
+
+        class ContratoViewSetAntigo(ContratoViewSet):
+            """Comportamento anterior: queryset sem relacionados e serializer completo."""
+
+            def get_queryset(self):
+                return super().get_queryset().select_related(None).prefetch_related(None)
+
+            def get_serializer_class(self):
+                return ContratoSerializer
+
+        return ContratoViewSetAntigo.as_view({"get": "list"})
+
+    def _criar_contrato(self, contratante, freelancer, ramo, habilidades):
+        hoje = datetime.date.today()
+        trabalho = Trabalho.objects.create(
+            titulo="Benchmark", descricao="-", prazo=hoje, orcamento=100,
+            contratante=contratante, ramo=ramo,
+        )
+        trabalho.habilidades.add(*habilidades)
+        proposta = Proposta.objects.create(
+            trabalho=trabalho, freelancer=freelancer, descricao="-", valor=100, prazo_estimado=hoje,
+        )
+        contrato = Contrato.objects.create(
+            proposta=proposta, trabalho=trabalho, contratante=contratante,
+            freelancer=freelancer, valor=100,
+        )
+        Pagamento.objects.create(contrato=contrato, contratante=contratante, valor=100)
+        return contrato
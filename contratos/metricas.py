@@ -0,0 +1,78 @@
+"""
+Métricas de performance dos freelancers (tabela MetricasFreelancer).
+
+O endpoint público /usuarios/{id}/metricas_performance/ lê uma única linha;
+o custo de agregação fica na escrita:
+- recalcular_metricas(freelancer_id): agrega os contratos de um freelancer no
+  banco (chamado pelos sinais em contratos/signals.py);
+- recalcular_todas(): reconstrói a tabela inteira com consultas agrupadas
+  (comando recalcular_metricas).
+Alterações feitas com QuerySet.update() não disparam sinais; quem as fizer
+deve chamar recalcular_metricas para os freelancers afetados.
+"""
+from collections import defaultdict
+
+from django.db.models import Count, F, Q
+
+ENTREGUE_NO_PRAZO = Q(
+    status="concluido",
+    data_entrega__isnull=False,
+    data_entrega__lte=F("trabalho__prazo"),
+)
+
+CONTAGENS = {
+    "total_contratos": Count("id"),
+    "contratos_concluidos": Count("id", filter=Q(status="concluido")),
+    "contratos_cancelados": Count("id", filter=Q(status="cancelado")),
+    "entregas_no_prazo": Count("id", filter=ENTREGUE_NO_PRAZO),
+}
+
+
+def recalcular_metricas(freelancer_id):
+    """Recalcula e grava as métricas de um freelancer. Retorna a instância."""
+    from .models import Contrato, MetricasFreelancer
+
+    contratos = Contrato.objects.filter(freelancer_id=freelancer_id).order_by()
+    valores = contratos.aggregate(**CONTAGENS)
+
+    por_contratante = contratos.values("contratante").annotate(n=Count("id"))
+    valores["contratantes_unicos"] = por_contratante.count()
+    valores["contratantes_recorrentes"] = por_contratante.filter(n__gte=2).count()
+
+    metricas, _ = MetricasFreelancer.objects.update_or_create(
+        freelancer_id=freelancer_id, defaults=valores
+    )
+    return metricas
+
+
+def recalcular_todas(tamanho_lote=500):
+    """
+    Reconstrói a tabela inteira com duas consultas agrupadas (contagens por
+    freelancer e contratos por par freelancer/contratante) e bulk_create.
+    Retorna o total de freelancers gravados.
+    """
+    from .models import Contrato, MetricasFreelancer
+
+    contratos = Contrato.objects.order_by()
+
+    contratantes = defaultdict(lambda: [0, 0])
+    pares = contratos.values_list("freelancer", "contratante").annotate(n=Count("id"))
+    for freelancer_id, _, n in pares.iterator(chunk_size=tamanho_lote):
+        contratantes[freelancer_id][0] += 1
+        if n >= 2:
+            contratantes[freelancer_id][1] += 1
+
+    linhas = []
+    for valores in contratos.values("freelancer").annotate(**CONTAGENS).iterator(chunk_size=tamanho_lote):
+        freelancer_id = valores.pop("freelancer")
+        unicos, recorrentes = contratantes[freelancer_id]
+        linhas.append(MetricasFreelancer(
+            freelancer_id=freelancer_id,
+            contratantes_unicos=unicos,
+            contratantes_recorrentes=recorrentes,
+            **valores,
+        ))
+
+    MetricasFreelancer.objects.all().delete()
+    MetricasFreelancer.objects.bulk_create(linhas, batch_size=tamanho_lote)
+    return len(linhas)
@@ -0,0 +1,73 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:27
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Q
+
+
+def preencher_metricas(apps, schema_editor):
+    """Mesmas agregações de contratos/metricas.py, congeladas nesta migração."""
+    Contrato = apps.get_model("contratos", "Contrato")
+    MetricasFreelancer = apps.get_model("contratos", "MetricasFreelancer")
+    contratos = Contrato.objects.order_by()
+
+    contratantes = defaultdict(lambda: [0, 0])
+    pares = contratos.values_list("freelancer", "contratante").annotate(n=Count("id"))
+    for freelancer_id, _, n in pares.iterator(chunk_size=500):
+        contratantes[freelancer_id][0] += 1
+        if n >= 2:
+            contratantes[freelancer_id][1] += 1
+
+    contagens = contratos.values("freelancer").annotate(
+        total_contratos=Count("id"),
+        contratos_concluidos=Count("id", filter=Q(status="concluido")),
+        contratos_cancelados=Count("id", filter=Q(status="cancelado")),
+        entregas_no_prazo=Count("id", filter=Q(
+            status="concluido",
+            data_entrega__isnull=False,
+            data_entrega__lte=F("trabalho__prazo"),
+        )),
+    )
+    linhas = []
+    for valores in contagens.iterator(chunk_size=500):
+        freelancer_id = valores.pop("freelancer")
+        unicos, recorrentes = contratantes[freelancer_id]
+        linhas.append(MetricasFreelancer(
+            freelancer_id=freelancer_id,
+            contratantes_unicos=unicos,
+            contratantes_recorrentes=recorrentes,
+            **valores,
+        ))
+    MetricasFreelancer.objects.bulk_create(linhas, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contratos', '0007_alter_contrato_contratante_alter_contrato_freelancer'),
+        ('usuarios', '0011_usuario_token_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MetricasFreelancer',
+            fields=[
+                ('freelancer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='metricas', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_contratos', models.PositiveIntegerField(default=0)),
+                ('contratos_concluidos', models.PositiveIntegerField(default=0)),
+                ('contratos_cancelados', models.PositiveIntegerField(default=0)),
+                ('entregas_no_prazo', models.PositiveIntegerField(default=0)),
+                ('contratantes_unicos', models.PositiveIntegerField(default=0)),
+                ('contratantes_recorrentes', models.PositiveIntegerField(default=0, help_text='Contratantes com dois ou mais contratos com o freelancer.')),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Métricas do freelancer',
+                'verbose_name_plural': 'Métricas dos freelancers',
+            },
+        ),
+        migrations.RunPython(preencher_metricas, migrations.RunPython.noop),
+    ]
@@ -67,3 +67,51 @@ class Contrato(models.Model):
     def __str__(self):
         contratante_nome = self.contratante.nome if self.contratante else "Desconhecido"
         return f"Contrato: {contratante_nome} ⇄ {self.freelancer.nome} | {self.trabalho.titulo}"
+
+
+class MetricasFreelancer(models.Model):
+    """
+    Métricas de performance materializadas de um freelancer (ver contratos/metricas.py).
+    Guarda apenas contagens; as taxas são calculadas na leitura.
+    Recalculada por sinais quando um contrato do freelancer muda de status ou
+    data_entrega (ou o prazo do trabalho muda) e pelo comando recalcular_metricas.
+    """
+    freelancer = models.OneToOneField(
+        Usuario,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='metricas'
+    )
+    total_contratos = models.PositiveIntegerField(default=0)
+    contratos_concluidos = models.PositiveIntegerField(default=0)
+    contratos_cancelados = models.PositiveIntegerField(default=0)
+    entregas_no_prazo = models.PositiveIntegerField(default=0)
+    contratantes_unicos = models.PositiveIntegerField(default=0)
+    contratantes_recorrentes = models.PositiveIntegerField(
+        default=0,
+        help_text="Contratantes com dois ou mais contratos com o freelancer."
+    )
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Métricas do freelancer'
+        verbose_name_plural = 'Métricas dos freelancers'
+
+    def __str__(self):
+        return f"Métricas #{self.freelancer_id}"
+
+    @staticmethod
+    def _taxa(parte, total):
+        return round((parte / total) * 100, 1) if total > 0 else 0
+
+    @property
+    def taxa_conclusao(self):
+        return self._taxa(self.contratos_concluidos, self.total_contratos)
+
+    @property
+    def taxa_entrega_prazo(self):
+        return self._taxa(self.entregas_no_prazo, self.contratos_concluidos)
+
+    @property
+    def taxa_recontratacao(self):
+        return self._taxa(self.contratantes_recorrentes, self.contratantes_unicos)
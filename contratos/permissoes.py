@@ -16,11 +16,11 @@ class PermissaoContrato(BasePermission):
 
         # Leitura (GET, HEAD, OPTIONS): contratante e freelancer podem visualizar
         if request.method in SAFE_METHODS:
-            return request.user == obj.contratante or request.user == obj.freelancer
+            return request.user.id in (obj.contratante_id, obj.freelancer_id)
 
         # Exclusão: apenas admin
         if request.method == "DELETE":
             return False
 
         # Edição: apenas contratante
-        return request.user == obj.contratante
+        return request.user.id == obj.contratante_id
@@ -1,15 +1,37 @@
 from rest_framework import serializers
 from datetime import date
 from .models import Contrato
-from usuarios.serializers import UsuarioSerializer
-from trabalhos.serializers import TrabalhoSerializer
-from propostas.serializers import PropostaSerializer
-from pagamentos.serializers import PagamentoSerializer
+from freelancer.campos import CamposEsparsosMixin
+from usuarios.serializers import UsuarioSerializer, UsuarioResumoSerializer
+from trabalhos.serializers import TrabalhoSerializer, TrabalhoResumoSerializer
+from propostas.serializers import PropostaSerializer, PropostaResumoSerializer
+from pagamentos.serializers import PagamentoSerializer, PagamentoResumoSerializer
 
 
-class ContratoSerializer(serializers.ModelSerializer):
+class ContratoListaSerializer(CamposEsparsosMixin, serializers.ModelSerializer):
     """
-    Serializador do modelo Contrato.
+    Representação da listagem de contratos: relacionados em versão resumida,
+    todos vindos do select_related/prefetch de ContratoViewSet.get_queryset
+    (número de consultas fixo, independente da quantidade de contratos).
+    """
+    contratante = UsuarioResumoSerializer(read_only=True)
+    freelancer = UsuarioResumoSerializer(read_only=True)
+    trabalho = TrabalhoResumoSerializer(read_only=True)
+    proposta = PropostaResumoSerializer(read_only=True, allow_null=True)
+    pagamento = PagamentoResumoSerializer(read_only=True, allow_null=True)
+
+    class Meta:
+        model = Contrato
+        fields = [
+            "id", "status", "valor", "data_inicio", "data_fim", "data_entrega",
+            "contratante", "freelancer", "trabalho", "proposta", "pagamento",
+        ]
+        read_only_fields = fields
+
+
+class ContratoSerializer(CamposEsparsosMixin, serializers.ModelSerializer):
+    """
+    Serializador do modelo Contrato (detalhe e escrita).
     Inclui validações de consistência e bloqueio de conclusão manual.
     """
     contratante = UsuarioSerializer(read_only=True)
@@ -0,0 +1,104 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from trabalhos.models import Trabalho
+from usuarios.busca_freelancers import indexar_freelancer
+from usuarios.models import Usuario
+
+from .metricas import recalcular_metricas
+from .models import Contrato
+
+# Campos do contrato que entram nas métricas do freelancer
+CAMPOS_METRICAS = ("status", "data_entrega", "freelancer_id", "contratante_id", "trabalho_id")
+
+
+def _valores_metricas(contrato):
+    return tuple(getattr(contrato, campo) for campo in CAMPOS_METRICAS)
+
+
+def atualizar_freelancer(freelancer_id):
+    """Métricas materializadas e, a partir delas, o perfil de busca."""
+    if not Usuario.objects.filter(pk=freelancer_id).exists():
+        return
+    recalcular_metricas(freelancer_id)
+    indexar_freelancer(freelancer_id)
+
+
+def _freelancers_com_concluidos(trabalho_ids):
+    return (
+        Contrato.objects
+        .filter(trabalho_id__in=trabalho_ids, status="concluido")
+        .values_list("freelancer_id", flat=True)
+        .distinct()
+    )
+
+
+# Métricas materializadas (contratos/metricas.py)
+@receiver(pre_save, sender=Contrato)
+def guardar_estado_anterior(sender, instance, raw=False, **kwargs):
+    instance._metricas_anteriores = None
+    if raw or instance.pk is None:
+        return
+    anterior = Contrato.objects.filter(pk=instance.pk).values_list(*CAMPOS_METRICAS).first()
+    instance._metricas_anteriores = anterior
+
+
+@receiver(post_save, sender=Contrato)
+def atualizar_metricas_ao_salvar(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    anterior = getattr(instance, "_metricas_anteriores", None)
+    if not created and anterior == _valores_metricas(instance):
+        return
+
+    atualizar_freelancer(instance.freelancer_id)
+    # Contrato transferido de freelancer: o anterior também muda
+    if anterior and anterior[2] != instance.freelancer_id:
+        atualizar_freelancer(anterior[2])
+
+
+@receiver(post_delete, sender=Contrato)
+def atualizar_metricas_ao_excluir(sender, instance, **kwargs):
+    # Após o commit: na exclusão em cascata do próprio freelancer, ele já não existe
+    freelancer_id = instance.freelancer_id
+    transaction.on_commit(lambda: atualizar_freelancer(freelancer_id))
+
+
+@receiver(pre_save, sender=Trabalho)
+def guardar_prazo_anterior(sender, instance, raw=False, **kwargs):
+    instance._anterior = None
+    if raw or instance.pk is None:
+        return
+    instance._anterior = Trabalho.objects.filter(pk=instance.pk).values_list("prazo", "ramo_id").first()
+
+
+@receiver(post_save, sender=Trabalho)
+def atualizar_metricas_ao_mudar_prazo(sender, instance, created, raw=False, **kwargs):
+    """
+    O prazo do trabalho define se as entregas concluídas foram no prazo e o
+    ramo entra no perfil de busca de quem concluiu o trabalho.
+    """
+    anterior = getattr(instance, "_anterior", None)
+    if created or raw or anterior is None:
+        return
+    prazo_anterior, ramo_anterior = anterior
+    if prazo_anterior != instance.prazo:
+        for freelancer_id in _freelancers_com_concluidos([instance.pk]):
+            atualizar_freelancer(freelancer_id)
+    elif ramo_anterior != instance.ramo_id:
+        for freelancer_id in _freelancers_com_concluidos([instance.pk]):
+            indexar_freelancer(freelancer_id)
+
+
+@receiver(m2m_changed, sender=Trabalho.habilidades.through)
+def atualizar_busca_ao_alterar_habilidades(sender, instance, action, reverse, pk_set, **kwargs):
+    """Habilidades dos trabalhos concluídos entram no perfil de busca do freelancer."""
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:
+        trabalho_ids = list(pk_set or ())
+    else:
+        trabalho_ids = [instance.pk]
+    for freelancer_id in _freelancers_com_concluidos(trabalho_ids):
+        indexar_freelancer(freelancer_id)
@@ -1,3 +1,87 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from rest_framework.test import APITestCase
+
+from contratos.models import Contrato
+from habilidades.models import Habilidade, Ramo
+from pagamentos.models import Pagamento
+from propostas.models import Proposta
+from trabalhos.models import Trabalho
+from usuarios.models import Usuario
+
+# Consultas de GET /api/contratos/ com qualquer quantidade de contratos na página:
+# contagem, contratos com relacionados e prefetch das habilidades
+# (ver ContratoViewSet.get_queryset)
+CONSULTAS_LISTAGEM = 3
+
+
+class ListagemContratosTests(APITestCase):
+    """Regressão de N+1 na listagem de contratos (benchmark_contratos mede o mesmo cenário)."""
+
+    url = "/api/contratos/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.contratante = Usuario.objects.create(
+            email="contratante@exemplo.com", nome="Contratante", tipo="contratante", telefone="0", password="!",
+        )
+        cls.freelancer = Usuario.objects.create(
+            email="freelancer@exemplo.com", nome="Freelancer", tipo="freelancer", telefone="0", password="!",
+        )
+        cls.ramo = Ramo.objects.create(nome="Backend")
+        cls.habilidades = Habilidade.objects.bulk_create(
+            [Habilidade(nome=f"Habilidade {i}") for i in range(3)]
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.contratante)
+
+    def _criar_contrato(self):
+        hoje = datetime.date.today()
+        trabalho = Trabalho.objects.create(
+            titulo="Trabalho", descricao="-", prazo=hoje, orcamento=100,
+            contratante=self.contratante, ramo=self.ramo,
+        )
+        trabalho.habilidades.add(*self.habilidades)
+        proposta = Proposta.objects.create(
+            trabalho=trabalho, freelancer=self.freelancer, descricao="-", valor=100, prazo_estimado=hoje,
+        )
+        contrato = Contrato.objects.create(
+            proposta=proposta, trabalho=trabalho, contratante=self.contratante,
+            freelancer=self.freelancer, valor=100,
+        )
+        Pagamento.objects.create(contrato=contrato, contratante=self.contratante, valor=100)
+        return contrato
+
+    def _listar(self, **params):
+        resposta = self.client.get(self.url, params, secure=True)
+        self.assertEqual(resposta.status_code, 200, resposta.content)
+        return resposta.data["results"]
+
+    def test_consultas_constantes_com_1_e_n_contratos(self):
+        self._criar_contrato()
+        with self.assertNumQueries(CONSULTAS_LISTAGEM):
+            self.assertEqual(len(self._listar()), 1)
+
+        for _ in range(5):
+            self._criar_contrato()
+        with self.assertNumQueries(CONSULTAS_LISTAGEM):
+            resultados = self._listar()
+        self.assertEqual(len(resultados), 6)
+        self.assertEqual(len(resultados[0]["trabalho"]["habilidades_detalhes"]), 3)
+
+    def test_fields_limita_os_campos_da_resposta(self):
+        self._criar_contrato()
+
+        completo = self._listar()[0]
+        self.assertIn("trabalho", completo)
+        self.assertIn("pagamento", completo)
+
+        for contrato in self._listar(fields="id,status,desconhecido"):
+            self.assertEqual(set(contrato), {"id", "status"})
+
+    def test_fields_nao_altera_as_consultas(self):
+        for _ in range(3):
+            self._criar_contrato()
+        with self.assertNumQueries(CONSULTAS_LISTAGEM):
+            self._listar(fields="id,trabalho")
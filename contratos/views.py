@@ -4,7 +4,7 @@ from rest_framework.permissions import IsAuthenticated
 from django.db import models
 
 from .models import Contrato
-from .serializers import ContratoSerializer
+from .serializers import ContratoSerializer, ContratoListaSerializer
 from .permissoes import PermissaoContrato
 from notificacoes.utils import enviar_notificacao
 
@@ -22,7 +22,18 @@ class ContratoViewSet(viewsets.ModelViewSet):
     # LISTAGEM — Filtra contratos conforme o usuário
     def get_queryset(self):
         user = self.request.user
-        qs_base = Contrato.objects.all().order_by("-id")
+        qs_base = (
+            Contrato.objects
+            .select_related("contratante", "freelancer", "trabalho__ramo", "proposta", "pagamento")
+            .prefetch_related("trabalho__habilidades")
+            .order_by("-id")
+        )
+
+        if self.action != "list":
+            # Serializer completo: contratante do trabalho/pagamento e dados da proposta
+            qs_base = qs_base.select_related(
+                "trabalho__contratante", "pagamento__contratante", "proposta__trabalho", "proposta__freelancer"
+            )
 
         if user.is_superuser:
             return qs_base
@@ -31,6 +42,12 @@ class ContratoViewSet(viewsets.ModelViewSet):
             models.Q(contratante=user) | models.Q(freelancer=user)
         ).distinct()
 
+    def get_serializer_class(self):
+        # Listagem com relacionados resumidos; detalhe e escrita com o serializer completo
+        if self.action == "list":
+            return ContratoListaSerializer
+        return ContratoSerializer
+
     # BLOQUEIA CRIAÇÃO MANUAL
     def create(self, request, *args, **kwargs):
         return Response(
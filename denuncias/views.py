@@ -1,12 +1,13 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from usuarios.autenticacao import JWTAutenticacaoCompartilhada
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.exceptions import ValidationError, PermissionDenied
 
 from .models import Denuncia, DenunciaProva
 from .serializers import DenunciaSerializer
+from usuarios.serializers import prefetch_usuario
 from notificacoes.utils import enviar_notificacao
 
 
@@ -19,9 +20,9 @@ class DenunciaViewSet(viewsets.ModelViewSet):
     """
     queryset = Denuncia.objects.all().select_related(
         "denunciante", "denunciado"
-    ).prefetch_related("provas")
+    ).prefetch_related("provas", *prefetch_usuario("denunciante", "denunciado"))
     serializer_class = DenunciaSerializer
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [JWTAutenticacaoCompartilhada]
     permission_classes = [permissions.IsAuthenticated]
 
     parser_classes = [MultiPartParser, FormParser, JSONParser]
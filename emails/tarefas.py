@@ -0,0 +1,11 @@
+from fila.registro import tarefa
+from .utils import enviar_email_sendgrid
+
+
+@tarefa("emails.enviar_email")
+def enviar_email(destinatario, assunto, corpo_texto, corpo_html=None):
+    """
+    Envia e-mail via SendGrid pela fila (com novas tentativas em caso de falha).
+    Uma tarefa por destinatário: a nova tentativa reenvia só o e-mail que falhou.
+    """
+    enviar_email_sendgrid(destinatario, assunto, corpo_texto, corpo_html)
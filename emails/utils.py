@@ -1,8 +1,11 @@
-import sendgrid
 from sendgrid.helpers.mail import Mail
 from django.conf import settings
 import logging
 
+from services.http import cliente
+
+URL_ENVIO_SENDGRID = "https://api.sendgrid.com/v3/mail/send"
+
 # Configura logger para exibir mensagens no console e Railway
 logger = logging.getLogger("sendgrid")
 
@@ -10,13 +13,12 @@ def enviar_email_sendgrid(destinatario, assunto, corpo_texto, corpo_html=None):
     """
     Envia e-mail via API HTTPS do SendGrid.
     Compatível com Railway e ambiente local.
+    Em caso de falha, registra o erro e relança a exceção para que a fila
+    de tarefas possa tentar novamente.
     """
     try:
         logger.info(f"📤 Iniciando envio de e-mail para: {destinatario}")
 
-        # Cria cliente SendGrid com a API Key
-        sg = sendgrid.SendGridAPIClient(api_key=settings.SENDGRID_API_KEY)
-
         # Monta o corpo da mensagem
         mensagem = Mail(
             from_email=settings.DEFAULT_FROM_EMAIL,
@@ -26,9 +28,15 @@ def enviar_email_sendgrid(destinatario, assunto, corpo_texto, corpo_html=None):
             html_content=corpo_html or corpo_texto,
         )
 
-        # Envia e registra o resultado
-        response = sg.send(mensagem)
+        # Envia pelo cliente HTTP compartilhado (o SDK abre uma conexão por envio)
+        response = cliente("sendgrid").post(
+            URL_ENVIO_SENDGRID,
+            json=mensagem.get(),
+            headers={"Authorization": f"Bearer {settings.SENDGRID_API_KEY}"},
+        )
+        response.raise_for_status()
         logger.info(f"✅ E-mail enviado para {destinatario} - Status {response.status_code}")
 
     except Exception as e:
         logger.error(f"❌ Falha ao enviar e-mail para {destinatario}: {e}")
+        raise
@@ -0,0 +1,21 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import Tarefa
+
+
+@admin.register(Tarefa)
+class TarefaAdmin(admin.ModelAdmin):
+    list_display = ("id", "nome", "status", "tentativas", "max_tentativas", "executar_em", "criado_em")
+    list_filter = ("status", "nome")
+    search_fields = ("nome",)
+    ordering = ("-id",)
+    readonly_fields = ("criado_em", "iniciada_em", "concluida_em", "ultimo_erro")
+    actions = ["reenfileirar"]
+
+    @admin.action(description="Reenfileirar tarefas selecionadas")
+    def reenfileirar(self, request, queryset):
+        total = queryset.exclude(status="executando").update(
+            status="pendente", tentativas=0, executar_em=timezone.now()
+        )
+        self.message_user(request, f"{total} tarefas reenfileiradas.")
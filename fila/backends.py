@@ -0,0 +1,57 @@
+"""
+Backends da fila de tarefas.
+- BancoDeDadosBackend (padrão): grava a tarefa na tabela fila_tarefa; o worker
+  executa depois. Como o INSERT participa da transação corrente, a tarefa só
+  fica visível ao worker se a requisição confirmar.
+- ImediatoBackend: executa a tarefa na hora (após o commit). Útil em testes e
+  em ambientes de desenvolvimento sem worker.
+
+O backend é escolhido por settings.FILA_BACKEND.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Tarefa
+from .registro import obter_tarefa
+
+logger = logging.getLogger(__name__)
+
+
+class BancoDeDadosBackend:
+    def enfileirar(self, nome, args, kwargs, atraso=None, max_tentativas=None):
+        executar_em = timezone.now() + timedelta(seconds=atraso) if atraso else timezone.now()
+        return Tarefa.objects.create(
+            nome=nome,
+            argumentos=list(args),
+            parametros=dict(kwargs),
+            executar_em=executar_em,
+            max_tentativas=max_tentativas or settings.FILA_MAX_TENTATIVAS,
+        )
+
+
+class ImediatoBackend:
+    def enfileirar(self, nome, args, kwargs, atraso=None, max_tentativas=None):
+        funcao = obter_tarefa(nome)
+
+        def executar():
+            try:
+                funcao(*args, **kwargs)
+            except Exception:
+                logger.exception("Falha ao executar a tarefa %s", nome)
+
+        transaction.on_commit(executar)
+
+
+def obter_backend():
+    return import_string(settings.FILA_BACKEND)()
+
+
+def enfileirar(nome, args=(), kwargs=None, atraso=None, max_tentativas=None):
+    """Envia a tarefa registrada `nome` para o backend configurado."""
+    obter_tarefa(nome)  # falha cedo se o nome não existir
+    return obter_backend().enfileirar(nome, args, kwargs or {}, atraso=atraso, max_tentativas=max_tentativas)
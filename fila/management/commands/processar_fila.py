@@ -0,0 +1,46 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from fila.worker import limpar_concluidas, processar_lote
+from freelancer.processos import exigir_estado_compartilhado
+
+
+class Command(BaseCommand):
+    help = "Worker da fila de tarefas: executa as tarefas pendentes gravadas no banco."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=10, help="Tarefas reservadas por ciclo.")
+        parser.add_argument("--intervalo", type=float, default=2.0, help="Espera (s) quando a fila está vazia.")
+        parser.add_argument("--uma-vez", action="store_true", help="Processa o que houver e encerra.")
+        parser.add_argument(
+            "--limpar-dias", type=int, default=None,
+            help="Remove tarefas concluídas há mais de N dias e encerra.",
+        )
+
+    def handle(self, *args, **options):
+        if options["limpar_dias"] is not None:
+            total = limpar_concluidas(options["limpar_dias"])
+            self.stdout.write(f"{total} tarefas concluídas removidas.")
+            return
+
+        if not options["uma_vez"]:
+            exigir_estado_compartilhado("processar_fila")
+        self._parar = False
+        signal.signal(signal.SIGTERM, self._sinal_parada)
+        signal.signal(signal.SIGINT, self._sinal_parada)
+
+        self.stdout.write("Worker da fila iniciado.")
+        while not self._parar:
+            close_old_connections()
+            processadas = processar_lote(options["lote"])
+            if options["uma_vez"] and not processadas:
+                break
+            if not processadas:
+                time.sleep(options["intervalo"])
+        self.stdout.write("Worker da fila encerrado.")
+
+    def _sinal_parada(self, signum, frame):
+        self._parar = True
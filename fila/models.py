@@ -0,0 +1,44 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Tarefa(models.Model):
+    """
+    Tarefa de segundo plano persistida no banco (broker da fila).
+    O worker (manage.py processar_fila) consome as pendentes em ordem de
+    execução, com novas tentativas e backoff exponencial. Quando esgota as
+    tentativas, a tarefa fica com status 'falhou' (dead-letter) para análise.
+    """
+
+    STATUS = [
+        ("pendente", "Pendente"),
+        ("executando", "Executando"),
+        ("concluida", "Concluída"),
+        ("falhou", "Falhou (dead-letter)"),
+    ]
+
+    nome = models.CharField(max_length=200, help_text="Nome registrado da tarefa.")
+    argumentos = models.JSONField(default=list, blank=True)
+    parametros = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(max_length=20, choices=STATUS, default="pendente")
+    tentativas = models.PositiveIntegerField(default=0)
+    max_tentativas = models.PositiveIntegerField(default=5)
+
+    executar_em = models.DateTimeField(default=timezone.now)
+    iniciada_em = models.DateTimeField(null=True, blank=True)
+    concluida_em = models.DateTimeField(null=True, blank=True)
+    ultimo_erro = models.TextField(blank=True, default="")
+
+    criado_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["executar_em", "id"]
+        verbose_name = "Tarefa"
+        verbose_name_plural = "Tarefas"
+        indexes = [
+            models.Index(fields=["status", "executar_em"]),
+        ]
+
+    def __str__(self):
+        return f"{self.nome} #{self.id} ({self.status})"
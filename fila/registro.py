@@ -0,0 +1,43 @@
+"""
+Registro das funções que podem ser executadas pela fila.
+
+Uso:
+    from fila.registro import tarefa
+
+    @tarefa("trabalhos.recomendar_trabalho")
+    def recomendar_trabalho(trabalho_id, notificar=False):
+        ...
+
+    recomendar_trabalho.enfileirar(trabalho.id, notificar=True)
+
+Os argumentos precisam ser serializáveis em JSON (passe IDs, não objetos).
+"""
+_TAREFAS = {}
+
+
+class TarefaNaoRegistrada(Exception):
+    """A fila recebeu uma tarefa cujo nome não está registrado."""
+    pass
+
+
+def tarefa(nome=None, max_tentativas=None):
+    def decorador(funcao):
+        nome_tarefa = nome or f"{funcao.__module__}.{funcao.__name__}"
+        _TAREFAS[nome_tarefa] = funcao
+
+        def enfileirar_tarefa(*args, **kwargs):
+            from .backends import enfileirar
+            return enfileirar(nome_tarefa, args, kwargs, max_tentativas=max_tentativas)
+
+        funcao.nome_tarefa = nome_tarefa
+        funcao.enfileirar = enfileirar_tarefa
+        return funcao
+
+    return decorador
+
+
+def obter_tarefa(nome):
+    try:
+        return _TAREFAS[nome]
+    except KeyError:
+        raise TarefaNaoRegistrada(f"Tarefa '{nome}' não registrada.")
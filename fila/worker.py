@@ -0,0 +1,91 @@
+"""
+Execução das tarefas persistidas (usado pelo comando processar_fila).
+"""
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Tarefa
+from .registro import obter_tarefa
+
+logger = logging.getLogger(__name__)
+
+
+def calcular_backoff(tentativas):
+    """Backoff exponencial com jitter: base * 2^(n-1), limitado ao máximo."""
+    base = settings.FILA_BACKOFF_BASE
+    atraso = min(settings.FILA_BACKOFF_MAXIMO, base * (2 ** max(0, tentativas - 1)))
+    return atraso + random.uniform(0, base)
+
+
+def reservar_tarefas(limite):
+    """
+    Marca até `limite` tarefas pendentes como 'executando' e as retorna.
+    Com SKIP LOCKED, vários workers podem rodar em paralelo sem pegar a mesma tarefa.
+    """
+    agora = timezone.now()
+    with transaction.atomic():
+        qs = Tarefa.objects.filter(status="pendente", executar_em__lte=agora).order_by("executar_em", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            qs = qs.select_for_update(skip_locked=True)
+        ids = list(qs.values_list("id", flat=True)[:limite])
+        if not ids:
+            return []
+        Tarefa.objects.filter(id__in=ids).update(
+            status="executando",
+            iniciada_em=agora,
+            tentativas=F("tentativas") + 1,
+        )
+    return list(Tarefa.objects.filter(id__in=ids).order_by("executar_em", "id"))
+
+
+def executar_tarefa(tarefa):
+    """Executa uma tarefa já reservada e registra o resultado."""
+    try:
+        funcao = obter_tarefa(tarefa.nome)
+        funcao(*tarefa.argumentos, **tarefa.parametros)
+    except Exception:
+        tarefa.ultimo_erro = traceback.format_exc()[-5000:]
+        if tarefa.tentativas >= tarefa.max_tentativas:
+            tarefa.status = "falhou"
+            logger.error("Tarefa %s #%s foi para a dead-letter após %s tentativas.",
+                         tarefa.nome, tarefa.id, tarefa.tentativas)
+        else:
+            tarefa.status = "pendente"
+            tarefa.executar_em = timezone.now() + timedelta(seconds=calcular_backoff(tarefa.tentativas))
+            logger.warning("Tarefa %s #%s falhou (tentativa %s/%s); nova tentativa em %s.",
+                           tarefa.nome, tarefa.id, tarefa.tentativas, tarefa.max_tentativas, tarefa.executar_em)
+        tarefa.save(update_fields=["status", "executar_em", "ultimo_erro"])
+        return False
+
+    tarefa.status = "concluida"
+    tarefa.concluida_em = timezone.now()
+    tarefa.save(update_fields=["status", "concluida_em"])
+    return True
+
+
+def recuperar_travadas():
+    """Devolve à fila tarefas 'executando' há mais tempo que o limite (worker caiu no meio)."""
+    limite = timezone.now() - timedelta(seconds=settings.FILA_TIMEOUT_EXECUCAO)
+    return Tarefa.objects.filter(status="executando", iniciada_em__lt=limite).update(status="pendente")
+
+
+def processar_lote(limite=10):
+    """Reserva e executa um lote. Retorna quantas tarefas foram processadas."""
+    recuperar_travadas()
+    tarefas = reservar_tarefas(limite)
+    for tarefa in tarefas:
+        executar_tarefa(tarefa)
+    return len(tarefas)
+
+
+def limpar_concluidas(dias):
+    limite = timezone.now() - timedelta(days=dias)
+    total, _ = Tarefa.objects.filter(status="concluida", concluida_em__lt=limite).delete()
+    return total
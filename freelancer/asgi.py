@@ -0,0 +1,44 @@
+"""
+ASGI config for freelancer project.
+
+Atende HTTP (Django) e WebSockets (Channels):
+- ws/contratos/<id>/chat/  → mensagens em tempo real do contrato
+- ws/notificacoes/         → notificações do usuário autenticado
+
+Servidor: daphne freelancer.asgi:application
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'freelancer.settings')
+
+# Inicializa o Django antes de importar consumers/models
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.security.websocket import OriginValidator  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+from usuarios.ws_auth import JWTAuthMiddleware  # noqa: E402
+import mensagens.routing  # noqa: E402
+import notificacoes.routing  # noqa: E402
+
+# O frontend roda em outra origem: valida o Origin com a mesma lista do CORS
+_origens_ws = ["*"] if getattr(settings, "CORS_ALLOW_ALL_ORIGINS", False) else list(
+    getattr(settings, "CORS_ALLOWED_ORIGINS", [])
+)
+
+application = ProtocolTypeRouter({
+    "http": django_asgi_app,
+    "websocket": OriginValidator(
+        JWTAuthMiddleware(
+            URLRouter(
+                mensagens.routing.websocket_urlpatterns
+                + notificacoes.routing.websocket_urlpatterns
+            )
+        ),
+        _origens_ws,
+    ),
+})
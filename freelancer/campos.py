@@ -0,0 +1,30 @@
+"""
+Campos esparsos: ?fields=id,status,... na query string limita a resposta aos
+campos pedidos (só no primeiro nível do serializer).
+Vale só para leitura; em escritas o serializer continua completo. Nomes
+desconhecidos são ignorados.
+"""
+from rest_framework.permissions import SAFE_METHODS
+
+PARAMETRO = "fields"
+
+
+def campos_pedidos(request):
+    """Conjunto de campos de ?fields=, ou None se o parâmetro não veio."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    valor = request.query_params.get(PARAMETRO)
+    if not valor:
+        return None
+    return {campo.strip() for campo in valor.split(",") if campo.strip()}
+
+
+class CamposEsparsosMixin:
+    """Mixin de serializer que aplica ?fields= do request no contexto."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        pedidos = campos_pedidos(self.context.get("request"))
+        if pedidos:
+            for nome in set(self.fields) - pedidos:
+                self.fields.pop(nome)
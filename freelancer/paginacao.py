@@ -0,0 +1,29 @@
+"""
+Cursores opacos para paginação por keyset em (data, id).
+O cliente recebe base64 de "<data ISO>|<id>" e só o devolve à API.
+"""
+import base64
+import binascii
+
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+
+def codificar_cursor(data, registro_id):
+    bruto = f"{data.isoformat()}|{registro_id}"
+    return base64.urlsafe_b64encode(bruto.encode()).decode()
+
+
+def decodificar_cursor(cursor):
+    """Retorna (data, id) ou levanta ValidationError se o cursor for inválido."""
+    try:
+        bruto = base64.urlsafe_b64decode(cursor.encode()).decode()
+        data_txt, id_txt = bruto.rsplit("|", 1)
+        data = parse_datetime(data_txt)
+        registro_id = int(id_txt)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        data = None
+
+    if data is None:
+        raise ValidationError({"detail": "Cursor inválido."})
+    return data, registro_id
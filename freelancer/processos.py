@@ -0,0 +1,39 @@
+"""
+Verificação do estado compartilhado entre os processos do Procfile.
+
+web, worker, sweeper, reconciliador e recomendador rodam em processos
+separados e só se enxergam pelo banco, pelo cache e pela camada do Channels.
+Sem REDIS_URL os dois últimos ficam em memória de cada processo: invalidações
+de cache feitas pelo worker não chegam ao web e eventos publicados fora do
+daphne nunca alcançam os WebSockets. Os processos auxiliares chamam
+`exigir_estado_compartilhado` ao iniciar e se recusam a rodar nessa situação.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+CACHES_LOCAIS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+CAMADAS_LOCAIS = ("channels.layers.InMemoryChannelLayer",)
+
+
+def estado_compartilhado():
+    """True se cache e camada do Channels são compartilhados entre processos."""
+    cache = settings.CACHES["default"]["BACKEND"]
+    camada = getattr(settings, "CHANNEL_LAYERS", {}).get("default", {}).get("BACKEND")
+    return cache not in CACHES_LOCAIS and camada not in CAMADAS_LOCAIS
+
+
+def exigir_estado_compartilhado(processo):
+    """
+    Impede um processo auxiliar de subir com cache/camada em memória, a menos
+    que PROCESSO_UNICO (desenvolvimento, deploy de um único processo) ou DEBUG.
+    """
+    if settings.PROCESSO_UNICO or settings.DEBUG or estado_compartilhado():
+        return
+    raise ImproperlyConfigured(
+        f"'{processo}' roda em processo separado e precisa de cache e camada do "
+        "Channels compartilhados: defina REDIS_URL (ou PROCESSO_UNICO=True se "
+        "tudo roda num único processo)."
+    )
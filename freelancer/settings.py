@@ -57,6 +57,9 @@ USE_X_FORWARDED_PORT = True
 # APPS INSTALADOS
 INSTALLED_APPS = [
 
+    # Servidor ASGI (runserver passa a atender WebSockets)
+    'daphne',
+
     # Django padrão
     'django.contrib.admin',
     'django.contrib.auth',
@@ -66,6 +69,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'django_extensions',
     # Terceiros
+    'channels',
     'rest_framework',
     'rest_framework_simplejwt',
     'corsheaders',
@@ -84,10 +88,16 @@ INSTALLED_APPS = [
     'punicoes',
     'habilidades',
     'notificacoes',
+    'emails',
+    'fila',
+    'moderacao',
+    'monitoramento',
 ]
 
 # MIDDLEWARE
 MIDDLEWARE = [
+    # Primeiro para medir a requisição inteira; sai da pilha sem INSTRUMENTACAO_ATIVA
+    'monitoramento.middleware.InstrumentacaoMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -118,8 +128,70 @@ TEMPLATES = [
     },
 ]
 
-# WSGI
+# WSGI / ASGI
 WSGI_APPLICATION = 'freelancer.wsgi.application'
+ASGI_APPLICATION = 'freelancer.asgi.application'
+
+# CHANNELS (WebSockets: chat dos contratos e notificações em tempo real)
+# Sem REDIS_URL usa a camada em memória (testes e deploy de um único processo).
+REDIS_URL = os.getenv("REDIS_URL", "")
+# Declara que web e tarefas rodam num único processo; sem isso os processos
+# auxiliares do Procfile não sobem sem REDIS_URL (freelancer/processos.py)
+PROCESSO_UNICO = os.getenv("PROCESSO_UNICO", "False") == "True"
+if REDIS_URL:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {"hosts": [REDIS_URL]},
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+    }
+
+# CACHE (contagens da listagem, estados de sessão etc.)
+# Com REDIS_URL o cache é compartilhado entre processos; sem ele, memória local.
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "freelancer",
+        }
+    }
+else:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+
+# Validade (s) das contagens aproximadas da listagem de trabalhos
+TRABALHOS_CONTAGEM_TTL = int(os.getenv("TRABALHOS_CONTAGEM_TTL", "300"))
+# Validade (s) do resumo do dashboard por usuário (/usuarios/me/resumo/)
+RESUMO_USUARIO_TTL = int(os.getenv("RESUMO_USUARIO_TTL", "60"))
+# Validade (s) da matriz de habilidades dos freelancers em cache por processo (trabalhos/recomendacao.py)
+RECOMENDACAO_MATRIZ_TTL = int(os.getenv("RECOMENDACAO_MATRIZ_TTL", "600"))
+# Intervalo (s) do recálculo em lote das recomendações (recomendar_trabalhos --loop)
+RECOMENDACAO_INTERVALO = int(os.getenv("RECOMENDACAO_INTERVALO", "3600"))
+# Intervalo (s) entre conferências da versão da taxonomia em cache (habilidades/cache.py)
+TAXONOMIA_VERIFICACAO = int(os.getenv("TAXONOMIA_VERIFICACAO", "5"))
+# Intervalo (s) entre conferências da versão do filtro de palavras proibidas (moderacao/filtro.py)
+MODERACAO_VERIFICACAO = int(os.getenv("MODERACAO_VERIFICACAO", "5"))
+
+# Instrumentação de requisições e /metrics (monitoramento/) — desligada por padrão;
+# ligue em todos os processos do Procfile para o /metrics incluir worker e afins
+INSTRUMENTACAO_ATIVA = os.getenv("INSTRUMENTACAO_ATIVA", "False") == "True"
+# Requisições acima disso (ms) sempre vão para o log "monitoramento"
+INSTRUMENTACAO_LENTA_MS = int(os.getenv("INSTRUMENTACAO_LENTA_MS", "1000"))
+# Fração das demais requisições registradas no log (0 a 1)
+INSTRUMENTACAO_AMOSTRA = float(os.getenv("INSTRUMENTACAO_AMOSTRA", "0"))
+# Token exigido em /metrics (Authorization: Bearer ...); vazio = só em DEBUG
+METRICAS_TOKEN = os.getenv("METRICAS_TOKEN", "")
+# Cada processo publica suas métricas no cache a cada METRICAS_PUBLICACAO (s);
+# a publicação vale METRICAS_VALIDADE (s) e há até METRICAS_MAX_PROCESSOS vagas
+METRICAS_PUBLICACAO = int(os.getenv("METRICAS_PUBLICACAO", "15"))
+METRICAS_VALIDADE = int(os.getenv("METRICAS_VALIDADE", "60"))
+METRICAS_MAX_PROCESSOS = int(os.getenv("METRICAS_MAX_PROCESSOS", "32"))
 
 # BANCO DE DADOS
 DATABASES = {
@@ -171,7 +243,8 @@ AUTH_USER_MODEL = 'usuarios.Usuario'
 # DJANGO REST + JWT
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWT que reaproveita o usuário já carregado pelo ModoLeituraMiddleware
+        'usuarios.autenticacao.JWTAutenticacaoCompartilhada',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -189,6 +262,10 @@ SIMPLE_JWT = {
 }
 
 # Modo leitura (desativação voluntária)
+# Validade (s) do estado de restrição em cache por processo (usuarios/estado.py)
+ESTADO_USUARIO_TTL = int(os.getenv("ESTADO_USUARIO_TTL", "30"))
+# Validade (s) do registro de token_version no cache (claims "rst"/"tv" dos JWT)
+TOKEN_VERSION_TTL = int(os.getenv("TOKEN_VERSION_TTL", "300"))
 SUSPENSION_BLOCKED_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
 SUSPENSION_RESPONSE_HEADER = 'X-Blocked-By-Suspension'
 SUSPENSION_MESSAGE = "Sua conta está desativada (modo leitura). Reative para realizar esta ação."
@@ -270,14 +347,49 @@ CPF_CNPJ_API_BASE = os.getenv("CPF_CNPJ_API_BASE")
 CPF_CNPJ_TOKEN = os.getenv("CPF_CNPJ_TOKEN")
 CPF_CNPJ_PACOTE_CPF_C = int(os.getenv("CPF_CNPJ_PACOTE_CPF_C", 2))
 CPF_CNPJ_PACOTE_CNPJ_C = int(os.getenv("CPF_CNPJ_PACOTE_CNPJ_C", 10))
-CPF_CNPJ_TIMEOUT = int(os.getenv("CPF_CNPJ_TIMEOUT", 15))
+CPF_CNPJ_TIMEOUT = int(os.getenv("CPF_CNPJ_TIMEOUT", 8))
+# Cache das consultas (usuarios.ValidacaoDocumento): documento válido em dias, inválido em horas
+CPF_CNPJ_CACHE_VALIDO_DIAS = int(os.getenv("CPF_CNPJ_CACHE_VALIDO_DIAS", 30))
+CPF_CNPJ_CACHE_INVALIDO_HORAS = int(os.getenv("CPF_CNPJ_CACHE_INVALIDO_HORAS", 24))
+
+# CLIENTES HTTP EXTERNOS (services/http.py)
+# Timeout de conexão (s), comum a todos; o de leitura é por serviço
+HTTP_TIMEOUT_CONEXAO = float(os.getenv("HTTP_TIMEOUT_CONEXAO", 3))
+MERCADOPAGO_TIMEOUT = int(os.getenv("MERCADOPAGO_TIMEOUT", 10))
+SENDGRID_TIMEOUT = int(os.getenv("SENDGRID_TIMEOUT", 10))
+# Conexões mantidas abertas por serviço
+HTTP_POOL_MAXIMO = int(os.getenv("HTTP_POOL_MAXIMO", 10))
+# Falhas seguidas que abrem o circuito e por quantos segundos ele fica aberto
+HTTP_CIRCUITO_FALHAS = int(os.getenv("HTTP_CIRCUITO_FALHAS", 5))
+HTTP_CIRCUITO_ABERTO = int(os.getenv("HTTP_CIRCUITO_ABERTO", 30))
+# Retentativas por chamada e fração das chamadas que pode ser retentativa
+HTTP_RETENTATIVAS = int(os.getenv("HTTP_RETENTATIVAS", 2))
+HTTP_ORCAMENTO_RETENTATIVAS = float(os.getenv("HTTP_ORCAMENTO_RETENTATIVAS", 0.2))
+
+# FILA DE TAREFAS (worker: python manage.py processar_fila)
+FILA_BACKEND = os.getenv("FILA_BACKEND", "fila.backends.BancoDeDadosBackend")
+FILA_MAX_TENTATIVAS = int(os.getenv("FILA_MAX_TENTATIVAS", 5))
+FILA_BACKOFF_BASE = int(os.getenv("FILA_BACKOFF_BASE", 5))
+FILA_BACKOFF_MAXIMO = int(os.getenv("FILA_BACKOFF_MAXIMO", 3600))
+FILA_TIMEOUT_EXECUCAO = int(os.getenv("FILA_TIMEOUT_EXECUCAO", 600))
 
 # MERCADO PAGO
 MERCADOPAGO_ACCESS_TOKEN = os.getenv("MERCADOPAGO_ACCESS_TOKEN")
 MERCADOPAGO_PUBLIC_KEY = os.getenv("MERCADOPAGO_PUBLIC_KEY")
+# Assinatura secreta do webhook (painel do MP); sem ela o webhook só é aceito em DEBUG
 MP_WEBHOOK_SECRET = os.getenv("MP_WEBHOOK_SECRET")
 MP_INCLUDE_PAYER = False
 
+# RECONCILIAÇÃO DE PAGAMENTOS (pagamentos/reconciliacao.py)
+# Segundos mínimos entre duas consultas do mesmo pagamento ao MP
+RECONCILIACAO_INTERVALO = int(os.getenv("RECONCILIACAO_INTERVALO", 60))
+# Pagamentos por ciclo, consultas simultâneas e consultas por segundo ao MP
+RECONCILIACAO_LOTE = int(os.getenv("RECONCILIACAO_LOTE", 200))
+RECONCILIACAO_CONCORRENCIA = int(os.getenv("RECONCILIACAO_CONCORRENCIA", 4))
+RECONCILIACAO_TAXA = float(os.getenv("RECONCILIACAO_TAXA", 5))
+# Pagamentos em aberto mais antigos que isso (dias) deixam de ser conferidos
+RECONCILIACAO_IDADE_MAXIMA_DIAS = int(os.getenv("RECONCILIACAO_IDADE_MAXIMA_DIAS", 30))
+
 # HTTPS / SEGURANÇA
 if not DEBUG:
     SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
@@ -323,5 +435,10 @@ LOGGING = {
             'level': 'ERROR',
             'propagate': False,
         },
+        'monitoramento': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
\ No newline at end of file
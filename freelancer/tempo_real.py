@@ -0,0 +1,33 @@
+"""
+Publicação de eventos em tempo real (WebSockets via Django Channels).
+As views e utilitários chamam `publicar`; os consumers de cada app
+repassam o evento aos clientes conectados no grupo.
+"""
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def _enviar(grupo, tipo, dados):
+    camada = get_channel_layer()
+    if camada is None:
+        return
+    try:
+        async_to_sync(camada.group_send)(grupo, {"type": tipo, "dados": dados})
+    except Exception:
+        # Falha no tempo real nunca deve derrubar a requisição:
+        # o cliente ainda recupera o estado pela API REST.
+        logger.exception("Falha ao publicar evento '%s' no grupo '%s'", tipo, grupo)
+
+
+def publicar(grupo, tipo, dados):
+    """
+    Envia o evento ao grupo somente após o commit da transação atual,
+    para que o cliente nunca receba dados que acabaram revertidos.
+    `tipo` é o nome do handler no consumer (ex.: "mensagem.evento").
+    """
+    transaction.on_commit(lambda: _enviar(grupo, tipo, dados))
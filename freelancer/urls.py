@@ -3,10 +3,9 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenRefreshView
 
 # JWT
-from usuarios.token_serializer import CustomTokenObtainPairView
+from usuarios.token_serializer import CustomTokenObtainPairView, CustomTokenRefreshView
 
 # ViewSets e APIs
 from usuarios.views import (
@@ -22,6 +21,7 @@ from avaliacoes.views import AvaliacaoViewSet
 from mensagens.views import MensagemViewSet
 from denuncias.views import DenunciaViewSet
 from notificacoes.views import NotificacaoViewSet
+from monitoramento.views import metricas
 
 # Roteador central DRF
 router = DefaultRouter()
@@ -38,12 +38,15 @@ router.register(r"notificacoes", NotificacaoViewSet, basename="notificacao")
 urlpatterns = [
     path("admin/", admin.site.urls),
 
+    # Métricas Prometheus (só com INSTRUMENTACAO_ATIVA)
+    path("metrics", metricas, name="metricas"),
+
     # Webhooks/integrações públicas
     path("mercadopago/", include("pagamentos.urls")),
 
     # JWT
     path("api/token/", CustomTokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("api/token/refresh/", CustomTokenRefreshView.as_view(), name="token_refresh"),
 
     # Usuário logado
     path("api/usuarios/me/", UsuarioMeAPIView.as_view(), name="usuario-me"),
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class HabilidadesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'habilidades'
+
+    def ready(self):
+        import habilidades.signals
@@ -0,0 +1,138 @@
+"""
+Cache da taxonomia (Habilidade e Ramo) em memória, por processo.
+
+A taxonomia é pequena, muda pouco e é lida o tempo todo: selects do frontend,
+filtros ?habilidade=/?ramo= da listagem de trabalhos e resolução de nomes ao
+salvar um trabalho. Cada processo guarda um retrato completo com índices por
+id e por nome normalizado (minúsculas, sem acentos, espaços colapsados), além
+das listas já serializadas e do ETag usados pelos endpoints de listagem.
+
+Versão: um contador no cache do Django (compartilhado entre processos) é
+trocado a cada save/delete de Habilidade ou Ramo (habilidades/signals.py).
+O processo confere a versão no máximo a cada TAXONOMIA_VERIFICACAO segundos
+e recarrega o retrato quando ela muda; o processo que alterou recarrega na hora.
+Escritas em massa (bulk_create/update) não disparam sinais: chame
+invalidar_taxonomia() depois delas.
+"""
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+CHAVE_VERSAO = "habilidades:taxonomia:versao"
+
+_lock = threading.Lock()
+_retrato = None
+_verificado_em = 0.0
+
+_ESPACOS = re.compile(r"\s+")
+
+
+def normalizar_nome(nome):
+    """Chave de busca por nome: minúsculas, sem acentos, espaços simples."""
+    nome = unicodedata.normalize("NFKD", str(nome or "")).encode("ASCII", "ignore").decode("ASCII")
+    return _ESPACOS.sub(" ", nome).strip().lower()
+
+
+class Taxonomia:
+    """Retrato imutável da taxonomia numa versão."""
+
+    def __init__(self, versao, habilidades, ramos):
+        self.versao = versao
+        # Listas no formato de HabilidadeSerializer/RamoSerializer, ordenadas por nome
+        self.habilidades = habilidades
+        self.ramos = ramos
+        self.habilidades_por_id = {h["id"]: h for h in habilidades}
+        self.ramos_por_id = {r["id"]: r for r in ramos}
+        # Em nomes que só diferem por acento/caixa vale o de menor id
+        self.habilidades_por_nome = {}
+        for h in sorted(habilidades, key=lambda h: h["id"]):
+            self.habilidades_por_nome.setdefault(normalizar_nome(h["nome"]), h)
+        self.ramos_por_nome = {}
+        for r in sorted(ramos, key=lambda r: r["id"]):
+            self.ramos_por_nome.setdefault(normalizar_nome(r["nome"]), r)
+        self.etag_habilidades = _etag("habilidades", versao)
+        self.etag_ramos = _etag("ramos", versao)
+
+
+def _etag(tipo, versao):
+    return '"' + hashlib.md5(f"{tipo}:{versao}".encode()).hexdigest() + '"'
+
+
+def _versao_atual():
+    versao = cache.get(CHAVE_VERSAO)
+    if versao is None:
+        versao = uuid.uuid4().hex
+        # add: se outro processo gravou antes, vale a dele
+        if not cache.add(CHAVE_VERSAO, versao, timeout=None):
+            versao = cache.get(CHAVE_VERSAO) or versao
+    return versao
+
+
+def _carregar(versao):
+    from .models import Habilidade, Ramo
+
+    habilidades = list(
+        Habilidade.objects.order_by("nome").values("id", "nome", "categoria", "subcategoria")
+    )
+    ramos = list(Ramo.objects.order_by("nome").values("id", "nome"))
+    return Taxonomia(versao, habilidades, ramos)
+
+
+def taxonomia():
+    """Retrato atual da taxonomia (recarregado só quando a versão muda)."""
+    global _retrato, _verificado_em
+
+    agora = time.monotonic()
+    with _lock:
+        retrato = _retrato
+        if retrato is not None and agora - _verificado_em < getattr(settings, "TAXONOMIA_VERIFICACAO", 5):
+            return retrato
+
+    versao = _versao_atual()
+    if retrato is None or retrato.versao != versao:
+        retrato = _carregar(versao)
+
+    with _lock:
+        _retrato = retrato
+        _verificado_em = agora
+    return retrato
+
+
+def invalidar_taxonomia():
+    """Troca a versão (todos os processos recarregam) e descarta o retrato local."""
+    global _retrato
+
+    cache.set(CHAVE_VERSAO, uuid.uuid4().hex, timeout=None)
+    with _lock:
+        _retrato = None
+
+
+# ---------------------------------------------------------------------------
+# Resolução sem consulta ao banco
+# ---------------------------------------------------------------------------
+
+def _resolver(valor, por_id, por_nome):
+    if valor in (None, ""):
+        return None
+    try:
+        return por_id.get(int(valor))
+    except (TypeError, ValueError):
+        return por_nome.get(normalizar_nome(valor))
+
+
+def resolver_habilidade(valor):
+    """Habilidade (dict) por id ou nome; None se não existir."""
+    t = taxonomia()
+    return _resolver(valor, t.habilidades_por_id, t.habilidades_por_nome)
+
+
+def resolver_ramo(valor):
+    """Ramo (dict) por id ou nome; None se não existir."""
+    t = taxonomia()
+    return _resolver(valor, t.ramos_por_id, t.ramos_por_nome)
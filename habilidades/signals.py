@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidar_taxonomia
+from .models import Habilidade, Ramo
+
+
+# Versão da taxonomia em cache (habilidades/cache.py)
+@receiver(post_save, sender=Habilidade)
+@receiver(post_delete, sender=Habilidade)
+@receiver(post_save, sender=Ramo)
+@receiver(post_delete, sender=Ramo)
+def invalidar_taxonomia_ao_alterar(sender, **kwargs):
+    invalidar_taxonomia()
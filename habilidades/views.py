@@ -1,15 +1,35 @@
-from rest_framework import generics, permissions, filters
+from rest_framework import generics, permissions, filters, status
 from rest_framework.response import Response
 
+from .cache import taxonomia
 from .models import Habilidade, Ramo
 from .serializers import HabilidadeSerializer, RamoSerializer
 
 
+def _resposta_taxonomia(request, dados, etag):
+    """
+    Lista em cache com ETag da versão da taxonomia: If-None-Match igual → 304.
+    no-cache obriga o navegador a revalidar (barato) a cada uso.
+    """
+    if etag in [e.strip() for e in request.headers.get("If-None-Match", "").split(",")]:
+        resposta = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        resposta = Response(dados)
+    resposta["ETag"] = etag
+    resposta["Cache-Control"] = "no-cache"
+    return resposta
+
+
+def _usa_filtros(request):
+    return any(request.query_params.get(p) for p in ("search", "ordering"))
+
+
 # HABILIDADES
 class HabilidadeListAPIView(generics.ListAPIView):
     """
     Lista todas as habilidades com suporte a busca e ordenação.
     Desativamos a paginação para retornar todas de uma vez.
+    Sem ?search=/?ordering= a lista vem do cache da taxonomia (com ETag/304).
     """
     queryset = Habilidade.objects.all()
     serializer_class = HabilidadeSerializer
@@ -20,7 +40,13 @@ class HabilidadeListAPIView(generics.ListAPIView):
     pagination_class = None  # 🔹 Retorna tudo no mesmo GET
 
     def list(self, request, *args, **kwargs):
-        habilidades = self.get_queryset().order_by("nome")
+        if not _usa_filtros(request):
+            t = taxonomia()
+            return _resposta_taxonomia(request, t.habilidades, t.etag_habilidades)
+
+        habilidades = self.filter_queryset(self.get_queryset())
+        if not request.query_params.get("ordering"):
+            habilidades = habilidades.order_by("nome")
         serializer = self.get_serializer(habilidades, many=True)
         return Response(serializer.data)
 
@@ -44,6 +70,7 @@ class RamoListAPIView(generics.ListAPIView):
     """
     Lista todos os Ramos (vocabulário controlado) para popular selects no frontend.
     Sem paginação; ordenado por nome.
+    Sem ?search=/?ordering= a lista vem do cache da taxonomia (com ETag/304).
     """
     queryset = Ramo.objects.all().order_by("nome")
     serializer_class = RamoSerializer
@@ -53,6 +80,12 @@ class RamoListAPIView(generics.ListAPIView):
     search_fields = ["nome"]
     ordering_fields = ["nome"]
 
+    def list(self, request, *args, **kwargs):
+        if not _usa_filtros(request):
+            t = taxonomia()
+            return _resposta_taxonomia(request, t.ramos, t.etag_ramos)
+        return super().list(request, *args, **kwargs)
+
 
 class RamoRetrieveAPIView(generics.RetrieveAPIView):
     """
@@ -1,6 +1,7 @@
 import React, { useEffect, useState, useRef } from "react";
 import { useNavigate } from "react-router-dom";
 import api from "../Servicos/Api";
+import { conectarTempoReal } from "../Servicos/TempoReal";
 import "../styles/NotificacoesDropdown.css";
 
 /* Ícone por tipo de mensagem */
@@ -80,12 +81,16 @@ export default function NotificacoesDropdown() {
     if (aberto) fetchNotificacoes();
   }, [aberto]);
 
-  // Refresh a cada 60s
+  // Tempo real: novas notificações chegam pelo WebSocket (sem polling)
   useEffect(() => {
-    if (!aberto) return;
-    const id = setInterval(fetchNotificacoes, 60000);
-    return () => clearInterval(id);
-  }, [aberto]);
+    return conectarTempoReal("/ws/notificacoes/", (evento) => {
+      const nova = evento?.notificacao;
+      if (!nova) return;
+      setNotificacoes((prev) =>
+        prev.some((n) => n.id === nova.id) ? prev : [nova, ...prev]
+      );
+    });
+  }, []);
 
   // Clique fora + Esc fecha
   useEffect(() => {
@@ -137,17 +142,12 @@ export default function NotificacoesDropdown() {
   async function marcarTodasComoLidas() {
     try {
       const token = localStorage.getItem("token");
-      const promises = notificacoes
-        .filter((n) => !n.lida)
-        .map((n) =>
-          api.patch(
-            `/notificacoes/${n.id}/`,
-            { lida: true },
-            { headers: { Authorization: `Bearer ${token}` } }
-          )
-        );
-
-    await Promise.all(promises);
+      // Uma única chamada: marca as pessoais e avança o cursor dos broadcasts
+      await api.post(
+        "/notificacoes/marcar_todas_lidas/",
+        {},
+        { headers: { Authorization: `Bearer ${token}` } }
+      );
     setNotificacoes((prev) => prev.map((n) => ({ ...n, lida: true })));
     } catch (err) {
       console.error("Erro ao marcar todas como lidas:", err);
@@ -1,6 +1,7 @@
 import React, { useEffect, useState, useRef, useCallback } from "react";
 import { useParams, useNavigate } from "react-router-dom";
 import api from "../Servicos/Api";
+import { conectarTempoReal } from "../Servicos/TempoReal";
 import "../styles/ChatContrato.css";
 
 export default function ChatContrato() {
@@ -15,6 +16,9 @@ export default function ChatContrato() {
   const [statusContrato, setStatusContrato] = useState("");
   const [enviando, setEnviando] = useState(false);
   const [carregando, setCarregando] = useState(true);
+  const [cursorAnterior, setCursorAnterior] = useState(null);
+  const [temAnteriores, setTemAnteriores] = useState(false);
+  const [carregandoAnteriores, setCarregandoAnteriores] = useState(false);
 
   const mensagensEndRef = useRef(null);
   const inputRef = useRef(null);
@@ -61,8 +65,11 @@ export default function ChatContrato() {
       const resp = await api.get(`/mensagens/conversa?contrato=${contratoId}`, {
         headers: { Authorization: `Bearer ${token}` },
       });
-      const lista = resp.data.mensagens || resp.data || [];
+      // Página mais recente; as anteriores são buscadas sob demanda (?before=)
+      const lista = resp.data.mensagens || [];
       setMensagens(lista);
+      setCursorAnterior(resp.data.cursor_anterior || null);
+      setTemAnteriores(Boolean(resp.data.tem_mais));
       setTimeout(() => {
         scrollToBottom();
         setCarregando(false);
@@ -73,14 +80,52 @@ export default function ChatContrato() {
     }
   }, [contratoId, token]);
 
+  const carregarAnteriores = async () => {
+    if (!cursorAnterior || carregandoAnteriores) return;
+    try {
+      setCarregandoAnteriores(true);
+      const resp = await api.get("/mensagens/conversa", {
+        params: { contrato: contratoId, before: cursorAnterior },
+        headers: { Authorization: `Bearer ${token}` },
+      });
+      const anteriores = resp.data.mensagens || [];
+      setMensagens((prev) => [...anteriores, ...prev]);
+      setCursorAnterior(resp.data.cursor_anterior || null);
+      setTemAnteriores(Boolean(resp.data.tem_mais));
+    } catch (err) {
+      console.error("Erro ao carregar mensagens anteriores", err);
+    } finally {
+      setCarregandoAnteriores(false);
+    }
+  };
+
+  // Insere ou substitui uma única mensagem (retorno da API ou evento do WebSocket)
+  const mesclarMensagem = useCallback((msg) => {
+    if (!msg) return;
+    setMensagens((prev) =>
+      prev.some((m) => m.id === msg.id)
+        ? prev.map((m) => (m.id === msg.id ? msg : m))
+        : [...prev, msg]
+    );
+  }, []);
+
   useEffect(() => {
     carregarContrato();
     carregarMensagens();
   }, [carregarContrato, carregarMensagens]);
 
+  // Tempo real: mensagens criadas/editadas/excluídas chegam pelo WebSocket
+  useEffect(() => {
+    return conectarTempoReal(`/ws/contratos/${contratoId}/chat/`, (evento) =>
+      mesclarMensagem(evento?.mensagem)
+    );
+  }, [contratoId, mesclarMensagem]);
+
+  // Rola só quando chega mensagem nova no fim (não ao carregar anteriores)
+  const ultimaMensagemId = mensagens.length ? mensagens[mensagens.length - 1].id : null;
   useEffect(() => {
     scrollToBottom();
-  }, [mensagens]);
+  }, [ultimaMensagemId]);
 
   // Foca no campo ao abrir a tela
   useEffect(() => {
@@ -133,8 +178,8 @@ export default function ChatContrato() {
         },
       });
 
-      // Atualiza lista de mensagens
-      setMensagens(resp.data.mensagens || resp.data || []);
+      // Acrescenta só a mensagem criada
+      mesclarMensagem(resp.data.mensagem);
 
       // Limpa campos e estado após envio
       setNovaMensagem("");
@@ -194,7 +239,7 @@ export default function ChatContrato() {
         }
       );
 
-      setMensagens(resp.data.mensagens || resp.data || []);
+      mesclarMensagem(resp.data.mensagem);
       fecharModalEdicao();
       scrollToBottom();
     } catch (err) {
@@ -212,7 +257,7 @@ export default function ChatContrato() {
       const resp = await api.delete(`/mensagens/${modalExclusao.mensagem.id}/`, {
         headers: { Authorization: `Bearer ${token}` },
       });
-      setMensagens(resp.data.mensagens || resp.data || []);
+      mesclarMensagem(resp.data.mensagem);
       fecharModalExclusao();
       scrollToBottom();
     } catch (err) {
@@ -292,6 +337,16 @@ export default function ChatContrato() {
               </div>
             ) : (
               <div className="mensagens-lista">
+                {temAnteriores && (
+                  <button
+                    type="button"
+                    className="btn-carregar-anteriores"
+                    onClick={carregarAnteriores}
+                    disabled={carregandoAnteriores}
+                  >
+                    {carregandoAnteriores ? "Carregando..." : "Carregar mensagens anteriores"}
+                  </button>
+                )}
                 {mensagens.map((m) => {
                   const podeEditar = new Date() - new Date(m.data_envio) <= 5 * 60 * 1000;
                   const podeExcluir = new Date() - new Date(m.data_envio) <= 7 * 60 * 1000;
@@ -57,8 +57,12 @@ export default function CheckoutRetorno() {
               params: { payment_id: paymentId },
             });
 
-            if (res?.data?.fonte === "local+mp") {
-              pagamento = res.data.local; 
+            if (res?.data?.fonte === "local" || res?.data?.fonte === "local+mp") {
+              pagamento = res.data.local;
+            } else if (res?.status === 202 || res?.data?.status === "aguardando_sincronizacao") {
+              // Sem registro local ainda: o backend consulta o MP em segundo plano
+              setTipo("info");
+              setMsg("Processando confirmação do Mercado Pago...");
             } else if (res?.data?.fonte === "mp") {
               const mp = res.data.mp || {};
               const st = String(mp.status || "").toLowerCase();
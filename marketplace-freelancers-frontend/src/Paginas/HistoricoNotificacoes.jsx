@@ -121,16 +121,12 @@ export default function HistoricoNotificacoes() {
   async function marcarTodasComoLidas() {
     try {
       const token = localStorage.getItem("token");
-      const naoLidas = notificacoesFiltradas.filter(n => !n.lida);
-      
-      const promises = naoLidas.map((n) =>
-        api.patch(
-          `/notificacoes/${n.id}/`,
-          { lida: true },
-          { headers: { Authorization: `Bearer ${token}` } }
-        )
+      // Uma única chamada: marca as pessoais e avança o cursor dos broadcasts
+      await api.post(
+        "/notificacoes/marcar_todas_lidas/",
+        {},
+        { headers: { Authorization: `Bearer ${token}` } }
       );
-      await Promise.all(promises);
       setNotificacoes(notificacoes.map((n) => ({ ...n, lida: true })));
     } catch (err) {
       console.error("Erro ao marcar todas como lidas:", err);
@@ -0,0 +1,52 @@
+import api from "./Api";
+
+// Monta a URL do WebSocket a partir da base da API (https → wss)
+function urlWebSocket(caminho) {
+  const base = new URL(api.defaults.baseURL);
+  const protocolo = base.protocol === "https:" ? "wss:" : "ws:";
+  const token = localStorage.getItem("token") || "";
+  return `${protocolo}//${base.host}${caminho}?token=${encodeURIComponent(token)}`;
+}
+
+/**
+ * Abre um WebSocket com reconexão automática.
+ * - caminho: ex. "/ws/notificacoes/" ou "/ws/contratos/10/chat/"
+ * - aoReceber: callback com o evento já convertido de JSON
+ * Retorna uma função para fechar a conexão (usar no cleanup do useEffect).
+ */
+export function conectarTempoReal(caminho, aoReceber) {
+  let socket = null;
+  let encerrado = false;
+  let tentativas = 0;
+  let timer = null;
+
+  function abrir() {
+    socket = new WebSocket(urlWebSocket(caminho));
+
+    socket.onopen = () => {
+      tentativas = 0;
+    };
+
+    socket.onmessage = (e) => {
+      try {
+        aoReceber(JSON.parse(e.data));
+      } catch {}
+    };
+
+    socket.onclose = (e) => {
+      // 4401/4403: sem autenticação ou sem acesso — não adianta reconectar
+      if (encerrado || e.code === 4401 || e.code === 4403) return;
+      tentativas += 1;
+      const espera = Math.min(30000, 1000 * 2 ** tentativas);
+      timer = setTimeout(abrir, espera);
+    };
+  }
+
+  abrir();
+
+  return () => {
+    encerrado = true;
+    clearTimeout(timer);
+    if (socket) socket.close();
+  };
+}
@@ -0,0 +1,48 @@
+from channels.db import database_sync_to_async
+from django.db.models import Q
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from contratos.models import Contrato
+
+
+def grupo_chat(contrato_id):
+    """Nome do grupo (channel layer) da sala de chat de um contrato."""
+    return f"chat_contrato_{contrato_id}"
+
+
+class ChatContratoConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Sala de chat de um contrato: ws/contratos/<contrato_id>/chat/
+    - Apenas contratante, freelancer do contrato ou admin podem entrar.
+    - Somente leitura: o envio continua pela API REST (validações/anexos);
+      cada mensagem criada/editada/excluída é publicada aqui.
+    """
+
+    async def connect(self):
+        self.contrato_id = self.scope["url_route"]["kwargs"]["contrato_id"]
+        user = self.scope.get("user")
+
+        if not (user and user.is_authenticated) or not await self._participa(user):
+            await self.close(code=4403)
+            return
+
+        self.grupo = grupo_chat(self.contrato_id)
+        await self.channel_layer.group_add(self.grupo, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        if hasattr(self, "grupo"):
+            await self.channel_layer.group_discard(self.grupo, self.channel_name)
+
+    @database_sync_to_async
+    def _participa(self, user):
+        if user.is_superuser:
+            return Contrato.objects.filter(id=self.contrato_id).exists()
+        return Contrato.objects.filter(
+            Q(contratante_id=user.id) | Q(freelancer_id=user.id),
+            id=self.contrato_id,
+        ).exists()
+
+    async def mensagem_evento(self, event):
+        """Handler de "mensagem.evento" (criada, editada ou excluida)."""
+        await self.send_json(event["dados"])
@@ -0,0 +1,135 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from contratos.models import Contrato
+from mensagens.models import Mensagem
+from mensagens.paginacao import cursor_da_mensagem
+from mensagens.serializers import MensagemSerializer
+from mensagens.views import MensagemViewSet
+from propostas.models import Proposta
+from trabalhos.models import Trabalho
+from usuarios.models import Usuario
+
+
+class _ContadorConsultas:
+    """Conta as consultas SQL executadas na conexão (sem guardar o SQL)."""
+
+    def __init__(self):
+        self.total = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.total += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara a conversa completa (comportamento antigo) com a paginação por "
+        "cursor em um contrato com N mensagens. Tudo roda dentro de uma transação "
+        "desfeita ao final: nenhum dado permanece no banco."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--mensagens", type=int, default=50000,
+            help="Quantidade de mensagens no contrato (padrão: 50000).",
+        )
+        parser.add_argument(
+            "--limite", type=int, default=50,
+            help="Tamanho da página na paginação por cursor.",
+        )
+
+    def handle(self, *args, **options):
+        self.factory = APIRequestFactory()
+        limite = options["limite"]
+
+        with transaction.atomic():
+            contrato, usuario = self._criar_conversa(options["mensagens"])
+            ids = list(
+                Mensagem.objects.filter(contrato=contrato)
+                .order_by("data_envio", "id")
+                .values_list("id", flat=True)
+            )
+            meio = Mensagem.objects.get(id=ids[len(ids) // 2])
+
+            self.stdout.write(f"Contrato com {len(ids)} mensagens\n")
+            self.stdout.write(f"{'modo':<22} | {'tempo (s)':>10} | {'consultas':>10} | {'itens':>7} | {'bytes':>10}")
+            self.stdout.write("-" * 72)
+
+            self._medir("completa (antigo)", lambda: self._conversa_completa(contrato, usuario))
+            self._medir("última página", lambda: self._conversa(usuario, contrato=contrato.id, limite=limite))
+            self._medir(
+                "página no meio",
+                lambda: self._conversa(usuario, contrato=contrato.id, limite=limite, before=cursor_da_mensagem(meio)),
+            )
+            self._medir(
+                "delta (since)",
+                lambda: self._conversa(usuario, contrato=contrato.id, limite=limite, since=ids[-10]),
+            )
+
+            transaction.set_rollback(True)
+
+    # Helpers
+    def _criar_conversa(self, total):
+        marcador = time.time_ns()
+        contratante = Usuario.objects.create(
+            email=f"benchmark-{marcador}-c@exemplo.com", nome="Contratante", tipo="contratante", telefone="0", password="!"
+        )
+        freelancer = Usuario.objects.create(
+            email=f"benchmark-{marcador}-f@exemplo.com", nome="Freelancer", tipo="freelancer", telefone="0", password="!"
+        )
+        hoje = datetime.date.today()
+        trabalho = Trabalho.objects.create(
+            titulo="Benchmark", descricao="-", prazo=hoje, orcamento=1, contratante=contratante
+        )
+        proposta = Proposta.objects.create(
+            trabalho=trabalho, freelancer=freelancer, descricao="-", valor=1, prazo_estimado=hoje
+        )
+        contrato = Contrato.objects.create(
+            proposta=proposta, trabalho=trabalho, contratante=contratante, freelancer=freelancer, valor=1
+        )
+
+        Mensagem.objects.bulk_create(
+            [
+                Mensagem(
+                    contrato=contrato,
+                    remetente=contratante if i % 2 else freelancer,
+                    destinatario=freelancer if i % 2 else contratante,
+                    texto=f"Mensagem de benchmark número {i}.",
+                )
+                for i in range(total)
+            ],
+            batch_size=1000,
+        )
+        return contrato, contratante
+
+    def _conversa_completa(self, contrato, usuario):
+        request = self.factory.get("/api/mensagens/conversa/")
+        request.user = usuario
+        qs = (
+            Mensagem.objects.filter(contrato_id=contrato.id)
+            .select_related("remetente", "destinatario")
+            .order_by("data_envio")
+        )
+        return {"mensagens": MensagemSerializer(qs, many=True, context={"request": request}).data}
+
+    def _conversa(self, usuario, **params):
+        request = self.factory.get("/api/mensagens/conversa/", params)
+        force_authenticate(request, user=usuario)
+        resposta = MensagemViewSet.as_view({"get": "conversa"})(request)
+        return resposta.data
+
+    def _medir(self, modo, funcao):
+        contador = _ContadorConsultas()
+        with connection.execute_wrapper(contador):
+            inicio = time.perf_counter()
+            dados = funcao()
+            duracao = time.perf_counter() - inicio
+        tamanho = len(JSONRenderer().render(dados))
+        itens = len(dados.get("mensagens", []))
+        self.stdout.write(f"{modo:<22} | {duracao:>10.3f} | {contador.total:>10} | {itens:>7} | {tamanho:>10}")
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contratos', '0007_alter_contrato_contratante_alter_contrato_freelancer'),
+        ('mensagens', '0009_alter_mensagem_anexo'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mensagem',
+            index=models.Index(fields=['contrato', 'data_envio', 'id'], name='mensagens_m_contrat_271508_idx'),
+        ),
+    ]
@@ -66,6 +66,10 @@ class Mensagem(models.Model):
 
     class Meta:
         ordering = ["data_envio"]
+        indexes = [
+            # Histórico paginado por cursor: WHERE contrato = ? ORDER BY data_envio, id
+            models.Index(fields=["contrato", "data_envio", "id"]),
+        ]
 
     def __str__(self) -> str:
         return f"Contrato {self.contrato_id} | {self.remetente_id} -> {self.destinatario_id} | {self.data_envio:%d/%m %H:%M}"
@@ -0,0 +1,39 @@
+"""
+Paginação por cursor (keyset) do histórico de mensagens de um contrato.
+A ordem é (data_envio, id); o cursor é opaco para o cliente (base64 de
+"<data_envio ISO>|<id>") e aponta para uma mensagem da conversa.
+"""
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+
+from freelancer.paginacao import codificar_cursor, decodificar_cursor  # noqa: F401
+
+# Quantidade de mensagens por página
+LIMITE_PADRAO = 50
+LIMITE_MAXIMO = 200
+
+
+def cursor_da_mensagem(mensagem):
+    return codificar_cursor(mensagem.data_envio, mensagem.id)
+
+
+def ler_limite(valor):
+    try:
+        limite = int(valor) if valor else LIMITE_PADRAO
+    except (TypeError, ValueError):
+        raise ValidationError({"detail": "Parâmetro 'limite' inválido."})
+    return max(1, min(limite, LIMITE_MAXIMO))
+
+
+def anteriores_a(qs, data_envio, mensagem_id):
+    """Mensagens anteriores a (data_envio, id), das mais novas para as mais antigas."""
+    return qs.filter(
+        Q(data_envio__lt=data_envio) | Q(data_envio=data_envio, id__lt=mensagem_id)
+    ).order_by("-data_envio", "-id")
+
+
+def posteriores_a(qs, data_envio, mensagem_id):
+    """Mensagens posteriores a (data_envio, id), em ordem cronológica."""
+    return qs.filter(
+        Q(data_envio__gt=data_envio) | Q(data_envio=data_envio, id__gt=mensagem_id)
+    ).order_by("data_envio", "id")
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .consumers import ChatContratoConsumer
+
+websocket_urlpatterns = [
+    path("ws/contratos/<int:contrato_id>/chat/", ChatContratoConsumer.as_asgi()),
+]
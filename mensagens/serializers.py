@@ -3,6 +3,7 @@ from rest_framework.exceptions import ValidationError
 from django.utils import timezone
 from .models import Mensagem
 from contratos.models import Contrato
+from moderacao.filtro import validar_texto
 import os
 
 # Extensões permitidas
@@ -84,12 +85,12 @@ class MensagemSerializer(serializers.ModelSerializer):
     def validate_texto(self, value):
         """
         Texto pode ser opcional (caso haja apenas anexo).
-        Apenas valida comprimento se houver texto.
+        Se houver texto, valida comprimento e palavras proibidas.
         """
         value = (value or "").strip()
         if value and len(value) > 2000:
             raise serializers.ValidationError("A mensagem não pode ter mais que 2000 caracteres.")
-        return value
+        return validar_texto(value, "A mensagem contém palavras ofensivas ou inapropriadas.")
 
     def validate(self, attrs):
         """
@@ -6,10 +6,21 @@ from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from django.utils import timezone
 
+from contratos.models import Contrato
 from .models import Mensagem
 from .serializers import MensagemSerializer
 from .permissoes import PermissaoMensagem
+from .paginacao import (
+    anteriores_a,
+    codificar_cursor,
+    cursor_da_mensagem,
+    decodificar_cursor,
+    ler_limite,
+    posteriores_a,
+)
 from notificacoes.utils import enviar_notificacao
+from freelancer.tempo_real import publicar
+from .consumers import grupo_chat
 
 
 class MensagemViewSet(viewsets.ModelViewSet):
@@ -38,15 +49,72 @@ class MensagemViewSet(viewsets.ModelViewSet):
             .distinct()
         )
 
-    def _conversa_response(self, contrato_id, status_code=status.HTTP_200_OK):
-        """Retorna a lista atualizada de mensagens da conversa"""
-        qs = (
-            Mensagem.objects.filter(contrato_id=contrato_id)
-            .select_related("remetente", "destinatario")
-            .order_by("data_envio")
+    def _conversa_response(self, contrato_id, params):
+        """
+        Página do histórico da conversa, paginada por cursor em (data_envio, id).
+        - sem cursor: as `limite` mensagens mais recentes;
+        - ?before=<cursor>: mensagens anteriores ao cursor (rolar para cima);
+        - ?after=<cursor>: mensagens posteriores ao cursor;
+        - ?since=<id>: mensagens posteriores à mensagem <id> (modo delta).
+        As mensagens vêm sempre em ordem cronológica; `tem_mais` indica se há
+        mais mensagens na direção consultada.
+        """
+        qs = Mensagem.objects.filter(contrato_id=contrato_id).select_related("remetente", "destinatario")
+        limite = ler_limite(params.get("limite"))
+
+        after = params.get("after")
+        since = params.get("since")
+        before = params.get("before")
+
+        referencia = None
+        if since:
+            referencia = qs.filter(id=since).values_list("data_envio", "id").first() if since.isdigit() else None
+            if referencia is None:
+                raise ValidationError({"detail": "Mensagem informada em 'since' não pertence à conversa."})
+        elif after:
+            referencia = decodificar_cursor(after)
+
+        if referencia:
+            pagina = list(posteriores_a(qs, *referencia)[:limite + 1])
+            tem_mais = len(pagina) > limite
+            pagina = pagina[:limite]
+        else:
+            base = anteriores_a(qs, *decodificar_cursor(before)) if before else qs.order_by("-data_envio", "-id")
+            pagina = list(base[:limite + 1])
+            tem_mais = len(pagina) > limite
+            pagina = pagina[:limite]
+            pagina.reverse()
+
+        serializer = MensagemSerializer(pagina, many=True, context={"request": self.request})
+
+        cursor_posterior = cursor_da_mensagem(pagina[-1]) if pagina else None
+        if cursor_posterior is None and referencia:
+            # Nada novo: devolve o mesmo ponto para o cliente continuar dali
+            cursor_posterior = codificar_cursor(*referencia)
+
+        return Response({
+            "mensagens": serializer.data,
+            "cursor_anterior": cursor_da_mensagem(pagina[0]) if pagina else None,
+            "cursor_posterior": cursor_posterior,
+            "tem_mais": tem_mais,
+        }, status=status.HTTP_200_OK)
+
+    def _mensagem_response(self, mensagem, dados, status_code=status.HTTP_200_OK):
+        """Retorno de criação/edição/exclusão: só a mensagem alterada e o seu cursor."""
+        return Response(
+            {"mensagem": dados, "cursor": cursor_da_mensagem(mensagem)},
+            status=status_code,
+        )
+
+    def _publicar(self, evento, mensagem, dados=None):
+        """Publica a mensagem na sala de chat do contrato (WebSocket)."""
+        if dados is None:
+            dados = MensagemSerializer(mensagem, context={"request": self.request}).data
+        publicar(
+            grupo_chat(mensagem.contrato_id),
+            "mensagem.evento",
+            {"evento": evento, "mensagem": dados},
         )
-        serializer = MensagemSerializer(qs, many=True, context={"request": self.request})
-        return Response({"mensagens": serializer.data}, status=status_code)
 
     # -------------------------
     # CREATE
@@ -61,6 +129,7 @@ class MensagemViewSet(viewsets.ModelViewSet):
             raise ValidationError({"erro": "A mensagem deve conter texto ou anexo."})
 
         mensagem = serializer.save(remetente=self.request.user)
+        self._publicar("criada", mensagem, serializer.data)
 
         # Envia notificação ao destinatário
         if mensagem.destinatario and mensagem.destinatario != self.request.user:
@@ -74,12 +143,12 @@ class MensagemViewSet(viewsets.ModelViewSet):
                 link=f"/contratos/{mensagem.contrato.id}/chat", 
             )
             
-        # Guarda o ID do contrato para o retorno pós-criação
-        self._last_contrato = mensagem.contrato.id
+        # Guarda a mensagem para o retorno pós-criação
+        self._ultima_mensagem = mensagem
 
     def create(self, request, *args, **kwargs):
-        super().create(request, *args, **kwargs)
-        return self._conversa_response(self._last_contrato, status.HTTP_201_CREATED)
+        resposta = super().create(request, *args, **kwargs)
+        return self._mensagem_response(self._ultima_mensagem, resposta.data, status.HTTP_201_CREATED)
 
     # -------------------------
     # UPDATE
@@ -89,8 +158,9 @@ class MensagemViewSet(viewsets.ModelViewSet):
         if instance.remetente != request.user:
             return Response({"detail": "Você não pode editar esta mensagem."}, status=403)
 
-        super().update(request, *args, **kwargs)
-        return self._conversa_response(instance.contrato.id, status.HTTP_200_OK)
+        resposta = super().update(request, *args, **kwargs)
+        self._publicar("editada", instance, resposta.data)
+        return self._mensagem_response(instance, resposta.data)
 
     # -------------------------
     # DELETE
@@ -115,8 +185,10 @@ class MensagemViewSet(viewsets.ModelViewSet):
         instance.texto = "Mensagem excluída"
         instance.anexo = None
         instance.save(update_fields=["excluida", "texto", "anexo"])
+        dados = MensagemSerializer(instance, context={"request": request}).data
+        self._publicar("excluida", instance, dados)
 
-        return self._conversa_response(instance.contrato.id, status.HTTP_200_OK)
+        return self._mensagem_response(instance, dados)
 
     # -------------------------
     # GET CONVERSA
@@ -129,4 +201,12 @@ class MensagemViewSet(viewsets.ModelViewSet):
                 {"detail": "Informe ?contrato=<id>."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        return self._conversa_response(contrato_id, status.HTTP_200_OK)
+
+        # Apenas participantes do contrato (ou admin) leem a conversa
+        contratos = Contrato.objects.filter(id=contrato_id) if str(contrato_id).isdigit() else Contrato.objects.none()
+        if not request.user.is_superuser:
+            contratos = contratos.filter(Q(contratante=request.user) | Q(freelancer=request.user))
+        if not contratos.exists():
+            return Response({"detail": "Contrato não encontrado."}, status=status.HTTP_404_NOT_FOUND)
+
+        return self._conversa_response(contrato_id, request.query_params)
@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import PalavraProibida
+
+
+@admin.register(PalavraProibida)
+class PalavraProibidaAdmin(admin.ModelAdmin):
+    list_display = ("id", "palavra", "tipo", "palavra_inteira", "ativo", "criado_em")
+    list_filter = ("tipo", "palavra_inteira", "ativo")
+    search_fields = ("palavra",)
+    ordering = ("palavra",)
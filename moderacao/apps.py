@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ModeracaoConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'moderacao'
+
+    def ready(self):
+        import moderacao.signals
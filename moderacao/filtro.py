@@ -0,0 +1,209 @@
+"""
+Filtro de palavras proibidas compartilhado pelos serializers.
+
+Os termos ativos de PalavraProibida viram, por tipo, expressões regulares
+compiladas uma única vez: todas as palavras numa só alternância em forma de
+trie (ramos com primeiro caractere distinto), então a busca percorre o texto
+uma vez, com custo por posição limitado ao tamanho do maior termo e não à
+quantidade de termos.
+
+Texto e termos passam pela mesma normalização:
+- minúsculas, sem acentos ("idióta" -> "idiota");
+- leetspeak comum ("1d10t4" -> "idiota", "m3rd@" -> "merda");
+- qualquer sequência fora de [a-z0-9] vira um espaço ("foda-se" -> "foda se").
+Termos com 3+ letras também são comparados com letras repetidas colapsadas
+("idiooota" -> "idiota"); os curtos ("cu") e os feitos de repetição ("aaaa")
+são comparados sem colapsar, senão casariam com qualquer letra isolada.
+
+Versão: como na taxonomia (habilidades/cache.py), um contador no cache do
+Django é trocado a cada save/delete de PalavraProibida (moderacao/signals.py)
+e cada processo confere a versão no máximo a cada MODERACAO_VERIFICACAO
+segundos, recompilando quando ela muda.
+"""
+import re
+import threading
+import time
+import unicodedata
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import serializers
+
+CHAVE_VERSAO = "moderacao:palavras:versao"
+
+# Texto livre (descrições, comentários, mensagens) e nomes curtos (habilidades, ramos).
+# Termos curtos ambíguos ("pinto", "rola", "cu"...) ficam em 'palavrao': barrados só em
+# nomes, senão "Eu pinto paredes" ou "a reunião rola amanhã" seriam recusados
+TIPOS_TEXTO = ("ofensa",)
+TIPOS_NOME = ("ofensa", "palavrao", "spam")
+
+MENSAGEM_PADRAO = "O texto contém palavras ofensivas ou inapropriadas."
+
+# Termos mais curtos que isso (depois de colapsar) não são colapsados
+TAMANHO_MINIMO_COLAPSO = 3
+
+_LEET = str.maketrans("013457@$", "oieastas")
+_SEPARADOR = re.compile(r"[^a-z0-9]+")
+_REPETICAO = re.compile(r"([a-z])\1+")
+_BORDA_INICIO = r"(?<![a-z0-9])"
+_BORDA_FIM = r"(?![a-z0-9])"
+
+_lock = threading.Lock()
+_filtro = None
+_verificado_em = 0.0
+
+
+def normalizar_texto(texto):
+    """Minúsculas, sem acentos, leetspeak traduzido e só [a-z0-9] separados por espaço."""
+    texto = unicodedata.normalize("NFKD", str(texto or "")).encode("ASCII", "ignore").decode("ASCII")
+    texto = texto.lower().translate(_LEET)
+    return _SEPARADOR.sub(" ", texto).strip()
+
+
+def colapsar(texto):
+    """Colapsa letras repetidas ("burrooo" -> "buro"); aplicado a texto e termos igualmente."""
+    return _REPETICAO.sub(r"\1", texto)
+
+
+# ---------------------------------------------------------------------------
+# Compilação
+# ---------------------------------------------------------------------------
+
+def _padrao_trie(termos):
+    """Alternância equivalente a termo1|termo2|..., fatorada por prefixo comum."""
+    raiz = {}
+    for termo in termos:
+        no = raiz
+        for caractere in termo:
+            no = no.setdefault(caractere, {})
+        no[""] = {}
+    return _padrao_no(raiz)
+
+
+def _padrao_no(no):
+    ramos = [re.escape(c) + _padrao_no(filho) for c, filho in sorted(no.items()) if c]
+    if not ramos:
+        return ""
+    corpo = ramos[0] if len(ramos) == 1 else "(?:" + "|".join(ramos) + ")"
+    if "" in no:
+        # Termo termina aqui, mas pode continuar num termo maior (tenta o maior antes)
+        return f"(?:{corpo})?"
+    return corpo
+
+
+def _compilar(inteiras, parciais):
+    partes = []
+    if inteiras:
+        partes.append(_BORDA_INICIO + "(?:" + _padrao_trie(inteiras) + ")" + _BORDA_FIM)
+    if parciais:
+        partes.append(_padrao_trie(parciais))
+    return re.compile("|".join(partes)) if partes else None
+
+
+class Filtro:
+    """Expressões compiladas dos termos ativos numa versão."""
+
+    def __init__(self, versao, termos):
+        self.versao = versao
+        # {tipo: (regex sobre o texto normalizado, regex sobre o texto colapsado)}
+        self.expressoes = {}
+        grupos = {}
+        for palavra, tipo, palavra_inteira in termos:
+            normalizado = normalizar_texto(palavra)
+            if not normalizado:
+                continue
+            colapsado = colapsar(normalizado)
+            if len(colapsado.replace(" ", "")) >= TAMANHO_MINIMO_COLAPSO:
+                modo, termo = 1, colapsado
+            else:
+                modo, termo = 0, normalizado
+            grupos.setdefault((tipo, modo, palavra_inteira), set()).add(termo)
+
+        for tipo in {t for t, _, _ in grupos}:
+            self.expressoes[tipo] = tuple(
+                _compilar(grupos.get((tipo, modo, True), ()), grupos.get((tipo, modo, False), ()))
+                for modo in (0, 1)
+            )
+
+    def encontrar(self, texto, tipos=TIPOS_TEXTO):
+        """Primeiro termo proibido encontrado no texto (normalizado), ou None."""
+        expressoes = [self.expressoes[t] for t in tipos if t in self.expressoes]
+        if not expressoes or not texto:
+            return None
+        normalizado = normalizar_texto(texto)
+        colapsado = None
+        for exato, por_colapso in expressoes:
+            if exato:
+                achado = exato.search(normalizado)
+                if achado:
+                    return achado.group()
+            if por_colapso:
+                if colapsado is None:
+                    colapsado = colapsar(normalizado)
+                achado = por_colapso.search(colapsado)
+                if achado:
+                    return achado.group()
+        return None
+
+
+def _versao_atual():
+    versao = cache.get(CHAVE_VERSAO)
+    if versao is None:
+        versao = uuid.uuid4().hex
+        # add: se outro processo gravou antes, vale a dele
+        if not cache.add(CHAVE_VERSAO, versao, timeout=None):
+            versao = cache.get(CHAVE_VERSAO) or versao
+    return versao
+
+
+def _carregar(versao):
+    from .models import PalavraProibida
+
+    termos = PalavraProibida.objects.filter(ativo=True).values_list("palavra", "tipo", "palavra_inteira")
+    return Filtro(versao, list(termos))
+
+
+def filtro():
+    """Filtro compilado atual (recompilado só quando a versão muda)."""
+    global _filtro, _verificado_em
+
+    agora = time.monotonic()
+    with _lock:
+        atual = _filtro
+        if atual is not None and agora - _verificado_em < getattr(settings, "MODERACAO_VERIFICACAO", 5):
+            return atual
+
+    versao = _versao_atual()
+    if atual is None or atual.versao != versao:
+        atual = _carregar(versao)
+
+    with _lock:
+        _filtro = atual
+        _verificado_em = agora
+    return atual
+
+
+def invalidar_filtro():
+    """Troca a versão (todos os processos recompilam) e descarta o filtro local."""
+    global _filtro
+
+    cache.set(CHAVE_VERSAO, uuid.uuid4().hex, timeout=None)
+    with _lock:
+        _filtro = None
+
+
+# ---------------------------------------------------------------------------
+# Uso nos serializers
+# ---------------------------------------------------------------------------
+
+def contem_proibida(texto, tipos=TIPOS_TEXTO):
+    """True se o texto tiver algum termo ativo dos tipos informados."""
+    return filtro().encontrar(texto, tipos) is not None
+
+
+def validar_texto(texto, mensagem=MENSAGEM_PADRAO, tipos=TIPOS_TEXTO):
+    """Levanta ValidationError (DRF) se o texto tiver termo proibido; senão devolve o texto."""
+    if contem_proibida(texto, tipos):
+        raise serializers.ValidationError(mensagem)
+    return texto
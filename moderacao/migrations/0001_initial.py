@@ -0,0 +1,30 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PalavraProibida',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('palavra', models.CharField(max_length=100, unique=True)),
+                ('tipo', models.CharField(choices=[('ofensa', 'Ofensa'), ('spam', 'Spam')], default='ofensa', max_length=10)),
+                ('palavra_inteira', models.BooleanField(default=True, help_text='Casa só a palavra isolada; desmarcado, casa também dentro de outras palavras.')),
+                ('ativo', models.BooleanField(default=True)),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Palavra proibida',
+                'verbose_name_plural': 'Palavras proibidas',
+                'ordering': ['palavra'],
+            },
+        ),
+    ]
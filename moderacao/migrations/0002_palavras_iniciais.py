@@ -0,0 +1,38 @@
+from django.db import migrations
+
+# Listas que ficavam fixas em trabalhos/serializers.py e avaliacoes/serializers.py
+OFENSAS = [
+    "merda", "porra", "puta", "puto", "caralho", "buceta", "pinto", "piroca",
+    "pau", "rola", "bosta", "arrombado", "vagabundo", "vagabunda", "corno",
+    "fdp", "foda-se", "foder", "cu", "cuzão", "desgraçado", "otário", "otaria",
+    "ofensa", "palavrão", "xingar", "idiota", "burro",
+]
+# Spam em nomes de habilidade/ramo; sequências de teclado casam dentro de outras palavras
+SPAM = ["lorem", "teste"]
+SPAM_PARCIAL = ["asdf", "qwerty", "aaaa", "bbbb", "cccc", "zzzz", "xxx"]
+
+
+def forwards(apps, schema_editor):
+    PalavraProibida = apps.get_model("moderacao", "PalavraProibida")
+    PalavraProibida.objects.bulk_create(
+        [PalavraProibida(palavra=p, tipo="ofensa") for p in OFENSAS]
+        + [PalavraProibida(palavra=p, tipo="spam") for p in SPAM]
+        + [PalavraProibida(palavra=p, tipo="spam", palavra_inteira=False) for p in SPAM_PARCIAL],
+        ignore_conflicts=True,
+    )
+
+
+def backwards(apps, schema_editor):
+    PalavraProibida = apps.get_model("moderacao", "PalavraProibida")
+    PalavraProibida.objects.filter(palavra__in=OFENSAS + SPAM + SPAM_PARCIAL).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("moderacao", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations, models
+
+# Termos curtos com outro sentido comum passam a valer só para nomes de habilidade/ramo:
+# "Eu pinto paredes", "a reunião rola amanhã", "Pau-brasil", "CU-1234", "ficou puto".
+# O resto da lista antiga continua como 'ofensa' (texto livre); as meta-palavras saem.
+AMBIGUAS = ["pinto", "rola", "pau", "cu", "puto", "corno"]
+META_PALAVRAS = ["ofensa", "palavrão", "xingar"]
+
+
+def forwards(apps, schema_editor):
+    PalavraProibida = apps.get_model("moderacao", "PalavraProibida")
+    PalavraProibida.objects.filter(palavra__in=AMBIGUAS, tipo="ofensa").update(tipo="palavrao")
+    PalavraProibida.objects.filter(palavra__in=META_PALAVRAS, tipo="ofensa").delete()
+
+
+def backwards(apps, schema_editor):
+    PalavraProibida = apps.get_model("moderacao", "PalavraProibida")
+    PalavraProibida.objects.filter(palavra__in=AMBIGUAS, tipo="palavrao").update(tipo="ofensa")
+    PalavraProibida.objects.bulk_create(
+        [PalavraProibida(palavra=p, tipo="ofensa") for p in META_PALAVRAS],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("moderacao", "0002_palavras_iniciais"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="palavraproibida",
+            name="tipo",
+            field=models.CharField(
+                choices=[("ofensa", "Ofensa"), ("palavrao", "Palavrão (só nomes)"), ("spam", "Spam")],
+                default="ofensa",
+                max_length=10,
+            ),
+        ),
+        migrations.RunPython(forwards, backwards),
+    ]
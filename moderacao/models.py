@@ -0,0 +1,38 @@
+from django.db import models
+
+
+class PalavraProibida(models.Model):
+    """
+    Termo bloqueado pelo filtro de moderação (moderacao/filtro.py).
+    'ofensa' vale para todo texto livre (trabalhos, propostas, avaliações,
+    mensagens) e deve ter só termos sem outro sentido; 'palavrao' (termos
+    ambíguos como "pinto", "rola", "pau") e 'spam' valem só para nomes curtos
+    como habilidades e ramos.
+    """
+
+    TIPOS = [
+        ("ofensa", "Ofensa"),
+        ("palavrao", "Palavrão (só nomes)"),
+        ("spam", "Spam"),
+    ]
+
+    palavra = models.CharField(max_length=100, unique=True)
+    tipo = models.CharField(max_length=10, choices=TIPOS, default="ofensa")
+    palavra_inteira = models.BooleanField(
+        default=True,
+        help_text="Casa só a palavra isolada; desmarcado, casa também dentro de outras palavras.",
+    )
+    ativo = models.BooleanField(default=True)
+    criado_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["palavra"]
+        verbose_name = "Palavra proibida"
+        verbose_name_plural = "Palavras proibidas"
+
+    def save(self, *args, **kwargs):
+        self.palavra = (self.palavra or "").strip().lower()
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.palavra
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .filtro import invalidar_filtro
+from .models import PalavraProibida
+
+
+# Versão do filtro compilado (moderacao/filtro.py)
+@receiver(post_save, sender=PalavraProibida)
+@receiver(post_delete, sender=PalavraProibida)
+def invalidar_filtro_ao_alterar(sender, **kwargs):
+    invalidar_filtro()
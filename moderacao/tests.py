@@ -0,0 +1,58 @@
+from django.test import TestCase
+from rest_framework import serializers
+
+from moderacao.filtro import TIPOS_NOME, contem_proibida, invalidar_filtro, validar_texto
+from moderacao.models import PalavraProibida
+
+
+class FiltroPalavrasTests(TestCase):
+    """Filtro sobre as palavras das migrações 0002/0003 (ofensas, palavrões ambíguos e spam)."""
+
+    def setUp(self):
+        invalidar_filtro()
+
+    def test_termos_sem_ambiguidade_barrados_em_texto_livre(self):
+        for texto in ("que merda de entrega", "Porra, atrasou de novo", "seu arrombado", "fdp", "foda-se"):
+            with self.subTest(texto=texto):
+                self.assertTrue(contem_proibida(texto))
+
+    def test_leetspeak_e_acentos(self):
+        self.assertTrue(contem_proibida("seu 1d10t4"))
+        self.assertTrue(contem_proibida("m3rd@ de serviço"))
+        self.assertTrue(contem_proibida("IDIÓTA"))
+
+    def test_letras_repetidas(self):
+        self.assertTrue(contem_proibida("idiooooota"))
+        self.assertTrue(contem_proibida("burrrroooo"))
+
+    def test_sem_falsos_positivos_dentro_de_palavras(self):
+        for texto in ("Ciência da Computação", "Disputa de preços", "Caçula", "Pauta da reunião", "Curso de Python"):
+            with self.subTest(texto=texto):
+                self.assertFalse(contem_proibida(texto))
+                self.assertFalse(contem_proibida(texto, TIPOS_NOME))
+
+    def test_ambiguas_liberadas_em_texto_e_barradas_em_nomes(self):
+        for texto, nome in (
+            ("Eu pinto paredes", "pinto"),
+            ("A reunião rola amanhã", "rola"),
+            ("Móveis de pau-brasil", "pau"),
+            ("Ele ficou puto com o atraso", "puto"),
+        ):
+            with self.subTest(texto=texto):
+                self.assertFalse(contem_proibida(texto))
+                self.assertTrue(contem_proibida(nome, TIPOS_NOME))
+
+    def test_spam_so_em_nomes(self):
+        self.assertFalse(contem_proibida("Faça um teste antes de entregar"))
+        self.assertTrue(contem_proibida("teste", TIPOS_NOME))
+        self.assertTrue(contem_proibida("asdfgh", TIPOS_NOME))
+
+    def test_termo_novo_vale_apos_invalidacao(self):
+        self.assertFalse(contem_proibida("golpista"))
+        PalavraProibida.objects.create(palavra="Golpista")
+        self.assertTrue(contem_proibida("GOLPISTA!"))
+
+    def test_validar_texto(self):
+        self.assertEqual(validar_texto("Ótimo trabalho"), "Ótimo trabalho")
+        with self.assertRaisesMessage(serializers.ValidationError, "Proibido"):
+            validar_texto("que porra", "Proibido")
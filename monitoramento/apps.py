@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class MonitoramentoConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'monitoramento'
+
+    def ready(self):
+        # HTTP externo só é medido (e o registro publicado no cache) com a instrumentação ligada
+        if getattr(settings, "INSTRUMENTACAO_ATIVA", False):
+            from .instrumentacao import instalar
+            instalar()
@@ -0,0 +1,272 @@
+"""
+Massa de dados para o teste de orçamento de consultas (verificar_orcamentos).
+
+semear(escala) cria com bulk_create um marketplace de tamanho realista
+(BASE multiplicado pela escala) e reconstrói as tabelas derivadas que os
+sinais manteriam (métricas, notas, busca, recomendações). Três usuários
+"protagonistas" concentram volume: o contratante e o freelancer principais
+aparecem em ~10% dos trabalhos/propostas, e há um superusuário. Retorna um
+dict com os ids usados nas rotas de detalhe (ver monitoramento/orcamentos.py).
+A geração é determinística (semente fixa).
+"""
+import datetime
+import random
+from decimal import Decimal
+
+# Quantidades na escala 1
+BASE = {
+    "contratantes": 500,
+    "freelancers": 1500,
+    "habilidades": 150,
+    "ramos": 20,
+    "trabalhos": 3000,
+    "propostas_por_trabalho": 3,
+    "contratos": 1500,
+    "mensagens_por_contrato": 10,
+    "notificacoes": 5000,
+    "denuncias": 200,
+}
+
+# Vocabulário dos títulos/descrições (a busca textual casa só parte dos trabalhos)
+TEMAS = [
+    "sistema web", "aplicativo mobile", "loja virtual", "landing page", "identidade visual",
+    "integração de API", "painel administrativo", "automação de planilhas", "chatbot",
+    "migração de banco de dados", "tradução técnica", "edição de vídeo", "artigos para blog",
+    "campanha de anúncios", "modelagem 3D", "testes automatizados", "análise de dados",
+    "aplicativo de delivery", "site institucional", "manutenção de servidor",
+]
+
+HABILIDADES_POR_TRABALHO = 3
+FRACAO_PRINCIPAL = 10  # 1 em cada N trabalhos/propostas vai para os protagonistas
+SENHA_INUTILIZAVEL = "!"
+
+
+def _n(chave, escala):
+    return max(1, int(BASE[chave] * escala))
+
+
+def _usuarios(prefixo, tipo, quantidade):
+    from usuarios.models import Usuario
+
+    return Usuario.objects.bulk_create(
+        [
+            Usuario(
+                email=f"{prefixo}{i}@orcamento.exemplo.com", nome=f"{tipo.capitalize()} {i}",
+                tipo=tipo, telefone="11999999999", password=SENHA_INUTILIZAVEL,
+            )
+            for i in range(quantidade)
+        ],
+        batch_size=1000,
+    )
+
+
+def semear(escala=1.0, semente=42):
+    from django.utils import timezone
+
+    from avaliacoes.models import Avaliacao
+    from avaliacoes.notas import reconciliar_notas
+    from contratos.metricas import recalcular_todas
+    from contratos.models import Contrato
+    from denuncias.models import Denuncia
+    from habilidades.cache import invalidar_taxonomia
+    from habilidades.models import Habilidade, Ramo
+    from mensagens.models import Mensagem
+    from notificacoes.models import Notificacao
+    from pagamentos.models import Pagamento
+    from propostas.models import Proposta
+    from trabalhos.busca import reindexar_todos
+    from trabalhos.models import Trabalho
+    from trabalhos.recomendacao import recalcular_abertos
+    from usuarios.busca_freelancers import reindexar_freelancers
+    from usuarios.models import Usuario
+
+    rng = random.Random(semente)
+    hoje = datetime.date.today()
+    sufixo = rng.randrange(10 ** 9)
+
+    # Usuários
+    admin = Usuario.objects.create(
+        email=f"admin-{sufixo}@orcamento.exemplo.com", nome="Admin", tipo="contratante",
+        telefone="11999999999", password=SENHA_INUTILIZAVEL, is_staff=True, is_superuser=True,
+    )
+    contratantes = _usuarios(f"contratante-{sufixo}-", "contratante", _n("contratantes", escala))
+    freelancers = _usuarios(f"freelancer-{sufixo}-", "freelancer", _n("freelancers", escala))
+    contratante, freelancer = contratantes[0], freelancers[0]
+
+    # Taxonomia
+    ramos = Ramo.objects.bulk_create([Ramo(nome=f"Ramo {sufixo} {i}") for i in range(_n("ramos", escala))])
+    habilidades = Habilidade.objects.bulk_create(
+        [Habilidade(nome=f"Habilidade {sufixo} {i}") for i in range(_n("habilidades", escala))],
+        batch_size=1000,
+    )
+
+    # Trabalhos (os primeiros recebem contrato)
+    total_trabalhos = _n("trabalhos", escala)
+    total_contratos = min(_n("contratos", escala), total_trabalhos)
+    trabalhos = Trabalho.objects.bulk_create(
+        [
+            Trabalho(
+                titulo=f"{tema.capitalize()} {i}",
+                descricao=f"Preciso de ajuda com {tema} e {rng.choice(TEMAS)} para o meu negócio.",
+                prazo=hoje + datetime.timedelta(days=rng.randint(5, 90)),
+                orcamento=Decimal(rng.randint(100, 10000)),
+                contratante=contratante if i % FRACAO_PRINCIPAL == 0 else rng.choice(contratantes),
+                ramo=rng.choice(ramos),
+                status="aberto",
+            )
+            for i, tema in enumerate(rng.choice(TEMAS) for _ in range(total_trabalhos))
+        ],
+        batch_size=1000,
+    )
+    TrabalhoHabilidade = Trabalho.habilidades.through
+    TrabalhoHabilidade.objects.bulk_create(
+        [
+            TrabalhoHabilidade(trabalho_id=t.id, habilidade_id=h.id)
+            for t in trabalhos
+            for h in rng.sample(habilidades, min(HABILIDADES_POR_TRABALHO, len(habilidades)))
+        ],
+        batch_size=1000,
+    )
+
+    # Propostas: a primeira de cada trabalho é a que vira contrato
+    propostas = []
+    por_trabalho = min(_n("propostas_por_trabalho", 1), len(freelancers))
+    for i, trabalho in enumerate(trabalhos):
+        autores = rng.sample(freelancers, por_trabalho)
+        if i % FRACAO_PRINCIPAL == 0:
+            # Protagonista como primeira proposta (a que vira contrato)
+            if freelancer in autores:
+                autores.remove(freelancer)
+            else:
+                autores.pop()
+            autores.insert(0, freelancer)
+        for autor in autores:
+            propostas.append(Proposta(
+                trabalho_id=trabalho.id, freelancer_id=autor.id, valor=trabalho.orcamento,
+                descricao="Tenho experiência com projetos parecidos e entrego no prazo.",
+                prazo_estimado=trabalho.prazo, status="pendente",
+            ))
+    propostas = Proposta.objects.bulk_create(propostas, batch_size=1000)
+
+    # Contratos, pagamentos e avaliações
+    contratos = []
+    for i in range(total_contratos):
+        proposta = propostas[i * por_trabalho]
+        trabalho = trabalhos[i]
+        status = rng.choices(["ativo", "concluido", "cancelado"], weights=[4, 5, 1])[0]
+        contratos.append(Contrato(
+            proposta_id=proposta.id, trabalho_id=trabalho.id, contratante_id=trabalho.contratante_id,
+            freelancer_id=proposta.freelancer_id, valor=proposta.valor, status=status,
+            data_fim=trabalho.prazo,
+            data_entrega=trabalho.prazo - datetime.timedelta(days=rng.randint(-5, 5))
+            if status == "concluido" else None,
+        ))
+    contratos = Contrato.objects.bulk_create(contratos, batch_size=1000)
+
+    status_trabalho = {"ativo": "em_andamento", "concluido": "concluido", "cancelado": "cancelado"}
+    for status, novo in status_trabalho.items():
+        Trabalho.objects.filter(id__in=[c.trabalho_id for c in contratos if c.status == status]).update(status=novo)
+    Proposta.objects.filter(id__in=[c.proposta_id for c in contratos]).update(status="aceita")
+
+    # Pagamentos já conferidos pela reconciliação (as rotas de status não enfileiram nada)
+    agora = timezone.now()
+    Pagamento.objects.bulk_create(
+        [
+            Pagamento(
+                contrato_id=c.id, contratante_id=c.contratante_id, valor=c.valor,
+                status="aprovado" if c.status == "concluido" else "pendente",
+                mercadopago_payment_id=str(sufixo * 10 ** 6 + c.id), sincronizado_em=agora,
+            )
+            for c in contratos if c.status != "cancelado"
+        ],
+        batch_size=1000,
+    )
+    concluidos = [c for c in contratos if c.status == "concluido"]
+    Avaliacao.objects.bulk_create(
+        [
+            Avaliacao(
+                contrato_id=c.id, avaliador_id=c.contratante_id, avaliado_id=c.freelancer_id,
+                nota=rng.randint(3, 5), comentario="Ótimo trabalho, recomendo.",
+            )
+            for c in concluidos
+        ]
+        + [
+            Avaliacao(
+                contrato_id=c.id, avaliador_id=c.freelancer_id, avaliado_id=c.contratante_id,
+                nota=rng.randint(3, 5), comentario="Contratante claro e pagou em dia.",
+            )
+            for c in concluidos[::2]
+        ],
+        batch_size=1000,
+    )
+
+    # Mensagens
+    mensagens = []
+    for c in contratos:
+        for j in range(_n("mensagens_por_contrato", 1)):
+            de, para = (c.contratante_id, c.freelancer_id) if j % 2 == 0 else (c.freelancer_id, c.contratante_id)
+            mensagens.append(Mensagem(
+                contrato_id=c.id, remetente_id=de, destinatario_id=para, texto=f"Mensagem {j} sobre o projeto.",
+            ))
+    Mensagem.objects.bulk_create(mensagens, batch_size=2000)
+
+    # Notificações e denúncias
+    todos = contratantes + freelancers
+    Notificacao.objects.bulk_create(
+        [
+            Notificacao(
+                usuario=contratante if i % FRACAO_PRINCIPAL == 0
+                else freelancer if i % FRACAO_PRINCIPAL == 1 else rng.choice(todos),
+                mensagem=f"Notificação {i}", link="/contratos",
+            )
+            for i in range(_n("notificacoes", escala))
+        ],
+        batch_size=2000,
+    )
+    denuncias = Denuncia.objects.bulk_create(
+        [
+            Denuncia(
+                denunciante=contratante if i % FRACAO_PRINCIPAL == 0 else rng.choice(contratantes),
+                denunciado=rng.choice(freelancers), motivo="Não respondeu às mensagens.",
+            )
+            for i in range(_n("denuncias", escala))
+        ],
+        batch_size=1000,
+    )
+
+    # Tabelas derivadas (bulk_create não dispara sinais)
+    invalidar_taxonomia()
+    reconciliar_notas(Usuario, Avaliacao, corrigir=True)
+    recalcular_todas()
+    reindexar_freelancers()
+    reindexar_todos()
+    recalcular_abertos()
+
+    contrato_principal = next(
+        c for c in contratos
+        if c.contratante_id == contratante.id and c.freelancer_id == freelancer.id and c.status != "cancelado"
+    )
+    return {
+        "admin": admin.id,
+        "contratante": contratante.id,
+        "freelancer": freelancer.id,
+        "trabalho": trabalhos[0].id,
+        "trabalho_aberto": trabalhos[-1].id,
+        "proposta": propostas[0].id,
+        "contrato": contrato_principal.id,
+        "pagamento": Pagamento.objects.filter(contrato_id=contrato_principal.id).values_list("id", flat=True).first(),
+        "pagamento_mp": str(sufixo * 10 ** 6 + contrato_principal.id),
+        "avaliacao": Avaliacao.objects.filter(avaliado_id=freelancer.id).values_list("id", flat=True).first(),
+        "mensagem": Mensagem.objects.filter(contrato_id=contrato_principal.id).values_list("id", flat=True).first(),
+        "notificacao": Notificacao.objects.filter(usuario=contratante).values_list("id", flat=True).first(),
+        "denuncia": denuncias[0].id,
+        "habilidade": habilidades[0].id,
+        "ramo": ramos[0].id,
+        "totais": {
+            "usuarios": len(todos) + 1,
+            "trabalhos": len(trabalhos),
+            "propostas": len(propostas),
+            "contratos": len(contratos),
+            "mensagens": len(mensagens),
+        },
+    }
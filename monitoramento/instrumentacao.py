@@ -0,0 +1,358 @@
+"""
+Instrumentação de requisições (opt-in: INSTRUMENTACAO_ATIVA).
+
+Cada requisição ganha uma Medicao (contextvar) preenchida por:
+- InstrumentacaoMiddleware (monitoramento/middleware.py): tempo total e
+  consultas SQL (contagem, tempo e impressões digitais para achar N+1); o
+  restante, fora do banco e do HTTP externo, é o tempo de aplicação
+  (serialização, renderização e a própria view);
+- medir_http(servico): tempo das chamadas externas (Mercado Pago, API de
+  CPF/CNPJ, SendGrid), também contado fora de requisições (fila, comandos).
+
+Os agregados ficam no Registro de cada processo do Procfile. Com a
+instrumentação ligada, cada um publica periodicamente um instantâneo numa
+vaga do cache compartilhado (Redis) e o /metrics do web soma o próprio
+registro com os publicados pelos demais (monitoramento/views.py).
+"""
+import atexit
+import contextvars
+import logging
+import os
+import re
+import socket
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger("monitoramento")
+
+# Mesma SQL (com placeholders) executada isso ou mais vezes numa requisição = suspeita de N+1
+REPETICOES_SUSPEITAS = 3
+
+# Limites dos histogramas
+BUCKETS_SEGUNDOS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_CONSULTAS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+_LISTA_PLACEHOLDERS = re.compile(r"\((?:%s, )+%s\)")
+_ESPACOS = re.compile(r"\s+")
+
+_atual = contextvars.ContextVar("medicao", default=None)
+_ativo = False
+
+
+class Medicao:
+    """O que uma requisição gastou."""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.tempo_db = 0.0
+        self.impressoes = Counter()
+        self.tempo_http = defaultdict(float)
+
+    def registrar_consulta(self, sql, duracao):
+        self.consultas += 1
+        self.tempo_db += duracao
+        self.impressoes[impressao_digital(sql)] += 1
+
+    def tempo_aplicacao(self, duracao):
+        """Parte de `duracao` fora do banco e das chamadas externas."""
+        return max(0.0, duracao - self.tempo_db - sum(self.tempo_http.values()))
+
+    def repetidas(self):
+        """[(sql, vezes)] das consultas repetidas a partir de REPETICOES_SUSPEITAS."""
+        return [(sql, n) for sql, n in self.impressoes.most_common() if n >= REPETICOES_SUSPEITAS]
+
+
+def impressao_digital(sql):
+    """SQL sem variações de IN (...) nem espaços: mesma consulta, mesmos parâmetros ou não."""
+    return _ESPACOS.sub(" ", _LISTA_PLACEHOLDERS.sub("(...)", sql)).strip()
+
+
+def medicao_atual():
+    return _atual.get()
+
+
+def iniciar_medicao():
+    """Abre a Medicao da requisição; devolve o token para encerrar_medicao()."""
+    medicao = Medicao()
+    return medicao, _atual.set(medicao)
+
+
+def encerrar_medicao(token):
+    _atual.reset(token)
+
+
+# ---------------------------------------------------------------------------
+# Registro de métricas (por processo)
+# ---------------------------------------------------------------------------
+
+class Registro:
+    """Contadores e histogramas com rótulos, exportados no formato texto do Prometheus."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contadores = defaultdict(int)  # (nome, rotulos) -> valor
+        self._histogramas = {}  # (nome, rotulos) -> [contagens por bucket, soma, total]
+        self._buckets = {}
+        self._ajuda = {}
+
+    def incrementar(self, nome, ajuda, valor=1, **rotulos):
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with self._lock:
+            self._ajuda.setdefault(nome, ("counter", ajuda))
+            self._contadores[chave] += valor
+
+    def observar(self, nome, ajuda, valor, buckets, **rotulos):
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with self._lock:
+            self._ajuda.setdefault(nome, ("histogram", ajuda))
+            self._buckets.setdefault(nome, buckets)
+            contagens, soma, total = self._histogramas.get(chave) or ([0] * len(buckets), 0.0, 0)
+            contagens = [c + (valor <= limite) for c, limite in zip(contagens, buckets)]
+            self._histogramas[chave] = (contagens, soma + valor, total + 1)
+
+    def limpar(self):
+        with self._lock:
+            self._contadores.clear()
+            self._histogramas.clear()
+
+    def instantaneo(self):
+        """Cópia dos valores atuais (serializável, para publicar no cache)."""
+        with self._lock:
+            return {
+                "contadores": dict(self._contadores),
+                "histogramas": dict(self._histogramas),
+                "ajuda": dict(self._ajuda),
+                "buckets": dict(self._buckets),
+            }
+
+
+def juntar(instantaneos):
+    """Soma instantâneos de vários processos (contadores e histogramas série a série)."""
+    total = {"contadores": defaultdict(int), "histogramas": {}, "ajuda": {}, "buckets": {}}
+    for instantaneo in instantaneos:
+        total["ajuda"].update(instantaneo["ajuda"])
+        total["buckets"].update(instantaneo["buckets"])
+        for chave, valor in instantaneo["contadores"].items():
+            total["contadores"][chave] += valor
+        for chave, (contagens, soma, quantidade) in instantaneo["histogramas"].items():
+            anterior = total["histogramas"].get(chave)
+            if anterior:
+                contagens = [a + b for a, b in zip(anterior[0], contagens)]
+                soma += anterior[1]
+                quantidade += anterior[2]
+            total["histogramas"][chave] = (contagens, soma, quantidade)
+    return total
+
+
+def exportar(instantaneo):
+    """Texto no formato de exposição do Prometheus (text/plain; version=0.0.4)."""
+    contadores = instantaneo["contadores"]
+    histogramas = instantaneo["histogramas"]
+    ajuda = instantaneo["ajuda"]
+    buckets = instantaneo["buckets"]
+
+    linhas = []
+    for nome in sorted(ajuda):
+        tipo, texto = ajuda[nome]
+        linhas.append(f"# HELP {nome} {texto}")
+        linhas.append(f"# TYPE {nome} {tipo}")
+        if tipo == "counter":
+            for (n, rotulos), valor in sorted(contadores.items()):
+                if n == nome:
+                    linhas.append(f"{nome}{_rotulos(rotulos)} {_numero(valor)}")
+            continue
+        for (n, rotulos), (contagens, soma, total) in sorted(histogramas.items()):
+            if n != nome:
+                continue
+            for limite, contagem in zip(buckets[nome], contagens):
+                linhas.append(f"{nome}_bucket{_rotulos(rotulos + (('le', _numero(limite)),))} {contagem}")
+            linhas.append(f"{nome}_bucket{_rotulos(rotulos + (('le', '+Inf'),))} {total}")
+            linhas.append(f"{nome}_sum{_rotulos(rotulos)} {_numero(soma)}")
+            linhas.append(f"{nome}_count{_rotulos(rotulos)} {total}")
+    return "\n".join(linhas) + "\n"
+
+
+def _rotulos(rotulos):
+    if not rotulos:
+        return ""
+    pares = ",".join(
+        f'{chave}="{str(valor).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for chave, valor in rotulos
+    )
+    return "{" + pares + "}"
+
+
+def _numero(valor):
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+registro = Registro()
+
+
+def registrar_requisicao(medicao, duracao, view, rota, metodo, status):
+    """Agrega uma requisição encerrada no registro."""
+    classe = f"{status // 100}xx"
+    registro.incrementar(
+        "http_requisicoes_total", "Requisições atendidas.", view=view, rota=rota, metodo=metodo, status=classe,
+    )
+    registro.observar(
+        "http_requisicao_segundos", "Tempo total da requisição.", duracao, BUCKETS_SEGUNDOS,
+        view=view, rota=rota, metodo=metodo,
+    )
+    registro.observar(
+        "http_db_consultas", "Consultas SQL por requisição.", medicao.consultas, BUCKETS_CONSULTAS,
+        view=view, rota=rota,
+    )
+    registro.incrementar(
+        "http_db_segundos_total", "Tempo em consultas SQL.", medicao.tempo_db, view=view, rota=rota,
+    )
+    registro.incrementar(
+        "http_aplicacao_segundos_total",
+        "Tempo fora do banco e do HTTP externo (serialização, renderização e a view).",
+        medicao.tempo_aplicacao(duracao), view=view, rota=rota,
+    )
+    if medicao.repetidas():
+        registro.incrementar(
+            "http_consultas_repetidas_total", "Requisições com consulta repetida (suspeita de N+1).",
+            view=view, rota=rota,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Pontos de medição
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def medir_http(servico):
+    """Mede uma chamada HTTP externa (servico: "mercadopago", "cpfcnpj", "sendgrid")."""
+    if not _ativo:
+        yield
+        return
+
+    resultado = "erro"
+    inicio = time.perf_counter()
+    try:
+        yield
+        resultado = "ok"
+    finally:
+        duracao = time.perf_counter() - inicio
+        medicao = _atual.get()
+        if medicao is not None:
+            medicao.tempo_http[servico] += duracao
+        registro.incrementar(
+            "http_externo_chamadas_total", "Chamadas HTTP externas.", servico=servico, resultado=resultado,
+        )
+        registro.observar(
+            "http_externo_segundos", "Duração das chamadas HTTP externas.", duracao, BUCKETS_SEGUNDOS,
+            servico=servico,
+        )
+
+
+def registrar_evento_http(servico, evento):
+    """Conta um evento dos clientes externos (services/http.py): "retentativa", "circuito_aberto"."""
+    if _ativo:
+        registro.incrementar(
+            "http_externo_eventos_total", "Retentativas e aberturas de circuito dos clientes externos.",
+            servico=servico, evento=evento,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Compartilhamento entre processos (cache)
+# ---------------------------------------------------------------------------
+
+PREFIXO_VAGA = "monitoramento:metricas:"
+
+_vaga = None
+
+
+def _processo():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _chaves_vagas():
+    return [f"{PREFIXO_VAGA}{vaga}" for vaga in range(getattr(settings, "METRICAS_MAX_PROCESSOS", 32))]
+
+
+def publicar():
+    """
+    Grava o instantâneo deste processo na sua vaga do cache. A vaga é tomada
+    com cache.add (atômico no Redis) e expira em METRICAS_VALIDADE se o
+    processo parar de publicar, ficando livre para outro.
+    """
+    global _vaga
+    instantaneo = registro.instantaneo()
+    if not instantaneo["ajuda"]:
+        return
+    processo = _processo()
+    valor = (processo, instantaneo)
+    validade = getattr(settings, "METRICAS_VALIDADE", 60)
+    chaves = _chaves_vagas()
+
+    if _vaga is not None:
+        atual = cache.get(_vaga)
+        if atual is not None and atual[0] == processo:
+            cache.set(_vaga, valor, validade)
+            return
+        # Vaga expirou (e talvez já seja de outro processo): procura outra
+        _vaga = None
+    for chave in chaves:
+        if cache.add(chave, valor, validade):
+            _vaga = chave
+            return
+    logger.warning("Sem vaga livre para as métricas de %s (METRICAS_MAX_PROCESSOS=%s).", processo, len(chaves))
+
+
+def instantaneo_agregado():
+    """Registro deste processo somado aos publicados pelos demais processos."""
+    processo = _processo()
+    outros = [
+        instantaneo
+        for dono, instantaneo in cache.get_many(_chaves_vagas()).values()
+        if dono != processo
+    ]
+    return juntar([registro.instantaneo(), *outros])
+
+
+def _publicar_periodicamente(intervalo):
+    while True:
+        time.sleep(intervalo)
+        try:
+            publicar()
+        except Exception:
+            logger.exception("Falha ao publicar as métricas do processo.")
+
+
+def _publicar_ao_sair():
+    try:
+        publicar()
+    except Exception:
+        pass
+
+
+def instalar():
+    """
+    Liga a instrumentação no processo (chamado no ready() quando
+    INSTRUMENTACAO_ATIVA) e inicia a publicação periódica do registro.
+    """
+    global _ativo
+    if _ativo:
+        return
+    _ativo = True
+    threading.Thread(
+        target=_publicar_periodicamente,
+        args=(getattr(settings, "METRICAS_PUBLICACAO", 15),),
+        name="publicar-metricas",
+        daemon=True,
+    ).start()
+    atexit.register(_publicar_ao_sair)
+
+
+def ativo():
+    return _ativo
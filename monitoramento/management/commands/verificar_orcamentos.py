@@ -0,0 +1,153 @@
+import json
+import statistics
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from habilidades.cache import invalidar_taxonomia
+from monitoramento.dados import semear
+from monitoramento.orcamentos import ENDPOINTS, SEM_ORCAMENTO, rotas_sem_orcamento
+from usuarios.models import Usuario
+from usuarios.token_serializer import CustomTokenObtainPairSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Semeia uma massa realista (monitoramento/dados.py), chama cada endpoint GET "
+        "com o JWT do perfil e compara consultas SQL e latência com os orçamentos de "
+        "monitoramento/orcamentos.py. Grava um relatório JSON e falha se algum "
+        "orçamento estourar ou se alguma rota do router ficar sem orçamento. "
+        "Tudo roda dentro de uma transação desfeita ao final; use um banco de "
+        "desenvolvimento/CI."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--escala", type=float, default=1.0,
+            help="Multiplicador das quantidades da massa (padrão: 1.0, ~2 mil usuários).",
+        )
+        parser.add_argument(
+            "--repeticoes", type=int, default=5,
+            help="Chamadas por endpoint; a primeira aquece os caches (padrão: 5).",
+        )
+        parser.add_argument(
+            "--saida", default="relatorio_orcamentos.json",
+            help="Arquivo do relatório JSON (padrão: relatorio_orcamentos.json).",
+        )
+
+    def handle(self, *args, **options):
+        repeticoes = max(2, options["repeticoes"])
+
+        descobertas = rotas_sem_orcamento()
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            with transaction.atomic():
+                inicio = time.perf_counter()
+                cenario = semear(options["escala"])
+                semeadura = time.perf_counter() - inicio
+                self.stdout.write(
+                    f"Massa criada em {semeadura:.1f}s: "
+                    + ", ".join(f"{n} {k}" for k, n in cenario["totais"].items())
+                )
+
+                clientes = self._clientes(cenario)
+                resultados = [self._medir(endpoint, cenario, clientes, repeticoes) for endpoint in ENDPOINTS]
+
+                transaction.set_rollback(True)
+        # A massa foi desfeita: descarta a taxonomia em cache que a incluía
+        invalidar_taxonomia()
+
+        falhas = [r for r in resultados if not r["ok"]]
+        relatorio = {
+            "escala": options["escala"],
+            "repeticoes": repeticoes,
+            "totais": cenario["totais"],
+            "endpoints": resultados,
+            "sem_orcamento": descobertas,
+            "ignorados": SEM_ORCAMENTO,
+            "falhas": len(falhas) + len(descobertas),
+        }
+        with open(options["saida"], "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+
+        self._imprimir(resultados)
+        self.stdout.write(f"Relatório: {options['saida']}")
+
+        erros = [f"{r['nome']}: {'; '.join(r['problemas'])}" for r in falhas]
+        erros += [f"rota {nome} sem orçamento em monitoramento/orcamentos.py" for nome in descobertas]
+        if erros:
+            raise CommandError("Orçamentos estourados:\n" + "\n".join(erros))
+        self.stdout.write(self.style.SUCCESS(f"{len(resultados)} endpoints dentro do orçamento."))
+
+    # Helpers
+    def _clientes(self, cenario):
+        clientes = {}
+        for perfil in ("contratante", "freelancer", "admin"):
+            usuario = Usuario.objects.get(pk=cenario[perfil])
+            token = CustomTokenObtainPairSerializer.get_token(usuario).access_token
+            cliente = APIClient()
+            cliente.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+            clientes[perfil] = cliente
+        return clientes
+
+    def _medir(self, endpoint, cenario, clientes, repeticoes):
+        url = endpoint.url(cenario)
+        cliente = clientes[endpoint.perfil]
+        chamadas = []
+        for _ in range(repeticoes):
+            with CaptureQueriesContext(connection) as capturadas:
+                inicio = time.perf_counter()
+                resposta = cliente.get(url, secure=True)
+                duracao = (time.perf_counter() - inicio) * 1000
+            chamadas.append((resposta.status_code, duracao, [q["sql"] for q in capturadas.captured_queries]))
+
+        status = chamadas[-1][0]
+        quentes = chamadas[1:]
+        consultas = max(len(sqls) for _, _, sqls in quentes)
+        mediana = statistics.median(d for _, d, _ in quentes)
+        repetidas = Counter(chamadas[-1][2]).most_common(1)
+
+        problemas = []
+        if status != 200:
+            problemas.append(f"status {status}")
+        if consultas > endpoint.consultas:
+            problemas.append(f"{consultas} consultas (orçamento {endpoint.consultas})")
+        if mediana > endpoint.ms:
+            problemas.append(f"{mediana:.0f} ms (orçamento {endpoint.ms})")
+
+        return {
+            "nome": endpoint.nome,
+            "url": url,
+            "perfil": endpoint.perfil,
+            "status": status,
+            "consultas": consultas,
+            "consultas_frias": len(chamadas[0][2]),
+            "orcamento_consultas": endpoint.consultas,
+            "ms_mediana": round(mediana, 1),
+            "ms_max": round(max(d for _, d, _ in quentes), 1),
+            "orcamento_ms": endpoint.ms,
+            # Mesma SQL repetida numa requisição costuma ser N+1
+            "sql_mais_repetida": (
+                {"vezes": repetidas[0][1], "sql": repetidas[0][0][:300]}
+                if repetidas and repetidas[0][1] > 1 else None
+            ),
+            "ok": not problemas,
+            "problemas": problemas,
+        }
+
+    def _imprimir(self, resultados):
+        self.stdout.write(
+            f"{'endpoint':<62} | {'status':>6} | {'consultas':>9} | {'orç.':>4} | {'ms':>7} | {'orç.':>5}"
+        )
+        self.stdout.write("-" * 110)
+        for r in resultados:
+            linha = (
+                f"{r['nome'][:62]:<62} | {r['status']:>6} | {r['consultas']:>9} | "
+                f"{r['orcamento_consultas']:>4} | {r['ms_mediana']:>7.1f} | {r['orcamento_ms']:>5}"
+            )
+            self.stdout.write(linha if r["ok"] else self.style.ERROR(linha))
+
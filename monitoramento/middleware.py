@@ -0,0 +1,96 @@
+import json
+import logging
+import random
+import re
+import time
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from . import instrumentacao
+
+logger = logging.getLogger("monitoramento")
+
+# X-Request-ID vindo do proxy só é reaproveitado se tiver formato seguro para log
+_REQUEST_ID_VALIDO = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class InstrumentacaoMiddleware:
+    """
+    Mede cada requisição (tempo, consultas SQL, HTTP externo e o restante
+    na aplicação),
+    agrega por view/rota para /metrics e registra no logger "monitoramento"
+    as requisições lentas (acima de INSTRUMENTACAO_LENTA_MS) e uma amostra
+    das demais (INSTRUMENTACAO_AMOSTRA).
+
+    Fica fora da pilha quando INSTRUMENTACAO_ATIVA é falso.
+    Toda resposta leva o X-Request-ID (recebido do proxy ou gerado aqui).
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "INSTRUMENTACAO_ATIVA", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.lenta = getattr(settings, "INSTRUMENTACAO_LENTA_MS", 1000) / 1000
+        self.amostra = getattr(settings, "INSTRUMENTACAO_AMOSTRA", 0.0)
+
+    def __call__(self, request):
+        request_id = request.headers.get("X-Request-ID", "")
+        if not _REQUEST_ID_VALIDO.match(request_id):
+            request_id = uuid.uuid4().hex
+        request.request_id = request_id
+
+        medicao, token = instrumentacao.iniciar_medicao()
+        try:
+            with connection.execute_wrapper(self._medir_consulta(medicao)):
+                response = self.get_response(request)
+        finally:
+            instrumentacao.encerrar_medicao(token)
+        duracao = time.perf_counter() - medicao.inicio
+
+        response["X-Request-ID"] = request_id
+        self._registrar(request, response, medicao, duracao)
+        return response
+
+    # Helpers
+    def _medir_consulta(self, medicao):
+        def wrapper(execute, sql, params, many, context):
+            inicio = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                medicao.registrar_consulta(sql, time.perf_counter() - inicio)
+        return wrapper
+
+    def _registrar(self, request, response, medicao, duracao):
+        match = getattr(request, "resolver_match", None)
+        view = match._func_path if match else "nao_resolvida"
+        rota = (match.view_name or match.route) if match else ""
+
+        instrumentacao.registrar_requisicao(medicao, duracao, view, rota, request.method, response.status_code)
+
+        lenta = duracao >= self.lenta
+        if not lenta and random.random() >= self.amostra:
+            return
+
+        registro = {
+            "request_id": request.request_id,
+            "metodo": request.method,
+            "caminho": request.path,
+            "view": view,
+            "rota": rota,
+            "status": response.status_code,
+            "ms": round(duracao * 1000, 1),
+            "consultas": medicao.consultas,
+            "db_ms": round(medicao.tempo_db * 1000, 1),
+            "aplicacao_ms": round(medicao.tempo_aplicacao(duracao) * 1000, 1),
+            "http_ms": {servico: round(t * 1000, 1) for servico, t in medicao.tempo_http.items()},
+            "repetidas": [{"vezes": n, "sql": sql[:300]} for sql, n in medicao.repetidas()[:5]],
+        }
+        logger.log(
+            logging.WARNING if lenta else logging.INFO,
+            "%s %s", "requisicao_lenta" if lenta else "requisicao_amostrada",
+            json.dumps(registro, ensure_ascii=False),
+        )
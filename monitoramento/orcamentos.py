@@ -0,0 +1,116 @@
+"""
+Orçamentos de consultas SQL e latência por endpoint (comando verificar_orcamentos).
+
+Cada Endpoint é um GET feito com o JWT do perfil indicado sobre a massa de
+monitoramento/dados.py; {chave} no caminho vem do dict devolvido por semear().
+`consultas` é o máximo de consultas com caches quentes (da segunda chamada em
+diante), contando a que carrega o usuário autenticado, e `ms` o máximo da
+mediana de latência. Os orçamentos não dependem do volume: uma listagem
+paginada cujas consultas crescem com a página é N+1.
+
+Toda rota GET registrada no router (freelancer/urls.py) precisa de um Endpoint
+aqui ou de uma justificativa em SEM_ORCAMENTO; o comando e monitoramento/tests.py
+falham se faltar.
+"""
+
+# Latência padrão (ms) — folgada para rodar em SQLite/CI; o que pega regressão são as consultas
+LATENCIA_PADRAO = 500
+
+
+class Endpoint:
+    def __init__(self, caminho, perfil, consultas, ms=LATENCIA_PADRAO, nome=None):
+        self.caminho = caminho
+        self.perfil = perfil  # "contratante", "freelancer" ou "admin"
+        self.consultas = consultas
+        self.ms = ms
+        self.nome = nome or f"{perfil} {caminho}"
+
+    def url(self, cenario):
+        return self.caminho.format(**cenario)
+
+
+ENDPOINTS = [
+    # Usuários
+    Endpoint("/api/usuarios/me/", "freelancer", 3),
+    Endpoint("/api/usuarios/", "contratante", 5),
+    Endpoint("/api/usuarios/", "admin", 5),
+    Endpoint("/api/usuarios/{freelancer}/", "contratante", 4),
+    Endpoint("/api/usuarios/{freelancer}/perfil_publico/", "contratante", 5),
+    Endpoint("/api/usuarios/{freelancer}/avaliacoes_publicas/", "contratante", 3),
+    Endpoint("/api/usuarios/{freelancer}/metricas_performance/", "contratante", 2),
+    Endpoint("/api/usuarios/{freelancer}/dados_publicos/", "contratante", 2),
+    Endpoint("/api/usuarios/buscar_freelancers/?q=freelancer", "contratante", 7),
+    Endpoint("/api/usuarios/me/resumo/", "freelancer", 1),
+
+    # Trabalhos e taxonomia
+    Endpoint("/api/trabalhos/", "freelancer", 3),
+    Endpoint("/api/trabalhos/?busca=sistema+web", "freelancer", 4),
+    Endpoint("/api/trabalhos/", "contratante", 3),
+    Endpoint("/api/trabalhos/{trabalho}/", "contratante", 5),
+    Endpoint("/api/trabalhos/para-mim/", "freelancer", 4),
+    Endpoint("/api/trabalhos/{trabalho_aberto}/recomendados/", "admin", 4),
+    Endpoint("/api/habilidades/", "freelancer", 1),
+    Endpoint("/api/habilidades/{habilidade}/", "freelancer", 2),
+    Endpoint("/api/ramos/", "freelancer", 1),
+    Endpoint("/api/ramos/{ramo}/", "freelancer", 2),
+
+    # Propostas, contratos e pagamentos
+    Endpoint("/api/propostas/", "freelancer", 3),
+    Endpoint("/api/propostas/", "contratante", 3),
+    Endpoint("/api/propostas/{proposta}/", "freelancer", 2),
+    Endpoint("/api/contratos/", "contratante", 4),
+    Endpoint("/api/contratos/", "freelancer", 4),
+    Endpoint("/api/contratos/{contrato}/", "contratante", 9),
+    Endpoint("/api/pagamentos/", "contratante", 5),
+    Endpoint("/api/pagamentos/{pagamento}/", "contratante", 4),
+    Endpoint("/api/pagamentos/{pagamento}/status/", "contratante", 4),
+    Endpoint("/api/pagamentos/{pagamento}/status/?payment_id={pagamento_mp}", "contratante", 4),
+    Endpoint("/api/pagamentos/consultar-status-mp/?payment_id={pagamento_mp}", "contratante", 4),
+
+    # Avaliações, mensagens, denúncias e notificações
+    Endpoint("/api/avaliacoes/", "freelancer", 3),
+    Endpoint("/api/avaliacoes/{avaliacao}/", "freelancer", 2),
+    Endpoint("/api/avaliacoes/feitas/", "contratante", 2),
+    Endpoint("/api/avaliacoes/recebidas/", "freelancer", 2),
+    Endpoint("/api/mensagens/", "freelancer", 3),
+    Endpoint("/api/mensagens/{mensagem}/", "freelancer", 2),
+    Endpoint("/api/mensagens/conversa/?contrato={contrato}", "freelancer", 3),
+    Endpoint("/api/denuncias/", "contratante", 8),
+    Endpoint("/api/denuncias/{denuncia}/", "contratante", 7),
+    Endpoint("/api/notificacoes/", "contratante", 6),
+    Endpoint("/api/notificacoes/{notificacao}/", "contratante", 2),
+
+    # Punições (admin)
+    Endpoint("/api/punicoes/historico/", "admin", 2),
+    Endpoint("/api/punicoes/historico/{freelancer}/", "admin", 2),
+]
+
+# Rotas GET do router fora do teste, por nome da rota
+SEM_ORCAMENTO = {}
+
+
+def rotas_sem_orcamento():
+    """Nomes das rotas GET do router sem Endpoint nem justificativa."""
+    from django.urls import resolve
+
+    from freelancer.urls import router
+
+    cobertas = {resolve(e.caminho.split("?")[0].format_map(_Qualquer())).url_name for e in ENDPOINTS}
+    faltando = []
+    for _, viewset, basename in router.registry:
+        for rota in router.get_routes(viewset):
+            # mapping de @action é um MethodMapper, cujo .get() é decorador
+            acao = dict.get(rota.mapping, "get")
+            if not acao or not hasattr(viewset, acao):
+                continue
+            nome = rota.name.format(basename=basename)
+            if nome not in cobertas and nome not in SEM_ORCAMENTO:
+                faltando.append(nome)
+    return sorted(faltando)
+
+
+class _Qualquer(dict):
+    """format_map que troca qualquer {chave} por 1 (só para resolver o nome da rota)."""
+
+    def __missing__(self, chave):
+        return 1
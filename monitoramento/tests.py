@@ -0,0 +1,125 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APITestCase
+
+from habilidades.cache import invalidar_taxonomia
+from monitoramento import instrumentacao
+from monitoramento.dados import semear
+from monitoramento.instrumentacao import BUCKETS_SEGUNDOS, Registro, publicar, registro
+from monitoramento.orcamentos import ENDPOINTS, rotas_sem_orcamento
+from usuarios.models import Usuario
+from usuarios.token_serializer import CustomTokenObtainPairSerializer
+
+# Massa pequena: os orçamentos não dependem do volume, só precisam de mais de um
+# item por página para que um N+1 apareça nas consultas
+ESCALA = 0.05
+
+
+class OrcamentosConsultasTests(APITestCase):
+    """
+    Orçamentos de consultas de monitoramento/orcamentos.py no `manage.py test`
+    (o comando verificar_orcamentos mede também a latência, numa massa maior).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cenario = semear(ESCALA)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        # A massa foi desfeita: descarta a taxonomia em cache que a incluía
+        invalidar_taxonomia()
+
+    def _cliente(self, perfil):
+        usuario = Usuario.objects.get(pk=self.cenario[perfil])
+        cliente = APIClient()
+        cliente.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {CustomTokenObtainPairSerializer.get_token(usuario).access_token}"
+        )
+        return cliente
+
+    def test_consultas_dentro_do_orcamento(self):
+        clientes = {perfil: self._cliente(perfil) for perfil in ("contratante", "freelancer", "admin")}
+        for endpoint in ENDPOINTS:
+            with self.subTest(endpoint.nome):
+                cliente = clientes[endpoint.perfil]
+                url = endpoint.url(self.cenario)
+                # A primeira chamada aquece os caches; o orçamento vale para as seguintes
+                cliente.get(url, secure=True)
+                with CaptureQueriesContext(connection) as consultas:
+                    resposta = cliente.get(url, secure=True)
+
+                self.assertEqual(resposta.status_code, 200, url)
+                self.assertLessEqual(
+                    len(consultas), endpoint.consultas,
+                    "\n".join(q["sql"] for q in consultas.captured_queries),
+                )
+
+    def test_toda_rota_get_do_router_tem_orcamento(self):
+        self.assertEqual(rotas_sem_orcamento(), [])
+
+
+@override_settings(INSTRUMENTACAO_ATIVA=True, METRICAS_TOKEN="token-metricas", METRICAS_MAX_PROCESSOS=4)
+class MetricasEntreProcessosTests(TestCase):
+    """/metrics soma o registro do web com os publicados no cache pelos outros processos."""
+
+    def setUp(self):
+        self._limpar()
+        self.addCleanup(self._limpar)
+
+    def _limpar(self):
+        registro.limpar()
+        instrumentacao._vaga = None
+        cache.delete_many(instrumentacao._chaves_vagas())
+
+    def _publicar_como(self, processo, vaga, chamadas):
+        """Instantâneo de outro processo (ex.: o worker enviando e-mails)."""
+        outro = Registro()
+        outro.incrementar(
+            "http_externo_chamadas_total", "Chamadas HTTP externas.", chamadas, servico="sendgrid", resultado="ok",
+        )
+        outro.observar("http_externo_segundos", "Duração.", 0.2, BUCKETS_SEGUNDOS, servico="sendgrid")
+        cache.set(f"{instrumentacao.PREFIXO_VAGA}{vaga}", (processo, outro.instantaneo()), 60)
+
+    def _metricas(self):
+        resposta = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer token-metricas", secure=True)
+        self.assertEqual(resposta.status_code, 200)
+        return resposta.content.decode()
+
+    def test_soma_os_processos(self):
+        registro.incrementar(
+            "http_externo_chamadas_total", "Chamadas HTTP externas.", servico="sendgrid", resultado="ok",
+        )
+        self._publicar_como("worker:1", 0, 2)
+        self._publicar_como("worker:2", 3, 4)
+
+        texto = self._metricas()
+        self.assertIn('http_externo_chamadas_total{resultado="ok",servico="sendgrid"} 7', texto)
+        self.assertIn('http_externo_segundos_count{servico="sendgrid"} 2', texto)
+
+    def test_publicacao_ocupa_uma_vaga_livre_e_nao_conta_duas_vezes(self):
+        self._publicar_como("worker:1", 0, 2)
+        registro.incrementar(
+            "http_externo_chamadas_total", "Chamadas HTTP externas.", servico="sendgrid", resultado="ok",
+        )
+
+        publicar()
+        publicar()
+
+        self.assertEqual(instrumentacao._vaga, f"{instrumentacao.PREFIXO_VAGA}1")
+        self.assertIsNone(cache.get(f"{instrumentacao.PREFIXO_VAGA}2"))
+        self.assertIn('http_externo_chamadas_total{resultado="ok",servico="sendgrid"} 3', self._metricas())
+
+    def test_vaga_expirada_e_tomada_por_outro(self):
+        registro.incrementar("fila_total", "Tarefas.")
+        publicar()
+        vaga = instrumentacao._vaga
+        self._publicar_como("worker:1", vaga.removeprefix(instrumentacao.PREFIXO_VAGA), 1)
+
+        publicar()
+
+        self.assertNotEqual(instrumentacao._vaga, vaga)
+        self.assertEqual(cache.get(vaga)[0], "worker:1")
@@ -0,0 +1,31 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from .instrumentacao import exportar, instantaneo_agregado
+
+
+def metricas(request):
+    """
+    Métricas de todos os processos (este e os que publicaram no cache) no
+    formato do Prometheus (GET /metrics).
+
+    Só existe com INSTRUMENTACAO_ATIVA. Com METRICAS_TOKEN definido, exige
+    "Authorization: Bearer <token>"; sem token, só responde em DEBUG.
+    """
+    if not settings.INSTRUMENTACAO_ATIVA:
+        raise Http404
+
+    token = settings.METRICAS_TOKEN
+    if token:
+        recebido = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        # Em bytes: compare_digest recusa str com caracteres fora do ASCII (TypeError -> 500)
+        if not hmac.compare_digest(recebido.encode(), token.encode()):
+            return HttpResponse(status=401)
+    elif not settings.DEBUG:
+        raise Http404
+
+    return HttpResponse(
+        exportar(instantaneo_agregado()), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,3 +1,11 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import NotificacaoBroadcast
+
+
+@admin.register(NotificacaoBroadcast)
+class NotificacaoBroadcastAdmin(admin.ModelAdmin):
+    list_display = ("id", "publico", "mensagem", "ramo", "habilidade", "data_criacao")
+    list_filter = ("publico",)
+    search_fields = ("mensagem",)
+    ordering = ("-data_criacao",)
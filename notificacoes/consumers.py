@@ -0,0 +1,45 @@
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+
+def grupo_usuario(usuario_id):
+    """Grupo com as conexões de um usuário (notificações pessoais)."""
+    return f"notificacoes_usuario_{usuario_id}"
+
+
+def grupo_publico(publico):
+    """Grupo de um público de broadcast ("todos", "freelancers", "contratantes")."""
+    return f"notificacoes_publico_{publico}"
+
+
+def _grupo_publico_do_tipo(tipo):
+    return grupo_publico({"freelancer": "freelancers", "contratante": "contratantes"}.get(tipo, "todos"))
+
+
+class NotificacaoConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Stream de notificações do usuário autenticado: ws/notificacoes/
+    Recebe as notificações pessoais e os broadcasts do seu público.
+    """
+
+    async def connect(self):
+        user = self.scope.get("user")
+        if not (user and user.is_authenticated):
+            await self.close(code=4401)
+            return
+
+        self.grupos = {
+            grupo_usuario(user.id),
+            grupo_publico("todos"),
+            _grupo_publico_do_tipo(user.tipo),
+        }
+        for grupo in self.grupos:
+            await self.channel_layer.group_add(grupo, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        for grupo in getattr(self, "grupos", ()):
+            await self.channel_layer.group_discard(grupo, self.channel_name)
+
+    async def notificacao_evento(self, event):
+        """Handler de "notificacao.evento"."""
+        await self.send_json(event["dados"])
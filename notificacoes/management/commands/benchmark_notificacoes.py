@@ -0,0 +1,104 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from notificacoes.models import Notificacao
+from notificacoes.utils import (
+    TAMANHO_LOTE_NOTIFICACOES,
+    enviar_notificacao,
+    enviar_notificacoes_em_massa,
+)
+from usuarios.models import Usuario
+
+
+class _ContadorConsultas:
+    """Conta as consultas SQL executadas na conexão (sem guardar o SQL)."""
+
+    def __init__(self):
+        self.total = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.total += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara o envio de notificações linha a linha com o envio em massa "
+        "(bulk_create em lotes) para N freelancers. Tudo roda dentro de uma "
+        "transação desfeita ao final: nenhum dado permanece no banco."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tamanhos", nargs="+", type=int, default=[1000, 10000, 100000],
+            help="Quantidades de freelancers a simular (padrão: 1000 10000 100000).",
+        )
+        parser.add_argument(
+            "--tamanho-lote", type=int, default=TAMANHO_LOTE_NOTIFICACOES,
+            help="Tamanho do lote usado no envio em massa.",
+        )
+        parser.add_argument(
+            "--sem-individual", action="store_true",
+            help="Pula a medição linha a linha (útil para tamanhos muito grandes).",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'freelancers':>12} | {'modo':<10} | {'tempo (s)':>10} | {'consultas':>10}")
+        self.stdout.write("-" * 52)
+
+        for tamanho in options["tamanhos"]:
+            with transaction.atomic():
+                ids = self._criar_freelancers(tamanho)
+                mensagem = "Novo trabalho publicado: 'Benchmark'."
+
+                if not options["sem_individual"]:
+                    usuarios = [Usuario(id=usuario_id) for usuario_id in ids]
+                    tempo, consultas = self._medir(
+                        lambda: [enviar_notificacao(usuario=u, mensagem=mensagem, link="/trabalhos") for u in usuarios]
+                    )
+                    self._linha(tamanho, "individual", tempo, consultas)
+                    Notificacao.objects.filter(usuario_id__in=ids).delete()
+
+                tempo, consultas = self._medir(
+                    lambda: enviar_notificacoes_em_massa(
+                        iter(ids), mensagem, link="/trabalhos", tamanho_lote=options["tamanho_lote"]
+                    )
+                )
+                self._linha(tamanho, "em massa", tempo, consultas)
+
+                transaction.set_rollback(True)
+
+    # Helpers
+    def _criar_freelancers(self, tamanho):
+        marcador = time.time_ns()
+        Usuario.objects.bulk_create(
+            [
+                Usuario(
+                    email=f"benchmark-{marcador}-{i}@exemplo.com",
+                    nome=f"Freelancer {i}",
+                    tipo="freelancer",
+                    telefone="0",
+                    password="!",
+                )
+                for i in range(tamanho)
+            ],
+            batch_size=1000,
+        )
+        return list(
+            Usuario.objects
+            .filter(email__startswith=f"benchmark-{marcador}-")
+            .values_list("id", flat=True)
+        )
+
+    def _medir(self, funcao):
+        contador = _ContadorConsultas()
+        with connection.execute_wrapper(contador):
+            inicio = time.perf_counter()
+            funcao()
+            duracao = time.perf_counter() - inicio
+        return duracao, contador.total
+
+    def _linha(self, tamanho, modo, tempo, consultas):
+        self.stdout.write(f"{tamanho:>12} | {modo:<10} | {tempo:>10.3f} | {consultas:>10}")
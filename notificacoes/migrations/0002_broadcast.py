@@ -0,0 +1,46 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habilidades', '0002_ramo_alter_habilidade_options'),
+        ('notificacoes', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CursorNotificacoes',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lidas_ate', models.DateTimeField(blank=True, null=True)),
+                ('usuario', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='cursor_notificacoes', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Cursor de notificações',
+                'verbose_name_plural': 'Cursores de notificações',
+            },
+        ),
+        migrations.CreateModel(
+            name='NotificacaoBroadcast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('publico', models.CharField(choices=[('todos', 'Todos os usuários'), ('freelancers', 'Freelancers'), ('contratantes', 'Contratantes')], default='freelancers', max_length=20)),
+                ('mensagem', models.CharField(max_length=255)),
+                ('link', models.CharField(blank=True, max_length=255, null=True)),
+                ('data_criacao', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('habilidade', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notificacoes_broadcast', to='habilidades.habilidade')),
+                ('ramo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notificacoes_broadcast', to='habilidades.ramo')),
+            ],
+            options={
+                'verbose_name': 'Notificação em massa',
+                'verbose_name_plural': 'Notificações em massa',
+                'ordering': ['-data_criacao'],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.1.7 on 2026-10-17 13:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def criar_cursores(apps, schema_editor):
+    """
+    Usuários sem cursor viam todo broadcast antigo como não lido. Começam a
+    partir do último login (o que chegou depois dele continua não lido).
+    """
+    Usuario = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    CursorNotificacoes = apps.get_model("notificacoes", "CursorNotificacoes")
+    agora = timezone.now()
+    sem_cursor = Usuario.objects.filter(cursor_notificacoes__isnull=True).values_list("id", "last_login")
+    CursorNotificacoes.objects.bulk_create(
+        [
+            CursorNotificacoes(usuario_id=usuario_id, lidas_ate=last_login or agora)
+            for usuario_id, last_login in sem_cursor.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notificacoes', '0002_broadcast'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BroadcastLido',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lido_em', models.DateTimeField(auto_now_add=True)),
+                ('broadcast', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leituras', to='notificacoes.notificacaobroadcast')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='broadcasts_lidos', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Broadcast lido',
+                'verbose_name_plural': 'Broadcasts lidos',
+                'constraints': [models.UniqueConstraint(fields=('usuario', 'broadcast'), name='broadcast_lido_unico')],
+            },
+        ),
+        migrations.RunPython(criar_cursores, migrations.RunPython.noop),
+    ]
@@ -19,3 +19,99 @@ class Notificacao(models.Model):
 
     def __str__(self):
         return f"{self.usuario} - {self.mensagem[:40]}"
+
+
+class NotificacaoBroadcast(models.Model):
+    """
+    Notificação única destinada a um público inteiro (fan-out na leitura).
+    Em vez de gravar uma linha por destinatário, grava-se uma linha por anúncio;
+    a listagem de cada usuário junta as notificações pessoais com os broadcasts
+    do seu público. O estado de leitura fica em CursorNotificacoes.
+    """
+
+    PUBLICOS = (
+        ("todos", "Todos os usuários"),
+        ("freelancers", "Freelancers"),
+        ("contratantes", "Contratantes"),
+    )
+
+    publico = models.CharField(max_length=20, choices=PUBLICOS, default="freelancers")
+
+    # Segmentação opcional (apenas freelancers com histórico no ramo/habilidade)
+    ramo = models.ForeignKey(
+        "habilidades.Ramo",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="notificacoes_broadcast",
+    )
+    habilidade = models.ForeignKey(
+        "habilidades.Habilidade",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="notificacoes_broadcast",
+    )
+
+    mensagem = models.CharField(max_length=255)
+    link = models.CharField(max_length=255, blank=True, null=True)
+    data_criacao = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["-data_criacao"]
+        verbose_name = "Notificação em massa"
+        verbose_name_plural = "Notificações em massa"
+
+    def __str__(self):
+        return f"[{self.publico}] {self.mensagem[:40]}"
+
+
+class CursorNotificacoes(models.Model):
+    """
+    Cursor de leitura dos broadcasts de um usuário:
+    todo broadcast criado até `lidas_ate` é considerado lido. Criado no
+    cadastro (notificacoes/signals.py), então anúncios anteriores à conta
+    não aparecem como não lidos.
+    """
+    usuario = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="cursor_notificacoes"
+    )
+    lidas_ate = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Cursor de notificações"
+        verbose_name_plural = "Cursores de notificações"
+
+    def __str__(self):
+        return f"{self.usuario} - lidas até {self.lidas_ate}"
+
+
+class BroadcastLido(models.Model):
+    """
+    Broadcast lido individualmente acima do cursor (ex.: o usuário abriu um
+    anúncio e deixou outros mais antigos sem ler). Quando não resta nada não
+    lido antes dele, o cursor avança e estas linhas são descartadas.
+    """
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="broadcasts_lidos"
+    )
+    broadcast = models.ForeignKey(
+        NotificacaoBroadcast,
+        on_delete=models.CASCADE,
+        related_name="leituras"
+    )
+    lido_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["usuario", "broadcast"], name="broadcast_lido_unico"),
+        ]
+        verbose_name = "Broadcast lido"
+        verbose_name_plural = "Broadcasts lidos"
+
+    def __str__(self):
+        return f"{self.usuario} - {self.broadcast_id}"
@@ -1,8 +1,40 @@
 from rest_framework import serializers
-from .models import Notificacao
+from .models import Notificacao, NotificacaoBroadcast
 
 class NotificacaoSerializer(serializers.ModelSerializer):
+    tipo = serializers.SerializerMethodField()
+
     class Meta:
         model = Notificacao
-        fields = ["id", "mensagem", "link", "lida", "data_criacao"]
+        fields = ["id", "tipo", "mensagem", "link", "lida", "data_criacao"]
         read_only_fields = ["id", "mensagem", "link", "data_criacao"]
+
+    def get_tipo(self, obj):
+        return "pessoal"
+
+
+class NotificacaoBroadcastSerializer(serializers.ModelSerializer):
+    """
+    Broadcast no mesmo formato da notificação pessoal.
+    - id recebe o prefixo "b" para não colidir com as pessoais;
+    - lida é derivada do cursor do usuário (context["lidas_ate"]) ou das
+      leituras individuais acima dele (context["lidos"]).
+    """
+    id = serializers.SerializerMethodField()
+    tipo = serializers.SerializerMethodField()
+    lida = serializers.SerializerMethodField()
+
+    class Meta:
+        model = NotificacaoBroadcast
+        fields = ["id", "tipo", "mensagem", "link", "lida", "data_criacao"]
+        read_only_fields = fields
+
+    def get_id(self, obj):
+        return f"b{obj.id}"
+
+    def get_tipo(self, obj):
+        return "broadcast"
+
+    def get_lida(self, obj):
+        lidas_ate = self.context.get("lidas_ate")
+        return bool(lidas_ate and obj.data_criacao <= lidas_ate) or obj.id in self.context.get("lidos", ())
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from usuarios.models import Usuario
+
+from .models import CursorNotificacoes
+
+
+@receiver(post_save, sender=Usuario)
+def criar_cursor_notificacoes(sender, instance, created, raw=False, **kwargs):
+    """Conta nova começa com os broadcasts anteriores ao cadastro já lidos."""
+    if created and not raw:
+        CursorNotificacoes.objects.get_or_create(usuario=instance, defaults={"lidas_ate": timezone.now()})
@@ -1,4 +1,17 @@
-from .models import Notificacao
+import heapq
+from itertools import islice
+
+from django.db.models import Q
+from django.utils import timezone
+
+from freelancer.tempo_real import publicar
+
+from .models import BroadcastLido, Notificacao, NotificacaoBroadcast, CursorNotificacoes
+from .consumers import grupo_usuario, grupo_publico
+
+# Quantidade de notificações inseridas por INSERT no envio em massa
+TAMANHO_LOTE_NOTIFICACOES = 1000
+
 
 def enviar_notificacao(usuario, mensagem, link=None, commit=True):
     if usuario and mensagem:
@@ -9,4 +22,207 @@ def enviar_notificacao(usuario, mensagem, link=None, commit=True):
         )
         if commit:
             notificacao.save()
+            publicar_notificacao(notificacao)
         return notificacao
+
+
+def publicar_notificacao(notificacao):
+    """Envia a notificação pessoal às conexões WebSocket do usuário."""
+    from .serializers import NotificacaoSerializer
+
+    publicar(
+        grupo_usuario(notificacao.usuario_id),
+        "notificacao.evento",
+        {"evento": "nova", "notificacao": NotificacaoSerializer(notificacao).data},
+    )
+
+
+def enviar_notificacoes_em_massa(usuario_ids, mensagem, link=None, tamanho_lote=TAMANHO_LOTE_NOTIFICACOES):
+    """
+    Cria a mesma notificação para vários usuários com bulk_create em lotes.
+    - usuario_ids pode ser qualquer iterável de IDs (lista, generator ou
+      queryset.iterator()); é consumido em fatias, sem carregar tudo em memória.
+    - Cada lote vira um único INSERT, em vez de um INSERT por usuário.
+    Retorna o total de notificações criadas.
+    """
+    mensagem = (mensagem or "").strip()[:255]
+    if not mensagem:
+        return 0
+
+    link = link or ""
+    ids = iter(usuario_ids)
+    total = 0
+
+    while True:
+        lote = list(islice(ids, tamanho_lote))
+        if not lote:
+            break
+        Notificacao.objects.bulk_create(
+            [Notificacao(usuario_id=usuario_id, mensagem=mensagem, link=link) for usuario_id in lote],
+            batch_size=tamanho_lote,
+        )
+        total += len(lote)
+
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Broadcast (fan-out na leitura)
+# ---------------------------------------------------------------------------
+
+def enviar_broadcast(mensagem, link=None, publico="freelancers", ramo=None, habilidade=None):
+    """
+    Publica uma notificação para um público inteiro gravando UMA linha,
+    independente da quantidade de destinatários.
+    """
+    mensagem = (mensagem or "").strip()[:255]
+    if not mensagem:
+        return None
+    broadcast = NotificacaoBroadcast.objects.create(
+        mensagem=mensagem,
+        link=link or "",
+        publico=publico,
+        ramo=ramo,
+        habilidade=habilidade,
+    )
+
+    # Tempo real só para broadcasts sem segmentação; os segmentados
+    # aparecem na próxima listagem (o filtro depende do histórico do usuário).
+    if not (ramo or habilidade):
+        from .serializers import NotificacaoBroadcastSerializer
+
+        publicar(
+            grupo_publico(publico),
+            "notificacao.evento",
+            {"evento": "nova", "notificacao": NotificacaoBroadcastSerializer(broadcast).data},
+        )
+    return broadcast
+
+
+def broadcasts_do_usuario(usuario):
+    """
+    Broadcasts visíveis para o usuário.
+    - publico "todos" ou o do tipo do usuário;
+    - segmentação por ramo/habilidade vale só para freelancers e considera os
+      trabalhos em que ele já enviou proposta ou teve contrato.
+    """
+    from trabalhos.models import Trabalho
+
+    if usuario.tipo == "freelancer":
+        publicos = ["todos", "freelancers"]
+    elif usuario.tipo == "contratante":
+        publicos = ["todos", "contratantes"]
+    else:
+        publicos = ["todos"]
+
+    qs = NotificacaoBroadcast.objects.filter(publico__in=publicos)
+
+    if usuario.tipo == "freelancer":
+        trabalhos = Trabalho.objects.filter(
+            Q(propostas__freelancer=usuario) | Q(contratos__freelancer=usuario)
+        )
+        qs = qs.filter(
+            Q(ramo__isnull=True) | Q(ramo__in=trabalhos.values("ramo_id"))
+        ).filter(
+            Q(habilidade__isnull=True) | Q(habilidade__in=trabalhos.values("habilidades"))
+        )
+    else:
+        qs = qs.filter(ramo__isnull=True, habilidade__isnull=True)
+
+    return qs.order_by("-data_criacao", "-id")
+
+
+def cursor_do_usuario(usuario):
+    """Momento até o qual os broadcasts do usuário estão lidos (ou None)."""
+    return (
+        CursorNotificacoes.objects
+        .filter(usuario=usuario)
+        .values_list("lidas_ate", flat=True)
+        .first()
+    )
+
+
+def avancar_cursor(usuario, ate=None):
+    """
+    Marca como lidos os broadcasts criados até `ate` (padrão: agora).
+    O cursor nunca volta no tempo.
+    """
+    ate = ate or timezone.now()
+    cursor, criado = CursorNotificacoes.objects.get_or_create(
+        usuario=usuario, defaults={"lidas_ate": ate}
+    )
+    if not criado and (cursor.lidas_ate is None or cursor.lidas_ate < ate):
+        CursorNotificacoes.objects.filter(pk=cursor.pk).update(lidas_ate=ate)
+        cursor.lidas_ate = ate
+    # Leituras individuais abaixo do cursor já estão cobertas por ele
+    BroadcastLido.objects.filter(usuario=usuario, broadcast__data_criacao__lte=cursor.lidas_ate).delete()
+    return cursor.lidas_ate
+
+
+def lidos_acima_do_cursor(usuario, broadcast_ids):
+    """IDs, dentre broadcast_ids, lidos individualmente pelo usuário."""
+    if not broadcast_ids:
+        return set()
+    return set(
+        BroadcastLido.objects
+        .filter(usuario=usuario, broadcast_id__in=broadcast_ids)
+        .values_list("broadcast_id", flat=True)
+    )
+
+
+def marcar_broadcast_lido(usuario, broadcast):
+    """
+    Marca só este broadcast como lido. O cursor avança até ele apenas se
+    nenhum broadcast mais antigo do usuário continuar não lido; senão a
+    leitura fica registrada em BroadcastLido.
+    Retorna (lidas_ate, ids lidos acima do cursor).
+    """
+    lidas_ate = cursor_do_usuario(usuario)
+    if lidas_ate and broadcast.data_criacao <= lidas_ate:
+        return lidas_ate, set()
+
+    anteriores = broadcasts_do_usuario(usuario).filter(
+        data_criacao__lt=broadcast.data_criacao
+    ).exclude(leituras__usuario=usuario)
+    if lidas_ate:
+        anteriores = anteriores.filter(data_criacao__gt=lidas_ate)
+
+    if anteriores.exists():
+        BroadcastLido.objects.get_or_create(usuario=usuario, broadcast=broadcast)
+        return lidas_ate, {broadcast.id}
+    return avancar_cursor(usuario, broadcast.data_criacao), set()
+
+
+class FeedNotificacoes:
+    """
+    Junta notificações pessoais e broadcasts, mais recentes primeiro, sem
+    materializar tudo: cada fatia busca no máximo `fim` itens de cada origem
+    e faz o merge em memória. Compatível com o Paginator do Django/DRF
+    (expõe count() e fatiamento).
+    """
+
+    def __init__(self, pessoais, broadcasts):
+        self.pessoais = pessoais.order_by("-data_criacao", "-id")
+        self.broadcasts = broadcasts
+
+    def count(self):
+        return self.pessoais.count() + self.broadcasts.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, fatia):
+        if not isinstance(fatia, slice):
+            return self[fatia:fatia + 1][0]
+
+        inicio = fatia.start or 0
+        fim = fatia.stop
+        pessoais = self.pessoais if fim is None else self.pessoais[:fim]
+        broadcasts = self.broadcasts if fim is None else self.broadcasts[:fim]
+
+        juntos = heapq.merge(
+            pessoais, broadcasts,
+            key=lambda n: n.data_criacao,
+            reverse=True,
+        )
+        return list(islice(juntos, inicio, fim))
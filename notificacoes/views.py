@@ -1,27 +1,78 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from usuarios.autenticacao import JWTAutenticacaoCompartilhada
 from rest_framework.decorators import action
+from django.shortcuts import get_object_or_404
 from .models import Notificacao
-from .serializers import NotificacaoSerializer
+from .serializers import NotificacaoSerializer, NotificacaoBroadcastSerializer
+from .utils import (
+    FeedNotificacoes, broadcasts_do_usuario, cursor_do_usuario, avancar_cursor,
+    lidos_acima_do_cursor, marcar_broadcast_lido,
+)
+
+# Prefixo dos IDs de broadcast na listagem (ex.: "b12")
+PREFIXO_BROADCAST = "b"
+
 
 class NotificacaoViewSet(viewsets.ModelViewSet):
     serializer_class = NotificacaoSerializer
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [JWTAutenticacaoCompartilhada]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         return Notificacao.objects.filter(usuario=self.request.user)
 
+    def list(self, request, *args, **kwargs):
+        """
+        Lista notificações pessoais + broadcasts do público do usuário,
+        mais recentes primeiro.
+        """
+        feed = FeedNotificacoes(self.get_queryset(), broadcasts_do_usuario(request.user))
+        lidas_ate = cursor_do_usuario(request.user)
+
+        pagina = self.paginate_queryset(feed)
+        itens = pagina if pagina is not None else list(feed)
+        lidos = lidos_acima_do_cursor(
+            request.user,
+            [item.id for item in itens if not isinstance(item, Notificacao)
+             and not (lidas_ate and item.data_criacao <= lidas_ate)],
+        )
+        dados = [self._serializar(item, lidas_ate, lidos) for item in itens]
+
+        if pagina is not None:
+            return self.get_paginated_response(dados)
+        return Response(dados)
+
+    def _serializar(self, item, lidas_ate, lidos):
+        if isinstance(item, Notificacao):
+            return NotificacaoSerializer(item, context=self.get_serializer_context()).data
+        contexto = {**self.get_serializer_context(), "lidas_ate": lidas_ate, "lidos": lidos}
+        return NotificacaoBroadcastSerializer(item, context=contexto).data
+
     def partial_update(self, request, *args, **kwargs):
         """Permite marcar como lida"""
+        pk = str(kwargs.get("pk", ""))
+        if pk.startswith(PREFIXO_BROADCAST):
+            return self._marcar_broadcast_lido(request, pk[len(PREFIXO_BROADCAST):])
+
         instance = self.get_object()
         instance.lida = request.data.get("lida", True)
         instance.save()
         return Response(self.get_serializer(instance).data)
 
+    def _marcar_broadcast_lido(self, request, broadcast_id):
+        """Broadcast não tem linha por usuário: marca só ele (cursor ou BroadcastLido)."""
+        if not broadcast_id.isdigit():
+            return Response({"erro": "Notificação não encontrada."}, status=status.HTTP_404_NOT_FOUND)
+
+        broadcast = get_object_or_404(broadcasts_do_usuario(request.user), pk=int(broadcast_id))
+        lidas_ate, lidos = marcar_broadcast_lido(request.user, broadcast)
+        contexto = {**self.get_serializer_context(), "lidas_ate": lidas_ate, "lidos": lidos}
+        return Response(NotificacaoBroadcastSerializer(broadcast, context=contexto).data)
+
     @action(detail=False, methods=["post"])
     def marcar_todas_lidas(self, request):
         """Marca todas as notificações do usuário como lidas"""
         total = Notificacao.objects.filter(usuario=request.user, lida=False).update(lida=True)
+        avancar_cursor(request.user)
         return Response({"mensagem": f"{total} notificações marcadas como lidas."}, status=status.HTTP_200_OK)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Pagamento
+from .models import EventoWebhook, Pagamento
 
 
 @admin.register(Pagamento)
@@ -191,3 +191,11 @@ class PagamentoAdmin(admin.ModelAdmin):
         """Otimiza consultas com select_related"""
         qs = super().get_queryset(request)
         return qs.select_related('contrato', 'contratante', 'contrato__trabalho')
+
+
+@admin.register(EventoWebhook)
+class EventoWebhookAdmin(admin.ModelAdmin):
+    list_display = ['id', 'tipo', 'payment_id', 'status', 'recebimentos', 'recebido_em', 'processado_em']
+    list_filter = ['status', 'tipo']
+    search_fields = ['payment_id']
+    readonly_fields = ['tipo', 'payment_id', 'payload', 'recebimentos', 'recebido_em', 'atualizado_em', 'processado_em']
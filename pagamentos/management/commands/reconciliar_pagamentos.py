@@ -0,0 +1,75 @@
+import logging
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from freelancer.processos import exigir_estado_compartilhado
+from pagamentos.reconciliacao import reconciliar_pagamentos
+
+logger = logging.getLogger(__name__)
+
+# Teto da espera (s) quando os ciclos seguidos falham
+ESPERA_MAXIMA = 600
+
+
+class Command(BaseCommand):
+    help = "Confere no Mercado Pago os pagamentos pendentes/em processamento e aplica os status em lote."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=None, help="Pagamentos por ciclo (padrão: RECONCILIACAO_LOTE).")
+        parser.add_argument("--loop", action="store_true", help="Executa continuamente (agendador).")
+        parser.add_argument(
+            "--intervalo", type=float, default=None,
+            help="Espera (s) entre ciclos no modo --loop (padrão: RECONCILIACAO_INTERVALO).",
+        )
+
+    def handle(self, *args, **options):
+        lote = options["lote"] or settings.RECONCILIACAO_LOTE
+        if not options["loop"]:
+            self._ciclo(lote, sempre=True)
+            return
+
+        exigir_estado_compartilhado("reconciliar_pagamentos --loop")
+        intervalo = options["intervalo"] if options["intervalo"] is not None else settings.RECONCILIACAO_INTERVALO
+        self._parar = False
+        signal.signal(signal.SIGTERM, self._sinal_parada)
+        signal.signal(signal.SIGINT, self._sinal_parada)
+
+        self.stdout.write("Reconciliação de pagamentos iniciada.")
+        falhas = 0
+        while not self._parar:
+            close_old_connections()
+            try:
+                metricas = self._ciclo(lote)
+            except Exception:
+                logger.exception("Erro no ciclo de reconciliação de pagamentos")
+                metricas = None
+
+            # Lote cheio e todo conferido: ainda há pagamentos esperando, segue sem pausa.
+            # Com erros (MP fora do ar) os mesmos pagamentos voltariam em seguida: espera com backoff
+            conferidos = metricas and metricas["atualizados"] + metricas["inalterados"]
+            if metricas is None or metricas["erros"] or (metricas["selecionados"] and not conferidos):
+                falhas += 1
+                time.sleep(min(max(intervalo, 1) * 2 ** (falhas - 1), ESPERA_MAXIMA))
+                continue
+            falhas = 0
+            if metricas["selecionados"] < lote:
+                time.sleep(intervalo)
+        self.stdout.write("Reconciliação de pagamentos encerrada.")
+
+    def _ciclo(self, lote, sempre=False):
+        metricas = reconciliar_pagamentos(tamanho_lote=lote)
+        if sempre or metricas["selecionados"]:
+            self.stdout.write(
+                f"{metricas['selecionados']} pagamentos conferidos: "
+                f"{metricas['atualizados']} atualizados, {metricas['inalterados']} inalterados, "
+                f"{metricas['erros']} erros, {metricas['contratos_concluidos']} contratos concluídos "
+                f"({metricas['duracao_s']}s)."
+            )
+        return metricas
+
+    def _sinal_parada(self, signum, frame):
+        self._parar = True
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pagamentos', '0008_alter_pagamento_options_remove_pagamento_cliente_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventoWebhook',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(max_length=50)),
+                ('payment_id', models.CharField(max_length=64)),
+                ('payload', models.JSONField(blank=True, default=dict, help_text='Último corpo recebido.')),
+                ('status', models.CharField(choices=[('pendente', 'Pendente'), ('processando', 'Processando'), ('processado', 'Processado'), ('ignorado', 'Ignorado'), ('falhou', 'Falhou')], default='pendente', max_length=20)),
+                ('recebimentos', models.PositiveIntegerField(default=1)),
+                ('recebido_em', models.DateTimeField(auto_now_add=True)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+                ('processado_em', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Evento de webhook',
+                'verbose_name_plural': 'Eventos de webhook',
+                'ordering': ['-atualizado_em'],
+                'constraints': [models.UniqueConstraint(fields=('tipo', 'payment_id'), name='evento_webhook_unico')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.7 on 2026-10-17 13:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contratos', '0008_metricasfreelancer'),
+        ('pagamentos', '0009_eventowebhook'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pagamento',
+            name='sincronizado_em',
+            field=models.DateTimeField(blank=True, help_text='Quando o status foi conferido no Mercado Pago pela última vez.', null=True),
+        ),
+        migrations.AlterField(
+            model_name='pagamento',
+            name='mercadopago_payment_id',
+            field=models.CharField(blank=True, db_index=True, help_text='ID do pagamento gerado pelo Mercado Pago.', max_length=255, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='pagamento',
+            index=models.Index(fields=['status', 'sincronizado_em'], name='pagamento_reconciliacao'),
+        ),
+    ]
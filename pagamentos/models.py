@@ -57,6 +57,7 @@ class Pagamento(models.Model):
         max_length=255,
         blank=True,
         null=True,
+        db_index=True,
         help_text="ID do pagamento gerado pelo Mercado Pago."
     )
 
@@ -77,10 +78,21 @@ class Pagamento(models.Model):
 
     observacoes = models.TextField(blank=True, null=True)
 
+    # 🔹 Última sincronização com o Mercado Pago (webhook, retorno ou reconciliação)
+    sincronizado_em = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Quando o status foi conferido no Mercado Pago pela última vez."
+    )
+
     class Meta:
         ordering = ['-data_criacao']
         verbose_name = "Pagamento"
         verbose_name_plural = "Pagamentos"
+        indexes = [
+            # Seleção dos pagamentos em aberto da reconciliação
+            models.Index(fields=['status', 'sincronizado_em'], name='pagamento_reconciliacao'),
+        ]
 
     def __str__(self):
         """Exibe o pagamento de forma legível no admin."""
@@ -91,3 +103,39 @@ class Pagamento(models.Model):
 
         contratante_nome = getattr(self.contratante, "nome", "Desconhecido") if self.contratante else "—"
         return f"Pagamento R$ {self.valor} ({metodo}) | {contratante_nome} | Status: {self.status}"
+
+
+class EventoWebhook(models.Model):
+    """
+    Notificação recebida pelo webhook do Mercado Pago, uma linha por
+    (tipo, payment_id). Repetições do MP só atualizam a linha; enquanto o
+    evento está pendente elas não geram trabalho novo, e depois de processado
+    o rearmam para uma única nova consulta (ver pagamentos/tarefas.py).
+    """
+    STATUS = [
+        ('pendente', 'Pendente'),
+        ('processando', 'Processando'),
+        ('processado', 'Processado'),
+        ('ignorado', 'Ignorado'),
+        ('falhou', 'Falhou'),
+    ]
+
+    tipo = models.CharField(max_length=50)
+    payment_id = models.CharField(max_length=64)
+    payload = models.JSONField(default=dict, blank=True, help_text="Último corpo recebido.")
+    status = models.CharField(max_length=20, choices=STATUS, default='pendente')
+    recebimentos = models.PositiveIntegerField(default=1)
+    recebido_em = models.DateTimeField(auto_now_add=True)
+    atualizado_em = models.DateTimeField(auto_now=True)
+    processado_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-atualizado_em']
+        verbose_name = "Evento de webhook"
+        verbose_name_plural = "Eventos de webhook"
+        constraints = [
+            models.UniqueConstraint(fields=['tipo', 'payment_id'], name='evento_webhook_unico'),
+        ]
+
+    def __str__(self):
+        return f"{self.tipo} {self.payment_id} ({self.status}, {self.recebimentos}x)"
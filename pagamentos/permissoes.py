@@ -55,18 +55,15 @@ class PermissaoPagamento(BasePermission):
 
         # Métodos seguros (GET, HEAD, OPTIONS) — permitem leitura
         if request.method in SAFE_METHODS:
-            return (
-                user == obj.contratante or
-                user == obj.contrato.contratante or
-                user == obj.contrato.freelancer
+            return user.id in (
+                obj.contratante_id,
+                obj.contrato.contratante_id,
+                obj.contrato.freelancer_id,
             )
 
         # Apenas o contratante pode editar
         if request.method in ['PUT', 'PATCH']:
-            return (
-                user == obj.contratante or
-                user == obj.contrato.contratante
-            )
+            return user.id in (obj.contratante_id, obj.contrato.contratante_id)
 
         # Apenas admin pode deletar pagamentos
         if request.method == 'DELETE':
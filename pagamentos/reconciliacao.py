@@ -0,0 +1,177 @@
+"""
+Reconciliação dos pagamentos em aberto com o Mercado Pago (comando
+reconciliar_pagamentos).
+
+Webhooks se perdem; sem a reconciliação um Pagamento podia ficar 'pendente'
+para sempre, e as rotas de status consultavam o MP a cada requisição para
+compensar. Cada ciclo:
+1. seleciona até RECONCILIACAO_LOTE pagamentos 'pendente'/'em_processamento'
+   criados há no máximo RECONCILIACAO_IDADE_MAXIMA_DIAS e não conferidos nos
+   últimos RECONCILIACAO_INTERVALO segundos (nunca conferidos primeiro);
+2. consulta o MP em RECONCILIACAO_CONCORRENCIA threads, limitadas a
+   RECONCILIACAO_TAXA consultas por segundo (as threads não tocam no banco):
+   pelo mercadopago_payment_id ou, sem ele, buscando pelo external_reference;
+3. aplica tudo numa transação: trava contratos e depois pagamentos (a mesma
+   ordem de aplicar_status_mp), um UPDATE por status novo, um UPDATE de
+   sincronizado_em para os inalterados, contratos aprovados concluídos em
+   massa e rejeições notificadas em bulk.
+
+Consultas que falharam não marcam sincronizado_em e voltam no próximo ciclo.
+As rotas de status servem o Pagamento local; sincronizado_em diz quão novo ele é.
+"""
+import datetime
+import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from contratos.models import Contrato
+from services.mercadopago import MercadoPagoService
+
+from .models import Pagamento
+from .sincronizacao import concluir_contratos_em_massa, notificar_rejeicoes_em_massa
+
+logger = logging.getLogger(__name__)
+
+STATUS_EM_ABERTO = ("pendente", "em_processamento")
+
+
+class LimiteTaxa:
+    """Espaça as chamadas (de qualquer thread) em pelo menos 1/por_segundo segundos."""
+
+    def __init__(self, por_segundo):
+        self.intervalo = 1.0 / por_segundo if por_segundo > 0 else 0.0
+        self._lock = threading.Lock()
+        self._proxima = 0.0
+
+    def aguardar(self):
+        with self._lock:
+            agora = time.monotonic()
+            espera = max(0.0, self._proxima - agora)
+            self._proxima = max(agora, self._proxima) + self.intervalo
+        if espera:
+            time.sleep(espera)
+
+
+def desatualizado(pagamento):
+    """Pagamento em aberto sem conferência no MP dentro de RECONCILIACAO_INTERVALO."""
+    if pagamento.status not in STATUS_EM_ABERTO:
+        return False
+    if pagamento.sincronizado_em is None:
+        return True
+    limite = timezone.now() - datetime.timedelta(seconds=settings.RECONCILIACAO_INTERVALO)
+    return pagamento.sincronizado_em < limite
+
+
+def _selecionar(agora, tamanho_lote):
+    limite_sincronizacao = agora - datetime.timedelta(seconds=settings.RECONCILIACAO_INTERVALO)
+    limite_idade = agora - datetime.timedelta(days=settings.RECONCILIACAO_IDADE_MAXIMA_DIAS)
+    return list(
+        Pagamento.objects
+        .filter(status__in=STATUS_EM_ABERTO, data_criacao__gte=limite_idade)
+        .filter(Q(sincronizado_em__isnull=True) | Q(sincronizado_em__lt=limite_sincronizacao))
+        .order_by(F("sincronizado_em").asc(nulls_first=True), "id")
+        .values("id", "contrato_id", "mercadopago_payment_id")[:tamanho_lote]
+    )
+
+
+def _consultar(mp, limite, linha):
+    """
+    (ok, info) do pagamento no MP; info=None com ok=True quando o contrato
+    ainda não tem pagamento lá. Roda nas threads: sem acesso ao banco.
+    """
+    limite.aguardar()
+    if linha["mercadopago_payment_id"]:
+        info = mp.consultar_pagamento(linha["mercadopago_payment_id"])
+        return info is not None, info
+    resultado = mp.buscar_pagamento_por_referencia(linha["contrato_id"])
+    return resultado["sucesso"], resultado["pagamento"]
+
+
+def _aplicar(linhas, resultados, agora):
+    """Aplica os resultados das consultas em massa; retorna as contagens."""
+    consultados = {linha["id"]: (linha, info) for linha, (ok, info) in zip(linhas, resultados) if ok}
+    contagens = {"atualizados": 0, "inalterados": 0, "contratos_concluidos": 0, "rejeitados": 0}
+    if not consultados:
+        return contagens
+
+    with transaction.atomic():
+        list(
+            Contrato.objects
+            .select_for_update()
+            .filter(id__in={linha["contrato_id"] for linha, _ in consultados.values()})
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        # Webhook ou retorno podem ter atualizado o pagamento durante as consultas
+        atuais = dict(
+            Pagamento.objects
+            .select_for_update()
+            .filter(id__in=consultados, status__in=STATUS_EM_ABERTO)
+            .values_list("id", "status")
+        )
+
+        por_status = defaultdict(list)
+        novos_ids_mp = {}
+        inalterados = []
+        for pagamento_id, status_atual in atuais.items():
+            linha, info = consultados[pagamento_id]
+            if info is None:
+                inalterados.append(pagamento_id)
+                continue
+            if not linha["mercadopago_payment_id"]:
+                novos_ids_mp[pagamento_id] = str(info["payment_id"])
+            novo = MercadoPagoService.mapear_status_mp_para_local(info.get("status"))
+            if novo == status_atual:
+                inalterados.append(pagamento_id)
+            else:
+                por_status[novo].append(pagamento_id)
+
+        for novo, ids in por_status.items():
+            contagens["atualizados"] += Pagamento.objects.filter(id__in=ids).update(status=novo, sincronizado_em=agora)
+        # Só quem não tinha o id (achado pela busca por external_reference); são poucos
+        for pagamento_id, payment_id in novos_ids_mp.items():
+            Pagamento.objects.filter(pk=pagamento_id).update(mercadopago_payment_id=payment_id)
+        contagens["inalterados"] = Pagamento.objects.filter(id__in=inalterados).update(sincronizado_em=agora)
+
+        aprovados = [consultados[i][0]["contrato_id"] for i in por_status.get("aprovado", [])]
+        rejeitados = [consultados[i][0]["contrato_id"] for i in por_status.get("rejeitado", [])]
+        if aprovados:
+            contagens["contratos_concluidos"] = len(concluir_contratos_em_massa(aprovados))
+        if rejeitados:
+            contagens["rejeitados"] = notificar_rejeicoes_em_massa(rejeitados)
+    return contagens
+
+
+def reconciliar_pagamentos(tamanho_lote=None):
+    """
+    Um ciclo de reconciliação (um lote). Retorna as métricas; "selecionados"
+    igual ao lote indica que há mais pagamentos esperando.
+    """
+    inicio = time.perf_counter()
+    tamanho_lote = tamanho_lote or settings.RECONCILIACAO_LOTE
+    agora = timezone.now()
+
+    linhas = _selecionar(agora, tamanho_lote)
+    resultados = []
+    if linhas:
+        mp = MercadoPagoService()
+        limite = LimiteTaxa(settings.RECONCILIACAO_TAXA)
+        with ThreadPoolExecutor(max_workers=settings.RECONCILIACAO_CONCORRENCIA) as executor:
+            resultados = list(executor.map(lambda linha: _consultar(mp, limite, linha), linhas))
+
+    metricas = {
+        "selecionados": len(linhas),
+        "erros": sum(1 for ok, _ in resultados if not ok),
+        **_aplicar(linhas, resultados, timezone.now()),
+        "duracao_s": round(time.perf_counter() - inicio, 3),
+    }
+    if linhas:
+        logger.info("Reconciliação de pagamentos: %s", metricas)
+    return metricas
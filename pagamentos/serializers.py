@@ -26,6 +26,7 @@ class PagamentoSerializer(serializers.ModelSerializer):
             "codigo_transacao",
             "payment_intent_id",
             "metodo",
+            "sincronizado_em",
         ]
 
     # VALIDAÇÕES
@@ -72,3 +73,11 @@ class PagamentoSerializer(serializers.ModelSerializer):
         validated_data["status"] = "pendente"
         validated_data["metodo"] = "checkout_pro"
         return super().create(validated_data)
+
+
+class PagamentoResumoSerializer(serializers.ModelSerializer):
+    """Resumo do pagamento para listagens aninhadas."""
+    class Meta:
+        model = Pagamento
+        fields = ["id", "valor", "status", "metodo", "data_criacao"]
+        read_only_fields = fields
@@ -0,0 +1,184 @@
+"""
+Aplicação do status do Mercado Pago no Pagamento local.
+
+Todos os caminhos que trazem um status do MP (webhook via fila, retorno do
+checkout, consultas de status, aprovação forçada) passam por
+aplicar_status_mp(). Ele trava o Contrato e depois o Pagamento com
+select_for_update, sempre nessa ordem. Assim, notificações repetidas ou
+simultâneas do mesmo pagamento não criam dois Pagamentos nem concluem o
+contrato duas vezes. A reconciliação em lote (pagamentos/reconciliacao.py)
+usa concluir_contratos_em_massa, com as mesmas travas.
+"""
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+from contratos.models import Contrato
+from contratos.signals import atualizar_freelancer
+from notificacoes.models import Notificacao
+from notificacoes.utils import enviar_notificacao
+from services.mercadopago import MercadoPagoService
+from trabalhos.models import Trabalho
+from trabalhos.paginacao import invalidar_contagens
+
+from .models import Pagamento
+
+logger = logging.getLogger(__name__)
+
+
+def _contrato_id(external_reference):
+    try:
+        return int(external_reference)
+    except (TypeError, ValueError):
+        return None
+
+
+def _mensagem_conclusao(titulo):
+    return f"O contrato do trabalho '{titulo}' foi concluído após o pagamento."
+
+
+def _mensagem_rejeicao(titulo):
+    return f"O pagamento do contrato '{titulo}' foi rejeitado. Tente novamente."
+
+
+def concluir_contrato(contrato):
+    """
+    Conclui contrato e trabalho numa transação, com o contrato travado.
+    As partes são notificadas após o commit. Retorna False se já estava concluído.
+    """
+    with transaction.atomic():
+        contrato = (
+            Contrato.objects
+            .select_for_update()
+            .select_related("trabalho", "contratante", "freelancer")
+            .get(pk=contrato.pk)
+        )
+        if contrato.status == "concluido":
+            return False
+
+        contrato.status = "concluido"
+        contrato.save()
+        contrato.trabalho.status = "concluido"
+        contrato.trabalho.save()
+
+        mensagem = _mensagem_conclusao(contrato.trabalho.titulo)
+        link = f"/contratos/{contrato.id}"
+        for usuario in (contrato.contratante, contrato.freelancer):
+            transaction.on_commit(lambda usuario=usuario: enviar_notificacao(usuario=usuario, mensagem=mensagem, link=link))
+    return True
+
+
+def concluir_contratos_em_massa(contrato_ids):
+    """
+    concluir_contrato para vários contratos com um UPDATE por tabela.
+    .update() não dispara sinais: métricas e perfil de busca dos freelancers
+    (contratos.signals.atualizar_freelancer) e as contagens de trabalhos são
+    atualizados aqui. Notificações vão em bulk, sem tempo real (como nos
+    demais envios em massa). Retorna os ids dos contratos concluídos agora.
+    """
+    with transaction.atomic():
+        contratos = list(
+            Contrato.objects
+            .select_for_update()
+            .filter(id__in=contrato_ids)
+            .exclude(status="concluido")
+            .values_list("id", "trabalho_id", "trabalho__titulo", "contratante_id", "freelancer_id")
+        )
+        if not contratos:
+            return []
+
+        ids = [c[0] for c in contratos]
+        Contrato.objects.filter(id__in=ids).update(status="concluido")
+        Trabalho.objects.filter(id__in=[c[1] for c in contratos]).update(status="concluido")
+
+        for freelancer_id in sorted({c[4] for c in contratos}):
+            atualizar_freelancer(freelancer_id)
+
+        Notificacao.objects.bulk_create([
+            Notificacao(usuario_id=usuario_id, mensagem=_mensagem_conclusao(titulo), link=f"/contratos/{contrato_id}")
+            for contrato_id, _, titulo, contratante_id, freelancer_id in contratos
+            for usuario_id in (contratante_id, freelancer_id)
+        ])
+        transaction.on_commit(invalidar_contagens)
+    return ids
+
+
+def notificar_rejeicoes_em_massa(contrato_ids):
+    """Avisa em bulk os contratantes dos contratos com pagamento rejeitado."""
+    contratos = (
+        Contrato.objects
+        .filter(id__in=contrato_ids)
+        .values_list("id", "trabalho__titulo", "contratante_id")
+    )
+    return len(Notificacao.objects.bulk_create([
+        Notificacao(usuario_id=contratante_id, mensagem=_mensagem_rejeicao(titulo), link=f"/contratos/{contrato_id}/pagamento")
+        for contrato_id, titulo, contratante_id in contratos
+    ]))
+
+
+def aplicar_status_mp(info, status=None):
+    """
+    Sincroniza o Pagamento do contrato com o pagamento `info` do MP
+    (dict de MercadoPagoService.consultar_pagamento), criando-o se preciso.
+    status força o status local (aprovação manual); o padrão é o do MP.
+    Retorna o Pagamento, ou None se o pagamento não referencia um contrato.
+    """
+    payment_id = str(info["payment_id"])
+    novo = status or MercadoPagoService.mapear_status_mp_para_local(info.get("status"))
+
+    # O Pagamento já vinculado ao payment_id manda; senão, o external_reference
+    contrato_id = (
+        Pagamento.objects.filter(mercadopago_payment_id=payment_id).values_list("contrato_id", flat=True).first()
+        or _contrato_id(info.get("external_reference"))
+    )
+
+    with transaction.atomic():
+        contrato = Contrato.objects.select_for_update().filter(pk=contrato_id).first() if contrato_id else None
+        if contrato is None:
+            logger.warning("MP: pagamento %s sem contrato válido (external_reference=%s)",
+                           payment_id, info.get("external_reference"))
+            return None
+
+        agora = timezone.now()
+        pagamento = Pagamento.objects.select_for_update().filter(contrato=contrato).first()
+        if pagamento is None:
+            anterior = None
+            pagamento = Pagamento.objects.create(
+                contrato=contrato,
+                contratante_id=contrato.contratante_id,
+                valor=info.get("transaction_amount") or contrato.valor,
+                metodo='checkout_pro',
+                status=novo,
+                mercadopago_payment_id=payment_id,
+                sincronizado_em=agora,
+            )
+        else:
+            anterior = pagamento.status
+            pagamento.sincronizado_em = agora
+            # Aprovado só muda para reembolsado: uma tentativa antiga rejeitada
+            # do mesmo contrato não pode desfazer a aprovação
+            if anterior == "aprovado" and novo not in ("aprovado", "reembolsado"):
+                logger.info("MP: ignorando status %s do pagamento %s; contrato %s já pago",
+                            novo, payment_id, contrato.id)
+                pagamento.save(update_fields=["sincronizado_em"])
+                return pagamento
+
+            campos = ["sincronizado_em"]
+            if pagamento.status != novo:
+                pagamento.status = novo
+                campos.append("status")
+            if pagamento.mercadopago_payment_id != payment_id:
+                pagamento.mercadopago_payment_id = payment_id
+                campos.append("mercadopago_payment_id")
+            pagamento.save(update_fields=campos)
+
+        if novo == "aprovado" and anterior != "aprovado":
+            concluir_contrato(contrato)
+        elif novo == "rejeitado" and anterior != "rejeitado":
+            transaction.on_commit(lambda: enviar_notificacao(
+                usuario=contrato.contratante,
+                mensagem=_mensagem_rejeicao(contrato.trabalho.titulo),
+                link=f"/contratos/{contrato.id}/pagamento"
+            ))
+    return pagamento
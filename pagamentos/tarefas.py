@@ -0,0 +1,92 @@
+import logging
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from fila.registro import tarefa
+from services.mercadopago import MercadoPagoService
+
+from .models import EventoWebhook
+from .sincronizacao import aplicar_status_mp
+
+logger = logging.getLogger(__name__)
+
+
+class PagamentoIndisponivelMP(Exception):
+    """O Mercado Pago não retornou o pagamento; a fila tentará novamente."""
+    pass
+
+
+def sincronizar_pagamento_mp(payment_id):
+    """Consulta o pagamento no Mercado Pago e aplica o status no Pagamento local."""
+    info = MercadoPagoService().consultar_pagamento(payment_id)
+    if not info:
+        raise PagamentoIndisponivelMP(f"Pagamento {payment_id} não retornado pelo Mercado Pago.")
+    return aplicar_status_mp(info)
+
+
+@tarefa("pagamentos.processar_evento_webhook")
+def processar_evento_webhook(evento_id):
+    """
+    Processa um EventoWebhook: uma consulta ao MP cobre todas as notificações
+    do mesmo pagamento recebidas até aqui.
+    Se chegar outra durante a consulta, o webhook volta o evento para
+    'pendente' e enfileira nova tarefa; por isso o fim só marca 'processado'
+    quem ainda está 'processando'. Em falha o evento fica 'falhou' até a
+    fila tentar de novo ou chegar nova notificação.
+    """
+    assumidos = (
+        EventoWebhook.objects
+        .filter(pk=evento_id, status__in=("pendente", "processando", "falhou"))
+        .update(status="processando")
+    )
+    if not assumidos:
+        # Outra tarefa já processou este evento
+        return
+
+    evento = EventoWebhook.objects.get(pk=evento_id)
+    try:
+        pagamento = sincronizar_pagamento_mp(evento.payment_id)
+    except Exception:
+        EventoWebhook.objects.filter(pk=evento_id, status="processando").update(status="falhou")
+        raise
+
+    EventoWebhook.objects.filter(pk=evento_id, status="processando").update(
+        status="processado" if pagamento else "ignorado",
+        processado_em=timezone.now(),
+    )
+
+
+def registrar_evento_webhook(tipo, payment_id, payload):
+    """
+    Uma linha por (tipo, payment_id). Repetições só contam e guardam o corpo;
+    uma tarefa nova só é enfileirada na criação ou ao rearmar um evento que
+    já saiu de 'pendente' (processado, em processamento ou com falha).
+    Usado pelo webhook e pelas rotas de status, que pedem uma conferência
+    em vez de consultar o MP na requisição.
+    """
+    with transaction.atomic():
+        evento, criado = EventoWebhook.objects.get_or_create(
+            tipo=tipo, payment_id=payment_id, defaults={"payload": payload},
+        )
+        if criado:
+            processar_evento_webhook.enfileirar(evento.id)
+            return
+
+        rearmado = (
+            EventoWebhook.objects
+            .filter(pk=evento.pk)
+            .exclude(status="pendente")
+            .update(status="pendente", payload=payload, recebimentos=F("recebimentos") + 1)
+        )
+        if rearmado:
+            processar_evento_webhook.enfileirar(evento.id)
+        else:
+            EventoWebhook.objects.filter(pk=evento.pk).update(payload=payload, recebimentos=F("recebimentos") + 1)
+
+
+@tarefa("pagamentos.processar_notificacao_mp")
+def processar_notificacao_mp(payment_id):
+    """Formato anterior ao EventoWebhook; mantida para tarefas que já estavam na fila."""
+    sincronizar_pagamento_mp(payment_id)
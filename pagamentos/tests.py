@@ -1,3 +1,320 @@
-from django.test import TestCase
+import datetime
+import hashlib
+import hmac
+import json
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from contratos.models import Contrato, MetricasFreelancer
+from fila.models import Tarefa
+from notificacoes.models import Notificacao
+from pagamentos.models import EventoWebhook, Pagamento
+from pagamentos.reconciliacao import reconciliar_pagamentos
+from pagamentos.sincronizacao import aplicar_status_mp
+from pagamentos.tarefas import processar_evento_webhook
+from propostas.models import Proposta
+from services.mercadopago import MercadoPagoService
+from trabalhos.models import Trabalho
+from usuarios.models import PerfilBuscaFreelancer, Usuario
+
+SEGREDO = "segredo-de-teste"
+
+
+class ContratoMixin:
+    """Contratante, freelancer e um contrato ativo com pagamento pendente."""
+
+    @classmethod
+    def criar_usuario(cls, email, tipo):
+        return Usuario.objects.create(email=email, nome=email.split("@")[0], tipo=tipo, telefone="0", password="!")
+
+    @classmethod
+    def criar_contrato(cls, contratante, freelancer, payment_id=None):
+        hoje = datetime.date.today()
+        trabalho = Trabalho.objects.create(
+            titulo="Site institucional", descricao="-", prazo=hoje, orcamento=100, contratante=contratante,
+        )
+        proposta = Proposta.objects.create(
+            trabalho=trabalho, freelancer=freelancer, descricao="-", valor=100, prazo_estimado=hoje,
+        )
+        contrato = Contrato.objects.create(
+            proposta=proposta, trabalho=trabalho, contratante=contratante, freelancer=freelancer, valor=100,
+        )
+        Pagamento.objects.create(
+            contrato=contrato, contratante=contratante, valor=100, mercadopago_payment_id=payment_id,
+        )
+        return contrato
+
+    @staticmethod
+    def info_mp(contrato, status, payment_id="123456"):
+        return {
+            "payment_id": payment_id,
+            "status": status,
+            "transaction_amount": 100,
+            "external_reference": str(contrato.id),
+        }
+
+
+@override_settings(MP_WEBHOOK_SECRET=SEGREDO, MERCADOPAGO_ACCESS_TOKEN="TEST-token")
+class WebhookTests(ContratoMixin, TestCase):
+    url = "/mercadopago/webhook/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.contratante = cls.criar_usuario("contratante@exemplo.com", "contratante")
+        cls.freelancer = cls.criar_usuario("freelancer@exemplo.com", "freelancer")
+        cls.contrato = cls.criar_contrato(cls.contratante, cls.freelancer, payment_id="123456")
+
+    def _assinatura(self, data_id, request_id="req-1", ts="1700000000", segredo=SEGREDO):
+        manifesto = f"id:{data_id};request-id:{request_id};ts:{ts};"
+        v1 = hmac.new(segredo.encode(), manifesto.encode(), hashlib.sha256).hexdigest()
+        return f"ts={ts},v1={v1}"
+
+    def _notificar(self, payment_id="123456", assinatura=None, corpo=None):
+        corpo = corpo if corpo is not None else {"type": "payment", "data": {"id": payment_id}}
+        cabecalhos = {"HTTP_X_REQUEST_ID": "req-1"}
+        if assinatura is not False:
+            cabecalhos["HTTP_X_SIGNATURE"] = assinatura or self._assinatura(payment_id)
+        return self.client.post(
+            f"{self.url}?data.id={payment_id}&type=payment", json.dumps(corpo),
+            content_type="application/json", secure=True, **cabecalhos,
+        )
+
+    def _tarefas(self):
+        return Tarefa.objects.filter(nome=processar_evento_webhook.nome_tarefa)
+
+    def test_assinatura_invalida_recusada(self):
+        for assinatura in (False, self._assinatura("123456", segredo="outro"), "ts=1,v1=abc", self._assinatura("999")):
+            with self.subTest(assinatura=assinatura):
+                resposta = self._notificar(assinatura=assinatura)
+                self.assertEqual(resposta.status_code, 401)
+        self.assertFalse(EventoWebhook.objects.exists())
+        self.assertFalse(self._tarefas().exists())
+
+    @override_settings(MP_WEBHOOK_SECRET="", DEBUG=False)
+    def test_sem_segredo_recusa_fora_de_debug(self):
+        self.assertEqual(self._notificar(assinatura="ts=1,v1=abc").status_code, 401)
+
+    def test_payment_id_invalido_nao_vira_evento(self):
+        for payment_id in ("abc", "12;drop", "1" * 21):
+            with self.subTest(payment_id=payment_id):
+                self.assertEqual(self._notificar(payment_id).status_code, 200)
+        self.assertFalse(EventoWebhook.objects.exists())
+
+    def test_notificacao_que_nao_e_de_pagamento_ignorada(self):
+        resposta = self._notificar(corpo={"type": "merchant_order", "data": {"id": "123456"}})
+        self.assertEqual(resposta.status_code, 200)
+        self.assertFalse(EventoWebhook.objects.exists())
+
+    def test_evento_repetido_processado_uma_vez(self):
+        for _ in range(3):
+            self.assertEqual(self._notificar().status_code, 200)
+
+        evento = EventoWebhook.objects.get()
+        self.assertEqual((evento.tipo, evento.payment_id, evento.recebimentos), ("payment", "123456", 3))
+        self.assertEqual(self._tarefas().count(), 1)
+
+        info = self.info_mp(self.contrato, "approved")
+        with mock.patch.object(MercadoPagoService, "consultar_pagamento", return_value=info) as consulta:
+            with self.captureOnCommitCallbacks(execute=True):
+                processar_evento_webhook(evento.id)
+                # Uma segunda execução da mesma tarefa (retentativa da fila) não consulta de novo
+                processar_evento_webhook(evento.id)
+        consulta.assert_called_once_with("123456")
+
+        evento.refresh_from_db()
+        self.assertEqual(evento.status, "processado")
+        self.contrato.refresh_from_db()
+        self.assertEqual(self.contrato.status, "concluido")
+        self.assertEqual(Pagamento.objects.get(contrato=self.contrato).status, "aprovado")
+
+    def test_notificacao_apos_processado_rearma_uma_vez(self):
+        self._notificar()
+        EventoWebhook.objects.update(status="processado")
+
+        self._notificar()
+        self._notificar()
+        self.assertEqual(EventoWebhook.objects.get().status, "pendente")
+        self.assertEqual(self._tarefas().count(), 2)
+
+
+class AplicarStatusMpTests(ContratoMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.contratante = cls.criar_usuario("contratante@exemplo.com", "contratante")
+        cls.freelancer = cls.criar_usuario("freelancer@exemplo.com", "freelancer")
+
+    def setUp(self):
+        self.contrato = self.criar_contrato(self.contratante, self.freelancer)
+
+    def _aplicar(self, status):
+        with self.captureOnCommitCallbacks(execute=True):
+            return aplicar_status_mp(self.info_mp(self.contrato, status))
+
+    def test_aprovacao_conclui_contrato_e_trabalho(self):
+        pagamento = self._aplicar("approved")
+
+        self.assertEqual((pagamento.status, pagamento.mercadopago_payment_id), ("aprovado", "123456"))
+        self.assertIsNotNone(pagamento.sincronizado_em)
+        self.contrato.refresh_from_db()
+        self.assertEqual(self.contrato.status, "concluido")
+        self.assertEqual(Trabalho.objects.get(pk=self.contrato.trabalho_id).status, "concluido")
+        self.assertEqual(Notificacao.objects.filter(link=f"/contratos/{self.contrato.id}").count(), 2)
+
+    def test_reenvio_apos_aprovado_nao_conclui_de_novo(self):
+        self._aplicar("approved")
+        notificacoes = Notificacao.objects.count()
+
+        with mock.patch("pagamentos.sincronizacao.concluir_contrato") as concluir:
+            self._aplicar("approved")
+            self._aplicar("rejected")
+            self._aplicar("pending")
+        concluir.assert_not_called()
+
+        self.assertEqual(Pagamento.objects.get(contrato=self.contrato).status, "aprovado")
+        self.assertEqual(Notificacao.objects.count(), notificacoes)
+
+    def test_reembolso_apos_aprovado_aplicado(self):
+        self._aplicar("approved")
+        self.assertEqual(self._aplicar("refunded").status, "reembolsado")
+
+    def test_rejeicao_notifica_o_contratante_uma_vez(self):
+        self._aplicar("rejected")
+        self._aplicar("rejected")
+
+        self.assertEqual(Pagamento.objects.get(contrato=self.contrato).status, "rejeitado")
+        self.assertEqual(
+            Notificacao.objects.filter(usuario=self.contratante, link=f"/contratos/{self.contrato.id}/pagamento").count(),
+            1,
+        )
+        self.contrato.refresh_from_db()
+        self.assertNotEqual(self.contrato.status, "concluido")
+
+    def test_sem_contrato_valido_ignorado(self):
+        info = self.info_mp(self.contrato, "approved", payment_id="999")
+        info["external_reference"] = "nao-e-contrato"
+        self.assertIsNone(aplicar_status_mp(info))
+
+
+@override_settings(MERCADOPAGO_ACCESS_TOKEN="TEST-token", RECONCILIACAO_TAXA=0)
+class ReconciliacaoTests(ContratoMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.contratante = cls.criar_usuario("contratante@exemplo.com", "contratante")
+        cls.freelancer = cls.criar_usuario("freelancer@exemplo.com", "freelancer")
+
+    def _reconciliar(self, consultas, por_referencia=None):
+        """Ciclo com o MP simulado: consultas {payment_id: info}, por_referencia {contrato_id: info}."""
+        por_referencia = por_referencia or {}
+        with (
+            mock.patch.object(MercadoPagoService, "consultar_pagamento", side_effect=consultas.get),
+            mock.patch.object(
+                MercadoPagoService, "buscar_pagamento_por_referencia",
+                side_effect=lambda ref: {"sucesso": True, "pagamento": por_referencia.get(ref)},
+            ),
+            mock.patch("pagamentos.sincronizacao.invalidar_contagens") as invalidar,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            metricas = reconciliar_pagamentos()
+        return metricas, invalidar
+
+    def test_aprovados_concluem_contratos_e_atualizam_o_freelancer(self):
+        com_id = self.criar_contrato(self.contratante, self.freelancer, payment_id="111")
+        sem_id = self.criar_contrato(self.contratante, self.freelancer)
+        pendente = self.criar_contrato(self.contratante, self.freelancer, payment_id="333")
+
+        metricas, invalidar = self._reconciliar(
+            {"111": self.info_mp(com_id, "approved", "111"), "333": self.info_mp(pendente, "pending", "333")},
+            {sem_id.id: self.info_mp(sem_id, "approved", "222")},
+        )
+
+        self.assertEqual(
+            {k: metricas[k] for k in ("selecionados", "erros", "atualizados", "inalterados", "contratos_concluidos")},
+            {"selecionados": 3, "erros": 0, "atualizados": 2, "inalterados": 1, "contratos_concluidos": 2},
+        )
+        for contrato, status in ((com_id, "concluido"), (sem_id, "concluido"), (pendente, "ativo")):
+            contrato.refresh_from_db()
+            self.assertEqual(contrato.status, status)
+            self.assertEqual(Trabalho.objects.get(pk=contrato.trabalho_id).status == "concluido", status == "concluido")
+        self.assertEqual(Pagamento.objects.get(contrato=sem_id).mercadopago_payment_id, "222")
+        self.assertFalse(Pagamento.objects.filter(sincronizado_em__isnull=True).exists())
+
+        # Sinais não disparam com .update(): métricas, perfil de busca e contagens vêm de concluir_contratos_em_massa
+        self.assertEqual(MetricasFreelancer.objects.get(pk=self.freelancer.pk).contratos_concluidos, 2)
+        self.assertEqual(PerfilBuscaFreelancer.objects.get(pk=self.freelancer.pk).contratos_concluidos, 2)
+        invalidar.assert_called_once_with()
+        self.assertEqual(Notificacao.objects.filter(mensagem__contains="concluído após o pagamento").count(), 4)
+
+        # Conferidos agora: o próximo ciclo não seleciona ninguém
+        self.assertEqual(self._reconciliar({})[0]["selecionados"], 0)
+
+    def test_rejeitado_notifica_o_contratante(self):
+        contrato = self.criar_contrato(self.contratante, self.freelancer, payment_id="444")
+
+        metricas, _ = self._reconciliar({"444": self.info_mp(contrato, "rejected", "444")})
+
+        self.assertEqual(metricas["rejeitados"], 1)
+        self.assertEqual(Pagamento.objects.get(contrato=contrato).status, "rejeitado")
+        self.assertTrue(Notificacao.objects.filter(usuario=self.contratante, link=f"/contratos/{contrato.id}/pagamento").exists())
+
+    def test_falha_na_consulta_volta_no_proximo_ciclo(self):
+        contrato = self.criar_contrato(self.contratante, self.freelancer, payment_id="555")
+
+        metricas, _ = self._reconciliar({})
+
+        self.assertEqual((metricas["selecionados"], metricas["erros"]), (1, 1))
+        pagamento = Pagamento.objects.get(contrato=contrato)
+        self.assertEqual(pagamento.status, "pendente")
+        self.assertIsNone(pagamento.sincronizado_em)
+
+
+@override_settings(MERCADOPAGO_ACCESS_TOKEN="TEST-token")
+class SincronizacaoPeloUsuarioTests(ContratoMixin, APITestCase):
+    """confirmar_retorno e rotas de status só pedem conferência de contratos do usuário."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.contratante = cls.criar_usuario("contratante@exemplo.com", "contratante")
+        cls.outro = cls.criar_usuario("outro@exemplo.com", "contratante")
+        cls.freelancer = cls.criar_usuario("freelancer@exemplo.com", "freelancer")
+        cls.contrato = cls.criar_contrato(cls.contratante, cls.freelancer)
+        cls.alheio = cls.criar_contrato(cls.outro, cls.freelancer, payment_id="777")
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.contratante)
+
+    def _confirmar(self, **dados):
+        return self.client.post("/api/pagamentos/confirmar_retorno/", dados, format="json", secure=True)
+
+    def test_contrato_de_outro_usuario_nao_e_sincronizado(self):
+        resposta = self._confirmar(payment_id="888", external_reference=str(self.alheio.id))
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.data["status"], "aguardando_webhook")
+        self.assertFalse(EventoWebhook.objects.exists())
+
+        resposta = self._confirmar(payment_id="777")
+        self.assertEqual(resposta.data["status"], "aguardando_webhook")
+        self.assertFalse(EventoWebhook.objects.exists())
+
+    def test_contrato_proprio_pede_conferencia(self):
+        resposta = self._confirmar(payment_id="888", external_reference=str(self.contrato.id))
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.data["contrato"], self.contrato.id)
+        self.assertTrue(EventoWebhook.objects.filter(tipo="payment", payment_id="888").exists())
+
+    def test_payment_id_invalido(self):
+        resposta = self._confirmar(payment_id="1 OR 1=1", external_reference=str(self.contrato.id))
+        self.assertEqual(resposta.status_code, 400)
+        self.assertFalse(EventoWebhook.objects.exists())
+
+    def test_status_de_pagamento_alheio(self):
+        pagamento = Pagamento.objects.get(contrato=self.alheio)
+        self.assertEqual(self.client.get(f"/api/pagamentos/{pagamento.id}/status/", secure=True).status_code, 404)
+
+        resposta = self.client.get("/api/pagamentos/consultar-status-mp/", {"payment_id": "777"}, secure=True)
+        self.assertEqual(resposta.status_code, 202)
+        self.assertNotIn("local", resposta.data)
+        self.assertFalse(EventoWebhook.objects.exists())
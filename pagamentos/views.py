@@ -4,28 +4,42 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from django.db.models import Q
-from django.http import JsonResponse, HttpResponse
+from django.http import Http404, JsonResponse, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 from django.shortcuts import redirect
 
+import hashlib
+import hmac
 import logging
 import json
 import re
 
 from .models import Pagamento
 from .serializers import PagamentoSerializer
+from usuarios.serializers import prefetch_usuario
 from .permissoes import PermissaoPagamento
 from services.mercadopago import MercadoPagoService
-from notificacoes.utils import enviar_notificacao
+from .reconciliacao import desatualizado
+from .sincronizacao import aplicar_status_mp
+from .tarefas import registrar_evento_webhook
 
 logger = logging.getLogger(__name__)
 
+# Ids de pagamento do Mercado Pago são numéricos; o limite cabe em EventoWebhook.payment_id
+PAYMENT_ID_MP = re.compile(r"^\d{1,20}$")
+
+
+def payment_id_valido(valor):
+    return bool(valor) and PAYMENT_ID_MP.match(str(valor)) is not None
+
 
 class PagamentoViewSet(viewsets.ModelViewSet):
     """
     CRUD de Pagamento + integração com Mercado Pago (Checkout Pro).
     Checkout Pro cria a preferência e o webhook confirma os pagamentos.
+    As rotas de status servem o Pagamento local (conferido pelo webhook e pela
+    reconciliação, ver sincronizado_em); não consultam o MP na requisição.
     """
     queryset = Pagamento.objects.all()
     serializer_class = PagamentoSerializer
@@ -33,9 +47,14 @@ class PagamentoViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
+        base = (
+            Pagamento.objects
+            .select_related("contratante", "contrato")
+            .prefetch_related(*prefetch_usuario("contratante"))
+        )
         if user.is_superuser:
-            return Pagamento.objects.all()
-        return Pagamento.objects.filter(
+            return base
+        return base.filter(
             Q(contratante=user) |
             Q(contrato__contratante=user) |
             Q(contrato__freelancer=user)
@@ -122,106 +141,81 @@ class PagamentoViewSet(viewsets.ModelViewSet):
     def confirmar_retorno(self, request):
         """
         Recebe payment_id/external_reference do front após o redirect.
-        Consulta o Mercado Pago e atualiza ou cria o pagamento local.
+        Devolve o pagamento local, se já existir, e pede à fila a conferência
+        do payment_id no Mercado Pago (o mesmo caminho do webhook). A conferência
+        só é pedida para pagamentos ou contratos do próprio contratante.
         """
-        mp_id = (request.data.get("payment_id") or "").strip()
-        ext_ref = (request.data.get("external_reference") or "").strip()
+        mp_id = str(request.data.get("payment_id") or "").strip()
+        ext_ref = str(request.data.get("external_reference") or "").strip()
 
         if not mp_id and not ext_ref:
             return Response({"erro": "Informe payment_id ou external_reference."}, status=400)
+        if mp_id and not payment_id_valido(mp_id):
+            return Response({"erro": "payment_id inválido."}, status=400)
 
-        mp = MercadoPagoService()
-        info = mp.consultar_pagamento(mp_id) if mp_id else None
+        from contratos.models import Contrato
 
-        if not info:
-            return Response({"ok": True, "status": "aguardando_webhook"}, status=200)
+        pagamento = None
+        if mp_id:
+            pagamento = self.get_queryset().filter(mercadopago_payment_id=mp_id).order_by("-id").first()
+        if pagamento is None and ext_ref.isdigit():
+            pagamento = self.get_queryset().filter(contrato__id=ext_ref).order_by("-id").first()
 
-        pagamento = Pagamento.objects.filter(mercadopago_payment_id=str(info["payment_id"])).first()
+        if mp_id:
+            if pagamento is not None:
+                pedir = pagamento.mercadopago_payment_id != mp_id or desatualizado(pagamento)
+            else:
+                # Sem Pagamento local: o external_reference precisa ser um contrato do usuário
+                pedir = ext_ref.isdigit() and Contrato.objects.filter(id=ext_ref, contratante=request.user).exists()
+            if pedir:
+                registrar_evento_webhook("payment", mp_id, {"origem": "retorno"})
 
         if not pagamento:
-            from contratos.models import Contrato
-            contrato = None
-            try:
-                contrato = Contrato.objects.get(id=int(info["external_reference"]))
-            except Exception:
-                pass
-
-            if not contrato:
-                return Response({"erro": "Pagamento no MP não referencia um contrato válido."}, status=404)
-
-            pagamento = Pagamento.objects.create(
-                contrato=contrato,
-                contratante=contrato.contratante,
-                valor=info.get("transaction_amount") or contrato.valor,
-                metodo='checkout_pro',
-                status=mp.mapear_status_mp_para_local(info['status']),
-                mercadopago_payment_id=str(info["payment_id"]),
-            )
-        else:
-            pagamento.status = mp.mapear_status_mp_para_local(info['status'])
-            pagamento.save()
-
-        if pagamento.status == 'aprovado':
-            self._concluir_contrato(pagamento.contrato)
+            return Response({"ok": True, "status": "aguardando_webhook"}, status=200)
 
         return Response(PagamentoSerializer(pagamento, context={"request": request}).data, status=200)
 
     # CONSULTAR STATUS
+    def _pedir_sincronizacao(self, pagamento):
+        """Pagamento em aberto e desatualizado: pede a conferência no MP à fila, sem esperar."""
+        if pagamento.mercadopago_payment_id and desatualizado(pagamento):
+            registrar_evento_webhook("payment", pagamento.mercadopago_payment_id, {"origem": "consulta"})
+
+    def _status_por_payment_id(self, payment_id_mp):
+        pagamento = self.get_queryset().filter(mercadopago_payment_id=payment_id_mp).order_by("-id").first()
+        if not pagamento:
+            # Ainda sem registro local: o webhook ou confirmar_retorno pedem a consulta ao MP
+            return Response({"status": "aguardando_sincronizacao", "payment_id": payment_id_mp}, status=202)
+
+        self._pedir_sincronizacao(pagamento)
+        serializer = self.get_serializer(pagamento)
+        return Response({"fonte": "local", "local": serializer.data}, status=200)
+
     @action(detail=True, methods=['get'], url_path='status')
     def consultar_status(self, request, pk=None):
         """
-        Consulta status do pagamento.
-        - Se vier ?payment_id= (id do Mercado Pago), consulta o MP,
-          tenta reconciliar com o Pagamento local via external_reference e sincroniza.
-        - Se não vier payment_id, mantém o comportamento antigo (busca por PK local).
+        Consulta status do pagamento (estado local; sincronizado_em indica a
+        última conferência no Mercado Pago).
+        - Se vier ?payment_id= (id do Mercado Pago), procura o Pagamento local
+          com esse id; sem ele, responde 202 (o webhook ainda vai sincronizar).
+        - Se não vier payment_id, busca por PK local.
         """
         try:
             payment_id_mp = request.query_params.get("payment_id")
-
-            # Consulta por payment_id do MP
             if payment_id_mp:
-                mp = MercadoPagoService()
-                info = mp.consultar_pagamento(payment_id_mp)
-                if not info:
-                    return Response({"detail": "Pagamento não encontrado no Mercado Pago."}, status=404)
-
-                # Tenta resolver o Pagamento local
-                extref = info.get("external_reference")
-                pagamento = None
-                if extref:
-                    pagamento = self.get_queryset().filter(contrato__id=extref).order_by("-id").first()
-
-                # Se ainda não existir registro local, devolve dados do MP
-                if not pagamento:
-                    return Response({"fonte": "mercado_pago", "mp": info}, status=200)
-
-                # Sincroniza status local
-                novo = mp.mapear_status_mp_para_local(info["status"])
-                if novo != pagamento.status:
-                    pagamento.status = novo
-                    pagamento.mercadopago_payment_id = str(info.get("payment_id") or payment_id_mp)
-                    pagamento.save(update_fields=["status", "mercadopago_payment_id"])
-                    if novo == 'aprovado':
-                        self._concluir_contrato(pagamento.contrato)
-
-                serializer = self.get_serializer(pagamento)
-                return Response({"fonte": "local+mp", "local": serializer.data, "mp": info}, status=200)
+                if not payment_id_valido(payment_id_mp):
+                    return Response({"detail": "payment_id inválido."}, status=400)
+                return self._status_por_payment_id(payment_id_mp)
 
             pagamento = self.get_object()
-            if pagamento.mercadopago_payment_id:
-                mp = MercadoPagoService()
-                info = mp.consultar_pagamento(pagamento.mercadopago_payment_id)
-                if info:
-                    novo = mp.mapear_status_mp_para_local(info['status'])
-                    if novo != pagamento.status:
-                        pagamento.status = novo
-                        pagamento.save(update_fields=["status"])
-                        if novo == 'aprovado':
-                            self._concluir_contrato(pagamento.contrato)
+            self._pedir_sincronizacao(pagamento)
 
             serializer = self.get_serializer(pagamento)
             return Response(serializer.data, status=200)
 
+        except Http404:
+            # Pagamento inexistente ou de outro usuário
+            raise
         except Exception:
             logger.exception("Erro ao consultar status")
             return Response({"erro": "Erro ao consultar status do pagamento"}, status=500)
@@ -235,47 +229,10 @@ class PagamentoViewSet(viewsets.ModelViewSet):
         payment_id_mp = request.query_params.get("payment_id")
         if not payment_id_mp:
             return Response({"detail": "payment_id é obrigatório."}, status=400)
+        if not payment_id_valido(payment_id_mp):
+            return Response({"detail": "payment_id inválido."}, status=400)
 
-        mp = MercadoPagoService()
-        info = mp.consultar_pagamento(payment_id_mp)
-        if not info:
-            return Response({"detail": "Pagamento não encontrado no Mercado Pago."}, status=404)
-
-        # Tenta reconciliar com o local
-        extref = info.get("external_reference")
-        pagamento = self.get_queryset().filter(contrato__id=extref).order_by("-id").first() if extref else None
-
-        if pagamento:
-            novo = mp.mapear_status_mp_para_local(info['status'])
-            if novo != pagamento.status:
-                pagamento.status = novo
-                pagamento.mercadopago_payment_id = str(info.get("payment_id") or payment_id_mp)
-                pagamento.save(update_fields=["status", "mercadopago_payment_id"])
-                if novo == 'aprovado':
-                    self._concluir_contrato(pagamento.contrato)
-
-            serializer = self.get_serializer(pagamento)
-            return Response({"fonte": "local+mp", "local": serializer.data, "mp": info}, status=200)
-
-        return Response({"fonte": "mp", "mp": info}, status=200)
-
-    # Helper interno
-    def _concluir_contrato(self, contrato):
-        contrato.status = "concluido"
-        contrato.trabalho.status = "concluido"
-        contrato.trabalho.save()
-        contrato.save()
-        enviar_notificacao(
-            usuario=contrato.contratante,
-            mensagem=f"O contrato do trabalho '{contrato.trabalho.titulo}' foi concluído após o pagamento.",
-            link=f"/contratos/{contrato.id}"
-        )
-        enviar_notificacao(
-            usuario=contrato.freelancer,
-            mensagem=f"O contrato do trabalho '{contrato.trabalho.titulo}' foi concluído após o pagamento.",
-            link=f"/contratos/{contrato.id}"
-        )
-
+        return self._status_por_payment_id(payment_id_mp)
 
 # Retorno do Checkout Pro
 def mercadopago_retorno(request):
@@ -288,71 +245,71 @@ def mercadopago_retorno(request):
 
 
 # Webhook Mercado Pago
+def _assinatura_valida(request, data_id):
+    """
+    Confere o cabeçalho x-signature ("ts=...,v1=...") do Mercado Pago: HMAC-SHA256
+    com MP_WEBHOOK_SECRET de "id:{data.id};request-id:{x-request-id};ts:{ts};"
+    (partes ausentes ficam de fora). Sem segredo configurado só passa em DEBUG.
+    """
+    segredo = settings.MP_WEBHOOK_SECRET
+    if not segredo:
+        if not settings.DEBUG:
+            logger.error("Webhook MP recusado: MP_WEBHOOK_SECRET não configurado")
+        return settings.DEBUG
+
+    partes = dict(
+        item.strip().split("=", 1)
+        for item in request.headers.get("x-signature", "").split(",")
+        if "=" in item
+    )
+    ts, recebido = partes.get("ts"), partes.get("v1")
+    if not ts or not recebido:
+        return False
+
+    manifesto = ""
+    if data_id:
+        manifesto += f"id:{data_id.lower()};"
+    if request.headers.get("x-request-id"):
+        manifesto += f"request-id:{request.headers['x-request-id']};"
+    manifesto += f"ts:{ts};"
+    esperado = hmac.new(segredo.encode(), manifesto.encode(), hashlib.sha256).hexdigest()
+    return hmac.compare_digest(esperado.encode(), recebido.encode())
+
+
 @csrf_exempt
 def mercadopago_webhook(request):
     if request.method != "POST":
         return HttpResponse(status=405)
 
+    # O MP assina o data.id da query string; o corpo repete o mesmo id
+    if not _assinatura_valida(request, request.GET.get("data.id", "")):
+        logger.warning("❌ Webhook MP: assinatura inválida")
+        return JsonResponse({"error": "Assinatura inválida"}, status=401)
+
     try:
         data = json.loads(request.body or "{}")
     except json.JSONDecodeError:
         logger.error("❌ Webhook MP: JSON inválido")
         return JsonResponse({"error": "JSON inválido"}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({"error": "JSON inválido"}, status=400)
 
     logger.info("🔔 Webhook recebido: %s", json.dumps(data, ensure_ascii=False)[:500])
 
     tipo = data.get("type") or data.get("action") or ""
-    payment_id = str(data.get("data", {}).get("id") or "")
+    corpo = data.get("data") if isinstance(data.get("data"), dict) else {}
+    payment_id = str(corpo.get("id") or "")
 
     if not payment_id:
-        resource = data.get("resource") or ""
+        resource = str(data.get("resource") or "")
         m = re.search(r'/v1/payments/(\d+)', resource)
         if m:
             payment_id = m.group(1)
 
-    if ("payment" in str(tipo).lower()) and payment_id:
-        mp = MercadoPagoService()
-        info = mp.consultar_pagamento(payment_id)
-        if not info:
-            return JsonResponse({"status": "ok"}, status=200)
-
-        pagamento = Pagamento.objects.filter(mercadopago_payment_id=str(payment_id)).first()
-
-        if not pagamento:
-            from contratos.models import Contrato
-            contrato = None
-            try:
-                contrato = Contrato.objects.get(id=int(info.get("external_reference")))
-            except Exception:
-                pass
-
-            if contrato:
-                status_local = mp.mapear_status_mp_para_local(info['status'])
-                pagamento = Pagamento.objects.create(
-                    contrato=contrato,
-                    contratante=contrato.contratante,
-                    valor=info.get("transaction_amount") or contrato.valor,
-                    metodo='checkout_pro',
-                    status=status_local,
-                    mercadopago_payment_id=str(payment_id),
-                )
-            else:
-                return JsonResponse({"status": "ok"}, status=200)
-
-        status_antigo = pagamento.status
-        pagamento.status = mp.mapear_status_mp_para_local(info['status'])
-        pagamento.save()
-
-        if pagamento.status == 'aprovado' and status_antigo != 'aprovado':
-            contrato = pagamento.contrato
-            if contrato.status != "concluido":
-                PagamentoViewSet()._concluir_contrato(contrato)
-        elif pagamento.status == 'rejeitado' and status_antigo != 'rejeitado':
-            enviar_notificacao(
-                usuario=pagamento.contrato.contratante,
-                mensagem=f"O pagamento do contrato '{pagamento.contrato.trabalho.titulo}' foi rejeitado. Tente novamente.",
-                link=f"/contratos/{pagamento.contrato.id}/pagamento"
-            )
+    # Grava o evento e responde já; consulta ao MP e sincronização ficam com a fila.
+    # Só notificações de pagamento com id numérico: o resto não vira linha nem consulta
+    if "payment" in str(tipo).lower() and payment_id_valido(payment_id):
+        registrar_evento_webhook("payment", payment_id, data)
 
     return JsonResponse({"status": "ok"}, status=200)
 
@@ -370,34 +327,9 @@ def force_approve_payment(request, pagamento_id: int):
     if not info:
         return Response({"erro": f"Pagamento {mp_id} não encontrado no Mercado Pago."}, status=404)
 
-    pagamento = Pagamento.objects.filter(mercadopago_payment_id=mp_id).first()
-
+    pagamento = aplicar_status_mp(info, status='aprovado')
     if not pagamento:
-        from contratos.models import Contrato
-        contrato = None
-        try:
-            contrato = Contrato.objects.get(id=int(info.get("external_reference")))
-        except Exception:
-            pass
-
-        if not contrato:
-            return Response({"erro": "Não há Pagamento local e o external_reference não mapeia um contrato."}, status=404)
-
-        pagamento = Pagamento.objects.create(
-            contrato=contrato,
-            contratante=contrato.contratante,
-            valor=info.get("transaction_amount") or contrato.valor,
-            metodo='checkout_pro',
-            status='pendente',
-            mercadopago_payment_id=mp_id,
-        )
-
-    status_antigo = pagamento.status
-    pagamento.status = 'aprovado'
-    pagamento.save()
-
-    if status_antigo != 'aprovado':
-        PagamentoViewSet()._concluir_contrato(pagamento.contrato)
+        return Response({"erro": "Não há Pagamento local e o external_reference não mapeia um contrato."}, status=404)
 
     return Response({
         "ok": True,
@@ -19,11 +19,11 @@ class PermissaoProposta(BasePermission):
         # Leitura (GET, HEAD, OPTIONS):
         # O contratante dono do trabalho ou o freelancer autor da proposta podem ver.
         if request.method in SAFE_METHODS:
-            return obj.trabalho.contratante == user or obj.freelancer == user
+            return user.id in (obj.trabalho.contratante_id, obj.freelancer_id)
 
         # Ações específicas (ex: alterar_status)
         if hasattr(view, "action") and view.action == "alterar_status":
-            return obj.trabalho.contratante == user
+            return obj.trabalho.contratante_id == user.id
 
         # Escrita geral (PATCH, PUT, DELETE): apenas freelancer autor da proposta
-        return obj.freelancer == user
+        return obj.freelancer_id == user.id
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from datetime import date
 from .models import Proposta
+from moderacao.filtro import validar_texto
 
 MAX_ENVIOS_POR_TRABALHO = 3
 
@@ -22,6 +23,12 @@ class PropostaSerializer(serializers.ModelSerializer):
         ]
 
     # VALIDAÇÕES DE CAMPOS
+    def validate_descricao(self, value):
+        return validar_texto(value, "A descrição contém palavras ofensivas ou inapropriadas.")
+
+    def validate_motivo_revisao(self, value):
+        return validar_texto(value, "O motivo da revisão contém palavras ofensivas ou inapropriadas.")
+
     def validate_valor(self, value):
         if value is None or value <= 0:
             raise serializers.ValidationError("O valor deve ser maior que zero.")
@@ -110,6 +117,14 @@ class PropostaSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
+class PropostaResumoSerializer(serializers.ModelSerializer):
+    """Resumo da proposta para listagens aninhadas."""
+    class Meta:
+        model = Proposta
+        fields = ["id", "valor", "prazo_estimado", "status", "numero_envio"]
+        read_only_fields = fields
+
+
 class AlterarStatusSerializer(serializers.Serializer):
     """Serializer para endpoint de alteração de status com motivo de recusa."""
     status = serializers.ChoiceField(choices=["aceita", "recusada"])
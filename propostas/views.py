@@ -9,6 +9,7 @@ from .models import Proposta
 from .serializers import PropostaSerializer, AlterarStatusSerializer
 from .permissoes import PermissaoProposta
 from notificacoes.utils import enviar_notificacao
+from usuarios.resumo import invalidar_resumo
 
 
 class PropostaViewSet(viewsets.ModelViewSet):
@@ -212,10 +213,14 @@ class PropostaViewSet(viewsets.ModelViewSet):
                 proposta_ref.save(update_fields=["status"])
 
                 # Recusa todas as outras pendentes do mesmo trabalho
-                Proposta.objects.filter(
+                recusadas = Proposta.objects.filter(
                     trabalho=proposta_ref.trabalho,
                     status="pendente",
-                ).exclude(id=proposta_ref.id).update(status="recusada")
+                ).exclude(id=proposta_ref.id)
+                # update() não dispara sinais: descarta o resumo desses freelancers
+                freelancers_recusados = list(recusadas.values_list("freelancer_id", flat=True))
+                recusadas.update(status="recusada")
+                transaction.on_commit(lambda: invalidar_resumo(*freelancers_recusados))
 
                 # Atualiza status do trabalho
                 trabalho = proposta_ref.trabalho
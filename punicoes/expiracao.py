@@ -0,0 +1,87 @@
+"""
+Expiração das suspensões administrativas vencidas (comando expirar_suspensoes).
+Substitui a limpeza que era feita no ModoLeituraMiddleware a cada requisição:
+aqui tudo é feito em lotes, com UPDATEs em massa e notificações em bulk.
+"""
+import logging
+import time
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from notificacoes.utils import enviar_notificacoes_em_massa
+from usuarios.estado import esquecer_versoes, invalidar_estado
+from usuarios.models import Usuario
+
+from .models import Punicao
+
+logger = logging.getLogger(__name__)
+
+MENSAGEM_FIM_SUSPENSAO = "Sua suspensão terminou. Sua conta foi liberada novamente."
+
+
+def _expirar_lote(agora, tamanho_lote):
+    """Expira um lote de usuários; retorna os IDs efetivamente liberados."""
+    with transaction.atomic():
+        qs = (
+            Usuario.objects
+            .filter(is_suspended_admin=True, suspenso_ate__lte=agora)
+            .order_by("id")
+        )
+        # Com SKIP LOCKED, duas execuções simultâneas não disputam os mesmos usuários
+        if connection.features.has_select_for_update_skip_locked:
+            qs = qs.select_for_update(skip_locked=True)
+        ids = list(qs.values_list("id", flat=True)[:tamanho_lote])
+        if not ids:
+            return []
+
+        Usuario.objects.filter(id__in=ids).update(
+            is_suspended_admin=False,
+            suspenso_ate=None,
+            motivo_suspensao_admin=None,
+            # claims "rst" dos tokens atuais ainda dizem "suspenso"
+            token_version=F("token_version") + 1,
+        )
+        Punicao.objects.filter(
+            usuario_punido_id__in=ids, tipo="suspensao", ativo=True
+        ).update(ativo=False)
+
+        enviar_notificacoes_em_massa(ids, MENSAGEM_FIM_SUSPENSAO, link="/conta")
+
+    # Caches só depois do commit: ninguém relê o estado antigo do banco
+    esquecer_versoes(ids)
+    for usuario_id in ids:
+        invalidar_estado(usuario_id)
+    return ids
+
+
+def expirar_suspensoes(tamanho_lote=500):
+    """
+    Libera todos os usuários com suspensão vencida e desativa as punições
+    correspondentes. Retorna as métricas da varredura.
+    """
+    inicio = time.perf_counter()
+    agora = timezone.now()
+    usuarios = lotes = 0
+
+    while True:
+        ids = _expirar_lote(agora, tamanho_lote)
+        if not ids:
+            break
+        usuarios += len(ids)
+        lotes += 1
+
+    # Punições de suspensão vencidas que ficaram ativas (usuário liberado por outro caminho)
+    punicoes = Punicao.objects.filter(
+        tipo="suspensao", ativo=True, valido_ate__lte=agora
+    ).update(ativo=False)
+
+    metricas = {
+        "usuarios_liberados": usuarios,
+        "punicoes_encerradas": punicoes,
+        "lotes": lotes,
+        "duracao_s": round(time.perf_counter() - inicio, 3),
+    }
+    logger.info("Varredura de suspensões: %s", metricas)
+    return metricas
@@ -0,0 +1,46 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from freelancer.processos import exigir_estado_compartilhado
+from punicoes.expiracao import expirar_suspensoes
+
+
+class Command(BaseCommand):
+    help = "Libera os usuários com suspensão vencida e encerra as punições correspondentes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=500, help="Usuários atualizados por UPDATE.")
+        parser.add_argument("--loop", action="store_true", help="Executa continuamente (agendador).")
+        parser.add_argument("--intervalo", type=float, default=60.0, help="Espera (s) entre varreduras no modo --loop.")
+
+    def handle(self, *args, **options):
+        if not options["loop"]:
+            self._varrer(options["lote"], sempre=True)
+            return
+
+        exigir_estado_compartilhado("expirar_suspensoes --loop")
+        self._parar = False
+        signal.signal(signal.SIGTERM, self._sinal_parada)
+        signal.signal(signal.SIGINT, self._sinal_parada)
+
+        self.stdout.write("Varredura de suspensões iniciada.")
+        while not self._parar:
+            close_old_connections()
+            self._varrer(options["lote"])
+            time.sleep(options["intervalo"])
+        self.stdout.write("Varredura de suspensões encerrada.")
+
+    def _varrer(self, lote, sempre=False):
+        metricas = expirar_suspensoes(tamanho_lote=lote)
+        if sempre or metricas["usuarios_liberados"] or metricas["punicoes_encerradas"]:
+            self.stdout.write(
+                f"{metricas['usuarios_liberados']} usuários liberados, "
+                f"{metricas['punicoes_encerradas']} punições encerradas "
+                f"({metricas['lotes']} lotes, {metricas['duracao_s']}s)."
+            )
+
+    def _sinal_parada(self, signum, frame):
+        self._parar = True
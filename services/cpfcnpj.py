@@ -1,84 +1,186 @@
+import datetime
+import hashlib
+import hmac
+import time
+
 import requests
 from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from services.http import cliente
+
+# Espera por uma consulta igual em andamento (single-flight), em segundos entre verificações
+INTERVALO_ESPERA = 0.2
 
 class CPF_CNPJValidationError(Exception):
     """Erro personalizado para falhas de validação de documentos"""
     pass
 
-def validar_cpf(cpf: str):
+# Dígitos verificadores (sem rede)
+def cpf_valido(cpf: str) -> bool:
+    if len(cpf) != 11 or not cpf.isdigit() or cpf == cpf[0] * 11:
+        return False
+    for n in (9, 10):
+        soma = sum(int(cpf[i]) * (n + 1 - i) for i in range(n))
+        if soma * 10 % 11 % 10 != int(cpf[n]):
+            return False
+    return True
+
+def cnpj_valido(cnpj: str) -> bool:
+    if len(cnpj) != 14 or not cnpj.isdigit() or cnpj == cnpj[0] * 14:
+        return False
+    for n in (12, 13):
+        pesos = list(range(n - 7, 1, -1)) + list(range(9, 1, -1))
+        resto = sum(int(d) * p for d, p in zip(cnpj, pesos)) % 11
+        if (0 if resto < 2 else 11 - resto) != int(cnpj[n]):
+            return False
+    return True
+
+# Consulta na API
+def _consultar_api(tipo: str, numero: str):
     """
-    Consulta API CPF e retorna (ok: bool, dados|mensagem: dict|str)
-    Pacote C retorna: status (1=válido, 0=inválido), nome, nascimento, mae, genero
+    Retorna (ok, dados|mensagem, definitivo). definitivo=False para falhas da
+    API (rede, 5xx, circuito aberto), que não podem ir para o cache.
     """
-    url = f"{settings.CPF_CNPJ_API_BASE}/{settings.CPF_CNPJ_TOKEN}/{settings.CPF_CNPJ_PACOTE_CPF_C}/{cpf}"
+    rotulo = tipo.upper()
+    pacote = settings.CPF_CNPJ_PACOTE_CPF_C if tipo == "cpf" else settings.CPF_CNPJ_PACOTE_CNPJ_C
+    url = f"{settings.CPF_CNPJ_API_BASE}/{settings.CPF_CNPJ_TOKEN}/{pacote}/{numero}"
     try:
-        resp = requests.get(url, timeout=settings.CPF_CNPJ_TIMEOUT)
+        resp = cliente("cpfcnpj").get(url)
         resp.raise_for_status()
         data = resp.json()
-        
+
         # Verifica campo "status" (1 = válido, 0 = inválido)
         status = data.get("status")
         if status == 1:
-            return True, data
+            return True, data, True
         elif status == 0:
-            return False, "CPF inválido ou não encontrado na base da Receita Federal."
+            return False, f"{rotulo} inválido ou não encontrado na base da Receita Federal.", True
         else:
-            # Se não tem status mas tem nome, considera válido
-            if data.get("nome"):
-                return True, data
-            return False, "CPF não encontrado na base da Receita Federal."
-    
+            # Se não tem status mas tem nome/razão social, considera válido
+            if data.get("nome") or data.get("razao_social") or data.get("nome_fantasia"):
+                return True, data, True
+            return False, f"{rotulo} não encontrado na base da Receita Federal.", True
+
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 404:
-            return False, "CPF não encontrado na base da Receita Federal."
-        return False, f"Erro ao validar CPF: Status {e.response.status_code}"
+            return False, f"{rotulo} não encontrado na base da Receita Federal.", True
+        return False, f"Erro ao validar {rotulo}: Status {e.response.status_code}", False
     except Exception as e:
-        return False, f"Erro ao validar CPF: {str(e)}"
+        return False, f"Erro ao validar {rotulo}: {str(e)}", False
+
+def validar_cpf(cpf: str):
+    """
+    Consulta API CPF e retorna (ok: bool, dados|mensagem: dict|str)
+    Pacote C retorna: status (1=válido, 0=inválido), nome, nascimento, mae, genero
+    """
+    ok, resultado, _ = _consultar_api("cpf", cpf)
+    return ok, resultado
 
 def validar_cnpj(cnpj: str):
     """
     Consulta API CNPJ e retorna (ok: bool, dados|mensagem: dict|str)
     Pacote C retorna: razao_social, nome_fantasia, etc.
     """
-    url = f"{settings.CPF_CNPJ_API_BASE}/{settings.CPF_CNPJ_TOKEN}/{settings.CPF_CNPJ_PACOTE_CNPJ_C}/{cnpj}"
+    ok, resultado, _ = _consultar_api("cnpj", cnpj)
+    return ok, resultado
+
+# Cache persistente (usuarios.ValidacaoDocumento)
+def _hash_documento(tipo: str, numero: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), f"{tipo}:{numero}".encode(), hashlib.sha256).hexdigest()
+
+def _resultado_em_cache(documento_hash: str):
+    """(ok, mensagem) ainda no prazo, ou None. Olha primeiro o cache do Django (consultas recém-feitas)."""
+    from usuarios.models import ValidacaoDocumento
+
+    resultado = cache.get(f"cpfcnpj:resultado:{documento_hash}")
+    if resultado is not None:
+        return resultado
+    return (
+        ValidacaoDocumento.objects
+        .filter(documento_hash=documento_hash, expira_em__gt=timezone.now())
+        .values_list("valido", "mensagem")
+        .first()
+    )
+
+def _guardar_resultado(documento_hash: str, tipo: str, ok: bool, mensagem: str):
+    from usuarios.models import ValidacaoDocumento
+
+    if ok:
+        validade = datetime.timedelta(days=settings.CPF_CNPJ_CACHE_VALIDO_DIAS)
+    else:
+        validade = datetime.timedelta(hours=settings.CPF_CNPJ_CACHE_INVALIDO_HORAS)
+
+    # Quem espera a mesma consulta lê daqui: a linha pode estar numa transação ainda aberta
+    cache.set(f"cpfcnpj:resultado:{documento_hash}", (ok, mensagem), timeout=60)
     try:
-        resp = requests.get(url, timeout=settings.CPF_CNPJ_TIMEOUT)
-        resp.raise_for_status()
-        data = resp.json()
-        
-        # Verifica campo "status" (1 = válido, 0 = inválido)
-        status = data.get("status")
-        if status == 1:
-            return True, data
-        elif status == 0:
-            return False, "CNPJ inválido ou não encontrado na base da Receita Federal."
-        else:
-            # Se não tem status mas tem razão social, considera válido
-            if data.get("razao_social") or data.get("nome_fantasia"):
-                return True, data
-            return False, "CNPJ não encontrado na base da Receita Federal."
-    
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 404:
-            return False, "CNPJ não encontrado na base da Receita Federal."
-        return False, f"Erro ao validar CNPJ: Status {e.response.status_code}"
-    except Exception as e:
-        return False, f"Erro ao validar CNPJ: {str(e)}"
+        with transaction.atomic():
+            ValidacaoDocumento.objects.update_or_create(
+                documento_hash=documento_hash,
+                defaults={"tipo": tipo, "valido": ok, "mensagem": mensagem[:255], "expira_em": timezone.now() + validade},
+            )
+    except IntegrityError:
+        # Outro processo gravou o mesmo documento ao mesmo tempo
+        pass
+
+def _consultar_com_cache(tipo: str, numero: str):
+    """
+    (ok, dados|mensagem), passando pelo cache. Consultas simultâneas do mesmo
+    documento (ex.: duplo clique no cadastro) viram uma só: quem pega a trava
+    consulta a API e os demais esperam o resultado dela.
+    Resultados vindos do cache não trazem os dados da Receita (não são guardados).
+    """
+    documento_hash = _hash_documento(tipo, numero)
+    resultado = _resultado_em_cache(documento_hash)
+    if resultado is not None:
+        ok, mensagem = resultado
+        return ok, ({} if ok else mensagem)
+
+    trava = f"cpfcnpj:consulta:{documento_hash}"
+    espera = settings.HTTP_TIMEOUT_CONEXAO + settings.CPF_CNPJ_TIMEOUT + 1
+    dono = cache.add(trava, 1, timeout=espera)
+    if not dono:
+        prazo = time.monotonic() + espera
+        while time.monotonic() < prazo:
+            time.sleep(INTERVALO_ESPERA)
+            resultado = _resultado_em_cache(documento_hash)
+            if resultado is not None:
+                ok, mensagem = resultado
+                return ok, ({} if ok else mensagem)
+            if cache.get(trava) is None:
+                # A outra consulta falhou sem resultado: consulta aqui mesmo
+                break
+
+    try:
+        ok, resultado, definitivo = _consultar_api(tipo, numero)
+        if definitivo:
+            _guardar_resultado(documento_hash, tipo, ok, "" if ok else resultado)
+        return ok, resultado
+    finally:
+        if dono:
+            cache.delete(trava)
 
 def consultar_documento(numero: str, pacote_id: int):
     """
     Consulta genérica (compatível com serializers.py).
     Decide se vai validar CPF ou CNPJ com base no pacote.
+    Dígitos verificadores errados são recusados sem chamar a API.
     """
     numero = numero.strip()
     if pacote_id == settings.CPF_CNPJ_PACOTE_CPF_C:
-        ok, result = validar_cpf(numero)
+        if not cpf_valido(numero):
+            raise CPF_CNPJValidationError("CPF inválido.")
+        ok, result = _consultar_com_cache("cpf", numero)
     elif pacote_id == settings.CPF_CNPJ_PACOTE_CNPJ_C:
-        ok, result = validar_cnpj(numero)
+        if not cnpj_valido(numero):
+            raise CPF_CNPJValidationError("CNPJ inválido.")
+        ok, result = _consultar_com_cache("cnpj", numero)
     else:
         raise CPF_CNPJValidationError(f"Pacote {pacote_id} não suportado.")
-    
+
     if not ok:
         raise CPF_CNPJValidationError(result)
-    
-    return result
\ No newline at end of file
+
+    return result
@@ -0,0 +1,211 @@
+"""
+Clientes HTTP compartilhados para os serviços externos (Mercado Pago, API de
+CPF/CNPJ, SendGrid).
+
+Cada serviço tem um ClienteHttp por processo, criado no primeiro uso por
+cliente(nome). Ele traz:
+- requests.Session com pool e keep-alive, para não repetir o handshake TLS a
+  cada chamada;
+- timeouts de conexão e leitura próprios do serviço;
+- circuit breaker: depois de HTTP_CIRCUITO_FALHAS falhas seguidas, as chamadas
+  falham na hora com CircuitoAberto durante HTTP_CIRCUITO_ABERTO segundos, e
+  então uma chamada de teste decide se o circuito fecha;
+- retentativas com backoff, limitadas por chamada (HTTP_RETENTATIVAS) e por um
+  orçamento de retentativas do processo (HTTP_ORCAMENTO_RETENTATIVAS), para não
+  multiplicar a carga num serviço que já está caindo.
+
+Só métodos idempotentes (GET/HEAD) são repetidos após resposta 429/5xx ou
+conexão perdida; POST só quando a conexão nem chegou a abrir. Timeout de
+leitura nunca é repetido, então o pior caso fica perto de um timeout só.
+O tempo de cada tentativa vai para os histogramas de monitoramento.instrumentacao.
+"""
+import logging
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from monitoramento.instrumentacao import medir_http, registrar_evento_http
+
+logger = logging.getLogger(__name__)
+
+# Serviço -> setting com o timeout de leitura (s)
+SERVICOS = {
+    "mercadopago": "MERCADOPAGO_TIMEOUT",
+    "cpfcnpj": "CPF_CNPJ_TIMEOUT",
+    "sendgrid": "SENDGRID_TIMEOUT",
+}
+
+STATUS_REPETIVEIS = {429, 500, 502, 503, 504}
+METODOS_IDEMPOTENTES = {"GET", "HEAD"}
+BACKOFF_BASE = 0.2  # segundos; dobra a cada tentativa, com jitter
+JANELA_ORCAMENTO = 10  # segundos considerados pelo orçamento de retentativas
+RETENTATIVAS_MINIMAS = 3  # por janela, mesmo com pouco tráfego
+
+
+class CircuitoAberto(requests.exceptions.ConnectionError):
+    """O serviço falhou demais há pouco; a chamada nem foi feita."""
+
+
+class Circuito:
+    """Circuit breaker simples: fechado -> aberto -> meio-aberto (uma chamada de teste)."""
+
+    def __init__(self, nome, falhas_para_abrir, segundos_aberto):
+        self.nome = nome
+        self.falhas_para_abrir = falhas_para_abrir
+        self.segundos_aberto = segundos_aberto
+        self._lock = threading.Lock()
+        self._falhas = 0
+        self._aberto_ate = 0.0
+        self._testando = False
+
+    def liberar(self):
+        """Levanta CircuitoAberto se a chamada não deve ser feita agora."""
+        with self._lock:
+            if self._falhas < self.falhas_para_abrir:
+                return
+            if time.monotonic() < self._aberto_ate or self._testando:
+                raise CircuitoAberto(f"Serviço {self.nome} indisponível no momento. Tente novamente em instantes.")
+            # Meio-aberto: só esta chamada passa até sabermos se o serviço voltou
+            self._testando = True
+
+    def sucesso(self):
+        with self._lock:
+            self._falhas = 0
+            self._testando = False
+
+    def falha(self):
+        with self._lock:
+            self._falhas += 1
+            self._testando = False
+            if self._falhas >= self.falhas_para_abrir:
+                if time.monotonic() >= self._aberto_ate:
+                    logger.warning("Circuito de %s aberto após %s falhas seguidas", self.nome, self._falhas)
+                    registrar_evento_http(self.nome, "circuito_aberto")
+                self._aberto_ate = time.monotonic() + self.segundos_aberto
+
+
+class OrcamentoRetentativas:
+    """Retentativas na janela limitadas a uma fração das chamadas (mais um mínimo fixo)."""
+
+    def __init__(self, proporcao):
+        self.proporcao = proporcao
+        self._lock = threading.Lock()
+        self._chamadas = deque()
+        self._retentativas = deque()
+
+    def _podar(self, agora):
+        for fila in (self._chamadas, self._retentativas):
+            while fila and fila[0] < agora - JANELA_ORCAMENTO:
+                fila.popleft()
+
+    def registrar_chamada(self):
+        agora = time.monotonic()
+        with self._lock:
+            self._podar(agora)
+            self._chamadas.append(agora)
+
+    def retirar(self):
+        """True (e consome) se ainda cabe uma retentativa na janela."""
+        agora = time.monotonic()
+        with self._lock:
+            self._podar(agora)
+            if len(self._retentativas) >= RETENTATIVAS_MINIMAS + self.proporcao * len(self._chamadas):
+                return False
+            self._retentativas.append(agora)
+            return True
+
+
+class ClienteHttp:
+    """Sessão com pool, timeouts, circuit breaker e retentativas de um serviço externo."""
+
+    def __init__(self, nome, timeout_leitura):
+        self.nome = nome
+        self.timeout = (settings.HTTP_TIMEOUT_CONEXAO, timeout_leitura)
+        self.tentativas = 1 + settings.HTTP_RETENTATIVAS
+        self.circuito = Circuito(nome, settings.HTTP_CIRCUITO_FALHAS, settings.HTTP_CIRCUITO_ABERTO)
+        self.orcamento = OrcamentoRetentativas(settings.HTTP_ORCAMENTO_RETENTATIVAS)
+
+        # Retentativas ficam por nossa conta (max_retries=0) para respeitar o orçamento
+        adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=settings.HTTP_POOL_MAXIMO, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount("https://", adaptador)
+        self.session.mount("http://", adaptador)
+
+    def request(self, metodo, url, **kwargs):
+        metodo = metodo.upper()
+        kwargs.setdefault("timeout", self.timeout)
+        self.orcamento.registrar_chamada()
+
+        tentativa = 0
+        while True:
+            tentativa += 1
+            self.circuito.liberar()
+            try:
+                with medir_http(self.nome):
+                    resposta = self.session.request(metodo, url, **kwargs)
+            except requests.exceptions.RequestException as erro:
+                self.circuito.falha()
+                # Timeout de leitura não repete (somaria outro timeout inteiro à latência);
+                # sem conexão a requisição não saiu, então qualquer método pode repetir
+                repetivel = isinstance(erro, requests.exceptions.ConnectTimeout) or (
+                    metodo in METODOS_IDEMPOTENTES and isinstance(erro, requests.exceptions.ConnectionError)
+                )
+                if not (repetivel and self._pode_repetir(tentativa)):
+                    raise
+                logger.info("%s %s falhou (%s); tentativa %s", metodo, self.nome, erro, tentativa + 1)
+                continue
+            except BaseException:
+                # Qualquer outro erro também encerra a chamada de teste do meio-aberto;
+                # sem isso _testando ficava preso e o circuito nunca mais fechava
+                self.circuito.falha()
+                raise
+
+            if resposta.status_code >= 500:
+                self.circuito.falha()
+            else:
+                self.circuito.sucesso()
+
+            if (
+                resposta.status_code in STATUS_REPETIVEIS
+                and metodo in METODOS_IDEMPOTENTES
+                and self._pode_repetir(tentativa)
+            ):
+                logger.info("%s %s respondeu %s; tentativa %s", metodo, self.nome, resposta.status_code, tentativa + 1)
+                resposta.close()
+                continue
+            return resposta
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    # Helpers
+    def _pode_repetir(self, tentativa):
+        if tentativa >= self.tentativas or not self.orcamento.retirar():
+            return False
+        registrar_evento_http(self.nome, "retentativa")
+        time.sleep(BACKOFF_BASE * 2 ** (tentativa - 1) * random.uniform(0.5, 1.5))
+        return True
+
+
+_clientes = {}
+_clientes_lock = threading.Lock()
+
+
+def cliente(nome):
+    """ClienteHttp compartilhado do serviço (um por processo)."""
+    instancia = _clientes.get(nome)
+    if instancia is None:
+        with _clientes_lock:
+            instancia = _clientes.get(nome)
+            if instancia is None:
+                instancia = ClienteHttp(nome, getattr(settings, SERVICOS[nome]))
+                _clientes[nome] = instancia
+    return instancia
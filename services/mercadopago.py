@@ -5,11 +5,15 @@ Escopo atual: Checkout Pro (preference) + consulta de pagamento.
 from __future__ import annotations
 
 import logging
+import threading
 from typing import Dict, Optional, Tuple
 from urllib.parse import urlparse
 
 import mercadopago
 from django.conf import settings
+from mercadopago.http import HttpClient
+
+from services.http import cliente
 
 logger = logging.getLogger(__name__)
 
@@ -191,12 +195,45 @@ def _normalize_payer(payer: Optional[dict]) -> Optional[dict]:
 
 
 # Serviço
+# SDK compartilhado
+class _HttpClientCompartilhado(HttpClient):
+    """
+    HttpClient do SDK sobre o cliente pooled de services/http.py.
+    O original abre uma Session (e um handshake TLS) por chamada e usa o
+    timeout/retentativas do SDK (60 s, 3x); aqui valem os do serviço.
+    """
+
+    def request(self, method, url, maxretries=None, **kwargs):
+        kwargs.pop("timeout", None)
+        api_result = cliente("mercadopago").request(method, url, **kwargs)
+        response = {"status": api_result.status_code, "response": None}
+        if api_result.status_code != 204 and api_result.content:
+            try:
+                response["response"] = api_result.json()
+            except ValueError:
+                logger.warning("MP resposta sem JSON válido (status=%s)", api_result.status_code)
+        return response
+
+
+_sdk = None
+_sdk_lock = threading.Lock()
+
+
+def _sdk_compartilhado():
+    """Um SDK por processo (não guarda estado por requisição, só o token e o cliente HTTP)."""
+    global _sdk
+    access = settings.MERCADOPAGO_ACCESS_TOKEN
+    with _sdk_lock:
+        if _sdk is None or _sdk.request_options.access_token != access:
+            _sdk = mercadopago.SDK(access, http_client=_HttpClientCompartilhado())
+        return _sdk
+
+
 class MercadoPagoService:
     """Operações do Mercado Pago via SDK (Checkout Pro + consulta)."""
 
     def __init__(self):
-        access = settings.MERCADOPAGO_ACCESS_TOKEN
-        self.sdk = mercadopago.SDK(access)
+        self.sdk = _sdk_compartilhado()
 
     # CHECKOUT PRO
     def criar_preferencia_checkout_pro(
@@ -297,21 +334,50 @@ class MercadoPagoService:
                 logger.warning("MP GET pagamento não encontrado/erro: %s", result)
                 return None
 
-            return {
-                "payment_id": payment.get("id"),
-                "status": payment.get("status"),
-                "status_detail": payment.get("status_detail"),
-                "transaction_amount": payment.get("transaction_amount"),
-                "date_created": payment.get("date_created"),
-                "date_approved": payment.get("date_approved"),
-                "external_reference": payment.get("external_reference"),
-            }
+            return self._resumo_pagamento(payment)
         except Exception as e:
             logger.exception("❌ Erro ao consultar pagamento %s", payment_id)
             return None
 
+    def buscar_pagamento_por_referencia(self, external_reference: str) -> Dict:
+        """
+        Pagamento mais recente com o external_reference (id do contrato), para
+        Pagamentos locais ainda sem mercadopago_payment_id.
+        Retorna {"sucesso": bool, "pagamento": dict|None}; sucesso=False em erro da API.
+        """
+        try:
+            result = self.sdk.payment().search({
+                "external_reference": str(external_reference),
+                "sort": "date_created",
+                "criteria": "desc",
+                "limit": 1,
+            })
+            if result.get("status") != 200:
+                logger.warning("MP busca por referência %s falhou: %s", external_reference, result)
+                return {"sucesso": False, "pagamento": None}
+
+            resultados = (result.get("response") or {}).get("results") or []
+            pagamento = self._resumo_pagamento(resultados[0]) if resultados else None
+            return {"sucesso": True, "pagamento": pagamento}
+        except Exception:
+            logger.exception("❌ Erro ao buscar pagamento da referência %s", external_reference)
+            return {"sucesso": False, "pagamento": None}
+
+    @staticmethod
+    def _resumo_pagamento(payment: dict) -> Dict:
+        return {
+            "payment_id": payment.get("id"),
+            "status": payment.get("status"),
+            "status_detail": payment.get("status_detail"),
+            "transaction_amount": payment.get("transaction_amount"),
+            "date_created": payment.get("date_created"),
+            "date_approved": payment.get("date_approved"),
+            "external_reference": payment.get("external_reference"),
+        }
+
     # MAPA STATUS 
-    def mapear_status_mp_para_local(self, status_mp: str) -> str:
+    @staticmethod
+    def mapear_status_mp_para_local(status_mp: str) -> str:
         """Mapeia status do Mercado Pago para os status do model local."""
         mapeamento = {
             "pending": "pendente",
@@ -0,0 +1,49 @@
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from services.http import CircuitoAberto, ClienteHttp
+
+
+@override_settings(HTTP_CIRCUITO_FALHAS=2, HTTP_CIRCUITO_ABERTO=0, HTTP_RETENTATIVAS=0)
+class CircuitoTests(SimpleTestCase):
+    """Circuit breaker do ClienteHttp (services/http.py)."""
+
+    def setUp(self):
+        self.cliente = ClienteHttp("teste", 1)
+
+    def _abrir(self):
+        with mock.patch.object(self.cliente.session, "request", side_effect=requests.exceptions.ReadTimeout):
+            for _ in range(2):
+                with self.assertRaises(requests.exceptions.ReadTimeout):
+                    self.cliente.get("https://exemplo.com")
+
+    def _resposta(self, status):
+        return mock.Mock(status_code=status)
+
+    def test_aberto_recusa_sem_chamar(self):
+        self.cliente.circuito.segundos_aberto = 60
+        self._abrir()
+        with mock.patch.object(self.cliente.session, "request") as chamada:
+            with self.assertRaises(CircuitoAberto):
+                self.cliente.get("https://exemplo.com")
+        chamada.assert_not_called()
+
+    def test_chamada_de_teste_com_sucesso_fecha(self):
+        self._abrir()
+        with mock.patch.object(self.cliente.session, "request", return_value=self._resposta(200)):
+            self.cliente.get("https://exemplo.com")
+            self.cliente.get("https://exemplo.com")
+
+    def test_erro_inesperado_na_chamada_de_teste_nao_prende_o_circuito(self):
+        self._abrir()
+        with mock.patch.object(self.cliente.session, "request", side_effect=ValueError("hook")):
+            with self.assertRaises(ValueError):
+                self.cliente.get("https://exemplo.com")
+
+        # O circuito volta a aceitar uma nova chamada de teste e fecha com o sucesso
+        with mock.patch.object(self.cliente.session, "request", return_value=self._resposta(200)) as chamada:
+            self.cliente.get("https://exemplo.com")
+            self.cliente.get("https://exemplo.com")
+        self.assertEqual(chamada.call_count, 2)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TrabalhosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'trabalhos'
+
+    def ready(self):
+        import trabalhos.signals
@@ -0,0 +1,157 @@
+"""
+Busca textual de trabalhos.
+
+Cada Trabalho tem um documento desnormalizado (TrabalhoBusca) com título,
+descrição, habilidades e ramo já normalizados: minúsculas, sem acentos e sem
+stopwords do português. O mesmo tratamento é aplicado ao texto buscado, então
+"Programação" encontra "programacao" e vice-versa.
+
+Índice conforme o banco:
+- MySQL: FULLTEXT (titulo, documento) com MATCH ... AGAINST em modo booleano;
+- SQLite (testes): tabela virtual FTS5 mantida por triggers, ranqueada por bm25;
+- outros bancos: icontains no documento (sem ranking).
+Os índices são criados na migração 0009_trabalhobusca, que traz a própria
+cópia de normalizar/montar_documento: mudanças aqui pedem reindexar_busca.
+"""
+import re
+import unicodedata
+
+from django.db import connection
+from django.db.models import FloatField, Value
+from django.db.models.expressions import RawSQL
+
+# Tabelas usadas nas consultas cruas
+TABELA_BUSCA = "trabalhos_trabalhobusca"
+TABELA_FTS = "trabalhos_trabalhobusca_fts"
+INDICE_FULLTEXT = "trabalhos_busca_fulltext"
+
+# Menor termo indexado pelo InnoDB (innodb_ft_min_token_size padrão)
+TAMANHO_MINIMO_MYSQL = 3
+
+STOPWORDS = frozenset("""
+a ao aos as ate com como da das de dela dele deles do dos e ela elas ele eles
+em entre era essa esse esta este eu foi for ha isso isto ja la lhe mais mas
+me mesmo meu minha muito na nao nas nem no nos nossa nosso num numa o os ou
+para pela pelas pelo pelos por qual quando que quem se sem ser seu seus sob
+sua suas tambem te tem ter um uma umas uns vai voce voces
+""".split())
+
+_NAO_ALFANUMERICO = re.compile(r"[^a-z0-9]+")
+
+
+def normalizar(texto):
+    """Minúsculas, sem acentos, só [a-z0-9], sem stopwords e termos de 1 caractere."""
+    texto = unicodedata.normalize("NFKD", texto or "").encode("ASCII", "ignore").decode("ASCII")
+    termos = _NAO_ALFANUMERICO.split(texto.lower())
+    return [t for t in termos if len(t) > 1 and t not in STOPWORDS]
+
+
+def montar_documento(titulo, descricao, habilidades=(), ramo=None):
+    """Retorna (titulo, documento) normalizados para o índice."""
+    titulo_norm = " ".join(normalizar(titulo))
+    partes = [titulo, descricao, " ".join(habilidades or ()), ramo or ""]
+    documento = " ".join(normalizar(" ".join(p for p in partes if p)))
+    return titulo_norm[:255], documento
+
+
+def indexar_trabalho(trabalho):
+    """Cria/atualiza o documento de busca de um trabalho."""
+    from .models import TrabalhoBusca
+
+    titulo, documento = montar_documento(
+        trabalho.titulo,
+        trabalho.descricao,
+        trabalho.habilidades.values_list("nome", flat=True),
+        trabalho.ramo.nome if trabalho.ramo_id else None,
+    )
+    TrabalhoBusca.objects.update_or_create(
+        trabalho_id=trabalho.pk,
+        defaults={"titulo": titulo, "documento": documento},
+    )
+
+
+def reindexar_todos(tamanho_lote=500):
+    """Reconstrói todos os documentos de busca em lotes. Retorna o total indexado."""
+    from .models import Trabalho, TrabalhoBusca
+
+    TrabalhoBusca.objects.all().delete()
+
+    total = 0
+    lote = []
+    trabalhos = (
+        Trabalho.objects
+        .select_related("ramo")
+        .prefetch_related("habilidades")
+        .order_by("id")
+    )
+    for trabalho in trabalhos.iterator(chunk_size=tamanho_lote):
+        titulo, documento = montar_documento(
+            trabalho.titulo,
+            trabalho.descricao,
+            [h.nome for h in trabalho.habilidades.all()],
+            trabalho.ramo.nome if trabalho.ramo else None,
+        )
+        lote.append(TrabalhoBusca(trabalho_id=trabalho.id, titulo=titulo, documento=documento))
+        if len(lote) >= tamanho_lote:
+            TrabalhoBusca.objects.bulk_create(lote)
+            total += len(lote)
+            lote = []
+
+    if lote:
+        TrabalhoBusca.objects.bulk_create(lote)
+        total += len(lote)
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Consulta
+# ---------------------------------------------------------------------------
+
+def _tem_fts5():
+    with connection.cursor() as cursor:
+        return TABELA_FTS in connection.introspection.table_names(cursor)
+
+
+def filtrar_por_busca(trabalhos, busca):
+    """
+    Filtra o queryset pelos termos buscados (todos obrigatórios, por prefixo)
+    e anota `relevancia` (maior = mais relevante).
+    """
+    termos = normalizar(busca)
+    if not termos:
+        return trabalhos.annotate(relevancia=Value(0.0, output_field=FloatField()))
+
+    vendor = connection.vendor
+    tabela = connection.ops.quote_name(trabalhos.model._meta.db_table)
+
+    if vendor == "mysql" and all(len(t) >= TAMANHO_MINIMO_MYSQL for t in termos):
+        consulta = " ".join(f"+{t}*" for t in termos)
+        match = "MATCH(b.titulo, b.documento) AGAINST (%s IN BOOLEAN MODE)"
+        return trabalhos.filter(
+            id__in=RawSQL(f"SELECT b.trabalho_id FROM {TABELA_BUSCA} b WHERE {match}", (consulta,))
+        ).annotate(
+            relevancia=RawSQL(
+                f"SELECT {match} FROM {TABELA_BUSCA} b WHERE b.trabalho_id = {tabela}.id",
+                (consulta,),
+                output_field=FloatField(),
+            )
+        )
+
+    if vendor == "sqlite" and _tem_fts5():
+        consulta = " AND ".join(f'"{t}"*' for t in termos)
+        return trabalhos.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {TABELA_FTS} WHERE {TABELA_FTS} MATCH %s", (consulta,))
+        ).annotate(
+            # bm25 é menor quanto mais relevante; título pesa 5x
+            relevancia=RawSQL(
+                f"SELECT -bm25({TABELA_FTS}, 5.0, 1.0) FROM {TABELA_FTS} "
+                f"WHERE {TABELA_FTS} MATCH %s AND rowid = {tabela}.id",
+                (consulta,),
+                output_field=FloatField(),
+            )
+        )
+
+    # Fallback: todos os termos presentes no documento, sem ranking
+    for termo in termos:
+        trabalhos = trabalhos.filter(busca__documento__icontains=termo)
+    return trabalhos.annotate(relevancia=Value(0.0, output_field=FloatField()))
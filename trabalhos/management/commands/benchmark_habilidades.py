@@ -0,0 +1,107 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from habilidades.cache import taxonomia
+from habilidades.models import Habilidade
+from trabalhos.models import Trabalho
+from trabalhos.serializers import TrabalhoSerializer
+from usuarios.models import Usuario
+
+
+class _ContadorConsultas:
+    """Conta as consultas SQL executadas na conexão (sem guardar o SQL)."""
+
+    def __init__(self):
+        self.total = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.total += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara consultas e tempo para aplicar N habilidades a um trabalho: "
+        "get_or_create + add por nome (antigo) contra a resolução em lote do "
+        "TrabalhoSerializer. Metade dos nomes já existe; a edição troca um terço. "
+        "Tudo roda dentro de uma transação desfeita ao final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tags", default="1,5,15,30",
+            help="Quantidades de habilidades por trabalho, separadas por vírgula (padrão: 1,5,15,30).",
+        )
+
+    def handle(self, *args, **options):
+        quantidades = [int(n) for n in options["tags"].split(",") if n.strip()]
+        serializer = TrabalhoSerializer(context={})
+
+        with transaction.atomic():
+            contratante = Usuario.objects.create(
+                email=f"benchmark-{time.time_ns()}@exemplo.com", nome="Contratante",
+                tipo="contratante", telefone="0", password="!",
+            )
+
+            self.stdout.write(
+                f"{'tags':>5} | {'modo':<7} | {'criar (consultas)':>17} | {'criar (ms)':>10} | "
+                f"{'editar (consultas)':>18} | {'editar (ms)':>11}"
+            )
+            self.stdout.write("-" * 82)
+
+            for n in quantidades:
+                for modo in ("antigo", "lote"):
+                    nomes, editados = self._preparar_nomes(n, modo)
+                    trabalho = Trabalho.objects.create(
+                        titulo="Benchmark", descricao="-", prazo=datetime.date.today(),
+                        orcamento=1, contratante=contratante,
+                    )
+                    taxonomia()  # cache quente, como numa requisição comum
+
+                    if modo == "antigo":
+                        criar = self._medir(lambda: self._antigo(trabalho, nomes))
+                        editar = self._medir(lambda: self._antigo(trabalho, editados, limpar=True))
+                    else:
+                        criar = self._medir(lambda: serializer._processar_habilidades(trabalho, nomes))
+                        editar = self._medir(
+                            lambda: serializer._processar_habilidades(trabalho, editados, substituir=True)
+                        )
+
+                    esperado = {nome.capitalize() for nome in editados}
+                    assert set(trabalho.habilidades.values_list("nome", flat=True)) == esperado
+
+                    self.stdout.write(
+                        f"{n:>5} | {modo:<7} | {criar[0]:>17} | {criar[1]:>10.1f} | "
+                        f"{editar[0]:>18} | {editar[1]:>11.1f}"
+                    )
+
+            transaction.set_rollback(True)
+
+    # Helpers
+    def _preparar_nomes(self, n, modo):
+        """n nomes (metade já cadastrada) e a versão editada com um terço trocado."""
+        prefixo = f"Bench{modo}{n}x"
+        nomes = [f"{prefixo}{i}" for i in range(n)]
+        Habilidade.objects.bulk_create([Habilidade(nome=nome.capitalize()) for nome in nomes[: n // 2]])
+        trocar = max(1, n // 3)
+        editados = nomes[trocar:] + [f"{prefixo}novo{i}" for i in range(trocar)]
+        return nomes, editados
+
+    def _antigo(self, trabalho, nomes, limpar=False):
+        """Comportamento anterior: clear() na edição e get_or_create + add por nome."""
+        if limpar:
+            trabalho.habilidades.clear()
+        for nome in nomes:
+            habilidade, _ = Habilidade.objects.get_or_create(nome=nome.capitalize())
+            trabalho.habilidades.add(habilidade)
+
+    def _medir(self, funcao):
+        contador = _ContadorConsultas()
+        with connection.execute_wrapper(contador):
+            inicio = time.perf_counter()
+            funcao()
+            duracao = (time.perf_counter() - inicio) * 1000
+        return contador.total, duracao
@@ -0,0 +1,66 @@
+import logging
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from freelancer.processos import exigir_estado_compartilhado
+from trabalhos.recomendacao import TOP_K, recalcular_abertos
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Recalcula em lote as recomendações freelancer ⇄ trabalho dos trabalhos públicos abertos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lote", type=int, default=500,
+            help="Trabalhos por multiplicação de matrizes (padrão: 500).",
+        )
+        parser.add_argument(
+            "--top", type=int, default=TOP_K,
+            help=f"Freelancers guardados por trabalho (padrão: {TOP_K}).",
+        )
+        parser.add_argument("--loop", action="store_true", help="Executa continuamente (agendador).")
+        parser.add_argument(
+            "--intervalo", type=float, default=None,
+            help="Espera (s) entre recálculos no modo --loop (padrão: RECOMENDACAO_INTERVALO).",
+        )
+
+    def handle(self, *args, **options):
+        if not options["loop"]:
+            self._recalcular(options)
+            return
+
+        exigir_estado_compartilhado("recomendar_trabalhos --loop")
+        intervalo = options["intervalo"] if options["intervalo"] is not None else settings.RECOMENDACAO_INTERVALO
+        self._parar = False
+        signal.signal(signal.SIGTERM, self._sinal_parada)
+        signal.signal(signal.SIGINT, self._sinal_parada)
+
+        self.stdout.write("Recálculo de recomendações iniciado.")
+        while not self._parar:
+            close_old_connections()
+            try:
+                self._recalcular(options)
+            except Exception:
+                logger.exception("Erro no recálculo das recomendações")
+            # Dorme em passos curtos para atender o SIGTERM sem esperar o intervalo inteiro
+            fim = time.monotonic() + intervalo
+            while not self._parar and time.monotonic() < fim:
+                time.sleep(min(1.0, fim - time.monotonic()))
+        self.stdout.write("Recálculo de recomendações encerrado.")
+
+    def _recalcular(self, options):
+        inicio = time.perf_counter()
+        trabalhos, recomendacoes = recalcular_abertos(tamanho_lote=options["lote"], top=options["top"])
+        duracao = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f"{trabalhos} trabalhos, {recomendacoes} recomendações gravadas em {duracao:.2f}s."
+        ))
+
+    def _sinal_parada(self, signum, frame):
+        self._parar = True
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from trabalhos.busca import reindexar_todos
+
+
+class Command(BaseCommand):
+    help = "Reconstrói em lote o índice de busca textual dos trabalhos (TrabalhoBusca)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lote", type=int, default=500,
+            help="Quantidade de trabalhos processados por INSERT (padrão: 500).",
+        )
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        with transaction.atomic():
+            total = reindexar_todos(tamanho_lote=options["lote"])
+        duracao = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(f"{total} trabalhos indexados em {duracao:.2f}s."))
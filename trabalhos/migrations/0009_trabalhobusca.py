@@ -0,0 +1,127 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:19
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Cópia do estado de trabalhos/busca.py nesta migração: ela não deve mudar de
+# comportamento quando o módulo evoluir (a reindexação fica com reindexar_busca)
+TABELA_BUSCA = "trabalhos_trabalhobusca"
+TABELA_FTS = "trabalhos_trabalhobusca_fts"
+INDICE_FULLTEXT = "trabalhos_busca_fulltext"
+
+STOPWORDS = frozenset("""
+a ao aos as ate com como da das de dela dele deles do dos e ela elas ele eles
+em entre era essa esse esta este eu foi for ha isso isto ja la lhe mais mas
+me mesmo meu minha muito na nao nas nem no nos nossa nosso num numa o os ou
+para pela pelas pelo pelos por qual quando que quem se sem ser seu seus sob
+sua suas tambem te tem ter um uma umas uns vai voce voces
+""".split())
+
+_NAO_ALFANUMERICO = re.compile(r"[^a-z0-9]+")
+
+
+def normalizar(texto):
+    texto = unicodedata.normalize("NFKD", texto or "").encode("ASCII", "ignore").decode("ASCII")
+    termos = _NAO_ALFANUMERICO.split(texto.lower())
+    return [t for t in termos if len(t) > 1 and t not in STOPWORDS]
+
+
+def montar_documento(titulo, descricao, habilidades=(), ramo=None):
+    titulo_norm = " ".join(normalizar(titulo))
+    partes = [titulo, descricao, " ".join(habilidades or ()), ramo or ""]
+    documento = " ".join(normalizar(" ".join(p for p in partes if p)))
+    return titulo_norm[:255], documento
+
+
+def criar_indice_fulltext(apps, schema_editor):
+    """FULLTEXT no MySQL; FTS5 (tabela externa + triggers) no SQLite."""
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "mysql":
+        schema_editor.execute(
+            f"ALTER TABLE {TABELA_BUSCA} ADD FULLTEXT INDEX {INDICE_FULLTEXT} (titulo, documento)"
+        )
+
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {TABELA_FTS} USING fts5("
+            f"titulo, documento, content='{TABELA_BUSCA}', content_rowid='trabalho_id')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {TABELA_FTS}_ai AFTER INSERT ON {TABELA_BUSCA} BEGIN "
+            f"INSERT INTO {TABELA_FTS}(rowid, titulo, documento) "
+            f"VALUES (new.trabalho_id, new.titulo, new.documento); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {TABELA_FTS}_ad AFTER DELETE ON {TABELA_BUSCA} BEGIN "
+            f"INSERT INTO {TABELA_FTS}({TABELA_FTS}, rowid, titulo, documento) "
+            f"VALUES ('delete', old.trabalho_id, old.titulo, old.documento); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER {TABELA_FTS}_au AFTER UPDATE ON {TABELA_BUSCA} BEGIN "
+            f"INSERT INTO {TABELA_FTS}({TABELA_FTS}, rowid, titulo, documento) "
+            f"VALUES ('delete', old.trabalho_id, old.titulo, old.documento); "
+            f"INSERT INTO {TABELA_FTS}(rowid, titulo, documento) "
+            f"VALUES (new.trabalho_id, new.titulo, new.documento); END"
+        )
+
+
+def remover_indice_fulltext(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == "mysql":
+        schema_editor.execute(f"ALTER TABLE {TABELA_BUSCA} DROP INDEX {INDICE_FULLTEXT}")
+
+    elif vendor == "sqlite":
+        for sufixo in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {TABELA_FTS}_{sufixo}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {TABELA_FTS}")
+
+
+def indexar_existentes(apps, schema_editor):
+    """Gera o documento de busca dos trabalhos já cadastrados."""
+    Trabalho = apps.get_model("trabalhos", "Trabalho")
+    TrabalhoBusca = apps.get_model("trabalhos", "TrabalhoBusca")
+
+    lote = []
+    for trabalho in Trabalho.objects.select_related("ramo").prefetch_related("habilidades").iterator(chunk_size=500):
+        titulo, documento = montar_documento(
+            trabalho.titulo,
+            trabalho.descricao,
+            [h.nome for h in trabalho.habilidades.all()],
+            trabalho.ramo.nome if trabalho.ramo else None,
+        )
+        lote.append(TrabalhoBusca(trabalho_id=trabalho.id, titulo=titulo, documento=documento))
+        if len(lote) >= 500:
+            TrabalhoBusca.objects.bulk_create(lote)
+            lote = []
+    if lote:
+        TrabalhoBusca.objects.bulk_create(lote)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trabalhos', '0008_trabalho_ramo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrabalhoBusca',
+            fields=[
+                ('trabalho', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='busca', serialize=False, to='trabalhos.trabalho')),
+                ('titulo', models.CharField(max_length=255)),
+                ('documento', models.TextField()),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Documento de busca',
+                'verbose_name_plural': 'Documentos de busca',
+            },
+        ),
+        migrations.RunPython(criar_indice_fulltext, remover_indice_fulltext),
+        migrations.RunPython(indexar_existentes, migrations.RunPython.noop),
+    ]
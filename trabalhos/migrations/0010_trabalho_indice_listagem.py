@@ -0,0 +1,20 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habilidades', '0002_ramo_alter_habilidade_options'),
+        ('trabalhos', '0009_trabalhobusca'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trabalho',
+            index=models.Index(fields=['criado_em', 'id'], name='trabalhos_t_criado__89275b_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trabalhos', '0010_trabalho_indice_listagem'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecomendacaoTrabalho',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pontuacao', models.FloatField(help_text='Similaridade de cosseno entre os vetores (0 a 1).')),
+                ('calculado_em', models.DateTimeField(auto_now_add=True)),
+                ('freelancer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trabalhos_recomendados', to=settings.AUTH_USER_MODEL)),
+                ('trabalho', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recomendacoes', to='trabalhos.trabalho')),
+            ],
+            options={
+                'verbose_name': 'Recomendação de trabalho',
+                'verbose_name_plural': 'Recomendações de trabalhos',
+                'indexes': [models.Index(fields=['freelancer', '-pontuacao'], name='recomendacao_freelancer'), models.Index(fields=['trabalho', '-pontuacao'], name='recomendacao_trabalho')],
+                'constraints': [models.UniqueConstraint(fields=('trabalho', 'freelancer'), name='recomendacao_unica')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.7 on 2026-10-17 13:18
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def marcar_calculados(apps, schema_editor):
+    """Trabalhos que já têm recomendações gravadas contam como calculados."""
+    Trabalho = apps.get_model("trabalhos", "Trabalho")
+    RecomendacaoTrabalho = apps.get_model("trabalhos", "RecomendacaoTrabalho")
+    Trabalho.objects.filter(
+        id__in=RecomendacaoTrabalho.objects.values("trabalho_id")
+    ).update(recomendacoes_em=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trabalhos', '0011_recomendacaotrabalho'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trabalho',
+            name='recomendacoes_em',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(marcar_calculados, migrations.RunPython.noop),
+    ]
@@ -66,6 +66,73 @@ class Trabalho(models.Model):
 
     criado_em = models.DateTimeField(auto_now_add=True)
     atualizado_em = models.DateTimeField(auto_now=True)
+    # Último cálculo das recomendações (trabalhos/recomendacao.py), mesmo que sem nenhum freelancer
+    recomendacoes_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Listagem ordenada por (-criado_em, -id) e paginação por cursor
+            models.Index(fields=['criado_em', 'id']),
+        ]
 
     def __str__(self):
         return self.titulo
+
+
+class TrabalhoBusca(models.Model):
+    """
+    Documento de busca desnormalizado de um Trabalho (ver trabalhos/busca.py).
+    Guarda título e documento já normalizados (minúsculas, sem acentos e sem
+    stopwords) para o índice full-text: FULLTEXT no MySQL, FTS5 no SQLite.
+    Atualizado por sinais ao salvar o trabalho ou alterar suas habilidades.
+    """
+    trabalho = models.OneToOneField(
+        Trabalho,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='busca'
+    )
+    titulo = models.CharField(max_length=255)
+    documento = models.TextField()
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Documento de busca"
+        verbose_name_plural = "Documentos de busca"
+
+    def __str__(self):
+        return f"Busca #{self.trabalho_id}"
+
+
+class RecomendacaoTrabalho(models.Model):
+    """
+    Compatibilidade pré-calculada entre um trabalho e um freelancer
+    (ver trabalhos/recomendacao.py). Guarda só os top-K freelancers de cada
+    trabalho aberto; serve o /recomendados/ do trabalho e o feed "para mim".
+    """
+    trabalho = models.ForeignKey(
+        Trabalho,
+        on_delete=models.CASCADE,
+        related_name='recomendacoes'
+    )
+    freelancer = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='trabalhos_recomendados'
+    )
+    pontuacao = models.FloatField(help_text="Similaridade de cosseno entre os vetores (0 a 1).")
+    calculado_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Recomendação de trabalho"
+        verbose_name_plural = "Recomendações de trabalhos"
+        constraints = [
+            models.UniqueConstraint(fields=['trabalho', 'freelancer'], name='recomendacao_unica'),
+        ]
+        indexes = [
+            models.Index(fields=['freelancer', '-pontuacao'], name='recomendacao_freelancer'),
+            models.Index(fields=['trabalho', '-pontuacao'], name='recomendacao_trabalho'),
+        ]
+
+    def __str__(self):
+        return f"{self.trabalho_id} → {self.freelancer_id} ({self.pontuacao:.2f})"
@@ -0,0 +1,64 @@
+"""
+Paginação da listagem de trabalhos.
+- Modo cursor (keyset) em (-criado_em, -id): o custo de cada página não
+  depende da profundidade (sem OFFSET).
+- Contagem total em cache por combinação de filtros; o cache é invalidado
+  trocando a versão a cada save/delete de Trabalho (ver signals.py).
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from freelancer.paginacao import codificar_cursor, decodificar_cursor
+
+CHAVE_VERSAO = "trabalhos:contagem:versao"
+
+
+def cursor_do_trabalho(trabalho):
+    return codificar_cursor(trabalho.criado_em, trabalho.id)
+
+
+def apos_cursor(trabalhos, cursor):
+    """Trabalhos depois do cursor na ordem (-criado_em, -id)."""
+    criado_em, trabalho_id = decodificar_cursor(cursor)
+    return trabalhos.filter(
+        Q(criado_em__lt=criado_em) | Q(criado_em=criado_em, id__lt=trabalho_id)
+    )
+
+
+# ---------------------------------------------------------------------------
+# Contagens em cache
+# ---------------------------------------------------------------------------
+
+def _versao():
+    versao = cache.get(CHAVE_VERSAO)
+    if versao is None:
+        cache.add(CHAVE_VERSAO, 1, timeout=None)
+        versao = cache.get(CHAVE_VERSAO, 1)
+    return versao
+
+
+def invalidar_contagens():
+    """Descarta todas as contagens em cache (troca de versão, O(1))."""
+    try:
+        cache.incr(CHAVE_VERSAO)
+    except ValueError:
+        cache.set(CHAVE_VERSAO, 1, timeout=None)
+
+
+def contar(trabalhos, filtros):
+    """
+    COUNT(*) do queryset, em cache por `filtros` (tupla com escopo do usuário
+    e parâmetros da busca). Pode ficar defasado no máximo TRABALHOS_CONTAGEM_TTL
+    segundos caso uma invalidação se perca.
+    """
+    assinatura = hashlib.sha1(repr(filtros).encode()).hexdigest()
+    chave = f"trabalhos:contagem:{_versao()}:{assinatura}"
+
+    total = cache.get(chave)
+    if total is None:
+        total = trabalhos.count()
+        cache.set(chave, total, timeout=getattr(settings, "TRABALHOS_CONTAGEM_TTL", 300))
+    return total
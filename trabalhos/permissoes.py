@@ -22,7 +22,7 @@ class PermissaoTrabalho(BasePermission):
             if hasattr(obj, "is_privado") and not obj.is_privado:
                 return True
             # Contratante pode visualizar seus próprios trabalhos (mesmo privados)
-            return obj.contratante == user
+            return obj.contratante_id == user.id
 
         # Edição e exclusão só para o contratante
-        return obj.contratante == user
+        return obj.contratante_id == user.id
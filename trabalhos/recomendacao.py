@@ -0,0 +1,266 @@
+"""
+Recomendação trabalho ⇄ freelancer por similaridade de habilidades.
+
+Vetores esparsos no espaço (habilidades + ramos):
+- freelancer: habilidades/ramo dos trabalhos em que entregou contrato
+  (PESO_ENTREGA) ou enviou proposta (PESO_PROPOSTA), com log1p nas contagens;
+- trabalho: 1 por habilidade e PESO_RAMO para o ramo.
+Os vetores são normalizados (L2), então o produto escalar é a similaridade de
+cosseno. Um lote de trabalhos vira uma matriz J e a compatibilidade com todos
+os freelancers sai de um único produto esparso J · Fᵀ (SciPy), do qual se
+extraem os top-K de cada linha com argpartition (NumPy).
+
+A matriz dos freelancers fica em cache no processo por RECOMENDACAO_MATRIZ_TTL
+segundos (o worker da fila e o comando recomendar_trabalhos a reaproveitam).
+O resultado é gravado em RecomendacaoTrabalho e Trabalho.recomendacoes_em marca
+o cálculo (lista vazia inclusive). O comando recomendar_trabalhos --loop
+(processo "recomendador" do Procfile) recalcula tudo a cada
+RECOMENDACAO_INTERVALO segundos, levando o histórico novo dos freelancers ao
+feed "para mim".
+"""
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+from scipy import sparse
+
+PESO_ENTREGA = 2.0
+PESO_PROPOSTA = 1.0
+PESO_RAMO = 0.5
+
+# Freelancers guardados por trabalho e similaridade mínima para entrar na lista
+TOP_K = 50
+PONTUACAO_MINIMA = 0.1
+
+_lock = threading.Lock()
+_matriz = None
+_matriz_expira = 0.0
+
+
+class MatrizFreelancers:
+    """Vetores normalizados dos freelancers elegíveis (linhas) e o mapa de colunas."""
+
+    def __init__(self, freelancer_ids, matriz, coluna_habilidade, coluna_ramo):
+        self.freelancer_ids = freelancer_ids
+        self.matriz = matriz
+        self.coluna_habilidade = coluna_habilidade
+        self.coluna_ramo = coluna_ramo
+
+    @property
+    def dimensao(self):
+        return len(self.coluna_habilidade) + len(self.coluna_ramo)
+
+
+def _normalizar_linhas(matriz):
+    normas = np.sqrt(np.asarray(matriz.multiply(matriz).sum(axis=1)).ravel())
+    normas[normas == 0] = 1.0
+    return sparse.diags(1.0 / normas) @ matriz
+
+
+def _colunas():
+    from habilidades.models import Habilidade, Ramo
+
+    coluna_habilidade = {h: i for i, h in enumerate(Habilidade.objects.order_by("id").values_list("id", flat=True))}
+    base = len(coluna_habilidade)
+    coluna_ramo = {r: base + i for i, r in enumerate(Ramo.objects.order_by("id").values_list("id", flat=True))}
+    return coluna_habilidade, coluna_ramo
+
+
+def construir_matriz_freelancers():
+    """Monta a matriz esparsa dos freelancers com consultas agrupadas."""
+    from contratos.models import Contrato
+    from propostas.models import Proposta
+    from usuarios.models import Usuario
+
+    coluna_habilidade, coluna_ramo = _colunas()
+
+    elegiveis = Usuario.objects.filter(
+        tipo="freelancer", is_active=True, is_suspended_self=False, banido=False
+    )
+    contratos = Contrato.objects.filter(status="concluido", freelancer__in=elegiveis).order_by()
+    propostas = Proposta.objects.filter(freelancer__in=elegiveis).order_by()
+
+    pesos = defaultdict(float)
+    for origem, peso in ((contratos, PESO_ENTREGA), (propostas, PESO_PROPOSTA)):
+        habilidades = (
+            origem.filter(trabalho__habilidades__isnull=False)
+            .values_list("freelancer_id", "trabalho__habilidades")
+            .annotate(n=Count("id"))
+        )
+        for freelancer_id, habilidade_id, n in habilidades.iterator():
+            if habilidade_id in coluna_habilidade:
+                pesos[freelancer_id, coluna_habilidade[habilidade_id]] += peso * np.log1p(n)
+
+        ramos = (
+            origem.filter(trabalho__ramo__isnull=False)
+            .values_list("freelancer_id", "trabalho__ramo_id")
+            .annotate(n=Count("id"))
+        )
+        for freelancer_id, ramo_id, n in ramos.iterator():
+            if ramo_id in coluna_ramo:
+                pesos[freelancer_id, coluna_ramo[ramo_id]] += PESO_RAMO * peso * np.log1p(n)
+
+    freelancer_ids = np.array(sorted({f for f, _ in pesos}), dtype=np.int64)
+    linha = {f: i for i, f in enumerate(freelancer_ids.tolist())}
+    dimensao = len(coluna_habilidade) + len(coluna_ramo)
+
+    if pesos:
+        chaves = list(pesos)
+        matriz = sparse.csr_matrix(
+            (
+                np.fromiter(pesos.values(), dtype=np.float64, count=len(pesos)),
+                (
+                    np.fromiter((linha[f] for f, _ in chaves), dtype=np.int64, count=len(chaves)),
+                    np.fromiter((c for _, c in chaves), dtype=np.int64, count=len(chaves)),
+                ),
+            ),
+            shape=(len(freelancer_ids), dimensao),
+        )
+        matriz = _normalizar_linhas(matriz).tocsr()
+    else:
+        matriz = sparse.csr_matrix((0, dimensao))
+
+    return MatrizFreelancers(freelancer_ids, matriz, coluna_habilidade, coluna_ramo)
+
+
+def matriz_freelancers(forcar=False):
+    """Matriz em cache no processo (RECOMENDACAO_MATRIZ_TTL)."""
+    global _matriz, _matriz_expira
+
+    with _lock:
+        if not forcar and _matriz is not None and time.monotonic() < _matriz_expira:
+            return _matriz
+
+    matriz = construir_matriz_freelancers()
+    with _lock:
+        _matriz = matriz
+        _matriz_expira = time.monotonic() + getattr(settings, "RECOMENDACAO_MATRIZ_TTL", 600)
+    return matriz
+
+
+def vetores_trabalhos(trabalho_ids, matriz):
+    """Matriz esparsa (um trabalho por linha, na ordem de trabalho_ids), normalizada."""
+    from .models import Trabalho
+
+    linha = {t: i for i, t in enumerate(trabalho_ids)}
+    linhas, colunas, valores = [], [], []
+
+    habilidades = Trabalho.habilidades.through.objects.filter(trabalho_id__in=trabalho_ids)
+    for trabalho_id, habilidade_id in habilidades.values_list("trabalho_id", "habilidade_id"):
+        if habilidade_id in matriz.coluna_habilidade:
+            linhas.append(linha[trabalho_id])
+            colunas.append(matriz.coluna_habilidade[habilidade_id])
+            valores.append(1.0)
+
+    ramos = Trabalho.objects.filter(id__in=trabalho_ids, ramo__isnull=False)
+    for trabalho_id, ramo_id in ramos.values_list("id", "ramo_id"):
+        if ramo_id in matriz.coluna_ramo:
+            linhas.append(linha[trabalho_id])
+            colunas.append(matriz.coluna_ramo[ramo_id])
+            valores.append(PESO_RAMO)
+
+    vetores = sparse.csr_matrix(
+        (valores, (linhas, colunas)), shape=(len(trabalho_ids), matriz.dimensao)
+    )
+    return _normalizar_linhas(vetores).tocsr()
+
+
+def recomendar(trabalho_ids, top=TOP_K, minimo=PONTUACAO_MINIMA, matriz=None):
+    """
+    Top-K freelancers de cada trabalho: {trabalho_id: [(freelancer_id, pontuacao), ...]}
+    em ordem decrescente de pontuação.
+    """
+    trabalho_ids = list(trabalho_ids)
+    matriz = matriz or matriz_freelancers()
+    resultado = {t: [] for t in trabalho_ids}
+    if not trabalho_ids or matriz.matriz.shape[0] == 0:
+        return resultado
+
+    similaridades = (vetores_trabalhos(trabalho_ids, matriz) @ matriz.matriz.T).tocsr()
+
+    for i, trabalho_id in enumerate(trabalho_ids):
+        inicio, fim = similaridades.indptr[i], similaridades.indptr[i + 1]
+        valores = similaridades.data[inicio:fim]
+        colunas = similaridades.indices[inicio:fim]
+
+        manter = valores >= minimo
+        valores, colunas = valores[manter], colunas[manter]
+        if len(valores) > top:
+            melhores = np.argpartition(-valores, top)[:top]
+            valores, colunas = valores[melhores], colunas[melhores]
+        ordem = np.argsort(-valores, kind="stable")
+
+        resultado[trabalho_id] = [
+            (int(matriz.freelancer_ids[c]), round(float(v), 4))
+            for c, v in zip(colunas[ordem], valores[ordem])
+        ]
+    return resultado
+
+
+def gravar_recomendacoes(resultado):
+    """Substitui as recomendações dos trabalhos calculados e marca o cálculo."""
+    from .models import RecomendacaoTrabalho, Trabalho
+
+    with transaction.atomic():
+        # .update(): sem sinais de Trabalho (busca, contagens) para uma marca interna
+        Trabalho.objects.filter(id__in=list(resultado)).update(recomendacoes_em=timezone.now())
+        RecomendacaoTrabalho.objects.filter(trabalho_id__in=list(resultado)).delete()
+        RecomendacaoTrabalho.objects.bulk_create(
+            [
+                RecomendacaoTrabalho(trabalho_id=trabalho_id, freelancer_id=freelancer_id, pontuacao=pontuacao)
+                for trabalho_id, pares in resultado.items()
+                for freelancer_id, pontuacao in pares
+            ],
+            batch_size=1000,
+        )
+
+
+def trabalhos_recomendaveis():
+    """Trabalhos que entram no feed e recebem recomendações: públicos e abertos."""
+    from .models import Trabalho
+
+    return Trabalho.objects.filter(is_privado=False, status="aberto")
+
+
+def recalcular_trabalho(trabalho_id, top=TOP_K):
+    """Recalcula e grava as recomendações de um trabalho. Retorna os pares."""
+    pares = recomendar([trabalho_id], top=top)[trabalho_id]
+    gravar_recomendacoes({trabalho_id: pares})
+    return pares
+
+
+def recalcular_abertos(tamanho_lote=500, top=TOP_K):
+    """
+    Recalcula todos os trabalhos recomendáveis em lotes, com a matriz montada
+    uma única vez. Remove as recomendações de trabalhos que deixaram de ser
+    recomendáveis. Retorna (trabalhos, recomendações gravadas).
+    """
+    from .models import RecomendacaoTrabalho
+
+    matriz = matriz_freelancers(forcar=True)
+    RecomendacaoTrabalho.objects.exclude(trabalho__in=trabalhos_recomendaveis()).delete()
+
+    ids = trabalhos_recomendaveis().order_by("id").values_list("id", flat=True).iterator(chunk_size=tamanho_lote)
+    total_trabalhos = total_recomendacoes = 0
+    lote = []
+    for trabalho_id in ids:
+        lote.append(trabalho_id)
+        if len(lote) >= tamanho_lote:
+            total_recomendacoes += _gravar_lote(lote, top, matriz)
+            total_trabalhos += len(lote)
+            lote = []
+    if lote:
+        total_recomendacoes += _gravar_lote(lote, top, matriz)
+        total_trabalhos += len(lote)
+    return total_trabalhos, total_recomendacoes
+
+
+def _gravar_lote(trabalho_ids, top, matriz):
+    resultado = recomendar(trabalho_ids, top=top, matriz=matriz)
+    gravar_recomendacoes(resultado)
+    return sum(len(pares) for pares in resultado.values())
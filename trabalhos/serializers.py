@@ -1,19 +1,12 @@
 from rest_framework import serializers
-from .models import Trabalho
+from .models import Trabalho, RecomendacaoTrabalho
 from habilidades.models import Habilidade, Ramo
+from habilidades.cache import invalidar_taxonomia, normalizar_nome, resolver_habilidade, resolver_ramo
+from moderacao.filtro import TIPOS_NOME, contem_proibida, validar_texto
 from datetime import date
 import re
 
 
-# Palavras proibidas
-PALAVRAS_PROIBIDAS = [
-    "merda", "porra", "puta", "puto", "caralho", "buceta", "pinto", "piroca",
-    "pau", "rola", "bosta", "arrombado", "vagabundo", "vagabunda", "corno",
-    "fdp", "foda-se", "foder", "cu", "cuzão", "desgraçado", "otário", "otaria",
-    "asdf", "qwerty", "lorem", "teste", "aaaa", "bbbb", "cccc", "zzzz", "xxx",
-]
-
-
 class RamoSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ramo
@@ -88,6 +81,12 @@ class TrabalhoSerializer(serializers.ModelSerializer):
             return None
 
     # Validações
+    def validate_titulo(self, value):
+        return validar_texto(value, "O título contém palavras ofensivas ou inapropriadas.")
+
+    def validate_descricao(self, value):
+        return validar_texto(value, "A descrição contém palavras ofensivas ou inapropriadas.")
+
     def validate_prazo(self, value):
         if value < date.today():
             raise serializers.ValidationError("O prazo deve ser uma data futura.")
@@ -134,7 +133,7 @@ class TrabalhoSerializer(serializers.ModelSerializer):
         self._processar_ramo(trabalho, ramo_input)
         
         # Processa habilidades
-        self._processar_habilidades(trabalho, habilidades_texto)
+        self._processar_habilidades(trabalho, habilidades_texto or [])
         
         return trabalho
 
@@ -159,7 +158,6 @@ class TrabalhoSerializer(serializers.ModelSerializer):
 
         # Processa habilidades se foram enviadas
         if habilidades_texto is not None:
-            trabalho.habilidades.clear()
             self._processar_habilidades(trabalho, habilidades_texto)
 
         return trabalho
@@ -198,13 +196,11 @@ class TrabalhoSerializer(serializers.ModelSerializer):
             trabalho.save(update_fields=["ramo"])
             return
         
-        ramo_obj = None
-        
+        # ID existente: resolvido no cache da taxonomia, sem consulta
         try:
-            ramo_id = int(ramo_input)
-            ramo_obj = Ramo.objects.filter(id=ramo_id).first()
-            if ramo_obj:
-                trabalho.ramo = ramo_obj
+            ramo = resolver_ramo(int(ramo_input))
+            if ramo:
+                trabalho.ramo_id = ramo["id"]
                 trabalho.save(update_fields=["ramo"])
                 return
         except (ValueError, TypeError):
@@ -216,7 +212,7 @@ class TrabalhoSerializer(serializers.ModelSerializer):
             return
         
         # Valida palavras proibidas
-        if any(p.lower() in nome_ramo.lower() for p in PALAVRAS_PROIBIDAS):
+        if contem_proibida(nome_ramo, TIPOS_NOME):
             return
         
         # Remove caracteres especiais
@@ -228,15 +224,21 @@ class TrabalhoSerializer(serializers.ModelSerializer):
         # Formata: primeira letra maiúscula de cada palavra
         nome_formatado = " ".join(word.capitalize() for word in nome_limpo.split())
         
-        ramo_obj, _ = Ramo.objects.get_or_create(nome=nome_formatado)
-        trabalho.ramo = ramo_obj
+        ramo = resolver_ramo(nome_formatado)
+        if ramo:
+            trabalho.ramo_id = ramo["id"]
+        else:
+            trabalho.ramo, _ = Ramo.objects.get_or_create(nome=nome_formatado)
         trabalho.save(update_fields=["ramo"])
 
     # Internos para habilidades
     def _extrair_habilidades(self):
+        """Lista de nomes enviada; None se o campo não veio (update mantém as atuais)."""
         request = self.context.get("request")
         habilidades = []
         if request and hasattr(request, "data"):
+            if "habilidades" not in request.data:
+                return None
             if hasattr(request.data, "getlist"):
                 habilidades = request.data.getlist("habilidades")
             else:
@@ -246,15 +248,80 @@ class TrabalhoSerializer(serializers.ModelSerializer):
         return habilidades
 
     def _processar_habilidades(self, trabalho, habilidades_texto):
+        """
+        Aplica as habilidades em lote (custo fixo, independente da quantidade):
+        - nomes limpos/formatados e deduplicados numa passada;
+        - existentes resolvidas pelo cache da taxonomia e, se faltar, um nome__in;
+        - inexistentes criadas com um único bulk_create;
+        - o M2M passa a ser exatamente a lista enviada.
+        """
+        nomes = {}
         for nome in habilidades_texto:
             nome_limpo = str(nome).strip()
             if not nome_limpo:
                 continue
-            if any(p.lower() in nome_limpo.lower() for p in PALAVRAS_PROIBIDAS):
+            if contem_proibida(nome_limpo, TIPOS_NOME):
                 continue
             nome_limpo = re.sub(r"[^a-zA-ZÀ-ÿ0-9\s]", "", nome_limpo)
             if len(nome_limpo) < 2:
                 continue
             nome_formatado = nome_limpo.capitalize()
-            habilidade, _ = Habilidade.objects.get_or_create(nome=nome_formatado)
-            trabalho.habilidades.add(habilidade)
\ No newline at end of file
+            nomes.setdefault(normalizar_nome(nome_formatado), nome_formatado)
+
+        # set() grava só a diferença e envia os m2m_changed (índice de busca, contagens, perfis)
+        trabalho.habilidades.set(self._resolver_habilidades(nomes))
+
+    def _resolver_habilidades(self, nomes):
+        """IDs das habilidades para {nome normalizado: nome formatado}, criando as que faltam."""
+        ids = set()
+        faltantes = {}
+        for chave, nome in nomes.items():
+            habilidade = resolver_habilidade(nome)
+            if habilidade:
+                ids.add(habilidade["id"])
+            else:
+                faltantes[chave] = nome
+        if not faltantes:
+            return ids
+
+        def buscar():
+            for habilidade_id, nome in Habilidade.objects.filter(nome__in=faltantes.values()).values_list("id", "nome"):
+                ids.add(habilidade_id)
+                faltantes.pop(normalizar_nome(nome), None)
+
+        buscar()
+        if faltantes:
+            # Sem sinais no bulk_create: a versão da taxonomia é trocada à mão
+            Habilidade.objects.bulk_create(
+                [Habilidade(nome=nome) for nome in faltantes.values()], ignore_conflicts=True
+            )
+            invalidar_taxonomia()
+            buscar()
+        return ids
+
+
+class TrabalhoResumoSerializer(serializers.ModelSerializer):
+    """Resumo do trabalho para listagens aninhadas (ramo e habilidades pré-carregados)."""
+    ramo_detalhes = RamoSerializer(source="ramo", read_only=True)
+    habilidades_detalhes = HabilidadeSerializer(source="habilidades", many=True, read_only=True)
+
+    class Meta:
+        model = Trabalho
+        fields = [
+            "id", "titulo", "status", "prazo", "orcamento", "is_privado",
+            "ramo_detalhes", "habilidades_detalhes",
+        ]
+        read_only_fields = fields
+
+
+class FreelancerRecomendadoSerializer(serializers.ModelSerializer):
+    """Freelancer recomendado para um trabalho, com a compatibilidade calculada."""
+    id = serializers.IntegerField(source="freelancer_id", read_only=True)
+    nome = serializers.CharField(source="freelancer.nome", read_only=True)
+    foto_perfil = serializers.ImageField(source="freelancer.foto_perfil", read_only=True)
+    nota_media = serializers.FloatField(source="freelancer.nota_media", read_only=True)
+    compatibilidade = serializers.FloatField(source="pontuacao", read_only=True)
+
+    class Meta:
+        model = RecomendacaoTrabalho
+        fields = ["id", "nome", "foto_perfil", "nota_media", "compatibilidade"]
@@ -0,0 +1,60 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from habilidades.models import Habilidade, Ramo
+
+from .busca import indexar_trabalho
+from .paginacao import invalidar_contagens
+from .models import Trabalho
+
+
+# Documento de busca (trabalhos/busca.py)
+@receiver(post_save, sender=Trabalho)
+def indexar_ao_salvar(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    indexar_trabalho(instance)
+
+
+@receiver(m2m_changed, sender=Trabalho.habilidades.through)
+def indexar_ao_alterar_habilidades(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        indexar_trabalho(instance)
+        return
+
+    # Alteração feita pelo lado da habilidade: reindexa os trabalhos afetados
+    for trabalho in Trabalho.objects.filter(pk__in=pk_set or ()).select_related("ramo"):
+        indexar_trabalho(trabalho)
+
+
+@receiver(post_save, sender=Habilidade)
+def reindexar_por_habilidade(sender, instance, created, raw=False, **kwargs):
+    """Renomear uma habilidade altera o documento dos trabalhos que a usam."""
+    if created or raw:
+        return
+    for trabalho in instance.trabalhos.select_related("ramo"):
+        indexar_trabalho(trabalho)
+
+
+@receiver(post_save, sender=Ramo)
+def reindexar_por_ramo(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    for trabalho in instance.trabalhos.select_related("ramo"):
+        indexar_trabalho(trabalho)
+
+
+# Contagens da listagem em cache (trabalhos/paginacao.py)
+@receiver(post_save, sender=Trabalho)
+@receiver(post_delete, sender=Trabalho)
+def invalidar_contagens_trabalho(sender, **kwargs):
+    invalidar_contagens()
+
+
+@receiver(m2m_changed, sender=Trabalho.habilidades.through)
+def invalidar_contagens_habilidades(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidar_contagens()
@@ -0,0 +1,51 @@
+from fila.registro import tarefa
+from notificacoes.models import Notificacao, NotificacaoBroadcast
+from notificacoes.utils import enviar_broadcast, enviar_notificacoes_em_massa
+
+from .recomendacao import recalcular_trabalho, trabalhos_recomendaveis
+
+# Freelancers notificados por trabalho publicado (os mais compatíveis)
+MAX_NOTIFICADOS = 200
+
+
+@tarefa("trabalhos.recomendar_trabalho")
+def recomendar_trabalho(trabalho_id, notificar=False, atualizado=False, desde=None):
+    """
+    Calcula as recomendações de um trabalho público e aberto. Com
+    notificar=True avisa só os freelancers compatíveis; num trabalho novo sem
+    nenhum compatível (sem habilidades/ramo ou sem histórico compatível) cai
+    no broadcast geral. Em atualizações (atualizado=True) não há broadcast.
+    `desde` é o momento do enfileiramento: numa nova tentativa, quem já
+    recebeu o aviso desde então não é notificado de novo.
+    """
+    trabalho = trabalhos_recomendaveis().filter(pk=trabalho_id).first()
+    if trabalho is None:
+        return
+
+    pares = recalcular_trabalho(trabalho_id, top=max(MAX_NOTIFICADOS, 50))
+    if not notificar:
+        return
+
+    if atualizado:
+        mensagem = f"O trabalho '{trabalho.titulo}' foi atualizado."
+    else:
+        mensagem = f"Novo trabalho publicado: '{trabalho.titulo}'."
+    # Mesmo corte de enviar_notificacoes_em_massa, para comparar com o que foi gravado
+    mensagem = mensagem[:255]
+    link = f"/trabalhos/detalhes/{trabalho.id}"
+    if pares:
+        destinatarios = [freelancer_id for freelancer_id, _ in pares[:MAX_NOTIFICADOS]]
+        if desde:
+            notificados = set(
+                Notificacao.objects
+                .filter(usuario_id__in=destinatarios, mensagem=mensagem, link=link, data_criacao__gte=desde)
+                .values_list("usuario_id", flat=True)
+            )
+            destinatarios = [i for i in destinatarios if i not in notificados]
+        enviar_notificacoes_em_massa(destinatarios, mensagem, link)
+    elif not atualizado:
+        if desde and NotificacaoBroadcast.objects.filter(
+            mensagem=mensagem, link=link, data_criacao__gte=desde
+        ).exists():
+            return
+        enviar_broadcast(mensagem=mensagem, link=link)
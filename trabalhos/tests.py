@@ -1,3 +1,113 @@
+import datetime
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from notificacoes.models import Notificacao, NotificacaoBroadcast
+from trabalhos.models import Trabalho, TrabalhoBusca
+from trabalhos.tarefas import recomendar_trabalho
+from usuarios.models import Usuario
+
+
+class HabilidadesTrabalhoTests(APITestCase):
+    """Habilidades enviadas na criação/edição do trabalho (TrabalhoSerializer)."""
+
+    url = "/api/trabalhos/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.contratante = Usuario.objects.create(
+            email="contratante@exemplo.com", nome="Contratante", tipo="contratante", telefone="0", password="!",
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(user=self.contratante)
+
+    def _criar(self, habilidades):
+        resposta = self.client.post(self.url, {
+            "titulo": "Loja virtual", "descricao": "Loja com pagamento online",
+            "prazo": str(datetime.date.today() + datetime.timedelta(days=30)), "orcamento": "1500.00",
+            "habilidades": habilidades,
+        }, format="multipart", secure=True)
+        self.assertEqual(resposta.status_code, 201, resposta.data)
+        return Trabalho.objects.get(pk=resposta.data["id"])
+
+    def _editar(self, trabalho, **dados):
+        resposta = self.client.patch(f"{self.url}{trabalho.id}/", dados, format="multipart", secure=True)
+        self.assertEqual(resposta.status_code, 200, resposta.data)
+
+    def _nomes(self, trabalho):
+        return set(trabalho.habilidades.values_list("nome", flat=True))
+
+    def test_criacao_deduplica_e_indexa(self):
+        trabalho = self._criar(["django", "Django ", "react", "x"])
+
+        self.assertEqual(self._nomes(trabalho), {"Django", "React"})
+        self.assertIn("django", TrabalhoBusca.objects.get(pk=trabalho.pk).documento)
+
+    def test_edicao_substitui_e_reindexa(self):
+        trabalho = self._criar(["Django", "React"])
+
+        self._editar(trabalho, habilidades=["React", "Vue"])
+
+        self.assertEqual(self._nomes(trabalho), {"React", "Vue"})
+        documento = TrabalhoBusca.objects.get(pk=trabalho.pk).documento
+        self.assertIn("vue", documento)
+        self.assertNotIn("django", documento)
+
+    def test_edicao_sem_o_campo_mantem_as_habilidades(self):
+        trabalho = self._criar(["Django"])
+
+        self._editar(trabalho, titulo="Loja virtual completa")
+
+        self.assertEqual(self._nomes(trabalho), {"Django"})
+
+
+class RecomendarTrabalhoNovaTentativaTests(TestCase):
+    """Uma nova tentativa da tarefa (fila) não repete avisos já enviados."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.contratante = Usuario.objects.create(
+            email="contratante@exemplo.com", nome="Contratante", tipo="contratante", telefone="0", password="!",
+        )
+        cls.freelancers = [
+            Usuario.objects.create(
+                email=f"freelancer{i}@exemplo.com", nome=f"Freelancer {i}", tipo="freelancer",
+                telefone="0", password="!",
+            )
+            for i in range(3)
+        ]
+        cls.trabalho = Trabalho.objects.create(
+            titulo="Loja virtual", descricao="-", prazo=datetime.date.today(), orcamento=100,
+            contratante=cls.contratante,
+        )
+
+    def _executar(self, pares, desde):
+        with mock.patch("trabalhos.tarefas.recalcular_trabalho", return_value=pares):
+            recomendar_trabalho(self.trabalho.id, notificar=True, desde=desde)
+
+    def test_nova_tentativa_avisa_so_quem_faltou(self):
+        desde = timezone.now().isoformat()
+        primeiro, *restantes = self.freelancers
+        self._executar([(primeiro.id, 0.9)], desde)
+        self._executar([(f.id, 0.9) for f in self.freelancers], desde)
+
+        avisados = Notificacao.objects.filter(link=f"/trabalhos/detalhes/{self.trabalho.id}")
+        self.assertEqual(sorted(avisados.values_list("usuario_id", flat=True)), sorted(f.id for f in self.freelancers))
+
+    def test_nova_tentativa_nao_repete_o_broadcast(self):
+        desde = timezone.now().isoformat()
+        self._executar([], desde)
+        self._executar([], desde)
+
+        self.assertEqual(NotificacaoBroadcast.objects.count(), 1)
+
+    def test_novo_enfileiramento_avisa_de_novo(self):
+        pares = [(f.id, 0.9) for f in self.freelancers]
+        self._executar(pares, timezone.now().isoformat())
+        self._executar(pares, timezone.now().isoformat())
 
-# Create your tests here.
+        self.assertEqual(Notificacao.objects.count(), 2 * len(self.freelancers))
@@ -3,12 +3,16 @@ from .views import (
     TrabalhoAPIView,
     TrabalhoDetalheAPIView,
     TrabalhoAceitarAPIView,
-    TrabalhoRecusarAPIView
+    TrabalhoRecusarAPIView,
+    TrabalhoRecomendadosAPIView,
+    TrabalhosParaMimAPIView,
 )
 
 urlpatterns = [
     path('trabalhos/', TrabalhoAPIView.as_view(), name='trabalhos-lista-criacao'),
+    path('trabalhos/para-mim/', TrabalhosParaMimAPIView.as_view(), name='trabalhos-para-mim'),
     path('trabalhos/<int:pk>/', TrabalhoDetalheAPIView.as_view(), name='trabalhos-detalhe'),
+    path('trabalhos/<int:pk>/recomendados/', TrabalhoRecomendadosAPIView.as_view(), name='trabalhos-recomendados'),
 
     # Endpoints para freelancer aceitar/recusar trabalho privado
     path('trabalhos/<int:pk>/aceitar/', TrabalhoAceitarAPIView.as_view(), name='trabalhos-aceitar'),
@@ -4,16 +4,25 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import get_object_or_404
+from django.core.cache import cache
 from django.db import transaction
 from django.db.models import Q
+from django.utils import timezone
 
 # Modelos e Serializers do app
-from .models import Trabalho
-from .serializers import TrabalhoSerializer
+from .models import Trabalho, RecomendacaoTrabalho
+from .serializers import TrabalhoSerializer, FreelancerRecomendadoSerializer
+from .busca import filtrar_por_busca
+from .paginacao import apos_cursor, contar, cursor_do_trabalho
+from .recomendacao import trabalhos_recomendaveis
+from .tarefas import recomendar_trabalho
 
 # Notificações e dependências externas
-from notificacoes.utils import enviar_notificacao
-from habilidades.models import Habilidade, Ramo
+from notificacoes.utils import enviar_notificacao, enviar_broadcast
+from habilidades.cache import resolver_habilidade, resolver_ramo
+
+# Segundos antes de pedir de novo à fila as recomendações de um trabalho ainda não calculado
+ESPERA_RECOMENDACAO = 60
 
 
 class TrabalhoAPIView(APIView):
@@ -32,8 +41,11 @@ class TrabalhoAPIView(APIView):
           - contratante: por padrão vê apenas os próprios; se ?todos=1, vê também os públicos (útil em consultas gerais)
           - freelancer: vê públicos e os privados destinados a ele
           - admin: vê todos
-        Filtros: ?busca=, ?habilidade= (id ou nome), ?ramo= (id ou nome), ?status=,
+        Filtros: ?busca= (ordenado por relevância), ?habilidade= (id ou nome), ?ramo= (id ou nome), ?status=,
                  ?page=, ?page_size=, ?todos=1 (só tem efeito para contratante)
+        Paginação por cursor: ?cursor= (vazio na primeira página) usa keyset em
+        (-criado_em, -id) e devolve `proximo_cursor`; nesse modo a ordem é sempre
+        por data, mesmo com ?busca=. O `total` vem de um cache por filtros.
         """
         usuario = request.user
 
@@ -42,6 +54,7 @@ class TrabalhoAPIView(APIView):
         ramo_param = (request.query_params.get("ramo") or "").strip()
         status_param = (request.query_params.get("status") or "").strip().lower()
         ver_todos_contratante = (request.query_params.get("todos") or "").strip() in ("1", "true", "True")
+        cursor = request.query_params.get("cursor")
 
         # paginação
         try:
@@ -55,8 +68,10 @@ class TrabalhoAPIView(APIView):
 
         # Base conforme o tipo do usuário
         if usuario.is_superuser:
+            escopo = ("admin",)
             trabalhos = Trabalho.objects.all()
         elif getattr(usuario, "tipo", None) == "contratante":
+            escopo = ("contratante", usuario.id, ver_todos_contratante)
             # Por padrão, contratante vê apenas os trabalhos que publicou.
             if ver_todos_contratante:
                 trabalhos = Trabalho.objects.filter(
@@ -66,42 +81,29 @@ class TrabalhoAPIView(APIView):
             else:
                 trabalhos = Trabalho.objects.filter(contratante=usuario)
         else:
+            escopo = ("freelancer", usuario.id)
             trabalhos = Trabalho.objects.filter(
                 Q(is_privado=False) |
                 Q(is_privado=True, freelancer=usuario)
             )
 
-        #Filtros
-            trabalhos = trabalhos.filter(
-                Q(titulo__icontains=busca) |
-                Q(descricao__icontains=busca) |
-                Q(habilidades__nome__icontains=busca) |
-                Q(ramo__nome__icontains=busca)
-            ).distinct()
+        # Filtro por texto (índice full-text, ver trabalhos/busca.py)
+        if busca:
+            trabalhos = filtrar_por_busca(trabalhos, busca)
 
-        #Filtro por habilidade
+        # Filtro por habilidade (id ou nome resolvido no cache da taxonomia)
         if habilidade_param:
-            habilidade_obj = None
-            try:
-                habilidade_obj = Habilidade.objects.filter(id=int(habilidade_param)).first()
-            except (ValueError, TypeError):
-                habilidade_obj = Habilidade.objects.filter(nome__iexact=habilidade_param).first()
-
-            if habilidade_obj:
-                trabalhos = trabalhos.filter(habilidades=habilidade_obj)
+            habilidade = resolver_habilidade(habilidade_param)
+            if habilidade:
+                trabalhos = trabalhos.filter(habilidades__id=habilidade["id"])
             else:
                 trabalhos = trabalhos.none()
 
         # Filtro por ramo
         if ramo_param:
-            ramo_obj = None
-            try:
-                ramo_obj = Ramo.objects.filter(id=int(ramo_param)).first()
-            except (ValueError, TypeError):
-                ramo_obj = Ramo.objects.filter(nome__iexact=ramo_param).first()
-
-            if ramo_obj:
-                trabalhos = trabalhos.filter(ramo=ramo_obj)
+            ramo = resolver_ramo(ramo_param)
+            if ramo:
+                trabalhos = trabalhos.filter(ramo_id=ramo["id"])
             else:
                 trabalhos = trabalhos.none()
 
@@ -109,11 +111,37 @@ class TrabalhoAPIView(APIView):
         if status_param:
             trabalhos = trabalhos.filter(status=status_param)
 
+        # Total em cache por combinação de filtros (invalidado a cada save/delete)
+        total = contar(trabalhos, (escopo, busca, habilidade_param, ramo_param, status_param))
+
         # Otimização + Ordenação
         trabalhos = trabalhos.select_related("contratante", "freelancer", "ramo").prefetch_related("habilidades")
-        trabalhos = trabalhos.order_by("-criado_em", "-id")
 
-        total = trabalhos.count()
+        # Paginação por cursor (keyset)
+        if cursor is not None:
+            trabalhos = trabalhos.order_by("-criado_em", "-id")
+            if cursor:
+                trabalhos = apos_cursor(trabalhos, cursor)
+
+            pagina = list(trabalhos[:page_size + 1])
+            tem_mais = len(pagina) > page_size
+            pagina = pagina[:page_size]
+
+            serializer = TrabalhoSerializer(pagina, many=True, context={"request": request})
+            return Response(
+                {
+                    "results": serializer.data,
+                    "total": total,
+                    "page_size": page_size,
+                    "proximo_cursor": cursor_do_trabalho(pagina[-1]) if tem_mais else None,
+                }
+            )
+
+        if busca:
+            trabalhos = trabalhos.order_by("-relevancia", "-criado_em", "-id")
+        else:
+            trabalhos = trabalhos.order_by("-criado_em", "-id")
+
         start = (page - 1) * page_size
         end = start + page_size
         trabalhos_paginados = trabalhos[start:end]
@@ -134,7 +162,8 @@ class TrabalhoAPIView(APIView):
         Cria um novo trabalho.
         Regras:
         - Apenas contratantes podem criar.
-        - Dispara notificações: se privado → apenas ao freelancer-alvo; senão → a todos os freelancers.
+        - Dispara notificações: se privado → apenas ao freelancer-alvo; senão → aos freelancers
+          compatíveis (trabalhos/recomendacao.py, calculado pela fila).
         """
         # Garantia de permissão
         if not (request.user.is_superuser or getattr(request.user, "tipo", None) == "contratante"):
@@ -147,7 +176,6 @@ class TrabalhoAPIView(APIView):
         trabalho = serializer.save()
 
         # Disparo de notificações
-        from usuarios.models import Usuario
         if trabalho.is_privado and trabalho.freelancer:
             # privado só para o freelancer selecionado
             enviar_notificacao(
@@ -156,14 +184,8 @@ class TrabalhoAPIView(APIView):
                 link=f"/trabalhos/detalhes/{trabalho.id}",
             )
         else:
-            # público para todos os freelancers
-            freelancers = Usuario.objects.filter(tipo="freelancer").only("id")
-            for f in freelancers:
-                enviar_notificacao(
-                    usuario=f,
-                    mensagem=f"Novo trabalho publicado: '{trabalho.titulo}'.",
-                    link=f"/trabalhos/detalhes/{trabalho.id}",
-                )
+            # público: recomendações + notificação dos compatíveis (broadcast se não houver)
+            recomendar_trabalho.enfileirar(trabalho.id, notificar=True, desde=timezone.now().isoformat())
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -217,7 +239,6 @@ class TrabalhoDetalheAPIView(APIView):
         trabalho_atualizado = serializer.save()
 
         # Notificações
-        from usuarios.models import Usuario
         if trabalho_atualizado.is_privado and trabalho_atualizado.freelancer:
             enviar_notificacao(
                 usuario=trabalho_atualizado.freelancer,
@@ -225,13 +246,10 @@ class TrabalhoDetalheAPIView(APIView):
                 link=f"/trabalhos/detalhes/{trabalho_atualizado.id}",
             )
         else:
-            freelancers = Usuario.objects.filter(tipo="freelancer").only("id")
-            for f in freelancers:
-                enviar_notificacao(
-                    usuario=f,
-                    mensagem=f"O trabalho '{trabalho_atualizado.titulo}' foi atualizado.",
-                    link=f"/trabalhos/detalhes/{trabalho_atualizado.id}",
-                )
+            # Habilidades/ramo podem ter mudado: recalcula e avisa só os compatíveis
+            recomendar_trabalho.enfileirar(
+                trabalho_atualizado.id, notificar=True, atualizado=True, desde=timezone.now().isoformat()
+            )
 
         return Response(serializer.data)
 
@@ -251,7 +269,6 @@ class TrabalhoDetalheAPIView(APIView):
         trabalho_atualizado = serializer.save()
 
         # Notificações 
-        from usuarios.models import Usuario
         if trabalho_atualizado.is_privado and trabalho_atualizado.freelancer:
             enviar_notificacao(
                 usuario=trabalho_atualizado.freelancer,
@@ -259,13 +276,10 @@ class TrabalhoDetalheAPIView(APIView):
                 link=f"/trabalhos/detalhes/{trabalho_atualizado.id}",
             )
         else:
-            freelancers = Usuario.objects.filter(tipo="freelancer").only("id")
-            for f in freelancers:
-                enviar_notificacao(
-                    usuario=f,
-                    mensagem=f"O trabalho '{trabalho_atualizado.titulo}' foi atualizado.",
-                    link=f"/trabalhos/detalhes/{trabalho_atualizado.id}",
-                )
+            # Habilidades/ramo podem ter mudado: recalcula e avisa só os compatíveis
+            recomendar_trabalho.enfileirar(
+                trabalho_atualizado.id, notificar=True, atualizado=True, desde=timezone.now().isoformat()
+            )
 
         return Response(serializer.data)
 
@@ -284,7 +298,6 @@ class TrabalhoDetalheAPIView(APIView):
         trabalho.delete()
 
         # Notificações pós-exclusão
-        from usuarios.models import Usuario
         if is_privado and freelancer_destino:
             enviar_notificacao(
                 usuario=freelancer_destino,
@@ -292,13 +305,10 @@ class TrabalhoDetalheAPIView(APIView):
                 link="/trabalhos",
             )
         else:
-            freelancers = Usuario.objects.filter(tipo="freelancer").only("id")
-            for f in freelancers:
-                enviar_notificacao(
-                    usuario=f,
-                    mensagem=f"O trabalho '{titulo}' foi removido pelo contratante.",
-                    link="/trabalhos",
-                )
+            enviar_broadcast(
+                mensagem=f"O trabalho '{titulo}' foi removido pelo contratante.",
+                link="/trabalhos",
+            )
 
         return Response({"mensagem": "Trabalho excluído com sucesso."}, status=status.HTTP_204_NO_CONTENT)
 
@@ -413,3 +423,91 @@ class TrabalhoRecusarAPIView(APIView):
         )
 
         return Response({"mensagem": "Trabalho recusado com sucesso!"}, status=status.HTTP_200_OK)
+
+
+class TrabalhoRecomendadosAPIView(APIView):
+    """
+    Freelancers mais compatíveis com um trabalho (ver trabalhos/recomendacao.py).
+    - GET: apenas contratante dono ou admin. ?limite= (padrão 10, máx. 50).
+    Se o trabalho aberto ainda não foi calculado, pede o cálculo à fila e
+    responde com `calculando: true` (a lista chega nas próximas chamadas).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        trabalho = get_object_or_404(Trabalho, pk=pk)
+        if not (request.user.is_superuser or request.user.id == trabalho.contratante_id):
+            return Response({"erro": "Você não tem permissão para ver as recomendações deste trabalho."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            limite = max(1, min(50, int(request.query_params.get("limite", 10))))
+        except ValueError:
+            limite = 10
+
+        calculando = False
+        if trabalho.recomendacoes_em is None and not trabalho.is_privado and trabalho.status == "aberto":
+            calculando = True
+            # Uma tarefa por trabalho enquanto a fila não calcula
+            if cache.add(f"trabalhos:recomendar:{trabalho.id}", 1, timeout=ESPERA_RECOMENDACAO):
+                recomendar_trabalho.enfileirar(trabalho.id)
+
+        recomendacoes = (
+            trabalho.recomendacoes
+            .filter(freelancer__is_active=True, freelancer__is_suspended_self=False, freelancer__banido=False)
+            .select_related("freelancer")
+            .order_by("-pontuacao", "freelancer_id")[:limite]
+        )
+        serializer = FreelancerRecomendadoSerializer(recomendacoes, many=True, context={"request": request})
+        return Response({"results": serializer.data, "calculando": calculando})
+
+
+class TrabalhosParaMimAPIView(APIView):
+    """
+    Feed "trabalhos para mim" do freelancer: trabalhos públicos abertos
+    ordenados pela compatibilidade pré-calculada.
+    - GET: ?page=, ?page_size= (máx. 50). Cada item traz `compatibilidade`.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if getattr(request.user, "tipo", None) != "freelancer":
+            return Response({"erro": "Feed disponível apenas para freelancers."}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            page = max(1, int(request.query_params.get("page", 1)))
+        except ValueError:
+            page = 1
+        try:
+            page_size = max(1, min(50, int(request.query_params.get("page_size", 6))))
+        except ValueError:
+            page_size = 6
+
+        recomendacoes = (
+            RecomendacaoTrabalho.objects
+            .filter(freelancer=request.user, trabalho__in=trabalhos_recomendaveis())
+            .order_by("-pontuacao", "-trabalho_id")
+        )
+        total = recomendacoes.count()
+
+        start = (page - 1) * page_size
+        pagina = list(
+            recomendacoes
+            .select_related("trabalho__contratante", "trabalho__freelancer", "trabalho__ramo")
+            .prefetch_related("trabalho__habilidades")[start:start + page_size]
+        )
+
+        serializer = TrabalhoSerializer([r.trabalho for r in pagina], many=True, context={"request": request})
+        resultados = serializer.data
+        for item, recomendacao in zip(resultados, pagina):
+            item["compatibilidade"] = recomendacao.pontuacao
+
+        return Response(
+            {
+                "results": resultados,
+                "total": total,
+                "page": page,
+                "page_size": page_size,
+                "num_pages": (total + page_size - 1) // page_size,
+            }
+        )
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import Usuario
+from .models import Usuario, ValidacaoDocumento
 
 
 @admin.register(Usuario)
@@ -40,4 +40,10 @@ class UsuarioAdmin(BaseUserAdmin):
     )
     
     # Campos somente leitura
-    readonly_fields = ('deactivated_at',)
\ No newline at end of file
+    readonly_fields = ('deactivated_at',)
+
+@admin.register(ValidacaoDocumento)
+class ValidacaoDocumentoAdmin(admin.ModelAdmin):
+    list_display = ('tipo', 'valido', 'mensagem', 'consultado_em', 'expira_em')
+    list_filter = ('tipo', 'valido')
+    readonly_fields = ('documento_hash', 'tipo', 'valido', 'mensagem', 'consultado_em', 'expira_em')
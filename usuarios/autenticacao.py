@@ -0,0 +1,40 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from .estado import estado_do_usuario, guardar_estado, registrar_versao
+
+# Atributo do HttpRequest com (token bruto, usuário, token validado)
+ATRIBUTO_AUTENTICACAO = "_autenticacao_jwt"
+
+
+def registrar_autenticacao(request, token_bruto, usuario, token_validado):
+    """Guarda o usuário autenticado no request e o seu estado no cache do processo."""
+    setattr(request, ATRIBUTO_AUTENTICACAO, (token_bruto, usuario, token_validado))
+    guardar_estado(usuario.pk, token_validado.get(api_settings.JTI_CLAIM), estado_do_usuario(usuario))
+    registrar_versao(usuario.pk, usuario.token_version)
+
+
+class JWTAutenticacaoCompartilhada(JWTAuthentication):
+    """
+    JWTAuthentication que reaproveita o usuário já carregado pelo
+    ModoLeituraMiddleware na mesma requisição, em vez de buscá-lo de novo.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        token_bruto = self.get_raw_token(header)
+        if token_bruto is None:
+            return None
+
+        django_request = getattr(request, "_request", request)
+        ja_autenticado = getattr(django_request, ATRIBUTO_AUTENTICACAO, None)
+        if ja_autenticado and ja_autenticado[0] == token_bruto:
+            return ja_autenticado[1], ja_autenticado[2]
+
+        token_validado = self.get_validated_token(token_bruto)
+        usuario = self.get_user(token_validado)
+        registrar_autenticacao(django_request, token_bruto, usuario, token_validado)
+        return usuario, token_validado
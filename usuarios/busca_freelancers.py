@@ -0,0 +1,298 @@
+"""
+Busca de freelancers (/usuarios/buscar_freelancers/).
+
+Cada freelancer tem uma linha em PerfilBuscaFreelancer com tudo que a busca
+filtra e ordena (nota, contratos concluídos, taxa de entrega no prazo,
+habilidades e ramos dos trabalhos concluídos) e a pontuação de ranking já
+calculada. A consulta não agrega contratos nem avaliações: filtra uma tabela
+indexada e pagina.
+
+Manutenção:
+- indexar_freelancer(id): recalcula a linha de um freelancer (sinais de
+  Contrato/Trabalho em contratos/signals.py e de Avaliacao em avaliacoes/signals.py);
+- atualizar_dados_usuario(usuario): nome/visibilidade a cada save do Usuario;
+- reindexar_freelancers(): reconstrução em lote (comando reindexar_freelancers).
+"""
+import math
+
+from django.db.models import Count
+from rest_framework.exceptions import ValidationError
+
+from trabalhos.busca import normalizar
+
+# Nota bayesiana: poucas avaliações puxam a nota para NOTA_PRIORI
+NOTA_PRIORI = 3.5
+PESO_PRIORI = 5
+# Contratos concluídos a partir dos quais a experiência conta como máxima
+CONCLUIDOS_REFERENCIA = 50
+
+# Peso de cada componente na pontuação (soma 1)
+PESO_NOTA = 0.5
+PESO_EXPERIENCIA = 0.3
+PESO_PRAZO = 0.2
+
+ORDENACOES = {
+    "relevancia": ("-pontuacao", "-freelancer_id"),
+    "nota": ("-nota_media", "-total_avaliacoes", "-freelancer_id"),
+    "contratos": ("-contratos_concluidos", "-freelancer_id"),
+    "prazo": ("-taxa_entrega_prazo", "-contratos_concluidos", "-freelancer_id"),
+}
+
+MAX_HABILIDADES_FILTRO = 5
+LIMITE_FACETAS = 20
+
+
+def calcular_pontuacao(soma_notas, total_avaliacoes, contratos_concluidos, taxa_entrega_prazo):
+    """Pontuação de 0 a 1 usada na ordenação por relevância."""
+    nota = (soma_notas + NOTA_PRIORI * PESO_PRIORI) / (total_avaliacoes + PESO_PRIORI)
+    experiencia = min(math.log1p(contratos_concluidos) / math.log1p(CONCLUIDOS_REFERENCIA), 1.0)
+    return round(
+        PESO_NOTA * (nota / 5) + PESO_EXPERIENCIA * experiencia + PESO_PRAZO * (taxa_entrega_prazo / 100),
+        6,
+    )
+
+
+def _visivel(ativo, modo_leitura, banido):
+    return bool(ativo and not modo_leitura and not banido)
+
+
+def _nome_busca(nome):
+    return " ".join(normalizar(nome))[:255]
+
+
+# ---------------------------------------------------------------------------
+# Indexação
+# ---------------------------------------------------------------------------
+
+def indexar_freelancer(usuario_id):
+    """Cria/atualiza a linha de busca de um freelancer (remove se não for freelancer)."""
+    from contratos.metricas import recalcular_metricas
+    from contratos.models import Contrato, MetricasFreelancer
+    from trabalhos.models import Trabalho
+
+    from .models import PerfilBuscaFreelancer, Usuario
+
+    usuario = Usuario.objects.filter(pk=usuario_id).first()
+    if usuario is None or usuario.tipo != "freelancer":
+        PerfilBuscaFreelancer.objects.filter(pk=usuario_id).delete()
+        return None
+
+    metricas = (
+        MetricasFreelancer.objects.filter(pk=usuario_id).first()
+        or recalcular_metricas(usuario_id)
+    )
+
+    perfil, _ = PerfilBuscaFreelancer.objects.update_or_create(
+        freelancer_id=usuario_id,
+        defaults={
+            "nome_busca": _nome_busca(usuario.nome),
+            "visivel": _visivel(usuario.is_active, usuario.is_suspended_self, usuario.banido),
+            "nota_media": usuario.nota_media,
+            "total_avaliacoes": usuario.total_avaliacoes,
+            "contratos_concluidos": metricas.contratos_concluidos,
+            "taxa_entrega_prazo": metricas.taxa_entrega_prazo,
+            "pontuacao": calcular_pontuacao(
+                usuario.soma_notas,
+                usuario.total_avaliacoes,
+                metricas.contratos_concluidos,
+                metricas.taxa_entrega_prazo,
+            ),
+        },
+    )
+
+    concluidos = Contrato.objects.filter(freelancer_id=usuario_id, status="concluido")
+    perfil.habilidades.set(
+        Trabalho.habilidades.through.objects
+        .filter(trabalho__in=concluidos.values("trabalho_id"))
+        .values_list("habilidade_id", flat=True)
+        .distinct()
+    )
+    perfil.ramos.set(
+        concluidos.filter(trabalho__ramo__isnull=False)
+        .values_list("trabalho__ramo_id", flat=True)
+        .distinct()
+    )
+    return perfil
+
+
+def atualizar_dados_usuario(usuario):
+    """
+    Reflete nome e visibilidade após um save do Usuario com um único UPDATE
+    (o save acontece a cada login, então não recalcula o resto).
+    """
+    from .models import PerfilBuscaFreelancer
+
+    if usuario.tipo != "freelancer":
+        PerfilBuscaFreelancer.objects.filter(pk=usuario.pk).delete()
+        return
+
+    atualizados = PerfilBuscaFreelancer.objects.filter(pk=usuario.pk).update(
+        nome_busca=_nome_busca(usuario.nome),
+        visivel=_visivel(usuario.is_active, usuario.is_suspended_self, usuario.banido),
+    )
+    if not atualizados:
+        indexar_freelancer(usuario.pk)
+
+
+def reindexar_freelancers(tamanho_lote=500):
+    """Reconstrói a tabela inteira com consultas agrupadas. Retorna o total indexado."""
+    from contratos.models import Contrato, MetricasFreelancer
+    from trabalhos.models import Trabalho
+
+    from .models import PerfilBuscaFreelancer, Usuario
+
+    metricas = {m.freelancer_id: m for m in MetricasFreelancer.objects.iterator(chunk_size=tamanho_lote)}
+
+    PerfilBuscaFreelancer.objects.all().delete()
+
+    perfis = []
+    total = 0
+    usuarios = (
+        Usuario.objects
+        .filter(tipo="freelancer")
+        .order_by("id")
+        .only("id", "nome", "is_active", "is_suspended_self", "banido",
+              "nota_media", "soma_notas", "total_avaliacoes")
+    )
+    for usuario in usuarios.iterator(chunk_size=tamanho_lote):
+        m = metricas.get(usuario.id)
+        concluidos = m.contratos_concluidos if m else 0
+        taxa_prazo = m.taxa_entrega_prazo if m else 0
+        perfis.append(PerfilBuscaFreelancer(
+            freelancer_id=usuario.id,
+            nome_busca=_nome_busca(usuario.nome),
+            visivel=_visivel(usuario.is_active, usuario.is_suspended_self, usuario.banido),
+            nota_media=usuario.nota_media,
+            total_avaliacoes=usuario.total_avaliacoes,
+            contratos_concluidos=concluidos,
+            taxa_entrega_prazo=taxa_prazo,
+            pontuacao=calcular_pontuacao(usuario.soma_notas, usuario.total_avaliacoes, concluidos, taxa_prazo),
+        ))
+        if len(perfis) >= tamanho_lote:
+            PerfilBuscaFreelancer.objects.bulk_create(perfis)
+            total += len(perfis)
+            perfis = []
+    if perfis:
+        PerfilBuscaFreelancer.objects.bulk_create(perfis)
+        total += len(perfis)
+
+    concluidos = Contrato.objects.filter(status="concluido", freelancer__tipo="freelancer").order_by()
+
+    HabilidadePerfil = PerfilBuscaFreelancer.habilidades.through
+    pares = (
+        Trabalho.habilidades.through.objects
+        .filter(trabalho__contratos__in=concluidos)
+        .values_list("trabalho__contratos__freelancer_id", "habilidade_id")
+        .distinct()
+    )
+    _inserir_pares(HabilidadePerfil, "habilidade_id", pares, tamanho_lote)
+
+    RamoPerfil = PerfilBuscaFreelancer.ramos.through
+    pares = (
+        concluidos.filter(trabalho__ramo__isnull=False)
+        .values_list("freelancer_id", "trabalho__ramo_id")
+        .distinct()
+    )
+    _inserir_pares(RamoPerfil, "ramo_id", pares, tamanho_lote)
+
+    return total
+
+
+def _inserir_pares(modelo, campo, pares, tamanho_lote):
+    lote = []
+    for perfil_id, valor_id in pares.iterator(chunk_size=tamanho_lote):
+        lote.append(modelo(perfilbuscafreelancer_id=perfil_id, **{campo: valor_id}))
+        if len(lote) >= tamanho_lote:
+            modelo.objects.bulk_create(lote, ignore_conflicts=True)
+            lote = []
+    if lote:
+        modelo.objects.bulk_create(lote, ignore_conflicts=True)
+
+
+# ---------------------------------------------------------------------------
+# Consulta
+# ---------------------------------------------------------------------------
+
+def _ids(valor, nome):
+    if not valor:
+        return []
+    try:
+        return [int(v) for v in valor.split(",") if v.strip()]
+    except ValueError:
+        raise ValidationError({nome: "Informe IDs numéricos separados por vírgula."})
+
+
+def _numero(valor, nome, tipo=float):
+    if valor in (None, ""):
+        return None
+    try:
+        return tipo(valor)
+    except ValueError:
+        raise ValidationError({nome: "Valor numérico inválido."})
+
+
+def buscar_freelancers(params):
+    """
+    Aplica os filtros da query string sobre os perfis visíveis:
+    q (nome), habilidade (IDs, todos exigidos), ramo (IDs, qualquer um),
+    nota_min, concluidos_min, prazo_min (taxa %), ordenar (ver ORDENACOES).
+    """
+    from .models import PerfilBuscaFreelancer
+
+    perfis = PerfilBuscaFreelancer.objects.filter(visivel=True)
+
+    for termo in normalizar(params.get("q", "")):
+        perfis = perfis.filter(nome_busca__icontains=termo)
+
+    habilidades = _ids(params.get("habilidade"), "habilidade")
+    if len(habilidades) > MAX_HABILIDADES_FILTRO:
+        raise ValidationError({"habilidade": f"Informe no máximo {MAX_HABILIDADES_FILTRO} habilidades."})
+    for habilidade_id in habilidades:
+        perfis = perfis.filter(habilidades__id=habilidade_id)
+
+    ramos = _ids(params.get("ramo"), "ramo")
+    if ramos:
+        perfis = perfis.filter(pk__in=PerfilBuscaFreelancer.ramos.through.objects.filter(
+            ramo_id__in=ramos
+        ).values("perfilbuscafreelancer_id"))
+
+    nota_min = _numero(params.get("nota_min"), "nota_min")
+    if nota_min is not None:
+        perfis = perfis.filter(nota_media__gte=nota_min)
+
+    concluidos_min = _numero(params.get("concluidos_min"), "concluidos_min", int)
+    if concluidos_min is not None:
+        perfis = perfis.filter(contratos_concluidos__gte=concluidos_min)
+
+    prazo_min = _numero(params.get("prazo_min"), "prazo_min")
+    if prazo_min is not None:
+        perfis = perfis.filter(taxa_entrega_prazo__gte=prazo_min)
+
+    ordenar = params.get("ordenar") or "relevancia"
+    if ordenar not in ORDENACOES:
+        raise ValidationError({"ordenar": f"Use um de: {', '.join(ORDENACOES)}."})
+    return perfis.order_by(*ORDENACOES[ordenar])
+
+
+def facetas(perfis):
+    """Contagem de perfis do resultado por habilidade e por ramo (top LIMITE_FACETAS)."""
+    from .models import PerfilBuscaFreelancer
+
+    ids = perfis.order_by().values("pk")
+    resultado = {}
+    for nome, through, campo in (
+        ("habilidades", PerfilBuscaFreelancer.habilidades.through, "habilidade"),
+        ("ramos", PerfilBuscaFreelancer.ramos.through, "ramo"),
+    ):
+        contagens = (
+            through.objects
+            .filter(perfilbuscafreelancer_id__in=ids)
+            .values(f"{campo}_id", f"{campo}__nome")
+            .annotate(total=Count("perfilbuscafreelancer_id"))
+            .order_by("-total", f"{campo}__nome")[:LIMITE_FACETAS]
+        )
+        resultado[nome] = [
+            {"id": c[f"{campo}_id"], "nome": c[f"{campo}__nome"], "total": c["total"]}
+            for c in contagens
+        ]
+    return resultado
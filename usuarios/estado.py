@@ -0,0 +1,148 @@
+"""
+Cache do estado de restrição de usuários autenticados por JWT.
+
+O ModoLeituraMiddleware só precisa de alguns campos do usuário para decidir
+se bloqueia a requisição. Este módulo mantém esses campos em dois níveis:
+- processo: dicionário com TTL curto, chaveado por (id do usuário, jti do token);
+- requisição: o usuário carregado pelo middleware fica guardado no request e é
+  reaproveitado pela autenticação do DRF (usuarios.autenticacao).
+Assim cada requisição faz no máximo uma busca do usuário no banco.
+
+Invalidação: post_save de Usuario (usuarios/signals.py) descarta as entradas
+do usuário neste processo; nos demais processos vale o TTL (ESTADO_USUARIO_TTL).
+
+Claims de restrição nos JWT (usuarios/token_serializer.py): os tokens levam
+"rst" (ro/su/ban/adm) e "tv" (token_version). O registro de versões no cache
+do Django diz qual token_version está em vigor para cada usuário; só tokens
+com a mesma versão são decididos pelas claims, sem tocar no banco.
+"""
+import datetime
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+CAMPOS_ESTADO = (
+    "banido",
+    "is_suspended_admin",
+    "suspenso_ate",
+    "is_suspended_self",
+    "is_staff",
+    "is_superuser",
+)
+
+# Limite de usuários mantidos em memória por processo
+MAX_USUARIOS = 10000
+
+_lock = threading.Lock()
+_estados = {}  # usuario_id -> {jti: (expira_em, estado)}
+
+
+def _ttl():
+    return getattr(settings, "ESTADO_USUARIO_TTL", 30)
+
+
+def estado_do_usuario(usuario):
+    """Extrai do usuário os campos usados pelo middleware."""
+    return {campo: getattr(usuario, campo) for campo in CAMPOS_ESTADO}
+
+
+def obter_estado(usuario_id, jti):
+    with _lock:
+        entrada = _estados.get(usuario_id, {}).get(jti)
+    if entrada is None:
+        return None
+    expira_em, estado = entrada
+    if expira_em < time.monotonic():
+        return None
+    return estado
+
+
+def guardar_estado(usuario_id, jti, estado):
+    with _lock:
+        if usuario_id not in _estados and len(_estados) >= MAX_USUARIOS:
+            _estados.clear()
+        _estados.setdefault(usuario_id, {})[jti] = (time.monotonic() + _ttl(), estado)
+
+
+def invalidar_estado(usuario_id):
+    """Descarta o estado de todos os tokens do usuário neste processo."""
+    with _lock:
+        _estados.pop(usuario_id, None)
+
+
+def limpar_estados():
+    with _lock:
+        _estados.clear()
+
+
+# ---------------------------------------------------------------------------
+# Claims de restrição no JWT + registro de token_version
+# ---------------------------------------------------------------------------
+
+def _chave_versao(usuario_id):
+    return f"usuarios:token_version:{usuario_id}"
+
+
+def versao_registrada(usuario_id):
+    return cache.get(_chave_versao(usuario_id))
+
+
+def registrar_versao(usuario_id, versao):
+    """Versão em vigor; some após TOKEN_VERSION_TTL e é recarregada do banco."""
+    cache.set(_chave_versao(usuario_id), versao, timeout=getattr(settings, "TOKEN_VERSION_TTL", 300))
+
+
+def esquecer_versoes(usuario_ids):
+    """Descarta o registro de versão (após UPDATE em massa do token_version)."""
+    cache.delete_many([_chave_versao(usuario_id) for usuario_id in usuario_ids])
+
+
+def claims_de_restricao(usuario):
+    """Claim compacta "rst": só inclui as chaves das restrições ativas."""
+    rst = {}
+    if usuario.is_suspended_self:
+        rst["ro"] = 1
+    if usuario.is_suspended_admin:
+        # 0 = suspensão sem data de término
+        rst["su"] = int(usuario.suspenso_ate.timestamp()) if usuario.suspenso_ate else 0
+    if usuario.banido:
+        rst["ban"] = 1
+    if usuario.is_staff or usuario.is_superuser:
+        rst["adm"] = 1
+    return rst
+
+
+def carimbar_token(token, usuario):
+    """Grava "rst" e "tv" no token (refresh ou access)."""
+    token["rst"] = claims_de_restricao(usuario)
+    token["tv"] = usuario.token_version
+    registrar_versao(usuario.pk, usuario.token_version)
+
+
+def estado_das_claims(token, usuario_id):
+    """
+    Estado de restrição a partir das claims, ou None se o token não tiver
+    claims ou se a versão dele não for a registrada (claims desatualizadas).
+    """
+    rst = token.get("rst")
+    versao = token.get("tv")
+    if rst is None or versao is None or versao != versao_registrada(usuario_id):
+        return None
+
+    suspenso_ate = None
+    suspenso = "su" in rst
+    if suspenso and rst["su"]:
+        suspenso_ate = datetime.datetime.fromtimestamp(rst["su"], tz=datetime.timezone.utc)
+        # Suspensão vencida já não bloqueia (a limpeza no banco é feita à parte)
+        suspenso = suspenso_ate > datetime.datetime.now(tz=datetime.timezone.utc)
+
+    return {
+        "banido": bool(rst.get("ban")),
+        "is_suspended_admin": suspenso,
+        "suspenso_ate": suspenso_ate if suspenso else None,
+        "is_suspended_self": bool(rst.get("ro")),
+        "is_staff": bool(rst.get("adm")),
+        "is_superuser": bool(rst.get("adm")),
+    }
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from usuarios.busca_freelancers import reindexar_freelancers
+
+
+class Command(BaseCommand):
+    help = "Reconstrói em lote a tabela de busca de freelancers (PerfilBuscaFreelancer)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--lote", type=int, default=500,
+            help="Quantidade de linhas gravadas por INSERT (padrão: 500).",
+        )
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        with transaction.atomic():
+            total = reindexar_freelancers(tamanho_lote=options["lote"])
+        duracao = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(f"{total} freelancers indexados em {duracao:.2f}s."))
@@ -2,9 +2,13 @@ from django.http import JsonResponse
 from django.conf import settings
 from django.utils import timezone
 
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework.exceptions import AuthenticationFailed
 
+from .autenticacao import JWTAutenticacaoCompartilhada, registrar_autenticacao
+from .estado import estado_das_claims, estado_do_usuario, obter_estado
+
 
 class ModoLeituraMiddleware:
     """
@@ -34,25 +38,39 @@ class ModoLeituraMiddleware:
         )
         self.header_name = getattr(settings, "SUSPENSION_RESPONSE_HEADER", "X-Blocked-By-Suspension")
         self.message_voluntaria = "Sua conta está desativada (modo leitura). Reative para realizar esta ação."
-        self.jwt_auth = JWTAuthentication()
-
-    # Tenta autenticar usuário via JWT
-    def _ensure_user_from_jwt(self, request):
-        if getattr(request, "user", None) and request.user.is_authenticated:
-            return request.user
+        self.jwt_auth = JWTAutenticacaoCompartilhada()
 
+    # Estado de restrição do usuário do JWT (claims, cache do processo; no máximo 1 consulta)
+    def _estado_do_jwt(self, request):
         try:
-            auth_tuple = self.jwt_auth.authenticate(request)
-            if auth_tuple:
-                user, _ = auth_tuple
-                request.user = user
-                return user
-        except AuthenticationFailed:
+            header = self.jwt_auth.get_header(request)
+            token_bruto = self.jwt_auth.get_raw_token(header) if header else None
+            if token_bruto is None:
+                return None
+
+            token = self.jwt_auth.get_validated_token(token_bruto)
+            usuario_id = token[api_settings.USER_ID_CLAIM]
+            jti = token.get(api_settings.JTI_CLAIM)
+
+            # 1º: claims do próprio token (sem banco), se a versão estiver em vigor
+            estado = estado_das_claims(token, usuario_id)
+
+            # 2º: cache do processo; 3º: banco (uma vez, compartilhado com o DRF)
+            if estado is None:
+                estado = obter_estado(usuario_id, jti)
+            if estado is None:
+                # Carrega o usuário uma vez; a view (DRF) reaproveita o mesmo objeto
+                usuario = self.jwt_auth.get_user(token)
+                registrar_autenticacao(request, token_bruto, usuario, token)
+                estado = estado_do_usuario(usuario)
+        except (AuthenticationFailed, InvalidToken, TokenError, KeyError):
             return None
         except Exception:
             return None
 
-        return None
+        if estado is not None:
+            estado = dict(estado, id=usuario_id)
+        return estado
 
     # Middleware principal
     def __call__(self, request):
@@ -67,19 +85,19 @@ class ModoLeituraMiddleware:
         if request.method == "OPTIONS":
             return self.get_response(request)
 
-        # Autentica usuário
-        user = self._ensure_user_from_jwt(request)
+        # Estado do usuário autenticado
+        estado = self._estado_do_jwt(request)
 
         # Não autenticado deixar seguir
-        if not (user and user.is_authenticated):
+        if estado is None:
             return self.get_response(request)
 
         # Superuser e staff nunca bloqueiam
-        if user.is_superuser or user.is_staff:
+        if estado["is_superuser"] or estado["is_staff"]:
             return self.get_response(request)
 
         # BANIMENTO PERMANENTE — BLOQUEIA TUDO
-        if user.banido:
+        if estado["banido"]:
             resp = JsonResponse({
                 "detail": "Sua conta foi banida permanentemente por violar as políticas da plataforma."
             }, status=403)
@@ -87,26 +105,22 @@ class ModoLeituraMiddleware:
             return resp
 
         # SUSPENSÃO ADMINISTRATIVA
-        if user.is_suspended_admin:
-            expiracao = user.suspenso_ate
-
-            # Se venceu limpa automaticamente
-            if expiracao and timezone.now() > expiracao:
-                user.is_suspended_admin = False
-                user.suspenso_ate = None
-                user.motivo_suspensao_admin = None
-                user.save(update_fields=["is_suspended_admin", "suspenso_ate", "motivo_suspensao_admin"])
-            else:
-                # Suspensão ativa bloquear MÉTODOS DE ESCRITA apenas
-                if request.method in self.blocked_methods:
-                    resp = JsonResponse({
-                        "detail": f"Sua conta está suspensa até {expiracao.strftime('%d/%m/%Y %H:%M')}."
-                    }, status=403)
-                    resp[self.header_name] = "true"
-                    return resp
+        if estado["is_suspended_admin"]:
+            expiracao = estado["suspenso_ate"]
+
+            # Vencida não bloqueia; quem limpa o banco é o comando expirar_suspensoes
+            vencida = expiracao and timezone.now() > expiracao
+
+            # Suspensão ativa bloquear MÉTODOS DE ESCRITA apenas
+            if not vencida and request.method in self.blocked_methods:
+                resp = JsonResponse({
+                    "detail": f"Sua conta está suspensa até {expiracao.strftime('%d/%m/%Y %H:%M')}."
+                }, status=403)
+                resp[self.header_name] = "true"
+                return resp
 
         # MODO LEITURA
-        if user.is_suspended_self:
+        if estado["is_suspended_self"]:
             if request.method in self.blocked_methods:
 
                 # Paths permitidos mesmo suspenso
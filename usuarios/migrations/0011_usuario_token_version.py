@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0010_usuario_banido_usuario_banido_em_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='token_version',
+            field=models.PositiveIntegerField(default=0, help_text='Tokens emitidos com versão menor têm as claims de restrição ignoradas.'),
+        ),
+    ]
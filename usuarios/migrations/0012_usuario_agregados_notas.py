@@ -0,0 +1,46 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:30
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def preencher_agregados(apps, schema_editor):
+    """Soma e total por avaliado numa consulta agrupada; nota_media com duas casas."""
+    Usuario = apps.get_model("usuarios", "Usuario")
+    Avaliacao = apps.get_model("avaliacoes", "Avaliacao")
+
+    agregados = (
+        Avaliacao.objects.order_by()
+        .values_list("avaliado")
+        .annotate(Sum("nota"), Count("id"))
+        .iterator(chunk_size=500)
+    )
+    avaliados = [
+        Usuario(id=avaliado_id, soma_notas=soma, total_avaliacoes=total, nota_media=round(soma / total, 2))
+        for avaliado_id, soma, total in agregados
+    ]
+    # Sem avaliações: contadores ficam no default (0) e nota_media passa a None
+    Usuario.objects.update(nota_media=None)
+    Usuario.objects.bulk_update(avaliados, ["soma_notas", "total_avaliacoes", "nota_media"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0011_usuario_token_version'),
+        ('avaliacoes', '0003_rename_freelancer_avaliacao_avaliado_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usuario',
+            name='soma_notas',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='usuario',
+            name='total_avaliacoes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(preencher_agregados, migrations.RunPython.noop),
+    ]
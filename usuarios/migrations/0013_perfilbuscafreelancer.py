@@ -0,0 +1,148 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:32
+
+import math
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Cópia do estado de usuarios/busca_freelancers.py (e da normalização de
+# trabalhos/busca.py) nesta migração; mudanças posteriores na pontuação valem
+# a partir do comando reindexar_freelancers
+NOTA_PRIORI = 3.5
+PESO_PRIORI = 5
+CONCLUIDOS_REFERENCIA = 50
+PESO_NOTA = 0.5
+PESO_EXPERIENCIA = 0.3
+PESO_PRAZO = 0.2
+
+STOPWORDS = frozenset("""
+a ao aos as ate com como da das de dela dele deles do dos e ela elas ele eles
+em entre era essa esse esta este eu foi for ha isso isto ja la lhe mais mas
+me mesmo meu minha muito na nao nas nem no nos nossa nosso num numa o os ou
+para pela pelas pelo pelos por qual quando que quem se sem ser seu seus sob
+sua suas tambem te tem ter um uma umas uns vai voce voces
+""".split())
+
+_NAO_ALFANUMERICO = re.compile(r"[^a-z0-9]+")
+
+TAMANHO_LOTE = 500
+
+
+def nome_busca(nome):
+    texto = unicodedata.normalize("NFKD", nome or "").encode("ASCII", "ignore").decode("ASCII")
+    termos = _NAO_ALFANUMERICO.split(texto.lower())
+    return " ".join(t for t in termos if len(t) > 1 and t not in STOPWORDS)[:255]
+
+
+def calcular_pontuacao(soma_notas, total_avaliacoes, contratos_concluidos, taxa_entrega_prazo):
+    nota = (soma_notas + NOTA_PRIORI * PESO_PRIORI) / (total_avaliacoes + PESO_PRIORI)
+    experiencia = min(math.log1p(contratos_concluidos) / math.log1p(CONCLUIDOS_REFERENCIA), 1.0)
+    return round(
+        PESO_NOTA * (nota / 5) + PESO_EXPERIENCIA * experiencia + PESO_PRAZO * (taxa_entrega_prazo / 100),
+        6,
+    )
+
+
+def inserir_pares(modelo, campo, pares):
+    lote = []
+    for perfil_id, valor_id in pares.iterator(chunk_size=TAMANHO_LOTE):
+        lote.append(modelo(perfilbuscafreelancer_id=perfil_id, **{campo: valor_id}))
+        if len(lote) >= TAMANHO_LOTE:
+            modelo.objects.bulk_create(lote, ignore_conflicts=True)
+            lote = []
+    if lote:
+        modelo.objects.bulk_create(lote, ignore_conflicts=True)
+
+
+def indexar_existentes(apps, schema_editor):
+    """Uma linha por freelancer, com habilidades e ramos dos contratos concluídos."""
+    Usuario = apps.get_model("usuarios", "Usuario")
+    Contrato = apps.get_model("contratos", "Contrato")
+    MetricasFreelancer = apps.get_model("contratos", "MetricasFreelancer")
+    Trabalho = apps.get_model("trabalhos", "Trabalho")
+    PerfilBuscaFreelancer = apps.get_model("usuarios", "PerfilBuscaFreelancer")
+
+    metricas = {m.freelancer_id: m for m in MetricasFreelancer.objects.iterator(chunk_size=TAMANHO_LOTE)}
+
+    perfis = []
+    usuarios = (
+        Usuario.objects
+        .filter(tipo="freelancer")
+        .order_by("id")
+        .only("id", "nome", "is_active", "is_suspended_self", "banido",
+              "nota_media", "soma_notas", "total_avaliacoes")
+    )
+    for usuario in usuarios.iterator(chunk_size=TAMANHO_LOTE):
+        m = metricas.get(usuario.id)
+        concluidos = m.contratos_concluidos if m else 0
+        taxa_prazo = round(m.entregas_no_prazo / concluidos * 100, 1) if concluidos else 0
+        perfis.append(PerfilBuscaFreelancer(
+            freelancer_id=usuario.id,
+            nome_busca=nome_busca(usuario.nome),
+            visivel=bool(usuario.is_active and not usuario.is_suspended_self and not usuario.banido),
+            nota_media=usuario.nota_media,
+            total_avaliacoes=usuario.total_avaliacoes,
+            contratos_concluidos=concluidos,
+            taxa_entrega_prazo=taxa_prazo,
+            pontuacao=calcular_pontuacao(usuario.soma_notas, usuario.total_avaliacoes, concluidos, taxa_prazo),
+        ))
+        if len(perfis) >= TAMANHO_LOTE:
+            PerfilBuscaFreelancer.objects.bulk_create(perfis)
+            perfis = []
+    if perfis:
+        PerfilBuscaFreelancer.objects.bulk_create(perfis)
+
+    concluidos = Contrato.objects.filter(status="concluido", freelancer__tipo="freelancer").order_by()
+    inserir_pares(
+        PerfilBuscaFreelancer.habilidades.through,
+        "habilidade_id",
+        Trabalho.habilidades.through.objects
+        .filter(trabalho__contratos__in=concluidos)
+        .values_list("trabalho__contratos__freelancer_id", "habilidade_id")
+        .distinct(),
+    )
+    inserir_pares(
+        PerfilBuscaFreelancer.ramos.through,
+        "ramo_id",
+        concluidos.filter(trabalho__ramo__isnull=False)
+        .values_list("freelancer_id", "trabalho__ramo_id")
+        .distinct(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habilidades', '0002_ramo_alter_habilidade_options'),
+        ('usuarios', '0012_usuario_agregados_notas'),
+        ('contratos', '0008_metricasfreelancer'),
+        ('trabalhos', '0008_trabalho_ramo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PerfilBuscaFreelancer',
+            fields=[
+                ('freelancer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='perfil_busca', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('nome_busca', models.CharField(blank=True, max_length=255)),
+                ('visivel', models.BooleanField(default=True, help_text='Falso para contas desativadas, inativas ou banidas.')),
+                ('nota_media', models.FloatField(blank=True, null=True)),
+                ('total_avaliacoes', models.PositiveIntegerField(default=0)),
+                ('contratos_concluidos', models.PositiveIntegerField(default=0)),
+                ('taxa_entrega_prazo', models.FloatField(default=0)),
+                ('pontuacao', models.FloatField(default=0)),
+                ('atualizado_em', models.DateTimeField(auto_now=True)),
+                ('habilidades', models.ManyToManyField(blank=True, related_name='perfis_freelancer', to='habilidades.habilidade')),
+                ('ramos', models.ManyToManyField(blank=True, related_name='perfis_freelancer', to='habilidades.ramo')),
+            ],
+            options={
+                'verbose_name': 'Perfil de busca do freelancer',
+                'verbose_name_plural': 'Perfis de busca dos freelancers',
+                'indexes': [models.Index(fields=['visivel', '-pontuacao'], name='perfil_busca_pontuacao'), models.Index(fields=['visivel', '-nota_media'], name='perfil_busca_nota'), models.Index(fields=['visivel', '-contratos_concluidos'], name='perfil_busca_concluidos')],
+            },
+        ),
+        migrations.RunPython(indexar_existentes, migrations.RunPython.noop),
+    ]
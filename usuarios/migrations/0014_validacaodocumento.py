@@ -0,0 +1,29 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0013_perfilbuscafreelancer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ValidacaoDocumento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('documento_hash', models.CharField(max_length=64, unique=True)),
+                ('tipo', models.CharField(choices=[('cpf', 'CPF'), ('cnpj', 'CNPJ')], max_length=4)),
+                ('valido', models.BooleanField()),
+                ('mensagem', models.CharField(blank=True, max_length=255)),
+                ('consultado_em', models.DateTimeField(auto_now=True)),
+                ('expira_em', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'verbose_name': 'Validação de documento',
+                'verbose_name_plural': 'Validações de documentos',
+            },
+        ),
+    ]
@@ -3,6 +3,8 @@ from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from cloudinary_storage.storage import MediaCloudinaryStorage
 
+from .estado import invalidar_estado, registrar_versao
+
 
 class UsuarioManager(BaseUserManager):
     """Gerencia a criação de usuários e superusuários."""
@@ -68,6 +70,9 @@ class Usuario(AbstractBaseUser, PermissionsMixin):
         blank=True
     )
     nota_media = models.FloatField(null=True, blank=True)
+    # Agregados das avaliações recebidas (avaliacoes/notas.py); nota_media deriva deles
+    soma_notas = models.PositiveIntegerField(default=0)
+    total_avaliacoes = models.PositiveIntegerField(default=0)
     notificacao_email = models.BooleanField(default=True)
     bio = models.TextField(blank=True, null=True)
 
@@ -124,6 +129,12 @@ class Usuario(AbstractBaseUser, PermissionsMixin):
         help_text="Motivo do banimento aplicado pelo admin."
     )
 
+    # Versão das claims de restrição nos JWT (incrementada a cada mudança de estado)
+    token_version = models.PositiveIntegerField(
+        default=0,
+        help_text="Tokens emitidos com versão menor têm as claims de restrição ignoradas."
+    )
+
     # ---------------------------
     # PERMISSÕES DJANGO
     # ---------------------------
@@ -187,3 +198,90 @@ class Usuario(AbstractBaseUser, PermissionsMixin):
             self.save(update_fields=["is_suspended_self", "deactivated_at", "deactivated_reason"])
         else:
             self.save(update_fields=["is_suspended_self", "deactivated_at"])
+
+    def invalidar_tokens(self):
+        """
+        Incrementa token_version: as claims de restrição dos tokens já emitidos
+        deixam de ser confiáveis e o middleware volta a consultar o estado real.
+        Chamado pelo post_save quando um campo de restrição muda
+        (usuarios/signals.py); UPDATEs em massa precisam chamar à parte.
+        """
+        Usuario.objects.filter(pk=self.pk).update(token_version=models.F("token_version") + 1)
+        self.refresh_from_db(fields=["token_version"])
+        registrar_versao(self.pk, self.token_version)
+        invalidar_estado(self.pk)
+
+
+class PerfilBuscaFreelancer(models.Model):
+    """
+    Linha desnormalizada de busca de um freelancer (ver usuarios/busca_freelancers.py).
+    Junta nota, contratos concluídos, taxa de entrega no prazo e as habilidades/ramos
+    dos trabalhos concluídos, com a pontuação de ranking já calculada.
+    Mantida pelos sinais de Usuario, Contrato, Trabalho e Avaliacao.
+    """
+    freelancer = models.OneToOneField(
+        Usuario,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='perfil_busca'
+    )
+    nome_busca = models.CharField(max_length=255, blank=True)
+    visivel = models.BooleanField(
+        default=True,
+        help_text="Falso para contas desativadas, inativas ou banidas."
+    )
+    nota_media = models.FloatField(null=True, blank=True)
+    total_avaliacoes = models.PositiveIntegerField(default=0)
+    contratos_concluidos = models.PositiveIntegerField(default=0)
+    taxa_entrega_prazo = models.FloatField(default=0)
+    pontuacao = models.FloatField(default=0)
+    habilidades = models.ManyToManyField(
+        'habilidades.Habilidade',
+        blank=True,
+        related_name='perfis_freelancer'
+    )
+    ramos = models.ManyToManyField(
+        'habilidades.Ramo',
+        blank=True,
+        related_name='perfis_freelancer'
+    )
+    atualizado_em = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Perfil de busca do freelancer"
+        verbose_name_plural = "Perfis de busca dos freelancers"
+        indexes = [
+            models.Index(fields=["visivel", "-pontuacao"], name="perfil_busca_pontuacao"),
+            models.Index(fields=["visivel", "-nota_media"], name="perfil_busca_nota"),
+            models.Index(fields=["visivel", "-contratos_concluidos"], name="perfil_busca_concluidos"),
+        ]
+
+    def __str__(self):
+        return f"Perfil de busca #{self.freelancer_id}"
+
+
+class ValidacaoDocumento(models.Model):
+    """
+    Resultado de uma consulta de CPF/CNPJ na API paga (ver services/cpfcnpj.py).
+    Chaveado por HMAC do documento: o número não fica guardado aqui. Resultados
+    válidos e inválidos têm prazos próprios (CPF_CNPJ_CACHE_VALIDO_DIAS e
+    CPF_CNPJ_CACHE_INVALIDO_HORAS); falhas da API não entram no cache.
+    """
+    TIPO_CHOICES = (
+        ('cpf', 'CPF'),
+        ('cnpj', 'CNPJ'),
+    )
+
+    documento_hash = models.CharField(max_length=64, unique=True)
+    tipo = models.CharField(max_length=4, choices=TIPO_CHOICES)
+    valido = models.BooleanField()
+    mensagem = models.CharField(max_length=255, blank=True)
+    consultado_em = models.DateTimeField(auto_now=True)
+    expira_em = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = "Validação de documento"
+        verbose_name_plural = "Validações de documentos"
+
+    def __str__(self):
+        return f"{self.get_tipo_display()} {'válido' if self.valido else 'inválido'} até {self.expira_em:%d/%m/%Y}"
@@ -0,0 +1,83 @@
+"""
+Resumo de atividades do usuário (/usuarios/me/resumo/).
+
+Uma consulta por tabela com agregação condicional (Count com filter, Avg) em
+vez de um COUNT por número exibido. O resultado fica no cache por
+RESUMO_USUARIO_TTL segundos e é descartado pelos sinais de Proposta,
+Avaliacao e Denuncia (usuarios/signals.py).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Q
+
+
+def _chave(usuario_id):
+    return f"usuarios:resumo:{usuario_id}"
+
+
+def calcular_resumo(usuario):
+    from avaliacoes.models import Avaliacao
+    from denuncias.models import Denuncia
+    from propostas.models import Proposta
+
+    resumo = {}
+
+    # PROPOSTAS
+    if usuario.tipo == "freelancer":
+        resumo.update(
+            Proposta.objects.filter(freelancer=usuario).order_by().aggregate(
+                enviadas=Count("id"),
+                aceitas=Count("id", filter=Q(status="aceita")),
+                recusadas=Count("id", filter=Q(status="recusada")),
+            )
+        )
+    elif usuario.tipo == "contratante":
+        resumo.update(
+            Proposta.objects.filter(trabalho__contratante=usuario).order_by().aggregate(
+                recebidas=Count("id"),
+                pendentes=Count("id", filter=Q(status="pendente")),
+                aceitas=Count("id", filter=Q(status="aceita")),
+            )
+        )
+
+    # AVALIAÇÕES
+    recebidas = Q(avaliado=usuario)
+    avaliacoes = (
+        Avaliacao.objects
+        .filter(recebidas | Q(avaliador=usuario))
+        .order_by()
+        .aggregate(
+            avaliacoesRecebidas=Count("id", filter=recebidas),
+            avaliacoesEnviadas=Count("id", filter=Q(avaliador=usuario)),
+            mediaAvaliacao=Avg("nota", filter=recebidas),
+        )
+    )
+    if avaliacoes["mediaAvaliacao"] is not None:
+        avaliacoes["mediaAvaliacao"] = round(avaliacoes["mediaAvaliacao"], 2)
+    resumo.update(avaliacoes)
+
+    # DENÚNCIAS
+    resumo.update(
+        Denuncia.objects
+        .filter(Q(denunciante=usuario) | Q(denunciado=usuario))
+        .order_by()
+        .aggregate(
+            denunciasEnviadas=Count("id", filter=Q(denunciante=usuario)),
+            denunciasRecebidas=Count("id", filter=Q(denunciado=usuario)),
+        )
+    )
+    return resumo
+
+
+def resumo_do_usuario(usuario):
+    """Resumo em cache; calculado na primeira leitura após expirar/invalidar."""
+    chave = _chave(usuario.pk)
+    resumo = cache.get(chave)
+    if resumo is None:
+        resumo = calcular_resumo(usuario)
+        cache.set(chave, resumo, timeout=getattr(settings, "RESUMO_USUARIO_TTL", 60))
+    return resumo
+
+
+def invalidar_resumo(*usuario_ids):
+    cache.delete_many([_chave(usuario_id) for usuario_id in usuario_ids if usuario_id])
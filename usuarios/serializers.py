@@ -2,15 +2,26 @@ from rest_framework import serializers
 import re
 from django.conf import settings
 
-from .models import Usuario
+from .models import Usuario, PerfilBuscaFreelancer
 from notificacoes.models import Notificacao
 from avaliacoes.models import Avaliacao
+from avaliacoes.notas import media
 from contratos.models import Contrato
 
 # Service real para CPF/CNPJ
 from services.cpfcnpj import consultar_documento, CPF_CNPJValidationError
 
 
+def prefetch_usuario(*caminhos):
+    """
+    Lookups de prefetch das M2M (groups, user_permissions) que o UsuarioSerializer
+    serializa (fields='__all__'); caminhos vazios = o próprio Usuario.
+    Ex.: .prefetch_related(*prefetch_usuario("contratante")).
+    """
+    caminhos = caminhos or ("",)
+    return [f"{c}__{m}" if c else m for c in caminhos for m in ("groups", "user_permissions")]
+
+
 class UsuarioSerializer(serializers.ModelSerializer):
     """
     Serializer principal do usuário (CRUD + /me).
@@ -238,6 +249,14 @@ class NotificacaoSerializer(serializers.ModelSerializer):
         fields = ['id', 'mensagem', 'lida', 'data_criacao', 'link']
 
 
+class UsuarioResumoSerializer(serializers.ModelSerializer):
+    """Resumo do usuário para listagens aninhadas (sem documentos nem contatos)."""
+    class Meta:
+        model = Usuario
+        fields = ["id", "nome", "tipo", "foto_perfil", "nota_media"]
+        read_only_fields = fields
+
+
 class UsuarioPublicoSerializer(serializers.ModelSerializer):
     """
     Dados públicos do perfil — com estatísticas adicionais.
@@ -284,10 +303,7 @@ class UsuarioPublicoSerializer(serializers.ModelSerializer):
 
     # métricas
     def get_nota_media(self, obj):
-        avaliacoes = Avaliacao.objects.filter(avaliado=obj)
-        if not avaliacoes.exists():
-            return None
-        return round(sum(a.nota for a in avaliacoes) / avaliacoes.count(), 2)
+        return media(obj.soma_notas, obj.total_avaliacoes)
 
     def get_trabalhos_publicados(self, obj):
         if obj.tipo != "contratante":
@@ -307,7 +323,7 @@ class UsuarioPublicoSerializer(serializers.ModelSerializer):
         return Avaliacao.objects.filter(avaliador=obj).count()
 
     def get_avaliacoes_recebidas(self, obj):
-        return Avaliacao.objects.filter(avaliado=obj).count()
+        return obj.total_avaliacoes
 
     def get_denuncias_enviadas(self, obj):
         from denuncias.models import Denuncia
@@ -317,6 +333,22 @@ class UsuarioPublicoSerializer(serializers.ModelSerializer):
         from denuncias.models import Denuncia
         return Denuncia.objects.filter(denunciado=obj).count()
 
+class PerfilBuscaFreelancerSerializer(serializers.ModelSerializer):
+    """Resultado da busca de freelancers (linha de PerfilBuscaFreelancer)."""
+    id = serializers.IntegerField(source="freelancer_id", read_only=True)
+    nome = serializers.CharField(source="freelancer.nome", read_only=True)
+    foto_perfil = serializers.ImageField(source="freelancer.foto_perfil", read_only=True)
+    habilidades = serializers.SlugRelatedField(many=True, read_only=True, slug_field="nome")
+    ramos = serializers.SlugRelatedField(many=True, read_only=True, slug_field="nome")
+
+    class Meta:
+        model = PerfilBuscaFreelancer
+        fields = [
+            "id", "nome", "foto_perfil", "nota_media", "total_avaliacoes",
+            "contratos_concluidos", "taxa_entrega_prazo", "habilidades", "ramos",
+        ]
+
+
 class PasswordResetRequestSerializer(serializers.Serializer):
     """Recebe apenas o e-mail para iniciar o reset de senha."""
     email = serializers.EmailField()
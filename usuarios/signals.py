@@ -1,7 +1,77 @@
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
+from avaliacoes.models import Avaliacao
+from denuncias.models import Denuncia
+from propostas.models import Proposta
+from trabalhos.models import Trabalho
+
 from .models import Usuario
+from .busca_freelancers import atualizar_dados_usuario
+from .estado import CAMPOS_ESTADO, invalidar_estado
+from .resumo import invalidar_resumo
 
 @receiver(post_delete, sender=Usuario)
 def deletar_usuario_log(sender, instance, **kwargs):
     print(f"Usuário '{instance.email}' deletado com sucesso.")
+
+
+@receiver(pre_save, sender=Usuario)
+def detectar_mudanca_restricao(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Marca se mudou algum campo das claims "rst" (modo leitura, suspensão,
+    banimento, staff/superuser), venha a mudança de uma view, do admin ou do
+    shell. O post_save abaixo invalida os tokens.
+    """
+    instance._restricao_alterada = False
+    if raw or instance.pk is None:
+        return
+    campos = [c for c in CAMPOS_ESTADO if update_fields is None or c in update_fields]
+    if not campos:
+        return
+    anterior = Usuario.objects.filter(pk=instance.pk).values(*campos).first()
+    if anterior is not None:
+        instance._restricao_alterada = any(anterior[c] != getattr(instance, c) for c in campos)
+
+
+@receiver(post_save, sender=Usuario)
+def invalidar_tokens_restricao(sender, instance, **kwargs):
+    """Claims de restrição dos tokens já emitidos deixam de valer."""
+    if getattr(instance, "_restricao_alterada", False):
+        instance._restricao_alterada = False
+        instance.invalidar_tokens()
+
+
+@receiver(post_save, sender=Usuario)
+def invalidar_estado_usuario(sender, instance, **kwargs):
+    """Suspensão/banimento/modo leitura alterados: descarta o estado em cache."""
+    invalidar_estado(instance.pk)
+
+
+@receiver(post_save, sender=Usuario)
+def atualizar_perfil_busca(sender, instance, raw=False, **kwargs):
+    """Nome e visibilidade no perfil de busca (usuarios/busca_freelancers.py)."""
+    if raw:
+        return
+    atualizar_dados_usuario(instance)
+
+
+# Resumo do dashboard (usuarios/resumo.py)
+@receiver(post_save, sender=Proposta)
+@receiver(post_delete, sender=Proposta)
+def invalidar_resumo_proposta(sender, instance, **kwargs):
+    contratante_id = (
+        Trabalho.objects.filter(pk=instance.trabalho_id).values_list("contratante_id", flat=True).first()
+    )
+    invalidar_resumo(instance.freelancer_id, contratante_id)
+
+
+@receiver(post_save, sender=Avaliacao)
+@receiver(post_delete, sender=Avaliacao)
+def invalidar_resumo_avaliacao(sender, instance, **kwargs):
+    invalidar_resumo(instance.avaliador_id, instance.avaliado_id)
+
+
+@receiver(post_save, sender=Denuncia)
+@receiver(post_delete, sender=Denuncia)
+def invalidar_resumo_denuncia(sender, instance, **kwargs):
+    invalidar_resumo(instance.denunciante_id, instance.denunciado_id)
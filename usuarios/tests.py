@@ -1,3 +1,84 @@
-from django.test import TestCase
+from asgiref.sync import async_to_sync
+from django.test import TransactionTestCase
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from usuarios.estado import estado_das_claims
+from usuarios.models import Usuario
+from usuarios.token_serializer import CustomTokenObtainPairSerializer
+from usuarios.ws_auth import _usuario_do_token
+
+
+def criar_usuario(email, **campos):
+    return Usuario.objects.create(
+        email=email, nome=email.split("@")[0], tipo="freelancer", telefone="0", password="!", **campos,
+    )
+
+
+def token_de_acesso(usuario):
+    return CustomTokenObtainPairSerializer.get_token(usuario).access_token
+
+
+class InvalidacaoTokensTests(APITestCase):
+    """
+    Mudança em campo de restrição por qualquer save() (admin, shell, views)
+    incrementa token_version: as claims dos tokens já emitidos deixam de valer.
+    """
+
+    def setUp(self):
+        self.usuario = criar_usuario("freelancer@exemplo.com")
+        self.token = token_de_acesso(self.usuario)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def _me(self):
+        return self.client.get("/api/usuarios/me/", secure=True)
+
+    def test_banimento_pelo_admin_recusa_o_token_antigo(self):
+        self.assertEqual(self._me().status_code, 200)
+
+        # Como no formulário do admin: save() completo, sem chamar invalidar_tokens
+        usuario = Usuario.objects.get(pk=self.usuario.pk)
+        usuario.banido = True
+        usuario.save()
+
+        self.assertIsNone(estado_das_claims(self.token, usuario.pk))
+        self.assertEqual(self._me().status_code, 403)
+
+    def test_remocao_de_staff_invalida_as_claims(self):
+        usuario = Usuario.objects.get(pk=self.usuario.pk)
+        usuario.is_staff = True
+        usuario.save()
+        token_staff = token_de_acesso(usuario)
+        self.assertTrue(estado_das_claims(token_staff, usuario.pk)["is_staff"])
+
+        usuario.is_staff = False
+        usuario.save()
+
+        self.assertIsNone(estado_das_claims(token_staff, usuario.pk))
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token_staff}")
+        self.assertEqual(self.client.get("/api/punicoes/historico/", secure=True).status_code, 403)
+
+    def test_save_sem_campo_de_restricao_mantem_o_token(self):
+        versao = self.usuario.token_version
+        usuario = Usuario.objects.get(pk=self.usuario.pk)
+        usuario.nome = "Outro nome"
+        usuario.save()
+        usuario.save(update_fields=["last_login"])
+
+        usuario.refresh_from_db()
+        self.assertEqual(usuario.token_version, versao)
+        self.assertIsNotNone(estado_das_claims(self.token, usuario.pk))
+        self.assertEqual(self._me().status_code, 200)
+
+
+class InvalidacaoTokensWebSocketTests(TransactionTestCase):
+    """Autenticação dos WebSockets (usuarios/ws_auth.py) com o token antigo."""
+
+    def test_banimento_pelo_admin_recusa_o_token_antigo(self):
+        usuario = criar_usuario("freelancer@exemplo.com")
+        token = str(token_de_acesso(usuario))
+        self.assertEqual(async_to_sync(_usuario_do_token)(token), usuario)
+
+        usuario.banido = True
+        usuario.save()
+
+        self.assertTrue(async_to_sync(_usuario_do_token)(token).is_anonymous)
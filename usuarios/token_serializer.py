@@ -1,8 +1,11 @@
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
 from django.utils import timezone
 from usuarios.models import Usuario
+from usuarios.estado import carimbar_token
 
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -12,10 +15,17 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     - banimento permanente
     - suspensão temporária por admin
     - mantém login válido para modo leitura voluntário (is_suspended_self=True)
+    Os tokens levam as claims de restrição ("rst") e a token_version ("tv").
     """
 
     username_field = "email"
 
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        carimbar_token(token, user)
+        return token
+
     def validate(self, attrs):
         email = attrs.get("email")
         password = attrs.get("password")
@@ -76,3 +86,30 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh que recarrega o usuário e carimba no novo access token as claims
+    de restrição atuais (as do refresh podem estar desatualizadas).
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user = Usuario.objects.filter(pk=refresh.get(api_settings.USER_ID_CLAIM)).first()
+
+        if user is None or not user.is_active:
+            raise AuthenticationFailed("Usuário inativo ou inexistente.")
+
+        if user.banido:
+            raise AuthenticationFailed(
+                "Sua conta foi banida permanentemente. Entre em contato com o suporte."
+            )
+
+        access = refresh.access_token
+        carimbar_token(access, user)
+        return {"access": str(access)}
+
+
+class CustomTokenRefreshView(TokenRefreshView):
+    serializer_class = CustomTokenRefreshSerializer
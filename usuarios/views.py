@@ -1,5 +1,3 @@
-import threading
-import time
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
@@ -20,22 +18,26 @@ from .serializers import (
     UsuarioSerializer,
     TrocaSenhaSerializer,
     UsuarioPublicoSerializer,
+    PerfilBuscaFreelancerSerializer,
     PasswordResetRequestSerializer,
     PasswordResetConfirmSerializer,
+    prefetch_usuario,
 )
 
 # Permissões e utilidades do app
 from .permissoes import PermissaoUsuario
+from .resumo import resumo_do_usuario
+from .busca_freelancers import buscar_freelancers, facetas
 from notificacoes.utils import enviar_notificacao
 
-# Integrações externas
-from emails.utils import enviar_email_sendgrid  # ✅ Envio de e-mails via API SendGrid
+# Integrações externas (e-mail enviado pela fila de tarefas)
+from emails.tarefas import enviar_email
 
 # Outros apps relacionados
 from avaliacoes.models import Avaliacao
 from avaliacoes.serializers import AvaliacaoSerializer
-from propostas.models import Proposta
-from contratos.models import Contrato
+from contratos.models import MetricasFreelancer
+from contratos.metricas import recalcular_metricas
 
 
 class UsuarioViewSet(viewsets.ModelViewSet):
@@ -46,6 +48,7 @@ class UsuarioViewSet(viewsets.ModelViewSet):
     - /usuarios/{id}/perfil_publico/
     - /usuarios/{id}/avaliacoes_publicas/
     - /usuarios/{id}/metricas_performance/
+    - /usuarios/buscar_freelancers/ (GET, contratantes)
     - /usuarios/me/alterar_senha/ (POST)
     - /usuarios/me/excluir_conta/ (POST)
     - /usuarios/me/desativar/ (POST)   ← novo
@@ -84,14 +87,19 @@ class UsuarioViewSet(viewsets.ModelViewSet):
         tipo = self.request.query_params.get("tipo")
 
         if user.is_superuser:
-            queryset = Usuario.objects.all().order_by("-id")
+            queryset = Usuario.objects.prefetch_related(*prefetch_usuario()).order_by("-id")
             if tipo:
                 queryset = queryset.filter(tipo=tipo)
             return queryset
 
         if getattr(user, "tipo", None) == "contratante":
             # Oculta perfis em modo leitura (desativados) das listagens públicas
-            return Usuario.objects.filter(tipo="freelancer", is_suspended_self=False).order_by("-id")
+            return (
+                Usuario.objects
+                .filter(tipo="freelancer", is_suspended_self=False)
+                .prefetch_related(*prefetch_usuario())
+                .order_by("-id")
+            )
 
         if getattr(user, "tipo", None) == "freelancer":
             return Usuario.objects.filter(id=user.id).order_by("-id")
@@ -146,7 +154,7 @@ class UsuarioViewSet(viewsets.ModelViewSet):
         avaliacoes = (
             Avaliacao.objects
             .filter(avaliado=usuario)
-            .select_related("avaliador")
+            .select_related("avaliador", "avaliado", "contrato__trabalho")
             .order_by("-id")
         )
         serializer = AvaliacaoSerializer(avaliacoes, many=True, context={"request": request})
@@ -163,7 +171,7 @@ class UsuarioViewSet(viewsets.ModelViewSet):
     def metricas_performance(self, request, pk=None):
         """Retorna métricas de performance para freelancers."""
         try:
-            usuario = Usuario.objects.get(pk=pk)
+            usuario = Usuario.objects.select_related("metricas").get(pk=pk)
         except Usuario.DoesNotExist:
             return Response({"detail": "Usuário não encontrado."}, status=404)
 
@@ -178,41 +186,42 @@ class UsuarioViewSet(viewsets.ModelViewSet):
                 "mensagem": "Métricas disponíveis apenas para freelancers"
             })
 
-        contratos_total = Contrato.objects.filter(freelancer=usuario)
-        contratos_concluidos = contratos_total.filter(status="concluido")
-        contratos_cancelados = contratos_total.filter(status="cancelado")
-
-        total = contratos_total.count()
-        concluidos = contratos_concluidos.count()
-        cancelados = contratos_cancelados.count()
+        # Linha materializada (contratos/metricas.py); calculada na primeira leitura se faltar
+        try:
+            metricas = usuario.metricas
+        except MetricasFreelancer.DoesNotExist:
+            metricas = recalcular_metricas(usuario.id)
 
-        taxa_conclusao = round((concluidos / total) * 100, 1) if total > 0 else 0
+        return Response({
+            "taxa_conclusao": metricas.taxa_conclusao,
+            "taxa_entrega_prazo": metricas.taxa_entrega_prazo,
+            "taxa_recontratacao": metricas.taxa_recontratacao,
+            "total_contratos": metricas.total_contratos,
+            "contratos_concluidos": metricas.contratos_concluidos,
+            "contratos_cancelados": metricas.contratos_cancelados,
+        })
 
-        entregas_no_prazo = 0
-        for contrato in contratos_concluidos.select_related("trabalho"):
-            if contrato.data_entrega and contrato.trabalho.prazo:
-                if contrato.data_entrega <= contrato.trabalho.prazo:
-                    entregas_no_prazo += 1
-        taxa_entrega_prazo = (
-            round((entregas_no_prazo / concluidos) * 100, 1) if concluidos > 0 else 0
-        )
+    # BUSCA DE FREELANCERS
+    @action(detail=False, methods=["get"], url_path="buscar_freelancers")
+    def buscar_freelancers(self, request):
+        """
+        Busca e ranking de freelancers (ver usuarios/busca_freelancers.py).
+        Filtros: ?q=&habilidade=1,2&ramo=3&nota_min=&concluidos_min=&prazo_min=
+        Ordenação: ?ordenar=relevancia|nota|contratos|prazo
+        A resposta paginada inclui "facetas" com contagens por habilidade e ramo.
+        """
+        user = request.user
+        if not (user.is_superuser or user.tipo == "contratante"):
+            return Response({"detail": "Busca disponível apenas para contratantes."}, status=403)
 
-        contratantes_counts = contratos_total.values("contratante").annotate(num_contratos=Count("id"))
-        total_contratantes_unicos = contratantes_counts.count()
-        contratantes_recontrataram = sum(1 for c in contratantes_counts if c["num_contratos"] >= 2)
-        taxa_recontratacao = (
-            round((contratantes_recontrataram / total_contratantes_unicos) * 100, 1)
-            if total_contratantes_unicos > 0 else 0
+        perfis = buscar_freelancers(request.query_params)
+        pagina = self.paginate_queryset(
+            perfis.select_related("freelancer").prefetch_related("habilidades", "ramos")
         )
-
-        return Response({
-            "taxa_conclusao": taxa_conclusao,
-            "taxa_entrega_prazo": taxa_entrega_prazo,
-            "taxa_recontratacao": taxa_recontratacao,
-            "total_contratos": total,
-            "contratos_concluidos": concluidos,
-            "contratos_cancelados": cancelados,
-        })
+        serializer = PerfilBuscaFreelancerSerializer(pagina, many=True, context={"request": request})
+        resposta = self.get_paginated_response(serializer.data)
+        resposta.data["facetas"] = facetas(perfis)
+        return resposta
 
     # DADOS PÚBLICOS
     @action(
@@ -318,41 +327,7 @@ class UsuarioViewSet(viewsets.ModelViewSet):
         Inclui propostas, avaliações e denúncias (enviadas e recebidas).
         Usado no Dashboard e no Perfil Público.
         """
-        user = request.user
-        resumo = {}
-
-        from denuncias.models import Denuncia
-
-        # PROPOSTAS
-        if user.tipo == "freelancer":
-            propostas = Proposta.objects.filter(freelancer=user)
-            resumo["enviadas"] = propostas.count()
-            resumo["aceitas"] = propostas.filter(status="aceita").count()
-            resumo["recusadas"] = propostas.filter(status="recusada").count()
-        elif user.tipo == "contratante":
-            propostas = Proposta.objects.filter(trabalho__contratante=user)
-            resumo["recebidas"] = propostas.count()
-            resumo["pendentes"] = propostas.filter(status="pendente").count()
-            resumo["aceitas"] = propostas.filter(status="aceita").count()
-
-        # AVALIAÇÕES
-        avaliacoes_recebidas = Avaliacao.objects.filter(avaliado=user)
-        avaliacoes_enviadas = Avaliacao.objects.filter(avaliador=user)
-
-        resumo["avaliacoesRecebidas"] = avaliacoes_recebidas.count()
-        resumo["avaliacoesEnviadas"] = avaliacoes_enviadas.count()
-
-        resumo["mediaAvaliacao"] = (
-            round(sum(a.nota for a in avaliacoes_recebidas) / avaliacoes_recebidas.count(), 2)
-            if avaliacoes_recebidas.exists()
-            else None
-        )
-
-        # DENÚNCIAS
-        resumo["denunciasEnviadas"] = Denuncia.objects.filter(denunciante=user).count()
-        resumo["denunciasRecebidas"] = Denuncia.objects.filter(denunciado=user).count()
-
-        return Response(resumo)
+        return Response(resumo_do_usuario(request.user))
 
 
 # USUÁRIO LOGADO
@@ -374,18 +349,6 @@ class UsuarioMeAPIView(APIView):
 
 
 # RECUPERAÇÃO DE SENHA
-def enviar_email_async(destinatario, assunto, corpo_texto, corpo_html):
-    """Executa o envio de e-mail de redefinição em uma thread separada."""
-    try:
-        print("🚀 [THREAD] Iniciando envio de e-mail de redefinição...")
-        inicio = time.time()
-        enviar_email_sendgrid(destinatario, assunto, corpo_texto, corpo_html)
-        duracao = round(time.time() - inicio, 2)
-        print(f"✅ [OK] E-mail enviado com sucesso em {duracao}s para {destinatario}")
-    except Exception as e:
-        print(f"❌ [ERRO] Falha ao enviar e-mail: {type(e).__name__} -> {e}")
-
-
 class PasswordResetRequestView(APIView):
     """Endpoint público: /api/password-reset/"""
     permission_classes = [AllowAny]
@@ -419,11 +382,7 @@ class PasswordResetRequestView(APIView):
             print("📧 Iniciando envio de e-mail para:", user.email)
             print("🔗 Link de redefinição:", reset_link)
 
-            threading.Thread(
-                target=enviar_email_async,
-                args=(user.email, subject, text_body, html_body),
-                daemon=True
-            ).start()
+            enviar_email.enfileirar(user.email, subject, text_body, html_body)
         else:
             print(f"⚠️ E-mail {email} não encontrado — nenhuma ação tomada.")
 
@@ -0,0 +1,39 @@
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework.exceptions import AuthenticationFailed
+
+
+@database_sync_to_async
+def _usuario_do_token(token):
+    """Valida o access token (mesmas regras da API REST) e retorna o usuário."""
+    auth = JWTAuthentication()
+    try:
+        validado = auth.get_validated_token(token)
+        usuario = auth.get_user(validado)
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return AnonymousUser()
+
+    # Banidos não recebem eventos em tempo real
+    if getattr(usuario, "banido", False):
+        return AnonymousUser()
+    return usuario
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """
+    Autenticação JWT para WebSockets.
+    Navegadores não enviam cabeçalho Authorization no handshake, então o
+    access token vem na query string: ws://.../ws/...?token=<access>
+    """
+
+    async def __call__(self, scope, receive, send):
+        query = parse_qs(scope.get("query_string", b"").decode())
+        token = (query.get("token") or [None])[0]
+
+        scope["user"] = await _usuario_do_token(token) if token else AnonymousUser()
+        return await super().__call__(scope, receive, send)